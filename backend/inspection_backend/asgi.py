@@ -1,6 +1,13 @@
-"""ASGI config for inspection_backend project."""
+"""ASGI config for inspection_backend project.
+
+Serving over ASGI (e.g. ``uvicorn inspection_backend.asgi:application``) turns on the
+async read views unless ``ASYNC_READ_VIEWS`` says otherwise, and stops keeping database
+connections open unless ``DATABASE_CONN_MAX_AGE`` is set.
+"""
 import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'inspection_backend.settings')
+os.environ.setdefault('ASYNC_READ_VIEWS', 'true')
+os.environ.setdefault('DATABASE_CONN_MAX_AGE', '0')
 application = get_asgi_application()
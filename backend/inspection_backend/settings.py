@@ -27,6 +27,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'inspections.perf.PerfMiddleware',
+    'inspections.replicas.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -60,33 +62,119 @@ ASGI_APPLICATION = 'inspection_backend.asgi.application'
 
 DEFAULT_DB_URL = 'sqlite:///' + str(BASE_DIR / 'db.sqlite3')
 DATABASE_URL = os.getenv('DATABASE_URL', DEFAULT_DB_URL)
+# Optional read replica of DATABASE_URL; see inspections/replicas.py for which reads it serves.
+DATABASE_REPLICA_URL = os.getenv('DATABASE_REPLICA_URL', '')
+# How long a client that wrote keeps reading from the primary; keep it above the replica's lag.
+DATABASE_REPLICA_PIN_SECONDS = int(os.getenv('DATABASE_REPLICA_PIN_SECONDS', '10'))
+
+
+def database_from_url(url: str) -> dict:
+    """Django database settings for a ``sqlite:///path`` or ``postgresql://`` URL."""
+    if url.startswith('postgres://'):
+        # Required by Django, but Supabase uses the deprecated prefix
+        url = url.replace('postgres://', 'postgresql://', 1)
+    database = {
+        # Reuse connections across requests, checking them before each request's first query.
+        # asgi.py defaults the age to 0: persistent connections are per thread, so put a pooler
+        # such as Supabase's in front of the database under ASGI instead.
+        'CONN_MAX_AGE': int(os.getenv('DATABASE_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': os.getenv('DATABASE_CONN_HEALTH_CHECKS', 'true').lower() == 'true',
+    }
+    if url.startswith('sqlite:///'):
+        return {**database, 'ENGINE': 'django.db.backends.sqlite3', 'NAME': url.replace('sqlite:///', '')}
 
-if DATABASE_URL.startswith('postgres://'):
-    # Required by Django, but Supabase uses the deprecated prefix
-    DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
+    from urllib.parse import urlparse
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3' if DATABASE_URL.startswith('sqlite:///') else 'django.db.backends.postgresql',
-        'NAME': '',
+    parsed = urlparse(url)
+    return {
+        **database,
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': parsed.path.lstrip('/'),
+        'USER': parsed.username,
+        'PASSWORD': parsed.password,
+        'HOST': parsed.hostname,
+        'PORT': parsed.port or '',
+        # Transaction-mode poolers (pgbouncer, Supabase port 6543) cannot hold server-side cursors.
+        'DISABLE_SERVER_SIDE_CURSORS': os.getenv('DATABASE_DISABLE_SERVER_SIDE_CURSORS', 'false').lower() == 'true',
     }
-}
 
-if DATABASE_URL.startswith('sqlite:///'):
-    DATABASES['default']['NAME'] = DATABASE_URL.replace('sqlite:///', '')
-else:
-    from urllib.parse import urlparse
 
-    parsed = urlparse(DATABASE_URL)
-    DATABASES['default'].update(
-        {
-            'NAME': parsed.path.lstrip('/'),
-            'USER': parsed.username,
-            'PASSWORD': parsed.password,
-            'HOST': parsed.hostname,
-            'PORT': parsed.port or '',
+DATABASES = {'default': database_from_url(DATABASE_URL)}
+DATABASE_ROUTERS: list[str] = []
+if DATABASE_REPLICA_URL:
+    DATABASES['replica'] = {**database_from_url(DATABASE_REPLICA_URL), 'TEST': {'MIRROR': 'default'}}
+    DATABASE_ROUTERS = ['inspections.replicas.ReplicaRouter']
+
+# Cache backend: in-process by default; point DJANGO_CACHE_URL at Redis (redis://host:6379/0)
+# or the database (db://cache_table_name, after ``manage.py createcachetable``) to share
+# cached documents between gunicorn workers.
+CACHE_URL = os.getenv('DJANGO_CACHE_URL', 'locmem://')
+
+if CACHE_URL.startswith(('redis://', 'rediss://')):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+        }
+    }
+elif CACHE_URL.startswith('db://'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': CACHE_URL.replace('db://', '', 1) or 'inspections_cache',
         }
-    )
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'inspections',
+            'OPTIONS': {'MAX_ENTRIES': int(os.getenv('DJANGO_LOCMEM_CACHE_MAX_ENTRIES', '5000'))},
+        }
+    }
+
+TANK_DETAIL_CACHE_ALIAS = 'default'
+# Each worker's in-process cache only sees its own writes, so there the timeout also bounds how
+# long another worker's edit can go unseen; keep it short unless the cache is shared.
+TANK_DETAIL_CACHE_TIMEOUT = int(
+    os.getenv('TANK_DETAIL_CACHE_TIMEOUT', '60' if CACHE_URL.startswith('locmem://') else '3600')
+)
+
+# Settlement analyses are refitted on a small in-process thread pool after writes commit.
+SETTLEMENT_ANALYSIS_ASYNC = os.getenv('SETTLEMENT_ANALYSIS_ASYNC', 'true').lower() == 'true'
+SETTLEMENT_ANALYSIS_WORKERS = int(os.getenv('SETTLEMENT_ANALYSIS_WORKERS', '2'))
+SETTLEMENT_YIELD_STRENGTH_PSI = float(os.getenv('SETTLEMENT_YIELD_STRENGTH_PSI', '30000'))
+SETTLEMENT_ELASTIC_MODULUS_PSI = float(os.getenv('SETTLEMENT_ELASTIC_MODULUS_PSI', '29000000'))
+
+# Tank reports render on a process pool; finished artifacts are kept here, named by content hash.
+REPORT_WORKERS = int(os.getenv('REPORT_WORKERS', '2'))
+REPORT_ARTIFACT_ROOT = Path(os.getenv('REPORT_ARTIFACT_ROOT', str(BASE_DIR / 'report_artifacts')))
+REPORT_STALL_SECONDS = int(os.getenv('REPORT_STALL_SECONDS', '600'))
+
+# Delta sync for offline tablets. The settle window is re-read at the end of every sync so
+# rows committed late with an earlier ``updated_at`` are still delivered.
+SYNC_PAGE_SIZE = int(os.getenv('SYNC_PAGE_SIZE', '500'))
+SYNC_SETTLE_SECONDS = int(os.getenv('SYNC_SETTLE_SECONDS', '5'))
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv('SYNC_TOMBSTONE_RETENTION_DAYS', '90'))
+SYNC_PUSH_MAX_CHANGES = int(os.getenv('SYNC_PUSH_MAX_CHANGES', '500'))
+
+# Years from the last recorded inspection of each kind to the next one, for the compliance rollup.
+COMPLIANCE_INTERVAL_YEARS = {
+    'external': int(os.getenv('COMPLIANCE_EXTERNAL_YEARS', '5')),
+    'internal': int(os.getenv('COMPLIANCE_INTERNAL_YEARS', '10')),
+    'ut': int(os.getenv('COMPLIANCE_UT_YEARS', '15')),
+}
+
+# Per-request timing, query counts and response sizes (inspections/perf.py), summarised per view at
+# /api/_perf/ for staff users or holders of PERF_TOKEN.
+PERF_INSTRUMENTATION = os.getenv('PERF_INSTRUMENTATION', 'true').lower() == 'true'
+PERF_SERVER_TIMING = os.getenv('PERF_SERVER_TIMING', 'true').lower() == 'true'
+PERF_SAMPLE_SIZE = int(os.getenv('PERF_SAMPLE_SIZE', '1000'))
+PERF_TOKEN = os.getenv('PERF_TOKEN', '')
+
+# Serve the hot read endpoints from native async views (inspections/async_views.py). Only worth it
+# under an ASGI server, so inspection_backend/asgi.py switches it on and WSGI leaves it off.
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS', 'false').lower() == 'true'
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -124,4 +212,6 @@ REST_FRAMEWORK = {
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
     ],
+    'DEFAULT_PAGINATION_CLASS': 'inspections.pagination.KeysetPagination',
+    'PAGE_SIZE': int(os.getenv('API_PAGE_SIZE', '100')),
 }
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from django.contrib import admin
 
-from . import models
+from . import cache, models
 
 
 @admin.register(models.Tank)
@@ -13,10 +13,24 @@ class TankAdmin(admin.ModelAdmin):
     list_filter = ('facility_type', 'state', 'design_standard')
 
 
+class SettlementReadingInline(admin.TabularInline):
+    model = models.SettlementReading
+    fields = ('position', 'station_label', 'measurement_in')
+    extra = 0
+
+
 @admin.register(models.ShellSettlementSurvey)
 class ShellSettlementSurveyAdmin(admin.ModelAdmin):
     list_display = ('tank', 'station_count', 'created_at')
     list_filter = ('tank',)
+    inlines = [SettlementReadingInline]
+
+    def save_formset(self, request, form, formset, change):
+        for reading in formset.save(commit=False):
+            reading.tank_id = form.instance.tank_id
+            reading.save()
+        for reading in formset.deleted_objects:
+            reading.delete()
 
 
 @admin.register(models.UTResult)
@@ -55,6 +69,18 @@ class GoalQuestionTemplateAdmin(admin.ModelAdmin):
     list_display = ('goal_key', 'prompt', 'is_default', 'created_at')
     list_filter = ('goal_key', 'is_default')
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        cache.invalidate_reference_data()
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        cache.invalidate_reference_data()
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        cache.invalidate_reference_data()
+
 
 @admin.register(models.GoalResult)
 class GoalResultAdmin(admin.ModelAdmin):
@@ -5,3 +5,13 @@ class InspectionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'inspections'
     verbose_name = 'Tank Inspections'
+
+    def ready(self):
+        from django.conf import settings
+
+        from . import perf, search, tags
+
+        search.connect_signals()
+        tags.connect_signals()
+        if settings.PERF_INSTRUMENTATION:
+            perf.install()
@@ -0,0 +1,201 @@
+"""Native async handlers for the hot read endpoints, used when the app runs under ASGI.
+
+The tank list, tank detail and summary, metadata and goal template list answer JSON GETs
+here with Django's async ORM, so a request waiting on the database holds no thread while
+the event loop serves others. Each handler drives an instance of the endpoint's DRF viewset
+for filtering, serialization, validators and error responses, so both paths answer the
+same requests with the same bytes. Every other method, and content negotiated to another
+renderer such as the browsable API, falls through to the DRF view itself.
+
+The routes are mounted ahead of the router when ``ASYNC_READ_VIEWS`` is on, which
+``inspection_backend/asgi.py`` makes the default.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from typing import Any, Awaitable, Callable
+
+from asgiref.sync import sync_to_async
+from django.db.models import Model, QuerySet
+from django.http import Http404, HttpResponse
+from django.urls import URLPattern, re_path
+from rest_framework.exceptions import NotAcceptable
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from . import cache, conditional, reference, replicas, serializers
+
+Handler = Callable[[Any], Awaitable[Any]]
+
+
+async def tank_list(view) -> Any:
+    """Async ``TankViewSet.list``, including its 304 answer for an unchanged page."""
+    queryset = view.filter_queryset(view.get_queryset())
+    rows = await view.paginator.apaginate_queryset(queryset, view.request, view=view)
+    validators = conditional.rows_validators(view.request, rows, view.paginator.has_next, view.paginator.has_previous)
+    not_modified = conditional.not_modified(view.request, validators)
+    if not_modified is not None:
+        return not_modified
+    data = view.get_serializer(rows, many=True).data
+    return conditional.apply(view.get_paginated_response(data), validators)
+
+
+async def tank_detail(view) -> Any:
+    """Async ``TankViewSet.retrieve`` and ``summary``: validators, then the cached or freshly built document."""
+    tank_id = cache.normalise_tank_id(view.kwargs[view.lookup_url_kwarg or view.lookup_field])
+    if tank_id is None:
+        raise Http404
+    validators = await conditional.atank_validators(view.request, tank_id)
+    not_modified = conditional.not_modified(view.request, validators)
+    if not_modified is not None:
+        return not_modified
+    version = await cache.acurrent_version(tank_id)
+    data = await cache.aget_tank_detail(tank_id, version)
+    model = view.get_queryset().model
+    if data is not None:
+        view.check_object_permissions(view.request, await _aget_object(model.objects.only('pk'), tank_id))
+    else:
+        with replicas.primary():
+            tank = await _aget_object(model.objects.all(), tank_id)
+            view.check_object_permissions(view.request, tank)
+            await aprefetch(tank, view.get_serializer_class().prefetch_fields)
+        context = {'request': view.request, 'format': view.format_kwarg, 'view': view}
+        data = view.get_serializer_class()(tank, context=context).data
+        await cache.aset_tank_detail(tank_id, version, data)
+    fields, exclude = view.get_sparse_fieldset()
+    return conditional.apply(Response(serializers.prune_fields(data, fields, exclude)), validators)
+
+
+async def _aget_object(queryset: QuerySet, pk: str) -> Model:
+    instance = await queryset.filter(pk=pk).afirst()
+    if instance is None:
+        raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
+    return instance
+
+
+async def metadata(view) -> Any:
+    """Async ``MetadataViewSet.list``."""
+    data = await reference.aget_reference_data()
+    return reference.respond(view.request, data.metadata, data.version)
+
+
+async def goal_question_templates(view) -> Any:
+    """Async ``GoalQuestionTemplateViewSet.list``: the cached first page, or a page from the database."""
+    request = view.request
+    if view.paginator.cursor_query_param not in request.query_params:
+        data = await reference.aget_reference_data()
+        goal_key = request.query_params.get('goal_key')
+        rows = [row for row in data.templates if not goal_key or row['goal_key'] == goal_key]
+        if len(rows) <= view.paginator.get_page_size(request):
+            fields, exclude = view.get_sparse_fieldset()
+            results = [serializers.prune_fields(row, fields, exclude) for row in rows]
+            return reference.respond(request, {'next': None, 'previous': None, 'results': results}, data.version)
+    queryset = view.filter_queryset(view.get_queryset())
+    rows = await view.paginator.apaginate_queryset(queryset, request, view=view)
+    return view.get_paginated_response(view.get_serializer(rows, many=True).data)
+
+
+async def aprefetch(instance: Model, lookups: tuple[str, ...]) -> None:
+    """``prefetch_related_objects`` for one instance, fetching its reverse relations concurrently.
+
+    ``lookups`` are ``prefetch_related`` paths; anything below the first level is
+    prefetched by that relation's own query.
+    """
+    nested: dict[str, list[str]] = defaultdict(list)
+    for lookup in lookups:
+        name, _, rest = lookup.partition('__')
+        if rest:
+            nested[name].append(rest)
+        else:
+            nested.setdefault(name, [])
+    querysets = {name: getattr(instance, name).all().prefetch_related(*rest) for name, rest in nested.items()}
+    results = await asyncio.gather(*(_fetch(queryset) for queryset in querysets.values()))
+    cached = getattr(instance, '_prefetched_objects_cache', {})
+    for (name, queryset), rows in zip(querysets.items(), results):
+        # The shape prefetch_related leaves behind: a queryset whose results are already fetched.
+        queryset._result_cache = rows
+        queryset._prefetch_done = True
+        cached[name] = queryset
+    instance._prefetched_objects_cache = cached
+
+
+async def _fetch(queryset: QuerySet) -> list[Any]:
+    return [row async for row in queryset]
+
+
+# ---------------------------------------------------------------------------
+# Dispatch
+
+def as_view(fallback: Callable[..., Any], handler: Handler) -> Callable[..., Any]:
+    """Serve JSON GETs of a router view with ``handler``; hand every other request to the view itself."""
+    viewset_class = fallback.cls  # type: ignore[attr-defined]
+    initkwargs = fallback.initkwargs  # type: ignore[attr-defined]
+    actions = fallback.actions  # type: ignore[attr-defined]
+    handlers = {'head': actions['get'], **actions} if 'get' in actions else actions
+    sync_view = sync_to_async(fallback)
+
+    async def view(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return await sync_view(request, *args, **kwargs)
+        self = viewset_class(**initkwargs)
+        self.action_map = actions
+        for method, action in handlers.items():
+            setattr(self, method, getattr(self, action))
+        self.args, self.kwargs = args, kwargs
+        self.request = self.initialize_request(request, *args, **kwargs)
+        self.headers = self.default_response_headers
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+        try:
+            renderer, media_type = self.perform_content_negotiation(self.request)
+        except NotAcceptable:
+            renderer = None
+        if not isinstance(renderer, JSONRenderer):
+            return await sync_view(request, *args, **kwargs)
+        self.request.accepted_renderer, self.request.accepted_media_type = renderer, media_type
+        try:
+            # Authentication may read the session, so it runs where the ORM can be used synchronously.
+            await sync_to_async(self.initial)(self.request, *args, **kwargs)
+            response = await handler(self)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        return _render(self, response)
+
+    view.cls = viewset_class  # type: ignore[attr-defined]
+    view.initkwargs = initkwargs  # type: ignore[attr-defined]
+    view.actions = actions  # type: ignore[attr-defined]
+    view.csrf_exempt = True  # type: ignore[attr-defined]
+    return view
+
+
+def _render(view, response) -> HttpResponse:
+    response = view.finalize_response(view.request, response)
+    if not isinstance(response, Response):
+        return response
+    # Django would render a DRF response in a worker thread; plain bytes go straight out.
+    response.render()
+    rendered = HttpResponse(response.content, status=response.status_code)
+    for header, value in response.items():
+        rendered[header] = value
+    return rendered
+
+
+ROUTES: tuple[tuple[str, str, Handler], ...] = (
+    (r'^tanks/$', 'tanks-list', tank_list),
+    (r'^tanks/(?P<pk>[^/.]+)/$', 'tanks-detail', tank_detail),
+    (r'^tanks/(?P<pk>[^/.]+)/summary/$', 'tanks-summary', tank_detail),
+    (r'^metadata/$', 'metadata-list', metadata),
+    (r'^goal-question-templates/$', 'goal-question-templates-list', goal_question_templates),
+)
+
+
+def urlpatterns(router_patterns: list[Any]) -> list[URLPattern]:
+    """Async routes to mount ahead of ``router_patterns``, each falling back to the router's view."""
+    views = {pattern.name: pattern.callback for pattern in router_patterns if isinstance(pattern, URLPattern)}
+    # Fixed routes such as tanks/compliance/ go first, or the async detail route would take them for a pk.
+    served = {name for _, name, _ in ROUTES}
+    fixed = [
+        pattern for pattern in router_patterns
+        if isinstance(pattern, URLPattern) and not pattern.pattern.regex.groups and pattern.name not in served
+    ]
+    return fixed + [re_path(route, as_view(views[name], handler)) for route, name, handler in ROUTES]
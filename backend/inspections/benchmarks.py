@@ -0,0 +1,403 @@
+"""Concurrent HTTP benchmarks of every API route against the fleet in the database.
+
+Endpoints are discovered from the router in :mod:`inspections.urls`, so new viewsets and
+actions are benchmarked without being listed here. Each one is requested over real HTTP,
+either from an in-process threaded server or a running deployment, and reported with
+latency percentiles, throughput, SQL statements per request (read from the
+``Server-Timing`` header of :mod:`inspections.perf`) and the server's peak RSS.
+"""
+from __future__ import annotations
+
+import json
+import os
+import platform
+import re
+import resource
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import django
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler, get_internal_wsgi_application
+from django.db import connection
+from django.db.models import Model
+from django.utils import timezone
+
+from . import cache, models, perf
+from .urls import router
+
+API_PREFIX = '/api/'
+SERVER_TIMING_DB = re.compile(r'db;dur=([\d.]+);desc="queries=(\d+)"')
+# Query strings for routes that need parameters to do representative work.
+QUERY_STRINGS = {
+    'tanks-typeahead': '?q=syn',
+    'search-list': '?q=corrosion',
+    'ut-results-statistics': '?group_by=category',
+    'sync-changes': '?page_size=200',
+}
+# Routes that are not measured, with the reason reported alongside the results.
+SKIPPED = {
+    'tanks-report': 'renders reports in the background; time it with a report batch instead',
+    'perf-list': 'requires staff access and reports on the benchmark itself',
+}
+WRITE_BATCH_SIZE = 100
+# Tank detail documents are cached, so warm requests never reach the serializer. The cold
+# variants request these many tanks in turn, moving each to a new cache version first.
+COLD_TANKS = 32
+COLD_ENDPOINTS = {'tanks-detail-cold': '', 'tanks-summary-cold': 'summary/'}
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    name: str
+    path: str
+    method: str = 'GET'
+    body: bytes | None = None
+    # Tank ids substituted for ``{tank}`` in ``path`` in turn, each invalidated before its request.
+    cold_tanks: tuple[str, ...] = ()
+
+
+@dataclass
+class Result:
+    endpoint: Endpoint
+    latencies: list[float] = field(default_factory=list)
+    statuses: dict[str, int] = field(default_factory=dict)
+    queries: list[int] = field(default_factory=list)
+    db_ms: list[float] = field(default_factory=list)
+    elapsed: float = 0.0
+    rss_peak: int | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        ordered = sorted(self.latencies)
+        count = len(ordered)
+        return {
+            'name': self.endpoint.name,
+            'method': self.endpoint.method,
+            'path': self.endpoint.path,
+            'requests': count,
+            'errors': sum(total for code, total in self.statuses.items() if not code.startswith(('2', '3'))),
+            'status_codes': dict(sorted(self.statuses.items())),
+            'throughput_rps': round(count / self.elapsed, 1) if self.elapsed else None,
+            'latency_ms': {
+                'mean': round(sum(ordered) / count, 2),
+                **{f'p{percent}': round(perf.percentile(ordered, percent), 2) for percent in perf.PERCENTILES},
+                'max': round(ordered[-1], 2),
+            } if count else None,
+            'queries': {
+                'mean': round(sum(self.queries) / len(self.queries), 1),
+                'max': max(self.queries),
+                'db_ms_mean': round(sum(self.db_ms) / len(self.db_ms), 2),
+            } if self.queries else None,
+            'rss_peak_mb': _mb(self.rss_peak),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Endpoint discovery
+
+def _sample_tank() -> models.Tank | None:
+    count = models.Tank.objects.count()
+    return models.Tank.objects.order_by('tank_name', 'pk')[count // 2] if count else None
+
+
+def _sample_pk(model: type[Model], tank: models.Tank) -> Any:
+    if model is models.Tank:
+        return tank.pk
+    queryset = model._default_manager.order_by('pk')
+    if any(field.name == 'tank' for field in model._meta.fields):
+        queryset = queryset.filter(tank=tank)
+    return queryset.values_list('pk', flat=True).first()
+
+
+def _viewset_model(viewset) -> type[Model] | None:
+    serializer_class = getattr(viewset, 'serializer_class', None)
+    return getattr(getattr(serializer_class, 'Meta', None), 'model', None)
+
+
+def _write_endpoints(tank: models.Tank) -> list[Endpoint]:
+    readings = [
+        {'category': 'shell', 'location': f'Bench {index}', 'course': 1 + index % 4, 'thickness_in': '0.2500'}
+        for index in range(WRITE_BATCH_SIZE)
+    ]
+    package = {
+        'ut_results': readings[:10],
+        'visual_findings': [{'area': 'shell', 'finding': 'Benchmark finding.', 'comment_type': 'monitor'}],
+    }
+    tank_body = {
+        field: getattr(tank, field)
+        for field in (
+            'owner', 'facility_type', 'city', 'state', 'design_standard', 'product_stored', 'foundation', 'anchors',
+            'shell_weld_type', 'insulation', 'shell_manway', 'access_structure', 'bottom_type',
+            'secondary_containment_type',
+        )
+    }
+    return [
+        Endpoint(
+            'tanks-create', f'{API_PREFIX}tanks/', 'POST', json.dumps({**tank_body, 'tank_name': 'BENCH'}).encode()
+        ),
+        Endpoint(
+            'ut-results-bulk', f'{API_PREFIX}ut-results/bulk/?tank_id={tank.pk}', 'POST', json.dumps(readings).encode()
+        ),
+        Endpoint(
+            'tanks-inspection-package', f'{API_PREFIX}tanks/{tank.pk}/inspection-package/', 'POST',
+            json.dumps(package).encode(),
+        ),
+    ]
+
+
+def _cold_endpoints(shared_cache: bool, skipped: dict[str, str]) -> list[Endpoint]:
+    if not shared_cache:
+        for name in COLD_ENDPOINTS:
+            skipped[name] = 'needs the server to share this cache (DJANGO_CACHE_URL) to invalidate it'
+        return []
+    tanks = models.Tank.objects.order_by('tank_name', 'pk').values_list('pk', flat=True)[:COLD_TANKS]
+    cold_tanks = tuple(str(pk) for pk in tanks)
+    return [
+        Endpoint(name, f'{API_PREFIX}tanks/{{tank}}/{suffix}', cold_tanks=cold_tanks)
+        for name, suffix in COLD_ENDPOINTS.items()
+    ]
+
+
+def discover(include_writes: bool = False, shared_cache: bool = True) -> tuple[list[Endpoint], dict[str, str]]:
+    """Every routed read endpoint (plus a few writes), and the routes left out with why.
+
+    ``shared_cache`` says whether the server sees this process's cache, which the cold tank
+    detail variants need; it does for the in-process server.
+    """
+    tank = _sample_tank()
+    if tank is None:
+        raise ValueError('The database has no tanks; run generate_synthetic_fleet first.')
+    endpoints: list[Endpoint] = []
+    skipped: dict[str, str] = {}
+
+    def add(name: str, path: str) -> None:
+        if name in SKIPPED:
+            skipped[name] = SKIPPED[name]
+        else:
+            endpoints.append(Endpoint(name, path + QUERY_STRINGS.get(name, '')))
+
+    for prefix, viewset, basename in router.registry:
+        base = f'{API_PREFIX}{prefix}/'
+        model = _viewset_model(viewset)
+        pk = 'tanks' if viewset.__name__ == 'ExportViewSet' else _sample_pk(model, tank) if model else None
+        if hasattr(viewset, 'list'):
+            add(f'{basename}-list', base)
+            if model is not None and model is not models.Tank and any(f.name == 'tank' for f in model._meta.fields):
+                add(f'{basename}-list-tank', f'{base}?tank_id={tank.pk}')
+        detail_routes = [('detail', '')] if hasattr(viewset, 'retrieve') else []
+        for extra in viewset.get_extra_actions():
+            if 'get' not in extra.mapping:
+                continue
+            if extra.detail:
+                detail_routes.append((extra.url_name, f'{extra.url_path}/'))
+            else:
+                add(f'{basename}-{extra.url_name}', f'{base}{extra.url_path}/')
+        for name, suffix in detail_routes:
+            if pk is None:
+                skipped[f'{basename}-{name}'] = 'no record to request'
+            else:
+                add(f'{basename}-{name}', f'{base}{pk}/{suffix}')
+    endpoints.extend(_cold_endpoints(shared_cache, skipped))
+    if include_writes:
+        endpoints.extend(_write_endpoints(tank))
+    return endpoints, skipped
+
+
+def fleet_counts() -> dict[str, int]:
+    counted = (
+        models.Tank, models.ShellSettlementSurvey, models.SettlementReading, models.SettlementAnalysis,
+        models.UTResult, models.EdgeSettlementCheck, models.ColumnPlumbnessCheck, models.VisualFinding,
+        models.OtherNDE, models.GoalResult, models.SearchDocument,
+    )
+    return {model._meta.model_name: model._default_manager.count() for model in counted}
+
+
+# ---------------------------------------------------------------------------
+# Running
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalServer:
+    """The project's WSGI application on a threaded server bound to an ephemeral local port."""
+
+    def __init__(self):
+        self.server = ThreadedWSGIServer(('127.0.0.1', 0), _QuietHandler, allow_reuse_address=False)
+        self.server.set_app(get_internal_wsgi_application())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def __enter__(self) -> LocalServer:
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class RSSSampler:
+    """Peak resident set size of this process while the block runs, polled from ``/proc``."""
+
+    INTERVAL = 0.02
+
+    def __init__(self):
+        self.peak: int | None = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def current() -> int | None:
+        try:
+            with open('/proc/self/statm') as statm:
+                return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError, IndexError):
+            return None
+
+    def _run(self) -> None:
+        while True:
+            rss = self.current()
+            if rss is not None and (self.peak is None or rss > self.peak):
+                self.peak = rss
+            if self._stop.wait(self.INTERVAL):
+                return
+
+    def __enter__(self) -> RSSSampler:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def _request(base_url: str, endpoint: Endpoint, timeout: float, number: int = 0) -> tuple[float, int, str | None]:
+    path = endpoint.path
+    if endpoint.cold_tanks:
+        tank_id = endpoint.cold_tanks[number % len(endpoint.cold_tanks)]
+        cache.invalidate_tanks(tank_id)
+        path = path.format(tank=tank_id)
+    request = Request(base_url + path, data=endpoint.body, method=endpoint.method)
+    if endpoint.body is not None:
+        request.add_header('Content-Type', 'application/json')
+    request.add_header('Accept', '*/*')
+    started = time.perf_counter()
+    try:
+        with urlopen(request, timeout=timeout) as response:
+            while response.read(64 * 1024):
+                pass
+            status, timing = response.status, response.headers.get('Server-Timing')
+    except HTTPError as error:
+        error.read()
+        status, timing = error.code, error.headers.get('Server-Timing')
+    return (time.perf_counter() - started) * 1000, status, timing
+
+
+def run_endpoint(
+    base_url: str,
+    endpoint: Endpoint,
+    requests: int,
+    concurrency: int,
+    warmup: int = 2,
+    timeout: float = 60.0,
+    measure_rss: bool = True,
+) -> Result:
+    for number in range(warmup):
+        _request(base_url, endpoint, timeout, number)
+    result = Result(endpoint)
+    with ThreadPoolExecutor(max_workers=concurrency) as pool, RSSSampler() as sampler:
+        started = time.perf_counter()
+        outcomes = list(pool.map(lambda number: _request(base_url, endpoint, timeout, number), range(requests)))
+        result.elapsed = time.perf_counter() - started
+    result.rss_peak = sampler.peak if measure_rss else None
+    for latency, status, timing in outcomes:
+        result.latencies.append(latency)
+        result.statuses[str(status)] = result.statuses.get(str(status), 0) + 1
+        match = SERVER_TIMING_DB.search(timing or '')
+        if match:
+            result.db_ms.append(float(match.group(1)))
+            result.queries.append(int(match.group(2)))
+    return result
+
+
+def run(
+    endpoints: list[Endpoint],
+    base_url: str | None = None,
+    requests: int = 200,
+    concurrency: int = 8,
+    warmup: int = 2,
+    timeout: float = 60.0,
+) -> Iterator[Result]:
+    """Benchmark ``endpoints`` one after another; without ``base_url`` an in-process server is started."""
+    if base_url:
+        for endpoint in endpoints:
+            yield run_endpoint(base_url.rstrip('/'), endpoint, requests, concurrency, warmup, timeout, False)
+        return
+    with LocalServer() as server:
+        for endpoint in endpoints:
+            yield run_endpoint(server.url, endpoint, requests, concurrency, warmup, timeout)
+
+
+def _mb(size: int | None) -> float | None:
+    return round(size / (1024 * 1024), 1) if size is not None else None
+
+
+def process_peak_rss() -> int:
+    # ``ru_maxrss`` is in kilobytes on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def report(
+    results: list[Result],
+    skipped: dict[str, str],
+    settings: dict[str, Any],
+    in_process: bool,
+) -> dict[str, Any]:
+    """The machine-readable benchmark document; diff two with :func:`compare`."""
+    return {
+        'meta': {
+            'created_at': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'in_process_server': in_process,
+            **settings,
+            'fleet': fleet_counts(),
+        },
+        'endpoints': [result.as_dict() for result in results],
+        'skipped': [{'name': name, 'reason': reason} for name, reason in sorted(skipped.items())],
+        'process_rss_peak_mb': _mb(process_peak_rss()) if in_process else None,
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any]) -> list[dict[str, Any]]:
+    """Per-endpoint p50/p95 latency and mean query count of ``current`` against ``baseline``."""
+    previous = {row['name']: row for row in baseline.get('endpoints', [])}
+    rows = []
+    for row in current['endpoints']:
+        before = previous.get(row['name'])
+        if not before or not row['latency_ms'] or not before['latency_ms']:
+            continue
+        rows.append({
+            'name': row['name'],
+            **{
+                f'{key}_ms': [before['latency_ms'][key], row['latency_ms'][key]]
+                for key in ('p50', 'p95')
+            },
+            'p95_ratio': round(row['latency_ms']['p95'] / before['latency_ms']['p95'], 2)
+            if before['latency_ms']['p95'] else None,
+            'queries': [(before['queries'] or {}).get('mean'), (row['queries'] or {}).get('mean')],
+        })
+    return rows
@@ -0,0 +1,133 @@
+"""Versioned caches of serialized tank detail documents, fleet rollups and reference data."""
+from __future__ import annotations
+
+import uuid
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+VERSION_KEY = 'inspections:tank-detail-version:{tank_id}'
+DETAIL_KEY = 'inspections:tank-detail:{tank_id}:{version}'
+REFERENCE_VERSION_KEY = 'inspections:reference-version'
+FLEET_VERSION_KEY = 'inspections:fleet-version'
+FLEET_DOCUMENT_KEY = 'inspections:fleet:{name}:{version}:{digest}'
+
+
+def _cache():
+    return caches[getattr(settings, 'TANK_DETAIL_CACHE_ALIAS', 'default')]
+
+
+def _timeout() -> int:
+    return getattr(settings, 'TANK_DETAIL_CACHE_TIMEOUT', 3600)
+
+
+def is_process_local() -> bool:
+    """Whether the cache lives in this process, unseen by other workers."""
+    return isinstance(_cache(), LocMemCache)
+
+
+def _version_timeout() -> int | None:
+    # An in-process cache never hears of other workers' writes, so there versions expire with the
+    # documents: an edit made through another worker is picked up within the cache timeout.
+    return _timeout() if is_process_local() else None
+
+
+def normalise_tank_id(value: Any) -> str | None:
+    """Return the canonical string form of a tank primary key, or None if it is not a UUID."""
+    try:
+        return str(uuid.UUID(str(value)))
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def current_version(tank_id: Any) -> str:
+    """Return the tank's cache version, minting one if none is stored yet.
+
+    Versions are random tokens rather than counters so an evicted version key
+    can never resurrect an older cached document.
+    """
+    return _version(VERSION_KEY.format(tank_id=tank_id))
+
+
+def reference_version() -> str:
+    """Return the shared version token of the goal question templates."""
+    return _version(REFERENCE_VERSION_KEY)
+
+
+def fleet_version() -> str:
+    """Return the shared version token of fleet-wide rollups; any tank write moves it."""
+    return _version(FLEET_VERSION_KEY)
+
+
+async def acurrent_version(tank_id: Any) -> str:
+    return await _aversion(VERSION_KEY.format(tank_id=tank_id))
+
+
+async def areference_version() -> str:
+    return await _aversion(REFERENCE_VERSION_KEY)
+
+
+def get_fleet_document(name: str, version: str, digest: str) -> Any | None:
+    return _cache().get(FLEET_DOCUMENT_KEY.format(name=name, version=version, digest=digest))
+
+
+def set_fleet_document(name: str, version: str, digest: str, data: Any) -> None:
+    _cache().set(FLEET_DOCUMENT_KEY.format(name=name, version=version, digest=digest), data, _timeout())
+
+
+def invalidate_reference_data() -> None:
+    _cache().set(REFERENCE_VERSION_KEY, uuid.uuid4().hex, _version_timeout())
+
+
+def _version(key: str) -> str:
+    backend = _cache()
+    version = backend.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not backend.add(key, version, _version_timeout()):
+            version = backend.get(key) or version
+    return version
+
+
+async def _aversion(key: str) -> str:
+    backend = _cache()
+    version = await backend.aget(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not await backend.aadd(key, version, _version_timeout()):
+            version = await backend.aget(key) or version
+    return version
+
+
+def get_tank_detail(tank_id: Any, version: str) -> Any | None:
+    return _cache().get(DETAIL_KEY.format(tank_id=tank_id, version=version))
+
+
+def set_tank_detail(tank_id: Any, version: str, data: Any) -> None:
+    _cache().set(DETAIL_KEY.format(tank_id=tank_id, version=version), data, _timeout())
+
+
+async def aget_tank_detail(tank_id: Any, version: str) -> Any | None:
+    return await _cache().aget(DETAIL_KEY.format(tank_id=tank_id, version=version))
+
+
+async def aset_tank_detail(tank_id: Any, version: str, data: Any) -> None:
+    await _cache().aset(DETAIL_KEY.format(tank_id=tank_id, version=version), data, _timeout())
+
+
+def invalidate_tanks(*tank_ids: Any) -> None:
+    """Move each tank to a fresh version so previously cached documents are never served."""
+    keys = {normalise_tank_id(tank_id) for tank_id in tank_ids if tank_id is not None}
+    keys.discard(None)
+    if keys:
+        versions = {VERSION_KEY.format(tank_id=tank_id): uuid.uuid4().hex for tank_id in keys}
+        _cache().set_many({**versions, FLEET_VERSION_KEY: uuid.uuid4().hex}, _version_timeout())
+
+
+def tank_id_for(instance: Any) -> Any:
+    """Return the owning tank id for a tank or any tank child record."""
+    if hasattr(instance, 'tank_id'):
+        return instance.tank_id
+    return instance.pk
@@ -0,0 +1,93 @@
+"""Inspection-compliance rollup of the fleet, bucketed and counted in the database."""
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Any, Sequence
+
+from django.conf import settings
+from django.db.models import Count, Min, Q, QuerySet
+
+BUCKETS = ('overdue', 'due_30', 'due_90', 'due_365', 'current', 'unscheduled')
+WINDOWS = (('due_30', 30), ('due_90', 90), ('due_365', 365))
+GROUP_FIELDS = {
+    'owner': 'owner',
+    'client': 'client_name',
+    'state': 'state',
+}
+DEFAULT_GROUP_BY = ('owner',)
+# ``next`` reads the planned due date; the others add an interval to the last recorded inspection.
+SCHEDULES = {
+    'next': 'next_inspection_due_date',
+    'external': 'external_inspection_date',
+    'internal': 'internal_inspection_date',
+    'ut': 'ut_inspection_date',
+}
+DEFAULT_INTERVAL_YEARS = {'external': 5, 'internal': 10, 'ut': 15}
+
+
+def interval_years(schedule: str) -> int:
+    if schedule == 'next':
+        return 0
+    return {**DEFAULT_INTERVAL_YEARS, **getattr(settings, 'COMPLIANCE_INTERVAL_YEARS', {})}[schedule]
+
+
+def _shift_years(day: date, years: int) -> date:
+    try:
+        return day.replace(year=day.year + years)
+    except ValueError:  # 29 February in a non-leap year
+        return day.replace(year=day.year + years, day=28)
+
+
+def rollup(
+    queryset: QuerySet,
+    as_of: date,
+    schedule: str = 'next',
+    group_by: Sequence[str] = DEFAULT_GROUP_BY,
+) -> dict[str, Any]:
+    """Count tanks per due-date bucket for each group in one ``GROUP BY`` query.
+
+    Buckets are mutually exclusive: ``overdue`` (due before ``as_of``), ``due_30``,
+    ``due_90`` and ``due_365`` (due within that many days, after the previous window),
+    ``current`` and ``unscheduled`` (no date recorded). For inspection-date schedules
+    the thresholds are moved back by the interval, so the database compares the stored
+    column directly and can use its index.
+    """
+    column = SCHEDULES[schedule]
+    years = interval_years(schedule)
+    cutoffs = [_shift_years(as_of + timedelta(days=days), -years) for days in (0, *(days for _, days in WINDOWS))]
+    aggregates: dict[str, Any] = {'overdue': Count('pk', filter=Q(**{f'{column}__lt': cutoffs[0]}))}
+    lower = Q(**{f'{column}__gte': cutoffs[0]})
+    for (name, _days), cutoff in zip(WINDOWS, cutoffs[1:]):
+        aggregates[name] = Count('pk', filter=lower & Q(**{f'{column}__lte': cutoff}))
+        lower = Q(**{f'{column}__gt': cutoff})
+    aggregates['current'] = Count('pk', filter=lower)
+    aggregates['unscheduled'] = Count('pk', filter=Q(**{f'{column}__isnull': True}))
+    aggregates['total'] = Count('pk')
+    aggregates['earliest'] = Min(column)
+
+    keys = [GROUP_FIELDS[name] for name in group_by]
+    base = queryset.order_by()
+    rows = base.values(*keys).annotate(**aggregates).order_by(*keys) if keys else [base.aggregate(**aggregates)]
+
+    groups = []
+    totals: dict[str, Any] = {name: 0 for name in (*BUCKETS, 'total')}
+    earliest: list[date] = []
+    for row in rows:
+        group = {name: row[GROUP_FIELDS[name]] for name in group_by}
+        group.update({name: row[name] for name in (*BUCKETS, 'total')})
+        group['earliest_due'] = _shift_years(row['earliest'], years) if row['earliest'] else None
+        for name in totals:
+            totals[name] += row[name]
+        if group['earliest_due']:
+            earliest.append(group['earliest_due'])
+        groups.append(group)
+    totals['earliest_due'] = min(earliest, default=None)
+    return {
+        'as_of': as_of,
+        'schedule': schedule,
+        'interval_years': years or None,
+        'group_by': list(group_by),
+        'windows': {name: as_of + timedelta(days=days) for name, days in WINDOWS},
+        'totals': totals,
+        'groups': groups if keys else [],
+    }
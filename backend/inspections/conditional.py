@@ -0,0 +1,120 @@
+"""Strong validators for conditional GETs of tank documents.
+
+A tank document changes whenever the tank row or one of its child rows is written or
+deleted. The tank's ``updated_at`` plus the newest ``updated_at`` and row count of each
+child table capture all three, and are read with one aggregate query.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Iterable
+
+from django.db.models import Count, IntegerField, Max, Model, OuterRef, QuerySet, Subquery
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from . import models
+
+CHILD_MODELS: dict[str, type[Model]] = {
+    'shell_settlement_surveys': models.ShellSettlementSurvey,
+    'ut_results': models.UTResult,
+    'edge_settlement_checks': models.EdgeSettlementCheck,
+    'column_plumbness_checks': models.ColumnPlumbnessCheck,
+    'visual_findings': models.VisualFinding,
+    'other_nde': models.OtherNDE,
+    'goal_results': models.GoalResult,
+}
+
+
+@dataclass(frozen=True)
+class Validators:
+    etag: str
+    last_modified: datetime | None
+
+
+def with_content_versions(queryset: QuerySet) -> QuerySet:
+    """Annotate each tank with the newest ``updated_at`` and row count of every child table."""
+    annotations: dict[str, Subquery] = {}
+    for name, model in CHILD_MODELS.items():
+        children = model.objects.filter(tank=OuterRef('pk')).order_by().values('tank')
+        annotations[f'{name}_updated'] = Subquery(children.annotate(value=Max('updated_at')).values('value'))
+        annotations[f'{name}_count'] = Subquery(
+            children.annotate(value=Count('pk')).values('value'), output_field=IntegerField()
+        )
+    return queryset.annotate(**annotations)
+
+
+def content_parts(tank: Any) -> list[Any]:
+    """JSON-ready change markers of a tank annotated by :func:`with_content_versions`."""
+    parts: list[Any] = [str(tank.pk), tank.updated_at.isoformat()]
+    for name in CHILD_MODELS:
+        updated = getattr(tank, f'{name}_updated')
+        parts.append([updated.isoformat() if updated else None, getattr(tank, f'{name}_count') or 0])
+    return parts
+
+
+def content_last_modified(tank: Any) -> datetime:
+    stamps = [getattr(tank, f'{name}_updated') for name in CHILD_MODELS]
+    return max([tank.updated_at, *(stamp for stamp in stamps if stamp is not None)])
+
+
+def _etag(request, parts: list[Any]) -> str:
+    # The same data renders differently per path, query string and negotiated format.
+    representation = [request.get_full_path(), getattr(request, 'accepted_media_type', None)]
+    digest = hashlib.sha256(json.dumps([representation, parts]).encode('utf-8')).hexdigest()
+    return f'"{digest}"'
+
+
+def _tank_versions(tank_id: Any) -> QuerySet:
+    return with_content_versions(models.Tank.objects.filter(pk=tank_id).only('pk', 'updated_at'))
+
+
+def _tank_validators(request, tank: Any) -> Validators | None:
+    if tank is None:
+        return None
+    return Validators(etag=_etag(request, content_parts(tank)), last_modified=content_last_modified(tank))
+
+
+def tank_validators(request, tank_id: Any) -> Validators | None:
+    """Validators for a tank detail document, or None when the tank does not exist."""
+    return _tank_validators(request, _tank_versions(tank_id).first())
+
+
+async def atank_validators(request, tank_id: Any) -> Validators | None:
+    return _tank_validators(request, await _tank_versions(tank_id).afirst())
+
+
+def rows_validators(request, rows: Iterable[Any], *extra: Any) -> Validators:
+    """Validators for a page of already fetched rows; ``extra`` covers paging state such as next links."""
+    rows = list(rows)
+    parts = [[str(row.pk), row.updated_at.isoformat()] for row in rows]
+    last_modified = max((row.updated_at for row in rows), default=None)
+    return Validators(etag=_etag(request, [parts, list(extra)]), last_modified=last_modified)
+
+
+def version_validators(request, *parts: Any) -> Validators:
+    """Validators for a document identified by version tokens rather than by rows."""
+    return Validators(etag=_etag(request, [str(part) for part in parts]), last_modified=None)
+
+
+def not_modified(request, validators: Validators | None):
+    """Return a 304 (or 412) response when the request's preconditions match, otherwise None."""
+    if validators is None:
+        return None
+    last_modified = int(validators.last_modified.timestamp()) if validators.last_modified else None
+    response = get_conditional_response(request, etag=validators.etag, last_modified=last_modified)
+    return apply(response, validators) if response is not None else None
+
+
+def apply(response, validators: Validators | None):
+    """Attach the validators and require clients to revalidate before reusing a stored copy."""
+    if validators is None:
+        return response
+    response['ETag'] = validators.etag
+    if validators.last_modified is not None:
+        response['Last-Modified'] = http_date(validators.last_modified.timestamp())
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -0,0 +1,175 @@
+"""Streaming CSV and NDJSON exports of tanks and inspection records."""
+from __future__ import annotations
+
+import csv
+import datetime
+import json
+import uuid
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Iterable, Iterator
+
+from django.db.models import Model, QuerySet
+from rest_framework import renderers
+from rest_framework.exceptions import ValidationError
+
+from . import filters, models
+from .cache import normalise_tank_id
+
+EXPORT_CHUNK_SIZE = 2000
+WRITE_BUFFER_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class ExportResource:
+    model: type[Model]
+    ordering: tuple[str, ...]
+    tank_path: str = 'tank__'
+    internal: tuple[str, ...] = ()
+
+    def columns(self) -> list[str]:
+        names = [field.attname for field in self.model._meta.concrete_fields if field.name not in self.internal]
+        if self.tank_path:
+            names.insert(names.index('tank_id') + 1, 'tank__tank_name')
+        return names
+
+    def queryset(self) -> QuerySet:
+        return self.model._default_manager.order_by(*self.ordering)
+
+
+RESOURCES: dict[str, ExportResource] = {
+    'tanks': ExportResource(
+        models.Tank, ('tank_name', 'tank_unique_id'), tank_path='', internal=models.Tank.NAME_KEY_FIELDS
+    ),
+    'shell-settlement-surveys': ExportResource(models.ShellSettlementSurvey, ('tank_id', '-created_at', '-id')),
+    'settlement-readings': ExportResource(models.SettlementReading, ('survey_id', 'position')),
+    'ut-results': ExportResource(models.UTResult, ('tank_id', '-created_at', '-id')),
+    'edge-settlement-checks': ExportResource(models.EdgeSettlementCheck, ('tank_id', '-created_at', '-id')),
+    'column-plumbness-checks': ExportResource(models.ColumnPlumbnessCheck, ('tank_id', '-created_at', '-id')),
+    'visual-findings': ExportResource(models.VisualFinding, ('tank_id', '-created_at', '-id')),
+    'other-nde': ExportResource(models.OtherNDE, ('tank_id', '-created_at', '-id')),
+    'goal-results': ExportResource(models.GoalResult, ('tank_id', '-created_at', '-id')),
+}
+
+
+class CSVRenderer(renderers.BaseRenderer):
+    """Selects CSV exports; also renders error payloads as a two-row table."""
+
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data if isinstance(data, list) else [data]
+        rows = [row if isinstance(row, dict) else {'detail': row} for row in rows]
+        header = list(dict.fromkeys(key for row in rows for key in row))
+        return ''.join(iter_csv([[row.get(key) for key in header] for row in rows], header)).encode(self.charset)
+
+
+class NDJSONRenderer(renderers.BaseRenderer):
+    """Selects NDJSON exports; also renders error payloads as one JSON line."""
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        items = data if isinstance(data, list) else [data]
+        return ''.join(json.dumps(item, default=_json_default) + '\n' for item in items).encode(self.charset)
+
+
+def tank_ids_param(params) -> list[str]:
+    """Read ``tank_id`` (repeatable or comma-separated), rejecting anything that is not a UUID."""
+    tank_ids = [value.strip() for raw in params.getlist('tank_id') for value in raw.split(',') if value.strip()]
+    if any(normalise_tank_id(value) is None for value in tank_ids):
+        raise ValidationError({'tank_id': 'Provide one or more tank UUIDs.'})
+    return tank_ids
+
+
+def filter_queryset(resource: ExportResource, queryset: QuerySet, params) -> QuerySet:
+    """Narrow an export to a tank (``tank_id``, repeatable or comma-separated) or tank attributes."""
+    tank_ids = tank_ids_param(params)
+    if tank_ids:
+        lookup = f'{resource.tank_path}pk__in' if resource.tank_path else 'pk__in'
+        queryset = queryset.filter(**{lookup: tank_ids})
+    return filters.filter_tanks(queryset, params, resource.tank_path)
+
+
+def iter_rows(queryset: QuerySet, columns: list[str]) -> Iterator[tuple]:
+    """Stream value tuples from a server-side cursor where the backend supports one."""
+    return queryset.values_list(*columns).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def _header(columns: list[str]) -> list[str]:
+    return [column.split('__')[-1] for column in columns]
+
+
+def _csv_cell(value: Any) -> Any:
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(',', ':'))
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, uuid.UUID)):
+        return str(value)
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+class _Buffer:
+    """File-like sink for ``csv.writer`` that hands back what was written."""
+
+    def __init__(self):
+        self.parts: list[str] = []
+        self.size = 0
+
+    def write(self, value: str) -> None:
+        self.parts.append(value)
+        self.size += len(value)
+
+    def drain(self) -> str:
+        text = ''.join(self.parts)
+        self.parts.clear()
+        self.size = 0
+        return text
+
+
+def iter_csv(rows: Iterable[Iterable[Any]], header: list[str]) -> Iterator[str]:
+    """Encode rows as CSV, yielding roughly ``WRITE_BUFFER_SIZE`` characters at a time."""
+    buffer = _Buffer()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow([_csv_cell(value) for value in row])
+        if buffer.size >= WRITE_BUFFER_SIZE:
+            yield buffer.drain()
+    yield buffer.drain()
+
+
+def iter_ndjson(rows: Iterable[Iterable[Any]], header: list[str]) -> Iterator[str]:
+    """Encode rows as one JSON object per line, buffered like :func:`iter_csv`."""
+    encoder = json.JSONEncoder(default=_json_default, separators=(',', ':'))
+    parts: list[str] = []
+    size = 0
+    for row in rows:
+        line = encoder.encode(dict(zip(header, row))) + '\n'
+        parts.append(line)
+        size += len(line)
+        if size >= WRITE_BUFFER_SIZE:
+            yield ''.join(parts)
+            parts, size = [], 0
+    yield ''.join(parts)
+
+
+WRITERS = {'csv': iter_csv, 'ndjson': iter_ndjson}
+
+
+def stream_export(resource: ExportResource, queryset: QuerySet, export_format: str) -> Iterator[str]:
+    columns = resource.columns()
+    return WRITERS[export_format](iter_rows(queryset, columns), _header(columns))
@@ -0,0 +1,104 @@
+"""Tank attribute filters shared by the tank list, exports, search and typeahead."""
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Callable
+
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+
+from . import models
+
+# Exact-match filters; repeat a parameter (``?state=TX&state=LA``) to match any of the values.
+TANK_FILTERS = ('owner', 'client_name', 'state', 'design_standard', 'facility_type', 'product_stored')
+RANGE_SUFFIXES = ('gt', 'gte', 'lt', 'lte')
+
+
+def _parse_year(value: str) -> int:
+    return int(value)
+
+
+def _parse_date(value: str) -> date:
+    parsed = parse_date(value)
+    if parsed is None:
+        raise ValueError(value)
+    return parsed
+
+
+# Conditions on a single construction tag; ``tag_color=red&tag_field=annular_plate`` finds tanks
+# with a red annular plate. The first three repeat like TANK_FILTERS, the flags take true or false.
+TAG_FILTERS = {'tag_color': 'color', 'tag_field': 'field_key', 'tag_label': 'label'}
+TAG_FLAGS = {'tag_ve': 've', 'tag_ut': 'ut'}
+
+# Range filters as ``<field>_<suffix>``, e.g. ``?next_inspection_due_date_lte=2025-12-31``.
+TANK_RANGE_FILTERS: dict[str, tuple[Callable[[str], Any], str]] = {
+    'next_inspection_due_date': (_parse_date, 'Use a YYYY-MM-DD date.'),
+    'year_built': (_parse_year, 'A valid integer is required.'),
+}
+
+
+def filter_tanks(queryset: QuerySet, params, path: str = '', tags: bool = True) -> QuerySet:
+    """Narrow ``queryset`` by tank attributes in ``params``; ``path`` reaches the tank, e.g. ``tank__``.
+
+    ``tags=False`` leaves out the construction tag conditions.
+    """
+    for name in TANK_FILTERS:
+        values = [value for value in params.getlist(name) if value]
+        if len(values) == 1:
+            queryset = queryset.filter(**{f'{path}{name}': values[0]})
+        elif values:
+            queryset = queryset.filter(**{f'{path}{name}__in': values})
+    for name, (parse, message) in TANK_RANGE_FILTERS.items():
+        for suffix in RANGE_SUFFIXES:
+            param = f'{name}_{suffix}'
+            value = params.get(param)
+            if not value:
+                continue
+            try:
+                queryset = queryset.filter(**{f'{path}{name}__{suffix}': parse(value)})
+            except ValueError:
+                raise ValidationError({param: message})
+    prefix = params.get('name')
+    if prefix:
+        queryset = filter_name_prefix(queryset, prefix, path)
+    tag = tag_condition(params) if tags else None
+    if tag:
+        queryset = queryset.filter(**{f'{path}pk__in': models.ConstructionTag.objects.filter(tag).values('tank')})
+    return queryset
+
+
+def tag_condition(params) -> Q:
+    """The ``TAG_FILTERS`` and ``TAG_FLAGS`` in ``params`` as one condition on ``ConstructionTag`` rows."""
+    condition = Q()
+    for param, field in TAG_FILTERS.items():
+        values = [value for value in params.getlist(param) if value]
+        if len(values) == 1:
+            condition &= Q(**{field: values[0]})
+        elif values:
+            condition &= Q(**{f'{field}__in': values})
+    for param, field in TAG_FLAGS.items():
+        value = params.get(param)
+        if not value:
+            continue
+        if value.lower() not in {'true', 'false'}:
+            raise ValidationError({param: 'Use true or false.'})
+        condition &= Q(**{field: value.lower() == 'true'})
+    return condition
+
+
+def filter_name_prefix(queryset: QuerySet, prefix: str, path: str = '') -> QuerySet:
+    """Tanks whose name starts with ``prefix``, ignoring case and repeated spaces, through an index.
+
+    Postgres matches with ``LIKE`` against the pattern-ops index. SQLite's ``LIKE`` is
+    case-insensitive and so cannot use a plain index; a half-open range on the
+    already casefolded key can.
+    """
+    key = models.tank_name_key(prefix)
+    if not key:
+        return queryset
+    if connections[queryset.db].vendor == 'postgresql':
+        return queryset.filter(**{f'{path}tank_name_key__startswith': key})
+    upper = key[:-1] + chr(ord(key[-1]) + 1)
+    return queryset.filter(**{f'{path}tank_name_key__gte': key, f'{path}tank_name_key__lt': upper})
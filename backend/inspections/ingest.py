@@ -0,0 +1,257 @@
+"""Streaming bulk ingest of UT thickness readings from gauge data loggers."""
+from __future__ import annotations
+
+import codecs
+import csv
+import functools
+import json
+import re
+from typing import Any, Iterable, Iterator
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import Field, empty
+
+from . import models, search, serializers
+
+READ_CHUNK_SIZE = 64 * 1024
+MAX_ROW_CHARS = 1024 * 1024
+MAX_REPORTED_ERRORS = 1000
+
+JSON_MEDIA_TYPES = {'application/json'}
+NDJSON_MEDIA_TYPES = {'application/x-ndjson', 'application/ndjson', 'application/jsonl', 'application/x-jsonlines'}
+CSV_MEDIA_TYPES = {'text/csv', 'application/csv'}
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class IngestError(Exception):
+    """The upload as a whole could not be read; nothing is written."""
+
+
+class MalformedRow:
+    """Placeholder yielded for a single line that could not be decoded."""
+
+    def __init__(self, message: str):
+        self.message = message
+
+
+def iter_json_array(stream, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array without reading the whole body."""
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder('utf-8')()
+    buffer, index, eof = '', 0, False
+    state = 'open'
+
+    def refill() -> None:
+        nonlocal buffer, index, eof
+        chunk = stream.read(chunk_size) if not eof else b''
+        eof = not chunk
+        buffer = buffer[index:] + text.decode(chunk or b'', final=eof)
+        index = 0
+
+    while True:
+        index = _WHITESPACE.match(buffer, index).end()  # type: ignore[union-attr]
+        if index >= len(buffer):
+            if eof:
+                break
+            refill()
+            continue
+        char = buffer[index]
+        if state == 'open':
+            if char != '[':
+                raise IngestError('Expected a JSON array of readings.')
+            index += 1
+            state = 'first'
+        elif state == 'separator':
+            if char == ',':
+                index += 1
+                state = 'value'
+            elif char == ']':
+                index += 1
+                state = 'closed'
+            else:
+                raise IngestError('Expected "," or "]" between readings.')
+        elif state in {'first', 'value'}:
+            if char == ']':
+                if state == 'value':
+                    raise IngestError('Trailing comma in JSON array.')
+                index += 1
+                state = 'closed'
+                continue
+            try:
+                item, end = decoder.raw_decode(buffer, index)
+            except json.JSONDecodeError:
+                item, end = None, -1
+            if end == -1 or (end == len(buffer) and not eof):
+                # The element may continue in the next chunk.
+                if eof:
+                    raise IngestError('Malformed JSON array.')
+                if len(buffer) - index > MAX_ROW_CHARS:
+                    raise IngestError('A reading exceeds the maximum row size.')
+                refill()
+                continue
+            index = end
+            state = 'separator'
+            yield item
+        else:
+            raise IngestError('Unexpected data after the JSON array.')
+    if state != 'closed':
+        raise IngestError('Unterminated JSON array.')
+
+
+def iter_ndjson(stream) -> Iterator[Any]:
+    """Yield one decoded object per non-blank line."""
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+            yield MalformedRow(f'Invalid JSON: {exc}')
+
+
+def iter_csv(stream) -> Iterator[Any]:
+    """Yield one dict per CSV data row, keyed by the header row."""
+
+    def lines() -> Iterator[str]:
+        first = True
+        for raw in stream:
+            line = raw.decode('utf-8')
+            if first:
+                line = line.lstrip('\ufeff')
+                first = False
+            yield line
+
+    for row in csv.DictReader(lines()):
+        yield {(key or '').strip(): value for key, value in row.items()}
+
+
+def iter_upload(stream, media_type: str) -> Iterator[Any]:
+    """Pick the row reader for ``media_type``; raises ValueError for unsupported types."""
+    if media_type in JSON_MEDIA_TYPES:
+        reader = iter_json_array
+    elif media_type in NDJSON_MEDIA_TYPES:
+        reader = iter_ndjson
+    elif media_type in CSV_MEDIA_TYPES:
+        reader = iter_csv
+    else:
+        raise ValueError(media_type)
+    if stream is None:
+        return iter(())
+    return _guard_decoding(reader(stream))
+
+
+def _guard_decoding(rows: Iterator[Any]) -> Iterator[Any]:
+    try:
+        yield from rows
+    except (UnicodeDecodeError, csv.Error) as exc:
+        raise IngestError(f'Could not read upload: {exc}') from exc
+
+
+# The upload columns, validated by the matching ``UTResultSerializer`` fields.
+UT_FIELDS = ('category', 'location', 'course', 'thickness_in', 'notes')
+
+
+@functools.lru_cache(maxsize=None)
+def ut_fields() -> dict[str, Field]:
+    """Build the serializer's fields once; each row then skips the per-instance serializer setup."""
+    fields = serializers.UTResultSerializer().fields
+    return {name: fields[name] for name in UT_FIELDS}
+
+
+def _blank(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def coerce_ut_row(raw: Any) -> tuple[dict[str, Any] | None, dict[str, list[str]] | None]:
+    """Convert one uploaded row to model values with the ``UTResultSerializer`` field rules.
+
+    Blank cells count as missing. The shell course rule spans the row, so
+    :func:`ingest_ut_results` applies it per batch.
+    """
+    if isinstance(raw, MalformedRow):
+        return None, {'non_field_errors': [raw.message]}
+    if not isinstance(raw, dict):
+        return None, {'non_field_errors': ['Each reading must be an object.']}
+    values: dict[str, Any] = {}
+    errors: dict[str, list[str]] = {}
+    for name, field in ut_fields().items():
+        value = raw.get(name)
+        if _blank(value):
+            value = empty if field.required else None
+        elif isinstance(value, str):
+            value = value.strip()
+        try:
+            values[name] = field.run_validation(value)
+        except ValidationError as exc:
+            errors[name] = [str(message) for message in exc.detail]
+    if errors:
+        return None, errors
+    return values, None
+
+
+class IngestReport:
+    def __init__(self):
+        self.received = 0
+        self.created = 0
+        self.rejected = 0
+        self.errors: list[dict[str, Any]] = []
+
+    def reject(self, row: int, errors: dict[str, list[str]]) -> None:
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row, 'errors': errors})
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'received': self.received,
+            'created': self.created,
+            'rejected': self.rejected,
+            'errors': sorted(self.errors, key=lambda error: error['row']),
+            'errors_truncated': self.rejected > len(self.errors),
+        }
+
+
+def ingest_ut_results(tank: models.Tank, rows: Iterable[Any], batch_size: int | None = None) -> IngestReport:
+    """Validate and insert readings for one tank in a single transaction.
+
+    Invalid rows are reported and skipped; valid rows are written with batched
+    ``bulk_create``. An :class:`IngestError` from the row source rolls back everything.
+    """
+    batch_size = batch_size or getattr(settings, 'UT_INGEST_BATCH_SIZE', 2000)
+    report = IngestReport()
+    batch: list[dict[str, Any]] = []
+    numbers: list[int] = []
+
+    def flush() -> None:
+        missing = set(serializers.UTResultSerializer.missing_shell_course(batch))
+        for position in sorted(missing):
+            report.reject(numbers[position], {'course': [serializers.UTResultSerializer.SHELL_COURSE_MESSAGE]})
+        objects = [
+            models.UTResult(tank=tank, **values)
+            for position, values in enumerate(batch)
+            if position not in missing
+        ]
+        models.UTResult.objects.bulk_create(objects, batch_size=batch_size)
+        search.index_instances(objects)
+        report.created += len(objects)
+        batch.clear()
+        numbers.clear()
+
+    with transaction.atomic():
+        for number, raw in enumerate(rows, start=1):
+            report.received += 1
+            values, errors = coerce_ut_row(raw)
+            if errors:
+                report.reject(number, errors)
+                continue
+            batch.append(values)  # type: ignore[arg-type]
+            numbers.append(number)
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+    return report
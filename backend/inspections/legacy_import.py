@@ -0,0 +1,529 @@
+"""Streaming import of legacy inspection archives (CSV or Excel) through a declarative column mapping.
+
+A mapping file names the target resource, how rows find their tank, and which column feeds
+each serializer field::
+
+    {
+      "resource": "ut-results",
+      "tank": {"column": "Tank", "match": "tank_name"},
+      "fields": {
+        "category": {"column": "Component", "values": {"SHELL": "shell", "BTM": "bottom"}},
+        "location": "Location",
+        "course": "Course",
+        "thickness_in": "Thk (in)",
+        "notes": {"column": "Remarks", "default": ""}
+      }
+    }
+
+Rows are read one at a time and cut into chunks. Worker processes map and validate each chunk
+with the resource's API serializer. The parent then resolves tanks, writes the chunk with
+``bulk_create`` and advances the file's :class:`~inspections.models.ImportCheckpoint` in one
+transaction, so an interrupted import resumes after the last committed chunk.
+"""
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import os
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+from django.db import connections, transaction
+from django.db.models import Model
+from rest_framework import serializers as drf_serializers
+
+from . import cache, models, search, serializers, tags
+
+try:  # Excel workbooks are optional; CSV needs nothing extra.
+    import openpyxl
+except ImportError:  # pragma: no cover
+    openpyxl = None
+
+CHUNK_SIZE = 2000
+EXCEL_SUFFIXES = {'.xlsx', '.xlsm'}
+TANK_MATCHES = ('tank_unique_id', 'tank_name')
+
+
+class MappingError(Exception):
+    """The mapping file or the source file's header cannot be used; nothing is imported."""
+
+
+# ---------------------------------------------------------------------------
+# Resources
+
+def _write_records(model: type[Model]) -> Callable[[list[dict[str, Any]]], list[Model]]:
+    def write(rows: list[dict[str, Any]]) -> list[Model]:
+        objects = model._default_manager.bulk_create(model(**attrs) for attrs in rows)
+        search.index_instances(objects)
+        return objects
+
+    return write
+
+
+def _write_tanks(rows: list[dict[str, Any]]) -> list[Model]:
+    tanks = [models.Tank(**attrs) for attrs in rows]
+    for tank in tanks:
+        tank.set_name_keys()
+    tanks = models.Tank.objects.bulk_create(tanks)
+    tags.index_tanks(tanks)
+    return tanks
+
+
+def _write_surveys(rows: list[dict[str, Any]]) -> list[Model]:
+    readings = [attrs.pop('station_readings') for attrs in rows]
+    surveys = models.ShellSettlementSurvey.objects.bulk_create(models.ShellSettlementSurvey(**attrs) for attrs in rows)
+    models.SettlementReading.objects.bulk_create(
+        models.SettlementReading(survey=survey, tank_id=survey.tank_id, position=position, **reading)
+        for survey, station_rows in zip(surveys, readings)
+        for position, reading in enumerate(station_rows)
+    )
+    return surveys
+
+
+def _write_goal_results(rows: list[dict[str, Any]]) -> list[Model]:
+    # A later row for the same tank and goal replaces an earlier one, as a re-import would.
+    latest = {(attrs['tank_id'], attrs['goal_key']): attrs for attrs in rows}
+    instances = []
+    for attrs in latest.values():
+        instance = models.GoalResult(**attrs)
+        instance.ensure_defaults()
+        instances.append(instance)
+    models.GoalResult.objects.bulk_create(
+        instances,
+        update_conflicts=True,
+        unique_fields=['tank', 'goal_key'],
+        update_fields=list(serializers.GoalResultUpsertListSerializer.UPDATE_FIELDS),
+    )
+    results = models.GoalResult.objects.filter(
+        tank_id__in={attrs['tank_id'] for attrs in latest.values()},
+        goal_key__in={attrs['goal_key'] for attrs in latest.values()},
+    )
+    results = [result for result in results if (result.tank_id, result.goal_key) in latest]
+    search.index_instances(results)
+    return results
+
+
+def _count_stations(attrs: dict[str, Any]) -> dict[str, Any]:
+    if attrs.get('station_count') in (None, '') and isinstance(attrs.get('readings'), list):
+        attrs['station_count'] = len(attrs['readings'])
+    return attrs
+
+
+@dataclass(frozen=True)
+class ImportResource:
+    name: str
+    model: type[Model]
+    serializer_class: type[drf_serializers.Serializer]
+    write: Callable[[list[dict[str, Any]]], list[Model]]
+    has_tank: bool = True
+    prepare: Callable[[dict[str, Any]], dict[str, Any]] | None = None
+
+
+RESOURCES: dict[str, ImportResource] = {
+    resource.name: resource
+    for resource in (
+        ImportResource('tanks', models.Tank, serializers.TankSerializer, _write_tanks, has_tank=False),
+        ImportResource(
+            'shell-settlement-surveys', models.ShellSettlementSurvey, serializers.ShellSettlementSurveySerializer,
+            _write_surveys, prepare=_count_stations,
+        ),
+        ImportResource('ut-results', models.UTResult, serializers.UTResultSerializer, _write_records(models.UTResult)),
+        ImportResource(
+            'edge-settlement-checks', models.EdgeSettlementCheck, serializers.EdgeSettlementCheckSerializer,
+            _write_records(models.EdgeSettlementCheck),
+        ),
+        ImportResource(
+            'column-plumbness-checks', models.ColumnPlumbnessCheck, serializers.ColumnPlumbnessCheckSerializer,
+            _write_records(models.ColumnPlumbnessCheck),
+        ),
+        ImportResource(
+            'visual-findings', models.VisualFinding, serializers.VisualFindingSerializer,
+            _write_records(models.VisualFinding),
+        ),
+        ImportResource('other-nde', models.OtherNDE, serializers.OtherNDESerializer, _write_records(models.OtherNDE)),
+        ImportResource(
+            'goal-results', models.GoalResult, serializers.GoalResultUpsertSerializer, _write_goal_results,
+        ),
+    )
+}
+
+
+# ---------------------------------------------------------------------------
+# Mapping
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """How one serializer field is filled from a row.
+
+    ``column`` reads a cell, ``value`` is a constant, ``stations`` reads one settlement
+    reading per listed column, and ``separator`` splits a cell into a list. ``values``
+    translates legacy codes (matched ignoring case), ``date_format`` parses legacy dates
+    with ``strptime`` and ``default`` stands in for blank cells.
+    """
+
+    target: str
+    column: str | None = None
+    value: Any = None
+    stations: tuple[str, ...] = ()
+    values: dict[str, Any] = field(default_factory=dict)
+    default: Any = None
+    date_format: str | None = None
+    separator: str | None = None
+
+    @classmethod
+    def parse(cls, target: str, spec: Any) -> FieldSpec:
+        if isinstance(spec, str):
+            return cls(target=target, column=spec)
+        if not isinstance(spec, dict):
+            raise MappingError(f'Field "{target}" must map to a column name or an object.')
+        unknown = set(spec) - {'column', 'value', 'stations', 'values', 'default', 'date_format', 'separator'}
+        if unknown:
+            raise MappingError(f'Field "{target}" has unknown keys: {", ".join(sorted(unknown))}.')
+        if sum(key in spec for key in ('column', 'value', 'stations')) != 1:
+            raise MappingError(f'Field "{target}" needs exactly one of "column", "value" or "stations".')
+        values = spec.get('values') or {}
+        if not isinstance(values, dict):
+            raise MappingError(f'Field "{target}": "values" must be an object.')
+        return cls(
+            target=target,
+            column=spec.get('column'),
+            value=spec.get('value'),
+            stations=tuple(spec.get('stations') or ()),
+            values={str(key).strip().casefold(): value for key, value in values.items()},
+            default=spec.get('default'),
+            date_format=spec.get('date_format'),
+            separator=spec.get('separator'),
+        )
+
+    def columns(self) -> list[str]:
+        return [self.column] if self.column else list(self.stations)
+
+    def read(self, cells: dict[str, Any]) -> Any:
+        if self.column is None and not self.stations:
+            return self.value
+        if self.stations:
+            return [
+                {'station_label': column, 'measurement_in': None if _blank(cells[column]) else cells[column]}
+                for column in self.stations
+            ]
+        raw = cells[self.column]
+        if _blank(raw):
+            return self.default
+        if isinstance(raw, str):
+            raw = raw.strip()
+            if self.values:
+                raw = self.values.get(raw.casefold(), raw)
+            if self.date_format and isinstance(raw, str):
+                try:
+                    raw = datetime.strptime(raw, self.date_format).date().isoformat()
+                except ValueError:
+                    pass  # left for the serializer to reject with its usual message
+            if self.separator and isinstance(raw, str):
+                raw = [part.strip() for part in raw.split(self.separator) if part.strip()]
+        elif isinstance(raw, datetime) and raw.time() == datetime.min.time():
+            raw = raw.date().isoformat()  # Excel stores dates as midnight datetimes
+        return raw
+
+
+@dataclass(frozen=True)
+class Mapping:
+    resource: ImportResource
+    fields: tuple[FieldSpec, ...]
+    tank_column: str | None = None
+    tank_match: str = 'tank_unique_id'
+    sheet: str | None = None
+    encoding: str = 'utf-8-sig'
+    delimiter: str = ','
+    digest: str = ''
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> Mapping:
+        try:
+            text = Path(path).read_text()
+            data = json.loads(text)
+        except (OSError, ValueError) as exc:
+            raise MappingError(f'Could not read mapping {path}: {exc}')
+        return cls.from_dict(data)
+
+    @classmethod
+    def from_dict(cls, data: Any) -> Mapping:
+        if not isinstance(data, dict):
+            raise MappingError('The mapping must be a JSON object.')
+        resource = RESOURCES.get(data.get('resource', ''))
+        if resource is None:
+            raise MappingError(f'"resource" must be one of {", ".join(RESOURCES)}.')
+        fields = data.get('fields')
+        if not isinstance(fields, dict) or not fields:
+            raise MappingError('"fields" must map serializer fields to columns.')
+        tank = data.get('tank') or {}
+        if resource.has_tank:
+            if not isinstance(tank, dict) or not tank.get('column'):
+                raise MappingError('"tank" must name the column that identifies each row\'s tank.')
+            if tank.get('match', 'tank_unique_id') not in TANK_MATCHES:
+                raise MappingError(f'"tank.match" must be one of {", ".join(TANK_MATCHES)}.')
+        csv_options = data.get('csv') or {}
+        return cls(
+            resource=resource,
+            fields=tuple(FieldSpec.parse(target, spec) for target, spec in fields.items()),
+            tank_column=tank.get('column') if resource.has_tank else None,
+            tank_match=tank.get('match', 'tank_unique_id'),
+            sheet=data.get('sheet'),
+            encoding=csv_options.get('encoding', 'utf-8-sig'),
+            delimiter=csv_options.get('delimiter', ','),
+            digest=hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest(),
+        )
+
+    def check_header(self, header: list[str]) -> None:
+        needed = [column for spec in self.fields for column in spec.columns()]
+        if self.tank_column:
+            needed.append(self.tank_column)
+        missing = [column for column in dict.fromkeys(needed) if column not in header]
+        if missing:
+            raise MappingError(f'Columns not found in the file: {", ".join(missing)}.')
+
+    def row_values(self, cells: dict[str, Any]) -> dict[str, Any]:
+        """Serializer input for one row; dotted targets such as ``standard_responses.mfl_summary`` nest."""
+        values: dict[str, Any] = {}
+        for spec in self.fields:
+            value = spec.read(cells)
+            target, _, key = spec.target.partition('.')
+            if key:
+                values.setdefault(target, {})[key] = value
+            else:
+                values[target] = value
+        return self.resource.prepare(values) if self.resource.prepare else values
+
+
+def _blank(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+# ---------------------------------------------------------------------------
+# Reading
+
+def iter_rows(path: Path, mapping: Mapping) -> tuple[list[str], Iterator[list[Any]]]:
+    """The header and a lazy iterator over the data rows of a CSV file or an Excel sheet."""
+    if path.suffix.lower() in EXCEL_SUFFIXES:
+        return _iter_excel(path, mapping)
+    handle = path.open(newline='', encoding=mapping.encoding)
+    reader = csv.reader(handle, delimiter=mapping.delimiter)
+    header = [column.strip() for column in next(reader, [])]
+
+    def rows() -> Iterator[list[Any]]:
+        with handle:
+            yield from reader
+
+    return header, rows()
+
+
+def _iter_excel(path: Path, mapping: Mapping) -> tuple[list[str], Iterator[list[Any]]]:
+    if openpyxl is None:
+        raise MappingError('Reading Excel files needs the openpyxl package; install it or save the sheet as CSV.')
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = workbook[mapping.sheet] if mapping.sheet else workbook.worksheets[0]
+    except KeyError:
+        workbook.close()
+        raise MappingError(f'The workbook has no sheet named "{mapping.sheet}".')
+    values = sheet.iter_rows(values_only=True)
+    header = [str(cell).strip() if cell is not None else '' for cell in next(values, ())]
+
+    def rows() -> Iterator[list[Any]]:
+        try:
+            yield from (list(row) for row in values)
+        finally:
+            workbook.close()
+
+    return header, rows()
+
+
+# ---------------------------------------------------------------------------
+# Validation (runs in worker processes)
+
+@dataclass
+class ChunkResult:
+    end: int
+    valid: list[tuple[int, Any, dict[str, Any]]] = field(default_factory=list)
+    errors: list[tuple[int, Any]] = field(default_factory=list)
+
+
+_worker: dict[str, Any] = {}
+
+
+def init_worker(mapping: Mapping, header: list[str]) -> None:
+    import django
+    from django.apps import apps
+
+    if not apps.ready:  # spawned rather than forked workers start without Django
+        django.setup()
+    _worker.clear()
+    _worker['mapping'] = mapping
+    _worker['header'] = header
+
+
+def row_serializer(resource: ImportResource) -> drf_serializers.Serializer:
+    """The resource's API serializer, reused for every row the way a ``many=True`` list reuses its child."""
+    serializer = resource.serializer_class()
+    # Tanks are resolved in bulk by the writer; dropping the field avoids a lookup per row.
+    serializer.fields.pop('tank', None)
+    return serializer
+
+
+def validate_chunk(chunk: tuple[int, int, list[list[Any]]]) -> ChunkResult:
+    """Map and validate ``rows``, numbered from ``first``; ``end`` is the rows consumed so far."""
+    first, end, rows = chunk
+    mapping: Mapping = _worker['mapping']
+    header: list[str] = _worker['header']
+    serializer = _worker.setdefault('serializer', row_serializer(mapping.resource))
+    result = ChunkResult(end=end)
+    for number, row in enumerate(rows, start=first):
+        cells = dict(zip(header, row))
+        for column in header[len(row):]:
+            cells[column] = None
+        tank_key = None
+        if mapping.tank_column:
+            tank_key = cells[mapping.tank_column]
+            if _blank(tank_key):
+                result.errors.append((number, {'tank': ['This field is required.']}))
+                continue
+            tank_key = str(tank_key).strip()
+        try:
+            attrs = serializer.run_validation(mapping.row_values(cells))
+        except drf_serializers.ValidationError as exc:
+            # Plain strings and lists cross the process boundary and the errors file alike.
+            result.errors.append((number, json.loads(json.dumps(exc.detail))))
+            continue
+        result.valid.append((number, tank_key, dict(attrs)))
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Writing
+
+@dataclass
+class ImportProgress:
+    rows_done: int
+    created: int
+    rejected: int
+    errors: list[tuple[int, Any]]
+
+
+def checkpoint_for(path: Path, mapping: Mapping, restart: bool = False) -> models.ImportCheckpoint:
+    """The file's checkpoint, new or reset with ``restart``; a changed mapping or file must be restarted."""
+    source = str(path.resolve())
+    key = hashlib.sha256(f'{mapping.resource.name}\n{source}'.encode()).hexdigest()
+    fingerprint = hashlib.sha256(f'{mapping.digest}\n{path.stat().st_size}'.encode()).hexdigest()
+    checkpoint, created = models.ImportCheckpoint.objects.get_or_create(
+        key=key, defaults={'resource': mapping.resource.name, 'source': source, 'fingerprint': fingerprint}
+    )
+    if restart and not created:
+        checkpoint.fingerprint = fingerprint
+        checkpoint.rows_done = checkpoint.created = checkpoint.rejected = 0
+        checkpoint.completed_at = None
+        checkpoint.save()
+    elif checkpoint.fingerprint != fingerprint:
+        raise MappingError(
+            f'{path} or its mapping changed since the import checkpointed at row {checkpoint.rows_done}; '
+            'restart it to import from the beginning.'
+        )
+    return checkpoint
+
+
+def _resolve_tanks(mapping: Mapping, keys: Iterable[str]) -> dict[str, list[Any]]:
+    """Matching tank ids per key; names are compared the way the tank typeahead compares them."""
+    keys = set(keys)
+    if not mapping.tank_column or not keys:
+        return {}
+    if mapping.tank_match == 'tank_unique_id':
+        tank_ids = {key: cache.normalise_tank_id(key) for key in keys}
+        found = models.Tank.objects.filter(pk__in={tank_id for tank_id in tank_ids.values() if tank_id})
+        found_ids = {str(pk) for pk in found.values_list('pk', flat=True)}
+        return {key: [tank_id] for key, tank_id in tank_ids.items() if tank_id in found_ids}
+    name_keys = {key: models.tank_name_key(key) for key in keys}
+    matches: dict[str, list[Any]] = {}
+    rows = models.Tank.objects.filter(tank_name_key__in=set(name_keys.values())).values_list('tank_name_key', 'pk')
+    for name_key, pk in rows:
+        matches.setdefault(name_key, []).append(pk)
+    return {key: matches[name_key] for key, name_key in name_keys.items() if name_key in matches}
+
+
+def write_chunk(
+    mapping: Mapping, result: ChunkResult, checkpoint: models.ImportCheckpoint | None
+) -> ImportProgress:
+    """Write a validated chunk and advance ``checkpoint`` (if any) in one transaction."""
+    errors = list(result.errors)
+    rows: list[dict[str, Any]] = []
+    with transaction.atomic():
+        tanks = _resolve_tanks(mapping, (key for _, key, _ in result.valid))
+        for number, key, attrs in result.valid:
+            if mapping.tank_column:
+                matches = tanks.get(key, [])
+                if len(matches) != 1:
+                    message = f'"{key}" matches {len(matches)} tanks.' if matches else f'No tank matches "{key}".'
+                    errors.append((number, {'tank': [message]}))
+                    continue
+                attrs = {**attrs, 'tank_id': matches[0]}
+            rows.append(attrs)
+        written = mapping.resource.write(rows) if rows else []
+        if checkpoint is not None:
+            checkpoint.rows_done = result.end
+            checkpoint.created += len(rows)
+            checkpoint.rejected += len(errors)
+            checkpoint.save(update_fields=['rows_done', 'created', 'rejected', 'updated_at'])
+    cache.invalidate_tanks(*{cache.tank_id_for(instance) for instance in written})
+    errors.sort(key=lambda error: error[0])
+    return ImportProgress(rows_done=result.end, created=len(rows), rejected=len(errors), errors=errors)
+
+
+# ---------------------------------------------------------------------------
+# Driving
+
+def _chunks(rows: Iterator[list[Any]], skip: int, chunk_size: int) -> Iterator[tuple[int, int, list[list[Any]]]]:
+    consumed = skip
+    for _ in islice(rows, skip):
+        pass
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        first = consumed + 2  # data rows are numbered as in a spreadsheet, after the header row
+        consumed += len(chunk)
+        yield first, consumed, chunk
+
+
+def validated_chunks(
+    path: Path,
+    mapping: Mapping,
+    skip: int = 0,
+    workers: int = 1,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[ChunkResult]:
+    """Validate the file's rows after ``skip`` chunk by chunk, in file order.
+
+    With more than one worker, chunks are validated in a process pool with a bounded
+    number in flight, so memory stays flat however large the file is.
+    """
+    header, rows = iter_rows(path, mapping)
+    mapping.check_header(header)
+    chunks = _chunks(rows, skip, chunk_size)
+    if workers <= 1:
+        init_worker(mapping, header)
+        yield from (validate_chunk(chunk) for chunk in chunks)
+        return
+
+    import multiprocessing
+
+    connections.close_all()  # forked workers must not share the parent's database connections
+    with multiprocessing.Pool(workers, initializer=init_worker, initargs=(mapping, header)) as pool:
+        pending: deque = deque()
+        for chunk in chunks:
+            pending.append(pool.apply_async(validate_chunk, (chunk,)))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
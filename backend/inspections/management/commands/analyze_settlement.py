@@ -0,0 +1,23 @@
+"""Recompute shell settlement analyses in bulk."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from inspections import models, settlement
+
+
+class Command(BaseCommand):
+    help = 'Fit the optimum cosine curve for settlement surveys whose analysis is missing or stale.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Refit every survey, even unchanged ones.')
+        parser.add_argument('--tank', action='append', default=[], help='Limit to a tank id (repeatable).')
+
+    def handle(self, *args, **options):
+        surveys = models.ShellSettlementSurvey.objects.all()
+        if options['tank']:
+            surveys = surveys.filter(tank_id__in=options['tank'])
+        if not options['force']:
+            surveys = settlement.stale_surveys(surveys)
+        written = settlement.refresh_analyses(surveys, force=options['force'])
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} settlement analyses.'))
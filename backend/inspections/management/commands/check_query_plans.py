@@ -0,0 +1,70 @@
+"""Fail when an API endpoint's queries need a sequential scan or an explicit sort."""
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.test import Client
+
+from inspections import query_plans, synthetic
+
+
+class Command(BaseCommand):
+    help = (
+        'Load a synthetic fleet inside a transaction that is rolled back, request each list and '
+        'detail endpoint, and EXPLAIN every query it runs. Exits non-zero when a plan contains a '
+        'sequential scan, or a sort outside the endpoints allowed one. Supports SQLite and PostgreSQL.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tanks', type=int, default=2000, help='Synthetic tanks to load (default 2000).')
+        parser.add_argument('--ut-results', type=int, default=40, help='UT results per tank (default 40).')
+        parser.add_argument('--show-plans', action='store_true', help='Print every plan, not just failures.')
+        parser.add_argument('--database', default='default', help='Database alias to check.')
+
+    def handle(self, *args, **options):
+        using = options['database']
+        connection = connections[using]
+        if connection.vendor not in {'sqlite', 'postgresql'}:
+            raise CommandError(f'Query plan checks support SQLite and PostgreSQL, not {connection.vendor}.')
+
+        failures = 0
+        with transaction.atomic(using=using):
+            size = synthetic.FleetSize(tanks=options['tanks'], ut_results=options['ut_results'])
+            tanks = synthetic.build_fleet(size, prefix='PLAN')
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+            tank = tanks[len(tanks) // 2]
+            survey = tank.shell_settlement_surveys.order_by('pk').first()
+
+            client = Client(SERVER_NAME=self._host())
+            endpoints = [(template, False) for template in query_plans.ENDPOINTS]
+            endpoints += [(template, True) for template in query_plans.SORTED_ENDPOINTS]
+            for template, allow_sort in endpoints:
+                path = template.format(tank=tank.pk, survey=survey.pk if survey else 0)
+                result = query_plans.check_endpoint(client, path, using, allow_sort=allow_sort)
+                failures += self._report(result, options['show_plans'])
+            transaction.set_rollback(True, using=using)
+
+        if failures:
+            raise CommandError(f'{failures} endpoint(s) have unindexed query plans.')
+        count = len(query_plans.ENDPOINTS) + len(query_plans.SORTED_ENDPOINTS)
+        self.stdout.write(self.style.SUCCESS(f'All {count} endpoints use indexed plans.'))
+
+    def _report(self, result: query_plans.EndpointPlans, show_plans: bool) -> int:
+        failed = result.status_code != 200 or bool(result.problems)
+        style = self.style.ERROR if failed else self.style.SUCCESS
+        self.stdout.write(style(f'{"FAIL" if failed else "ok":4} {result.status_code} {result.path}'))
+        for query in result.queries:
+            if not (show_plans or query.problems):
+                continue
+            self.stdout.write(f'    {query.sql}')
+            for line in query.plan:
+                self.stdout.write(f'      {line}')
+            for problem in query.problems:
+                self.stdout.write(self.style.WARNING(f'    -> {problem}'))
+        return int(failed)
+
+    @staticmethod
+    def _host() -> str:
+        return next((host.lstrip('.') for host in settings.ALLOWED_HOSTS if host != '*'), 'localhost')
@@ -0,0 +1,68 @@
+"""Load a deterministic synthetic fleet for benchmarks and load testing."""
+from __future__ import annotations
+
+import time
+from dataclasses import fields
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from inspections import models, settlement, synthetic
+
+REPLACE_CHUNK_SIZE = 100
+
+
+class Command(BaseCommand):
+    help = (
+        'Insert synthetic tanks with settlement surveys and readings, UT results, edge and plumbness '
+        'checks, visual findings, other NDE and goal results using batched inserts, then index them for '
+        'search and fit their settlement analyses. Counts other than --tanks are per tank, or per survey '
+        'for --stations. Example for 10k tanks and 5M UT readings: --tanks 10000 --ut-results 500.'
+    )
+
+    def add_arguments(self, parser):
+        defaults = synthetic.FleetSize()
+        for field in fields(synthetic.FleetSize):
+            parser.add_argument(
+                f'--{field.name.replace("_", "-")}',
+                type=int,
+                default=getattr(defaults, field.name),
+                help=f'Default {getattr(defaults, field.name)}.',
+            )
+        parser.add_argument('--seed', type=int, default=0, help='Random seed; the same seed gives the same fleet.')
+        parser.add_argument('--prefix', default='SYN', help='Tank name prefix (default SYN).')
+        parser.add_argument('--skip-analyses', action='store_true', help='Do not fit settlement analyses.')
+        parser.add_argument('--replace', action='store_true', help='Delete tanks with the same prefix first.')
+
+    def handle(self, *args, **options):
+        size = synthetic.FleetSize(**{field.name: options[field.name] for field in fields(synthetic.FleetSize)})
+        if any(getattr(size, field.name) < 0 for field in fields(size)):
+            raise CommandError('Counts cannot be negative.')
+        prefix = options['prefix']
+        existing = models.Tank.objects.filter(tank_name__startswith=f'{prefix}-')
+        if existing.exists():
+            if not options['replace']:
+                raise CommandError(f'Tanks named {prefix}-* already exist; pass --replace or another --prefix.')
+            # Tanks go a few at a time: the delete collects every child row in memory.
+            tank_ids = list(existing.values_list('pk', flat=True))
+            deleted = 0
+            for start in range(0, len(tank_ids), REPLACE_CHUNK_SIZE):
+                deleted += models.Tank.objects.filter(pk__in=tank_ids[start:start + REPLACE_CHUNK_SIZE]).delete()[0]
+            self.stdout.write(f'Deleted {deleted:,} rows from the previous {prefix} fleet.')
+
+        started = time.perf_counter()
+        last = started
+
+        def progress(name: str, count: int) -> None:
+            nonlocal last
+            now = time.perf_counter()
+            self.stdout.write(f'{count:>10,} {name} ({now - last:.1f}s)')
+            last = now
+
+        with transaction.atomic():
+            tanks = synthetic.build_fleet(size, seed=options['seed'], prefix=prefix, progress=progress)
+        if not options['skip_analyses']:
+            surveys = models.ShellSettlementSurvey.objects.filter(tank__tank_name__startswith=f'{prefix}-')
+            progress('settlement analyses', settlement.refresh_analyses(surveys))
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Generated {len(tanks):,} tanks in {elapsed:.1f}s.'))
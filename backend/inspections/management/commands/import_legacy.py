@@ -0,0 +1,107 @@
+"""Import legacy inspection spreadsheets and CSV exports through a column mapping."""
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from inspections import legacy_import
+
+
+class Command(BaseCommand):
+    help = (
+        'Stream rows from CSV or Excel files, map columns to API fields with a JSON mapping file, validate '
+        'them with the API serializers in worker processes, and insert valid rows in chunked transactions. '
+        'Progress is checkpointed per file, so rerunning the same command resumes where it stopped. See '
+        'inspections/legacy_import.py for the mapping format.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('mapping', help='JSON mapping file.')
+        parser.add_argument('files', nargs='+', help='CSV, .xlsx or .xlsm files to import, in order.')
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Processes that map and validate rows (default: one per CPU; 1 validates in this process).',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=legacy_import.CHUNK_SIZE,
+            help=f'Rows per transaction and checkpoint (default {legacy_import.CHUNK_SIZE}).',
+        )
+        parser.add_argument('--errors', help='Append rejected rows with their errors to this NDJSON file.')
+        parser.add_argument('--restart', action='store_true', help='Ignore checkpoints and import from the top.')
+        parser.add_argument('--dry-run', action='store_true', help='Validate and resolve tanks, but write nothing.')
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1.')
+        try:
+            mapping = legacy_import.Mapping.load(options['mapping'])
+        except legacy_import.MappingError as exc:
+            raise CommandError(str(exc))
+        errors_file = Path(options['errors']).open('a') if options['errors'] else None
+        try:
+            for name in options['files']:
+                path = Path(name)
+                if not path.is_file():
+                    raise CommandError(f'{path} is not a file.')
+                try:
+                    self._import(path, mapping, options, errors_file)
+                except legacy_import.MappingError as exc:
+                    raise CommandError(f'{path}: {exc}')
+        finally:
+            if errors_file:
+                errors_file.close()
+        if mapping.resource.name == 'shell-settlement-surveys' and not options['dry_run']:
+            self.stdout.write('Run analyze_settlement to fit the imported surveys.')
+
+    def _import(self, path: Path, mapping: legacy_import.Mapping, options, errors_file) -> None:
+        checkpoint = None
+        skip = 0
+        if not options['dry_run']:
+            checkpoint = legacy_import.checkpoint_for(path, mapping, restart=options['restart'])
+            if checkpoint.completed_at:
+                self.stdout.write(f'{path}: already imported ({checkpoint.created:,} created); skipping.')
+                return
+            skip = checkpoint.rows_done
+            if skip:
+                self.stdout.write(f'{path}: resuming after {skip:,} rows.')
+
+        started = time.perf_counter()
+        rows = created = rejected = shown = 0
+        chunks = legacy_import.validated_chunks(
+            path, mapping, skip=skip, workers=options['workers'], chunk_size=options['chunk_size']
+        )
+        for result in chunks:
+            if checkpoint is None:
+                with transaction.atomic():
+                    progress = legacy_import.write_chunk(mapping, result, None)
+                    transaction.set_rollback(True)
+            else:
+                progress = legacy_import.write_chunk(mapping, result, checkpoint)
+            rows = progress.rows_done - skip
+            created += progress.created
+            rejected += progress.rejected
+            for number, errors in progress.errors:
+                if errors_file:
+                    errors_file.write(json.dumps({'file': str(path), 'row': number, 'errors': errors}) + '\n')
+                if shown < 10:
+                    self.stdout.write(self.style.WARNING(f'  row {number}: {json.dumps(errors)}'))
+                    shown += 1
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'{path}: {rows:,} rows, {created:,} {"valid" if checkpoint is None else "created"}, '
+                f'{rejected:,} rejected ({rows / elapsed if elapsed else 0:,.0f} rows/s)'
+            )
+
+        if checkpoint is not None:
+            checkpoint.completed_at = timezone.now()
+            checkpoint.save(update_fields=['completed_at', 'updated_at'])
+        verb = 'Validated' if checkpoint is None else 'Imported'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {path}: {created:,} rows accepted, {rejected:,} rejected in {time.perf_counter() - started:.1f}s.'
+        ))
@@ -0,0 +1,25 @@
+"""Delete sync tombstones older than the retention window."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from inspections import models
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS. Clients whose cursor is older '
+        'than the window are told to run a full sync instead of missing deletes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Override the retention window in days.')
+
+    def handle(self, *args, **options):
+        days = options['days'] or getattr(settings, 'SYNC_TOMBSTONE_RETENTION_DAYS', 90)
+        deleted, _ = models.Tombstone.objects.filter(deleted_at__lt=timezone.now() - timedelta(days=days)).delete()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} tombstones older than {days} days.'))
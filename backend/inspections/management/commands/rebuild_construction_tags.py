@@ -0,0 +1,18 @@
+"""Rebuild the indexed construction tags from every tank's annotations."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from inspections import tags
+
+
+class Command(BaseCommand):
+    help = (
+        'Rewrite the construction tag rows of every tank from its construction_annotations. Saves keep '
+        'the tags current, so this is only needed after changing annotations outside Tank.save(), e.g. '
+        'with queryset.update(), loaddata or raw SQL.'
+    )
+
+    def handle(self, *args, **options):
+        count = tags.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Construction tags rebuilt: {count} tags.'))
@@ -0,0 +1,25 @@
+"""Rebuild the full-text search documents from the inspection records."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from inspections import search
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the search documents of every searchable resource. Writes keep the index current, '
+        'so this is only needed after loading data outside the API, e.g. with loaddata or raw SQL.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--resource', action='append', choices=sorted(search.SOURCES), help='Limit to a resource (repeatable).'
+        )
+
+    def handle(self, *args, **options):
+        names = options['resource'] or list(search.SOURCES)
+        counts = search.rebuild(search.SOURCES[name] for name in names)
+        for name, count in counts.items():
+            self.stdout.write(f'{name}: {count} documents')
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt.'))
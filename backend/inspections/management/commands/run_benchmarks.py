@@ -0,0 +1,94 @@
+"""Benchmark every API endpoint with a concurrent HTTP client."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from inspections import benchmarks, cache
+
+
+class Command(BaseCommand):
+    help = (
+        'Request every routed API endpoint concurrently over HTTP and report p50/p95/p99 latency, '
+        'throughput, SQL statements per request and peak RSS. Serves the project in-process unless '
+        '--url points at a running server. Load a fleet with generate_synthetic_fleet first.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help='Base URL of a running server, e.g. http://127.0.0.1:8000.')
+        parser.add_argument('--requests', type=int, default=200, help='Measured requests per endpoint (default 200).')
+        parser.add_argument('--concurrency', type=int, default=8, help='Concurrent client threads (default 8).')
+        parser.add_argument('--warmup', type=int, default=2, help='Unmeasured requests per endpoint (default 2).')
+        parser.add_argument('--timeout', type=float, default=60.0, help='Per-request timeout in seconds.')
+        parser.add_argument(
+            '--only', action='append', default=[], help='Only endpoints whose name contains this (repeatable).'
+        )
+        parser.add_argument(
+            '--include-writes', action='store_true',
+            help='Also time tank creation, UT bulk ingest and inspection packages; these add rows to the database.',
+        )
+        parser.add_argument('--output', help='Write the JSON results to this file.')
+        parser.add_argument('--json', action='store_true', help='Print the JSON results instead of a table.')
+        parser.add_argument('--baseline', help='Earlier JSON results to compare latency and queries against.')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError('--requests and --concurrency must be at least 1.')
+        baseline = None
+        if options['baseline']:
+            try:
+                baseline = json.loads(Path(options['baseline']).read_text())
+            except (OSError, ValueError) as exc:
+                raise CommandError(f'Could not read baseline: {exc}')
+        try:
+            endpoints, skipped = benchmarks.discover(
+                options['include_writes'], shared_cache=not options['url'] or not cache.is_process_local()
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        if options['only']:
+            endpoints = [endpoint for endpoint in endpoints if any(part in endpoint.name for part in options['only'])]
+
+        results = []
+        for result in benchmarks.run(
+            endpoints,
+            base_url=options['url'],
+            requests=options['requests'],
+            concurrency=options['concurrency'],
+            warmup=options['warmup'],
+            timeout=options['timeout'],
+        ):
+            results.append(result)
+            if not options['json']:
+                self._row(result.as_dict())
+
+        settings = {key: options[key] for key in ('requests', 'concurrency', 'warmup')}
+        document = benchmarks.report(results, skipped, settings, in_process=not options['url'])
+        if baseline is not None:
+            document['comparison'] = benchmarks.compare(document, baseline)
+        text = json.dumps(document, indent=2)
+        if options['output']:
+            Path(options['output']).write_text(text + '\n')
+        if options['json']:
+            self.stdout.write(text)
+            return
+        for name, reason in skipped.items():
+            self.stdout.write(f'skipped {name}: {reason}')
+        for row in document.get('comparison', []):
+            style = self.style.ERROR if (row['p95_ratio'] or 0) > 1.2 else self.style.SUCCESS
+            before, after = row['p95_ms']
+            self.stdout.write(style(f'{row["name"]:<40} p95 {before:>9.1f} -> {after:>9.1f} ms  x{row["p95_ratio"]}'))
+        if document['process_rss_peak_mb'] is not None:
+            self.stdout.write(f'Peak RSS {document["process_rss_peak_mb"]} MB')
+
+    def _row(self, row: dict) -> None:
+        latency = row['latency_ms'] or {}
+        queries = row['queries'] or {}
+        style = self.style.WARNING if row['errors'] else self.style.SUCCESS
+        self.stdout.write(style(
+            f'{row["name"]:<40} p50 {latency.get("p50", 0):>8.1f}  p95 {latency.get("p95", 0):>8.1f}  '
+            f'p99 {latency.get("p99", 0):>8.1f} ms  {row["throughput_rps"] or 0:>7.1f} req/s  '
+            f'{queries.get("mean", "-"):>5} queries  errors {row["errors"]}'
+        ))
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inspections', '0003_workflow_three_fields'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='columnplumbnesscheck',
+            index=models.Index(fields=['-created_at', '-id'], name='plumbness_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='edgesettlementcheck',
+            index=models.Index(fields=['-created_at', '-id'], name='edge_check_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goalresult',
+            index=models.Index(fields=['-created_at', '-id'], name='goal_result_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='othernde',
+            index=models.Index(fields=['-created_at', '-id'], name='other_nde_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shellsettlementsurvey',
+            index=models.Index(fields=['-created_at', '-id'], name='settlement_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tank',
+            index=models.Index(fields=['tank_name', 'tank_unique_id'], name='tank_name_pk_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='utresult',
+            index=models.Index(fields=['-created_at', '-id'], name='ut_result_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visualfinding',
+            index=models.Index(fields=['-created_at', '-id'], name='visual_created_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inspections', '0004_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SettlementAnalysis',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('inputs_digest', models.CharField(max_length=64)),
+                ('station_count', models.PositiveIntegerField()),
+                ('cosine_offset_in', models.FloatField()),
+                ('cosine_amplitude_in', models.FloatField()),
+                ('cosine_phase_deg', models.FloatField()),
+                ('r_squared', models.FloatField(blank=True, null=True)),
+                ('max_out_of_plane_in', models.FloatField()),
+                ('allowed_out_of_plane_in', models.FloatField(blank=True, null=True)),
+                ('utilization', models.FloatField(blank=True, help_text='max_out_of_plane_in / allowed_out_of_plane_in', null=True)),
+                ('stations', models.JSONField(default=list, help_text='List of {station_label, measurement_in, fitted_in, out_of_plane_in}')),
+            ],
+            options={
+                'ordering': [models.OrderBy(models.F('utilization'), descending=True, nulls_last=True), '-max_out_of_plane_in'],
+            },
+        ),
+        migrations.AddField(
+            model_name='settlementanalysis',
+            name='survey',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='analysis', to='inspections.shellsettlementsurvey'),
+        ),
+        migrations.AddField(
+            model_name='settlementanalysis',
+            name='tank',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='settlement_analyses', to='inspections.tank'),
+        ),
+        migrations.AddIndex(
+            model_name='settlementanalysis',
+            index=models.Index(fields=['-utilization', '-max_out_of_plane_in'], name='settlement_worst_idx'),
+        ),
+    ]
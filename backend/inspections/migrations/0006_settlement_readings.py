@@ -0,0 +1,131 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:39
+
+import math
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+BATCH_SIZE = 1000
+
+
+def _measurement(value):
+    """The reading as a float, or None when it was left blank; raises ValueError for anything else."""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{value!r} is not a number')
+    if not math.isfinite(value):
+        raise ValueError(f'{value!r} is not a finite number')
+    return value
+
+
+def split_readings(apps, schema_editor):
+    """Copy each survey's JSON readings into one row per station.
+
+    Readings that would not survive the copy (non-numeric measurements, labels longer than
+    the column) stop the migration with a list of them to correct first.
+    """
+    ShellSettlementSurvey = apps.get_model('inspections', 'ShellSettlementSurvey')
+    SettlementReading = apps.get_model('inspections', 'SettlementReading')
+
+    batch = []
+    problems = []
+    surveys = ShellSettlementSurvey.objects.order_by('pk').values_list('pk', 'tank_id', 'readings')
+    for survey_id, tank_id, readings in surveys.iterator(chunk_size=BATCH_SIZE):
+        for position, reading in enumerate(readings if isinstance(readings, list) else []):
+            where = f'survey {survey_id}, station {position + 1}'
+            if not isinstance(reading, dict):
+                problems.append(f'{where}: {reading!r} is not a reading object')
+                continue
+            label = str(reading.get('station_label', ''))
+            if len(label) > 50:
+                problems.append(f'{where}: station label {label!r} is longer than 50 characters')
+            try:
+                measurement = _measurement(reading.get('measurement_in'))
+            except ValueError as exc:
+                problems.append(f'{where} ({label!r}): measurement_in {exc}')
+                continue
+            batch.append(SettlementReading(
+                survey_id=survey_id,
+                tank_id=tank_id,
+                position=position,
+                station_label=label[:50],
+                measurement_in=measurement,
+            ))
+        if len(batch) >= BATCH_SIZE:
+            SettlementReading.objects.bulk_create(batch)
+            batch = []
+    if problems:
+        raise ValueError(
+            f'{len(problems)} settlement readings cannot be copied; correct them and migrate again:\n'
+            + '\n'.join(problems)
+        )
+    SettlementReading.objects.bulk_create(batch)
+
+
+def join_readings(apps, schema_editor):
+    """Rebuild the JSON readings column from the station rows."""
+    ShellSettlementSurvey = apps.get_model('inspections', 'ShellSettlementSurvey')
+    SettlementReading = apps.get_model('inspections', 'SettlementReading')
+
+    readings = {}
+    rows = SettlementReading.objects.order_by('survey_id', 'position').values_list(
+        'survey_id', 'station_label', 'measurement_in'
+    )
+    for survey_id, label, measurement in rows.iterator(chunk_size=BATCH_SIZE):
+        readings.setdefault(survey_id, []).append({'station_label': label, 'measurement_in': measurement})
+    surveys = list(ShellSettlementSurvey.objects.only('pk'))
+    for survey in surveys:
+        survey.readings = readings.get(survey.pk, [])
+    ShellSettlementSurvey.objects.bulk_update(surveys, ['readings'], batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inspections', '0005_settlement_analysis'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SettlementReading',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField(help_text='Zero-based station index around the shell')),
+                ('station_label', models.CharField(max_length=50)),
+                ('measurement_in', models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['survey', 'position'],
+            },
+        ),
+        migrations.AddField(
+            model_name='settlementreading',
+            name='survey',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='station_readings', to='inspections.shellsettlementsurvey'),
+        ),
+        migrations.AddField(
+            model_name='settlementreading',
+            name='tank',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='settlement_readings', to='inspections.tank'),
+        ),
+        migrations.AddIndex(
+            model_name='settlementreading',
+            index=models.Index(fields=['tank', 'survey', 'position'], name='settlement_reading_station_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='settlementreading',
+            index=models.Index(fields=['tank', 'station_label'], name='settlement_reading_label_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='settlementreading',
+            index=models.Index(fields=['measurement_in'], name='settlement_reading_value_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='settlementreading',
+            constraint=models.UniqueConstraint(fields=('survey', 'position'), name='unique_settlement_station'),
+        ),
+        migrations.RunPython(split_readings, join_readings),
+    ]
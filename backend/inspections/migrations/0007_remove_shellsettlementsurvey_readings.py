@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inspections', '0006_settlement_readings'),
+    ]
+
+    operations = [
+        # A default lets the column be re-added over existing rows when unapplied.
+        migrations.AlterField(
+            model_name='shellsettlementsurvey',
+            name='readings',
+            field=models.JSONField(default=list, help_text='List of {station_label, measurement_in}'),
+        ),
+        migrations.RemoveField(
+            model_name='shellsettlementsurvey',
+            name='readings',
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inspections', '0007_remove_shellsettlementsurvey_readings'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='settlementreading',
+            options={'ordering': ['survey_id', 'position']},
+        ),
+        migrations.AddIndex(
+            model_name='columnplumbnesscheck',
+            index=models.Index(fields=['tank', '-created_at', '-id'], name='plumbness_tank_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='columnplumbnesscheck',
+            index=models.Index(fields=['tank', 'column_id', '-created_at'], name='plumbness_tank_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='edgesettlementcheck',
+            index=models.Index(fields=['tank', '-created_at', '-id'], name='edge_check_tank_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goalresult',
+            index=models.Index(fields=['tank', '-created_at', '-id'], name='goal_result_tank_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='othernde',
+            index=models.Index(fields=['tank', '-created_at', '-id'], name='other_nde_tank_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shellsettlementsurvey',
+            index=models.Index(fields=['tank', '-created_at', '-id'], name='settlement_tank_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='utresult',
+            index=models.Index(fields=['tank', '-created_at', '-id'], name='ut_result_tank_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='utresult',
+            index=models.Index(fields=['tank', 'category', '-created_at', '-id'], name='ut_result_tank_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='utresult',
+            index=models.Index(fields=['category', '-created_at', '-id'], name='ut_result_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='utresult',
+            index=models.Index(fields=['tank', 'category', 'course', '-created_at'], name='ut_result_tank_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visualfinding',
+            index=models.Index(fields=['tank', '-created_at', '-id'], name='visual_tank_created_idx'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:47
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inspections', '0008_child_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportBatch',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('report_format', models.CharField(choices=[('pdf', 'PDF'), ('html', 'HTML')], default='pdf', max_length=8)),
+                ('filters', models.JSONField(blank=True, default=dict)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ReportBatchItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=16)),
+                ('content_key', models.CharField(blank=True, default='', max_length=64)),
+                ('error', models.TextField(blank=True, default='')),
+            ],
+            options={
+                'ordering': ['batch_id', 'id'],
+            },
+        ),
+        migrations.AddField(
+            model_name='reportbatchitem',
+            name='batch',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='inspections.reportbatch'),
+        ),
+        migrations.AddField(
+            model_name='reportbatchitem',
+            name='tank',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='report_batch_items', to='inspections.tank'),
+        ),
+        migrations.AddIndex(
+            model_name='reportbatchitem',
+            index=models.Index(fields=['batch', 'status'], name='report_item_status_idx'),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:58
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inspections', '0009_report_batches'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resource', models.CharField(max_length=40)),
+                ('object_id', models.CharField(max_length=36)),
+                ('tank_id', models.UUIDField()),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['deleted_at', 'id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='columnplumbnesscheck',
+            index=models.Index(fields=['updated_at', 'id'], name='plumbness_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='edgesettlementcheck',
+            index=models.Index(fields=['updated_at', 'id'], name='edge_check_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goalresult',
+            index=models.Index(fields=['updated_at', 'id'], name='goal_result_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='othernde',
+            index=models.Index(fields=['updated_at', 'id'], name='other_nde_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shellsettlementsurvey',
+            index=models.Index(fields=['updated_at', 'id'], name='settlement_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tank',
+            index=models.Index(fields=['updated_at', 'tank_unique_id'], name='tank_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='utresult',
+            index=models.Index(fields=['updated_at', 'id'], name='ut_result_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visualfinding',
+            index=models.Index(fields=['updated_at', 'id'], name='visual_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['deleted_at', 'id'], name='tombstone_deleted_idx'),
+        ),
+    ]
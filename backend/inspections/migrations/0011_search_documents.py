@@ -0,0 +1,149 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+SQLITE_INDEX = [
+    """CREATE VIRTUAL TABLE inspections_searchdocument_fts USING fts5(
+        title, body, content='inspections_searchdocument', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER inspections_searchdocument_ai AFTER INSERT ON inspections_searchdocument BEGIN
+        INSERT INTO inspections_searchdocument_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END""",
+    """CREATE TRIGGER inspections_searchdocument_ad AFTER DELETE ON inspections_searchdocument BEGIN
+        INSERT INTO inspections_searchdocument_fts(inspections_searchdocument_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END""",
+    """CREATE TRIGGER inspections_searchdocument_au AFTER UPDATE ON inspections_searchdocument BEGIN
+        INSERT INTO inspections_searchdocument_fts(inspections_searchdocument_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO inspections_searchdocument_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END""",
+]
+SQLITE_DROP = [
+    'DROP TRIGGER IF EXISTS inspections_searchdocument_au',
+    'DROP TRIGGER IF EXISTS inspections_searchdocument_ad',
+    'DROP TRIGGER IF EXISTS inspections_searchdocument_ai',
+    'DROP TABLE IF EXISTS inspections_searchdocument_fts',
+]
+POSTGRES_INDEX = [
+    """ALTER TABLE inspections_searchdocument ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english', body), 'B')
+    ) STORED""",
+    'CREATE INDEX search_document_vector_idx ON inspections_searchdocument USING gin (search_vector)',
+]
+POSTGRES_DROP = [
+    'DROP INDEX IF EXISTS search_document_vector_idx',
+    'ALTER TABLE inspections_searchdocument DROP COLUMN IF EXISTS search_vector',
+]
+
+
+def _run(schema_editor, statements):
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def create_text_index(apps, schema_editor):
+    _run(schema_editor, {'sqlite': SQLITE_INDEX, 'postgresql': POSTGRES_INDEX})
+
+
+def drop_text_index(apps, schema_editor):
+    _run(schema_editor, {'sqlite': SQLITE_DROP, 'postgresql': POSTGRES_DROP})
+
+
+# The document rules of inspections/search.py as they stood when the table was created.
+INDEX_CHUNK_SIZE = 1000
+
+
+def _label(row, field):
+    value = getattr(row, field)
+    return dict(row._meta.get_field(field).choices or ()).get(value, value or '')
+
+
+def _text(*parts):
+    return '\n'.join(str(part).strip() for part in parts if isinstance(part, str) and part.strip())
+
+
+def _goal_text(row):
+    custom = [
+        _text(item.get('prompt'), item.get('answer')) for item in row.custom_responses or [] if isinstance(item, dict)
+    ]
+    return _text(*(row.standard_responses or {}).values(), *custom)
+
+
+SOURCES = (
+    (
+        'visual-findings',
+        'VisualFinding',
+        lambda row: _text(_label(row, 'area'), _label(row, 'comment_type')).replace('\n', ' · '),
+        lambda row: _text(row.finding),
+    ),
+    (
+        'ut-results',
+        'UTResult',
+        lambda row: _text(_label(row, 'category'), row.location).replace('\n', ' '),
+        lambda row: _text(row.notes),
+    ),
+    ('other-nde', 'OtherNDE', lambda row: row.nde_type, lambda row: _text(row.result)),
+    ('edge-settlement-checks', 'EdgeSettlementCheck', lambda row: 'Edge settlement', lambda row: _text(row.result)),
+    ('goal-results', 'GoalResult', lambda row: _label(row, 'goal_key'), _goal_text),
+)
+
+
+def index_existing_records(apps, schema_editor):
+    SearchDocument = apps.get_model('inspections', 'SearchDocument')
+    for resource, model_name, title, body in SOURCES:
+        documents = []
+        rows = apps.get_model('inspections', model_name).objects.order_by('pk')
+        for row in rows.iterator(chunk_size=INDEX_CHUNK_SIZE):
+            text = body(row)
+            if text:
+                documents.append(SearchDocument(
+                    resource=resource,
+                    object_id=str(row.pk),
+                    tank_id=row.tank_id,
+                    title=title(row)[:255],
+                    body=text,
+                    updated_at=row.updated_at,
+                ))
+            if len(documents) >= INDEX_CHUNK_SIZE:
+                SearchDocument.objects.bulk_create(documents)
+                documents = []
+        SearchDocument.objects.bulk_create(documents)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inspections', '0010_sync_change_feed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resource', models.CharField(max_length=40)),
+                ('object_id', models.CharField(max_length=36)),
+                ('title', models.CharField(blank=True, default='', max_length=255)),
+                ('body', models.TextField()),
+                ('updated_at', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['resource', 'object_id'],
+            },
+        ),
+        migrations.AddField(
+            model_name='searchdocument',
+            name='tank',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_documents', to='inspections.tank'),
+        ),
+        migrations.AddConstraint(
+            model_name='searchdocument',
+            constraint=models.UniqueConstraint(fields=('resource', 'object_id'), name='search_document_unique'),
+        ),
+        migrations.RunPython(create_text_index, drop_text_index),
+        migrations.RunPython(index_existing_records, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:06
+
+import re
+
+from django.db import migrations, models
+
+_DIGITS = re.compile(r'\d+')
+
+
+def _name_key(name):
+    return ' '.join(name.split()).casefold()[:255]
+
+
+def _sort_key(name):
+    return _DIGITS.sub(lambda match: match.group().lstrip('0').rjust(12, '0'), _name_key(name))[:255]
+
+
+def fill_name_keys(apps, schema_editor):
+    Tank = apps.get_model('inspections', 'Tank')
+    batch = []
+    for tank in Tank.objects.only('tank_name').iterator(chunk_size=2000):
+        tank.tank_name_key = _name_key(tank.tank_name)
+        tank.tank_name_sort = _sort_key(tank.tank_name)
+        batch.append(tank)
+        if len(batch) >= 2000:
+            Tank.objects.bulk_update(batch, ['tank_name_key', 'tank_name_sort'])
+            batch = []
+    Tank.objects.bulk_update(batch, ['tank_name_key', 'tank_name_sort'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inspections', '0011_search_documents'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tank',
+            name='tank_name_key',
+            field=models.CharField(default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='tank',
+            name='tank_name_sort',
+            field=models.CharField(default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(fill_name_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='tank',
+            index=models.Index(fields=['owner', 'tank_name', 'tank_unique_id'], name='tank_owner_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tank',
+            index=models.Index(fields=['client_name', 'tank_name', 'tank_unique_id'], name='tank_client_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tank',
+            index=models.Index(fields=['facility_type', 'tank_name', 'tank_unique_id'], name='tank_facility_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tank',
+            index=models.Index(fields=['state', 'tank_name', 'tank_unique_id'], name='tank_state_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tank',
+            index=models.Index(fields=['design_standard', 'tank_name', 'tank_unique_id'], name='tank_standard_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tank',
+            index=models.Index(fields=['product_stored', 'tank_name', 'tank_unique_id'], name='tank_product_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tank',
+            index=models.Index(fields=['next_inspection_due_date', 'tank_unique_id'], name='tank_due_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tank',
+            index=models.Index(fields=['year_built', 'tank_unique_id'], name='tank_year_built_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tank',
+            index=models.Index(fields=['tank_name_key'], name='tank_name_key_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='tank',
+            index=models.Index(fields=['tank_name_sort', 'tank_unique_id'], name='tank_name_sort_idx'),
+        ),
+    ]
@@ -0,0 +1,131 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# The tagging rules of inspections/tags.py as they stood when the table was created.
+INDEX_CHUNK_SIZE = 1000
+COLORS = {'red', 'blue', 'yellow', 'green'}
+FIELD_LABELS = {
+    'foundation': 'Foundation',
+    'anchors': 'Anchors',
+    'shell_weld_type': 'Shell weld type',
+    'insulation': 'Insulation',
+    'shell_manway': 'Shell manway',
+    'drain': 'Drain',
+    'level_gauge_type': 'Level gauge type',
+    'access_structure': 'Access structure',
+    'bottom_type': 'Bottom type',
+    'bottom_weld': 'Bottom weld type',
+    'annular_plate': 'Annular plate',
+    'fixed_roof_type': 'Fixed roof type',
+    'floating_roof_type': 'Floating roof type',
+    'primary_seal': 'Primary seal',
+    'secondary_seal': 'Secondary seal',
+    'anti_rotation_device': 'Anti-rotation device',
+    'vent_type_and_number': 'Vent type & quantity',
+    'emergency_venting_type': 'Emergency venting',
+    'roof_manway_or_hatch': 'Roof manway / hatch',
+    'pressure': 'Pressure',
+    'temperature': 'Temperature',
+}
+
+
+def _annotation_entries(annotations):
+    if not isinstance(annotations, dict):
+        return
+    standard, additional = annotations.get('standard'), annotations.get('additional')
+    sections = (
+        ('standard', standard.items() if isinstance(standard, dict) else ()),
+        ('additional', enumerate(additional) if isinstance(additional, list) else ()),
+    )
+    for section, entries in sections:
+        for position, (key, entry) in enumerate(entries):
+            if not isinstance(entry, dict):
+                continue
+            is_standard = section == 'standard'
+            tag = {
+                'section': section,
+                'position': position,
+                'field_key': str(key)[:64] if is_standard else '',
+                'label': str(FIELD_LABELS.get(key, key) if is_standard else entry.get('label') or '')[:255],
+                'value': '' if is_standard else str(entry.get('value') or '')[:255],
+                'color': entry.get('color') if entry.get('color') in COLORS else None,
+                've': bool(entry.get('ve')),
+                'ut': bool(entry.get('ut')),
+                'comment': str(entry.get('comment') or ''),
+            }
+            if tag['color'] or tag['ve'] or tag['ut'] or tag['comment']:
+                yield tag
+
+
+def index_existing_tanks(apps, schema_editor):
+    Tank = apps.get_model('inspections', 'Tank')
+    ConstructionTag = apps.get_model('inspections', 'ConstructionTag')
+    rows = []
+    for tank_id, annotations in Tank.objects.values_list('pk', 'construction_annotations').iterator(
+        chunk_size=INDEX_CHUNK_SIZE
+    ):
+        rows.extend(ConstructionTag(tank_id=tank_id, **entry) for entry in _annotation_entries(annotations))
+        if len(rows) >= INDEX_CHUNK_SIZE:
+            ConstructionTag.objects.bulk_create(rows)
+            rows = []
+    ConstructionTag.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inspections', '0013_import_checkpoints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConstructionTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('section', models.CharField(choices=[('standard', 'Standard field'), ('additional', 'Additional entry')], max_length=16)),
+                ('position', models.PositiveIntegerField(help_text='Order of the entry within its section')),
+                ('field_key', models.CharField(blank=True, default='', help_text='Tank field of a standard entry', max_length=64)),
+                ('label', models.CharField(blank=True, default='', max_length=255)),
+                ('value', models.CharField(blank=True, default='', max_length=255)),
+                ('color', models.CharField(blank=True, choices=[('red', 'Red'), ('blue', 'Blue'), ('yellow', 'Yellow'), ('green', 'Green')], max_length=8, null=True)),
+                ('ve', models.BooleanField(default=False)),
+                ('ut', models.BooleanField(default=False)),
+                ('comment', models.TextField(blank=True, default='')),
+            ],
+            options={
+                'ordering': ['tank', 'section', 'position'],
+            },
+        ),
+        migrations.AddField(
+            model_name='constructiontag',
+            name='tank',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='construction_tags', to='inspections.tank'),
+        ),
+        migrations.AddIndex(
+            model_name='constructiontag',
+            index=models.Index(fields=['field_key', 'color', 'tank'], name='tag_field_color_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='constructiontag',
+            index=models.Index(fields=['label', 'color', 'tank'], name='tag_label_color_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='constructiontag',
+            index=models.Index(fields=['color', 'tank'], name='tag_color_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='constructiontag',
+            index=models.Index(condition=models.Q(('ve', True)), fields=['field_key', 'tank'], name='tag_ve_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='constructiontag',
+            index=models.Index(condition=models.Q(('ut', True)), fields=['field_key', 'tank'], name='tag_ut_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='constructiontag',
+            constraint=models.UniqueConstraint(fields=('tank', 'section', 'position'), name='construction_tag_unique'),
+        ),
+        migrations.RunPython(index_existing_tanks, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,26 @@
 """Data models for the tank inspection workflows."""
 from __future__ import annotations
 
+import re
 import uuid
 
 from django.db import models
+from django.utils import timezone
+
+# Digit runs are zero-padded to this width in natural sort keys.
+NATURAL_SORT_DIGITS = 12
+_DIGITS = re.compile(r'\d+')
+
+
+def tank_name_key(name: str) -> str:
+    """Case- and spacing-insensitive form of a tank name, for prefix lookups."""
+    return ' '.join(name.split()).casefold()[:255]
+
+
+def tank_name_sort_key(name: str) -> str:
+    """Sort key that orders digit runs by value, so "13" comes before "129"."""
+    padded = _DIGITS.sub(lambda match: match.group().lstrip('0').rjust(NATURAL_SORT_DIGITS, '0'), tank_name_key(name))
+    return padded[:255]
 
 
 class TimeStampedModel(models.Model):
@@ -43,6 +60,9 @@ class Tank(TimeStampedModel):
 
     tank_unique_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     tank_name = models.CharField(max_length=255)
+    # Derived from tank_name on save, for typeahead lookups and natural ordering.
+    tank_name_key = models.CharField(max_length=255, editable=False, default='')
+    tank_name_sort = models.CharField(max_length=255, editable=False, default='')
     owner = models.CharField(max_length=255)
     facility_type = models.CharField(max_length=64, choices=FACILITY_CHOICES)
     city = models.CharField(max_length=255)
@@ -95,22 +115,100 @@ class Tank(TimeStampedModel):
     secondary_containment_type = models.CharField(max_length=255)
     construction_annotations = models.JSONField(default=dict, blank=True)
 
+    NAME_KEY_FIELDS = ('tank_name_key', 'tank_name_sort')
+
     class Meta:
         ordering = ['tank_name']
+        indexes = [
+            models.Index(fields=['tank_name', 'tank_unique_id'], name='tank_name_pk_idx'),
+            models.Index(fields=['updated_at', 'tank_unique_id'], name='tank_updated_idx'),
+            # Each list filter is served in list order (tank_name, tank_unique_id) straight from its index.
+            models.Index(fields=['owner', 'tank_name', 'tank_unique_id'], name='tank_owner_idx'),
+            models.Index(fields=['client_name', 'tank_name', 'tank_unique_id'], name='tank_client_idx'),
+            models.Index(fields=['facility_type', 'tank_name', 'tank_unique_id'], name='tank_facility_idx'),
+            models.Index(fields=['state', 'tank_name', 'tank_unique_id'], name='tank_state_idx'),
+            models.Index(fields=['design_standard', 'tank_name', 'tank_unique_id'], name='tank_standard_idx'),
+            models.Index(fields=['product_stored', 'tank_name', 'tank_unique_id'], name='tank_product_idx'),
+            models.Index(fields=['next_inspection_due_date', 'tank_unique_id'], name='tank_due_date_idx'),
+            models.Index(fields=['year_built', 'tank_unique_id'], name='tank_year_built_idx'),
+            # The pattern operator class lets Postgres serve LIKE 'prefix%'; other databases ignore it.
+            models.Index(fields=['tank_name_key'], name='tank_name_key_idx', opclasses=['varchar_pattern_ops']),
+            models.Index(fields=['tank_name_sort', 'tank_unique_id'], name='tank_name_sort_idx'),
+        ]
 
     def __str__(self) -> str:
         return f"{self.tank_name} ({self.tank_unique_id})"
 
+    def set_name_keys(self) -> None:
+        """Refresh the typeahead and natural-sort keys; ``bulk_create`` callers must call this themselves."""
+        self.tank_name_key = tank_name_key(self.tank_name)
+        self.tank_name_sort = tank_name_sort_key(self.tank_name)
+
+    def save(self, *args, **kwargs):  # type: ignore[override]
+        self.set_name_keys()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'tank_name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, *self.NAME_KEY_FIELDS}
+        return super().save(*args, **kwargs)
+
 
 class ShellSettlementSurvey(TimeStampedModel):
     """Stores settlement survey readings per tank."""
 
     tank = models.ForeignKey(Tank, on_delete=models.CASCADE, related_name='shell_settlement_surveys')
     station_count = models.PositiveIntegerField()
-    readings = models.JSONField(help_text='List of {station_label, measurement_in}')
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='settlement_created_idx'),
+            models.Index(fields=['tank', '-created_at', '-id'], name='settlement_tank_created_idx'),
+            models.Index(fields=['updated_at', 'id'], name='settlement_updated_idx'),
+        ]
+
+
+class SettlementReading(models.Model):
+    """One station measurement of a shell settlement survey, in survey order."""
+
+    survey = models.ForeignKey(ShellSettlementSurvey, on_delete=models.CASCADE, related_name='station_readings')
+    tank = models.ForeignKey(Tank, on_delete=models.CASCADE, related_name='settlement_readings')
+    position = models.PositiveIntegerField(help_text='Zero-based station index around the shell')
+    station_label = models.CharField(max_length=50)
+    measurement_in = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['survey_id', 'position']
+        constraints = [
+            models.UniqueConstraint(fields=['survey', 'position'], name='unique_settlement_station'),
+        ]
+        indexes = [
+            models.Index(fields=['tank', 'survey', 'position'], name='settlement_reading_station_idx'),
+            models.Index(fields=['tank', 'station_label'], name='settlement_reading_label_idx'),
+            models.Index(fields=['measurement_in'], name='settlement_reading_value_idx'),
+        ]
+
+
+class SettlementAnalysis(TimeStampedModel):
+    """Cosine-fit settlement results derived from a shell settlement survey."""
+
+    survey = models.OneToOneField(ShellSettlementSurvey, on_delete=models.CASCADE, related_name='analysis')
+    tank = models.ForeignKey(Tank, on_delete=models.CASCADE, related_name='settlement_analyses')
+    inputs_digest = models.CharField(max_length=64)
+    station_count = models.PositiveIntegerField()
+    cosine_offset_in = models.FloatField()
+    cosine_amplitude_in = models.FloatField()
+    cosine_phase_deg = models.FloatField()
+    r_squared = models.FloatField(null=True, blank=True)
+    max_out_of_plane_in = models.FloatField()
+    allowed_out_of_plane_in = models.FloatField(null=True, blank=True)
+    utilization = models.FloatField(null=True, blank=True, help_text='max_out_of_plane_in / allowed_out_of_plane_in')
+    stations = models.JSONField(default=list, help_text='List of {station_label, measurement_in, fitted_in, out_of_plane_in}')
+
+    class Meta:
+        ordering = [models.F('utilization').desc(nulls_last=True), '-max_out_of_plane_in']
+        indexes = [
+            models.Index(fields=['-utilization', '-max_out_of_plane_in'], name='settlement_worst_idx'),
+        ]
 
 
 class UTResult(TimeStampedModel):
@@ -132,6 +230,14 @@ class UTResult(TimeStampedModel):
 
     class Meta:
         ordering = ['category', 'course', '-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='ut_result_created_idx'),
+            models.Index(fields=['tank', '-created_at', '-id'], name='ut_result_tank_created_idx'),
+            models.Index(fields=['updated_at', 'id'], name='ut_result_updated_idx'),
+            models.Index(fields=['tank', 'category', '-created_at', '-id'], name='ut_result_tank_category_idx'),
+            models.Index(fields=['category', '-created_at', '-id'], name='ut_result_category_idx'),
+            models.Index(fields=['tank', 'category', 'course', '-created_at'], name='ut_result_tank_order_idx'),
+        ]
 
 
 class EdgeSettlementCheck(TimeStampedModel):
@@ -141,6 +247,11 @@ class EdgeSettlementCheck(TimeStampedModel):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='edge_check_created_idx'),
+            models.Index(fields=['tank', '-created_at', '-id'], name='edge_check_tank_created_idx'),
+            models.Index(fields=['updated_at', 'id'], name='edge_check_updated_idx'),
+        ]
 
 
 class ColumnPlumbnessCheck(TimeStampedModel):
@@ -151,6 +262,12 @@ class ColumnPlumbnessCheck(TimeStampedModel):
 
     class Meta:
         ordering = ['column_id', '-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='plumbness_created_idx'),
+            models.Index(fields=['tank', '-created_at', '-id'], name='plumbness_tank_created_idx'),
+            models.Index(fields=['updated_at', 'id'], name='plumbness_updated_idx'),
+            models.Index(fields=['tank', 'column_id', '-created_at'], name='plumbness_tank_order_idx'),
+        ]
 
 
 class VisualFinding(TimeStampedModel):
@@ -178,6 +295,11 @@ class VisualFinding(TimeStampedModel):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='visual_created_idx'),
+            models.Index(fields=['tank', '-created_at', '-id'], name='visual_tank_created_idx'),
+            models.Index(fields=['updated_at', 'id'], name='visual_updated_idx'),
+        ]
 
 
 class OtherNDE(TimeStampedModel):
@@ -187,6 +309,11 @@ class OtherNDE(TimeStampedModel):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='other_nde_created_idx'),
+            models.Index(fields=['tank', '-created_at', '-id'], name='other_nde_tank_created_idx'),
+            models.Index(fields=['updated_at', 'id'], name='other_nde_updated_idx'),
+        ]
 
 
 class GoalKey(models.TextChoices):
@@ -227,6 +354,11 @@ class GoalResult(TimeStampedModel):
     class Meta:
         unique_together = ('tank', 'goal_key')
         ordering = ['goal_key']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='goal_result_created_idx'),
+            models.Index(fields=['tank', '-created_at', '-id'], name='goal_result_tank_created_idx'),
+            models.Index(fields=['updated_at', 'id'], name='goal_result_updated_idx'),
+        ]
 
     def ensure_defaults(self) -> None:
         """Populate missing standard response keys where needed."""
@@ -255,3 +387,147 @@ class GoalResult(TimeStampedModel):
     def save(self, *args, **kwargs):  # type: ignore[override]
         self.ensure_defaults()
         return super().save(*args, **kwargs)
+
+
+class SearchDocument(models.Model):
+    """Searchable text of one inspection record, maintained by :mod:`inspections.search`.
+
+    The database indexes ``title`` and ``body``: through a generated ``search_vector`` column
+    on Postgres and the ``inspections_searchdocument_fts`` table on SQLite, both created by
+    migration rather than declared here.
+    """
+
+    resource = models.CharField(max_length=40)
+    object_id = models.CharField(max_length=36)
+    tank = models.ForeignKey(Tank, on_delete=models.CASCADE, related_name='search_documents')
+    title = models.CharField(max_length=255, blank=True, default='')
+    body = models.TextField()
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['resource', 'object_id']
+        constraints = [
+            models.UniqueConstraint(fields=['resource', 'object_id'], name='search_document_unique'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.resource} {self.object_id}"
+
+
+class ConstructionTag(models.Model):
+    """One tagged entry of a tank's ``construction_annotations``, maintained by :mod:`inspections.tags`.
+
+    The JSON stays the source of truth; these rows let fleet-wide questions such as "red
+    annular plates" or "everything flagged for UT" be answered from indexes.
+    """
+
+    STANDARD = 'standard'
+    ADDITIONAL = 'additional'
+    SECTION_CHOICES = [(STANDARD, 'Standard field'), (ADDITIONAL, 'Additional entry')]
+    COLOR_CHOICES = [('red', 'Red'), ('blue', 'Blue'), ('yellow', 'Yellow'), ('green', 'Green')]
+
+    tank = models.ForeignKey(Tank, on_delete=models.CASCADE, related_name='construction_tags')
+    section = models.CharField(max_length=16, choices=SECTION_CHOICES)
+    position = models.PositiveIntegerField(help_text='Order of the entry within its section')
+    field_key = models.CharField(max_length=64, blank=True, default='', help_text='Tank field of a standard entry')
+    label = models.CharField(max_length=255, blank=True, default='')
+    value = models.CharField(max_length=255, blank=True, default='')
+    color = models.CharField(max_length=8, choices=COLOR_CHOICES, null=True, blank=True)
+    ve = models.BooleanField(default=False)
+    ut = models.BooleanField(default=False)
+    comment = models.TextField(blank=True, default='')
+
+    class Meta:
+        ordering = ['tank', 'section', 'position']
+        constraints = [
+            models.UniqueConstraint(fields=['tank', 'section', 'position'], name='construction_tag_unique'),
+        ]
+        indexes = [
+            # Cover the tank filters and the per field and colour rollup without touching the table.
+            models.Index(fields=['field_key', 'color', 'tank'], name='tag_field_color_idx'),
+            models.Index(fields=['label', 'color', 'tank'], name='tag_label_color_idx'),
+            models.Index(fields=['color', 'tank'], name='tag_color_idx'),
+            models.Index(fields=['field_key', 'tank'], condition=models.Q(ve=True), name='tag_ve_idx'),
+            models.Index(fields=['field_key', 'tank'], condition=models.Q(ut=True), name='tag_ut_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.field_key or self.label} ({self.color or 'untagged'})"
+
+
+class Tombstone(models.Model):
+    """Marks a deleted tank or inspection record so offline clients can sync the delete.
+
+    Deleting a tank leaves one tombstone for the tank; its records go with it.
+    """
+
+    resource = models.CharField(max_length=40)
+    object_id = models.CharField(max_length=36)
+    tank_id = models.UUIDField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['deleted_at', 'id']
+        indexes = [
+            models.Index(fields=['deleted_at', 'id'], name='tombstone_deleted_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.resource} {self.object_id} deleted {self.deleted_at:%Y-%m-%d %H:%M}"
+
+
+class ReportBatch(TimeStampedModel):
+    """A request to render reports for many tanks at once, e.g. a client's fleet at month-end."""
+
+    FORMAT_CHOICES = [
+        ('pdf', 'PDF'),
+        ('html', 'HTML'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    report_format = models.CharField(max_length=8, choices=FORMAT_CHOICES, default='pdf')
+    filters = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+
+class ReportBatchItem(TimeStampedModel):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    batch = models.ForeignKey(ReportBatch, on_delete=models.CASCADE, related_name='items')
+    tank = models.ForeignKey(Tank, on_delete=models.CASCADE, related_name='report_batch_items')
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=PENDING)
+    content_key = models.CharField(max_length=64, blank=True, default='')
+    error = models.TextField(blank=True, default='')
+
+    class Meta:
+        ordering = ['batch_id', 'id']
+        indexes = [
+            models.Index(fields=['batch', 'status'], name='report_item_status_idx'),
+        ]
+
+
+class ImportCheckpoint(TimeStampedModel):
+    """Progress of one legacy import file, saved in the same transaction as each chunk it counts."""
+
+    key = models.CharField(max_length=64, unique=True, help_text='SHA-256 of the resource and absolute file path')
+    resource = models.CharField(max_length=40)
+    source = models.TextField(help_text='Path of the imported file')
+    fingerprint = models.CharField(max_length=64, help_text='Digest of the mapping and the file size')
+    rows_done = models.PositiveBigIntegerField(default=0)
+    created = models.PositiveBigIntegerField(default=0)
+    rejected = models.PositiveBigIntegerField(default=0)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        return f"{self.resource} from {self.source}: {self.rows_done} rows"
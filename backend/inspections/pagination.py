@@ -0,0 +1,175 @@
+"""Keyset (cursor) pagination for the inspection list endpoints."""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from typing import Any
+
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Paginates by seeking past the last row seen instead of counting an offset.
+
+    The ordering must be unique and made of non-null columns; views pick it with a
+    ``pagination_ordering`` attribute and fall back to newest-first. Cursors are opaque
+    base64 tokens holding the boundary row's ordering values, so rows inserted while a
+    client is paging never shift or duplicate the pages it has yet to read.
+    """
+
+    ordering: tuple[str, ...] = ('-created_at', '-pk')
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def paginate_queryset(self, queryset: QuerySet, request, view=None):  # type: ignore[override]
+        page = self.page_queryset(queryset, request, view)
+        return self.collect_page(list(page))
+
+    async def apaginate_queryset(self, queryset: QuerySet, request, view=None):
+        """:meth:`paginate_queryset` for async views."""
+        page = self.page_queryset(queryset, request, view)
+        return self.collect_page([row async for row in page])
+
+    def page_queryset(self, queryset: QuerySet, request, view=None) -> QuerySet:
+        """Order and seek ``queryset`` to the requested page, plus one row to tell whether more follow."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = tuple(getattr(view, 'pagination_ordering', self.ordering))
+        self.base_url = request.build_absolute_uri()
+
+        position, reverse = self.decode_cursor(request)
+        self.position, self.reverse = position, reverse
+        ordering = self.reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.seek_filter(ordering, position))
+        return queryset[: self.page_size + 1]
+
+    def collect_page(self, rows: list[Any]) -> list[Any]:
+        """Trim the fetched rows of :meth:`page_queryset` to the page and record the paging state."""
+        position, reverse = self.position, self.reverse
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.has_next = True if reverse else has_more
+        self.has_previous = has_more if reverse else position is not None
+        self.first_position = self.position_for(rows[0]) if rows else position
+        self.last_position = self.position_for(rows[-1]) if rows else position
+        return rows
+
+    def get_paginated_response(self, data):  # type: ignore[override]
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):  # type: ignore[override]
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request) -> int:
+        default = api_settings.PAGE_SIZE or 100
+        raw = request.query_params.get(self.page_size_query_param)
+        if raw is None:
+            return default
+        try:
+            size = int(raw)
+        except ValueError:
+            return default
+        if size <= 0:
+            return default
+        return min(size, self.max_page_size)
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next or self.last_position is None:
+            return None
+        return self.encode_cursor(self.last_position, reverse=False)
+
+    def get_previous_link(self) -> str | None:
+        if not self.has_previous or self.first_position is None:
+            return None
+        return self.encode_cursor(self.first_position, reverse=True)
+
+    def encode_cursor(self, position: list[Any], reverse: bool) -> str:
+        payload = json.dumps({'p': position, 'r': int(reverse)}, separators=(',', ':'))
+        token = base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request) -> tuple[list[Any] | None, bool]:
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+            position = payload['p']
+            reverse = bool(payload.get('r'))
+        except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def position_for(self, instance: Any) -> list[Any]:
+        values: list[Any] = []
+        for field in self.ordering:
+            value = getattr(instance, field.lstrip('-'))
+            if hasattr(value, 'isoformat'):
+                value = value.isoformat()
+            elif not isinstance(value, (int, str)):
+                value = str(value)
+            values.append(value)
+        return values
+
+    @staticmethod
+    def reverse_ordering(ordering: tuple[str, ...]) -> tuple[str, ...]:
+        return tuple(field[1:] if field.startswith('-') else f'-{field}' for field in ordering)
+
+    @staticmethod
+    def seek_filter(ordering: tuple[str, ...], position: list[Any]) -> Q:
+        """Build ``(a, b, c) > (x, y, z)`` for a mixed-direction ordering as nested ORs."""
+        condition = Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            clause = Q(**{f'{name}__{lookup}': position[index]})
+            for prior_field, prior_value in zip(ordering[:index], position[:index]):
+                clause &= Q(**{prior_field.lstrip('-'): prior_value})
+            condition |= clause
+        return condition
+
+    def get_schema_operation_parameters(self, view):  # type: ignore[override]
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Opaque pagination cursor.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of results to return per page.',
+                'schema': {'type': 'integer'},
+            },
+        ]
@@ -0,0 +1,260 @@
+"""Per-request performance instrumentation: ``Server-Timing`` headers and a rolling summary per view.
+
+:class:`PerfMiddleware` times every DRF request, counts its SQL statements and their time
+through an execute wrapper on every connection, and measures response size; serializers built
+on :class:`TimedSerializerMixin` add their time. The numbers go out in a ``Server-Timing``
+header and into a bounded window of recent samples per view action, which ``/api/_perf/``
+summarises. Samples are kept per worker process.
+"""
+from __future__ import annotations
+
+import hmac
+import threading
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils import timezone
+from rest_framework.permissions import BasePermission
+from rest_framework.views import APIView
+
+PERCENTILES = (50, 95, 99)
+
+
+@dataclass
+class RequestMetrics:
+    started: float = field(default_factory=perf_counter)
+    queries: int = 0
+    query_seconds: float = 0.0
+    serialize_seconds: float = 0.0
+    serializing: bool = False
+
+    def server_timing(self, total: float) -> str:
+        return (
+            f'app;dur={total * 1000:.1f}, '
+            f'db;dur={self.query_seconds * 1000:.1f};desc="queries={self.queries}", '
+            f'serialize;dur={self.serialize_seconds * 1000:.1f}'
+        )
+
+
+_current: ContextVar[RequestMetrics | None] = ContextVar('perf_request_metrics', default=None)
+
+
+def _record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.query_seconds += perf_counter() - start
+
+
+def _instrument(connection) -> None:
+    # Installed once per connection rather than per request: async views run their
+    # queries on worker-thread connections the middleware cannot reach.
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def _on_connection_created(sender, connection, **kwargs) -> None:
+    _instrument(connection)
+
+
+# ---------------------------------------------------------------------------
+# Serializer timing
+
+class TimedSerializerMixin:
+    """Adds a serializer's outermost ``to_representation`` calls to the request's serializer time.
+
+    A list serializer calls its child once per row and nested serializers run inside their
+    parent, so each row is timed once, and fetching the rows (already counted as SQL) is not.
+    """
+
+    def to_representation(self, instance):
+        metrics = _current.get()
+        if metrics is None or metrics.serializing:
+            return super().to_representation(instance)  # type: ignore[misc]
+        metrics.serializing = True
+        start = perf_counter()
+        try:
+            return super().to_representation(instance)  # type: ignore[misc]
+        finally:
+            metrics.serializing = False
+            metrics.serialize_seconds += perf_counter() - start
+
+
+def install() -> None:
+    """Count queries for instrumented requests on every connection; called once from the app config."""
+    for connection in connections.all(initialized_only=True):
+        _instrument(connection)
+    connection_created.connect(_on_connection_created, dispatch_uid='inspections.perf')
+
+
+# ---------------------------------------------------------------------------
+# Rolling summary
+
+@dataclass(frozen=True)
+class Sample:
+    total_ms: float
+    db_ms: float
+    queries: int
+    serialize_ms: float
+    size: int | None
+    status: int
+
+
+class ViewStats:
+    def __init__(self, size: int):
+        self.samples: deque[Sample] = deque(maxlen=size)
+        self.count = 0
+        self.errors = 0
+
+    def add(self, sample: Sample) -> None:
+        self.samples.append(sample)
+        self.count += 1
+        if sample.status >= 500:
+            self.errors += 1
+
+
+_stats: dict[str, ViewStats] = {}
+_lock = threading.Lock()
+_since = timezone.now()
+
+
+def percentile(ordered: list[float], percent: int) -> float:
+    """Nearest-rank percentile of an ascending, non-empty list."""
+    return ordered[min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))]
+
+
+def _mean(values: list[float]) -> float:
+    return round(sum(values) / len(values), 2) if values else 0.0
+
+
+def record(name: str, sample: Sample) -> None:
+    with _lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = ViewStats(settings.PERF_SAMPLE_SIZE)
+        stats.add(sample)
+
+
+def summary() -> dict[str, Any]:
+    """Latency percentiles and mean query, serializer and size figures per view, slowest p95 first."""
+    with _lock:
+        snapshot = {name: (list(stats.samples), stats.count, stats.errors) for name, stats in _stats.items()}
+    views = []
+    for name, (samples, count, errors) in snapshot.items():
+        totals = sorted(sample.total_ms for sample in samples)
+        sizes = [sample.size for sample in samples if sample.size is not None]
+        views.append({
+            'view': name,
+            'requests': count,
+            'errors': errors,
+            'window': len(samples),
+            **{f'p{percent}_ms': round(percentile(totals, percent), 2) for percent in PERCENTILES},
+            'max_ms': round(totals[-1], 2),
+            'db_ms': _mean([sample.db_ms for sample in samples]),
+            'queries': _mean([sample.queries for sample in samples]),
+            'max_queries': max(sample.queries for sample in samples),
+            'serialize_ms': _mean([sample.serialize_ms for sample in samples]),
+            'response_bytes': _mean(sizes) if sizes else None,
+        })
+    views.sort(key=lambda row: row['p95_ms'], reverse=True)
+    return {'since': _since, 'sample_size': settings.PERF_SAMPLE_SIZE, 'views': views}
+
+
+def reset() -> None:
+    global _since
+    with _lock:
+        _stats.clear()
+        _since = timezone.now()
+
+
+# ---------------------------------------------------------------------------
+# Middleware and access
+
+def view_name(request) -> str | None:
+    """``<ViewSet>.<action>`` for DRF views, ``None`` for anything else or exempt views."""
+    match = getattr(request, 'resolver_match', None)
+    cls = getattr(match.func, 'cls', None) if match else None
+    if cls is None or not issubclass(cls, APIView) or getattr(cls, 'perf_exempt', False):
+        return None
+    method = request.method.lower()
+    actions = getattr(match.func, 'actions', None) or {}
+    return f'{cls.__name__}.{actions.get(method, method)}'
+
+
+class PerfMiddleware:
+    """Instrument each request; disabled entirely with ``PERF_INSTRUMENTATION=false``.
+
+    Streamed responses are measured up to their first byte: queries run while the
+    body streams, and its size, are not counted. Works in both sync and async stacks.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PERF_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+
+    def finish(self, request, response, metrics: RequestMetrics):
+        total = perf_counter() - metrics.started
+        name = view_name(request)
+        if name is None:
+            return response
+        record(name, Sample(
+            total_ms=total * 1000,
+            db_ms=metrics.query_seconds * 1000,
+            queries=metrics.queries,
+            serialize_ms=metrics.serialize_seconds * 1000,
+            size=None if response.streaming else len(response.content),
+            status=response.status_code,
+        ))
+        if settings.PERF_SERVER_TIMING:
+            response['Server-Timing'] = metrics.server_timing(total)
+        return response
+
+
+class PerfAccess(BasePermission):
+    """Staff users, or callers presenting ``PERF_TOKEN`` in an ``X-Perf-Token`` header."""
+
+    def has_permission(self, request, view):
+        token = settings.PERF_TOKEN
+        supplied = request.headers.get('X-Perf-Token', '')
+        if token and supplied and hmac.compare_digest(token.encode(), supplied.encode()):
+            return True
+        return bool(request.user and request.user.is_staff)
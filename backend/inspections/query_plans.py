@@ -0,0 +1,141 @@
+"""Capture and audit the query plans behind the inspection API endpoints."""
+from __future__ import annotations
+
+import json
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+from django.db import connections
+
+# Endpoints whose queries must be served from indexes. ``{tank}`` and ``{survey}``
+# are filled in with records from the middle of the dataset.
+ENDPOINTS: tuple[str, ...] = (
+    '/api/tanks/',
+    '/api/tanks/?owner=Harbor%20Fuels',
+    '/api/tanks/?state=TX',
+    '/api/tanks/?facility_type=terminal',
+    '/api/tanks/{tank}/',
+    '/api/shell-settlement-surveys/',
+    '/api/shell-settlement-surveys/?tank_id={tank}',
+    '/api/settlement-readings/?tank_id={tank}',
+    '/api/settlement-readings/?survey_id={survey}',
+    '/api/ut-results/',
+    '/api/ut-results/?tank_id={tank}',
+    '/api/ut-results/?tank_id={tank}&category=shell',
+    '/api/ut-results/?category=shell',
+    '/api/edge-settlement-checks/',
+    '/api/edge-settlement-checks/?tank_id={tank}',
+    '/api/column-plumbness-checks/',
+    '/api/column-plumbness-checks/?tank_id={tank}',
+    '/api/visual-findings/',
+    '/api/visual-findings/?tank_id={tank}',
+    '/api/other-nde/',
+    '/api/other-nde/?tank_id={tank}',
+    '/api/goal-results/',
+    '/api/goal-results/?tank_id={tank}',
+    '/api/sync/changes/?page_size=200',
+)
+# Endpoints that must find their rows through indexes but may sort what those select: tank lists
+# narrowed by construction tags order the matching tanks by name, and the tag rollup counts
+# distinct tanks per group.
+SORTED_ENDPOINTS: tuple[str, ...] = (
+    '/api/tanks/?tag_field=foundation&tag_color=red',
+    '/api/tanks/?tag_ut=true',
+    '/api/tanks/construction-tags/',
+    '/api/tanks/construction-tags/?group_by=color',
+    '/api/tanks/construction-tags/?group_by=field_key&tag_ut=true',
+)
+
+
+@dataclass
+class QueryPlan:
+    sql: str
+    plan: list[str]
+    problems: list[str] = field(default_factory=list)
+
+
+@dataclass
+class EndpointPlans:
+    path: str
+    status_code: int
+    queries: list[QueryPlan] = field(default_factory=list)
+
+    @property
+    def problems(self) -> list[str]:
+        return [problem for query in self.queries for problem in query.problems]
+
+
+@contextmanager
+def capture_selects(using: str = 'default') -> Iterator[list[tuple[str, Any]]]:
+    """Record the SQL and parameters of every SELECT run inside the block."""
+    captured: list[tuple[str, Any]] = []
+
+    def wrapper(execute, sql, params, many, context):
+        if not many and sql.lstrip().upper().startswith('SELECT'):
+            captured.append((sql, params))
+        return execute(sql, params, many, context)
+
+    with connections[using].execute_wrapper(wrapper):
+        yield captured
+
+
+def explain(sql: str, params: Any, using: str = 'default') -> list[str]:
+    """Return the plan for one statement as a list of node descriptions."""
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            document = cursor.fetchone()[0]
+            if isinstance(document, str):
+                document = json.loads(document)
+            return list(_postgres_nodes(document[0]['Plan']))
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return [row[-1] for row in cursor.fetchall()]
+    raise NotImplementedError(f'Query plan checks are not implemented for {connection.vendor}.')
+
+
+def _postgres_nodes(node: dict[str, Any], depth: int = 0) -> Iterator[str]:
+    relation = node.get('Relation Name')
+    index = node.get('Index Name')
+    description = node['Node Type']
+    if relation:
+        description += f' on {relation}'
+    if index:
+        description += f' using {index}'
+    yield '  ' * depth + description
+    for child in node.get('Plans', []):
+        yield from _postgres_nodes(child, depth + 1)
+
+
+def plan_problems(plan: list[str], vendor: str, allow_sort: bool = False) -> list[str]:
+    """Flag full-table scans and, unless ``allow_sort``, sorts the database has to do itself."""
+    problems = []
+    for line in plan:
+        step = line.strip()
+        if vendor == 'sqlite':
+            if step.startswith('SCAN ') and ' USING ' not in step:
+                problems.append(f'sequential scan: {step}')
+            elif step.startswith('USE TEMP B-TREE') and not allow_sort:
+                problems.append(f'sort: {step}')
+        elif vendor == 'postgresql':
+            if step.startswith('Seq Scan'):
+                problems.append(f'sequential scan: {step}')
+            elif step.startswith('Sort') and not allow_sort:
+                problems.append(f'sort: {step}')
+    return problems
+
+
+def check_endpoint(client, path: str, using: str = 'default', allow_sort: bool = False) -> EndpointPlans:
+    """Request ``path`` and explain every SELECT it issued."""
+    vendor = connections[using].vendor
+    with capture_selects(using) as captured:
+        response = client.get(path)
+        if getattr(response, 'streaming', False):
+            b''.join(response.streaming_content)
+    result = EndpointPlans(path=path, status_code=response.status_code)
+    for sql, params in captured:
+        plan = explain(sql, params, using)
+        result.queries.append(QueryPlan(sql=sql, plan=plan, problems=plan_problems(plan, vendor, allow_sort)))
+    return result
@@ -0,0 +1,116 @@
+"""Process-wide cache of the reference data behind ``/api/metadata/`` and the goal templates.
+
+Both documents are built once per process and version. A token kept in the Django cache
+moves when a goal question template is created, edited or deleted; with a shared cache every
+worker sees it at once, while an in-process cache expires it after ``TANK_DETAIL_CACHE_TIMEOUT``
+so other workers catch up within that time. The version published to clients is a hash of
+the built documents, so it only moves when the content does.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from rest_framework.response import Response
+
+from . import cache, models, replicas, serializers
+
+VERSION_QUERY_PARAM = 'v'
+# Responses requested with the current version in the URL never change.
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+METHODS = (
+    '100% Visual Examination (VE) of bottom plates, corner weld, and bottom welds',
+    '100% VE of base of tank, bottom extension, and shell',
+    'Document with digital camera',
+    'Ultrasonic Thickness Testing (UT)',
+    'Note brittle-fracture concerns if applicable',
+    'Document findings affecting structural or hydraulic integrity',
+    'Survey of the shell for settlement',
+    'Survey of fixed-roof supports for plumbness',
+    'VE of shell for bulges or distortion',
+    'Document potential findings affecting foundation or bottom integrity',
+    'Thorough VE of access structure and appurtenances',
+    'Thorough VE of roof and appurtenances',
+    'UT readings of accessible roof plates',
+    'VE of floating roof and appurtenances (if present)',
+    'VE of existing venting system',
+    'VE of coatings',
+)
+
+
+@dataclass(frozen=True)
+class ReferenceData:
+    token: str
+    version: str
+    metadata: dict[str, Any]
+    templates: list[dict[str, Any]]
+
+
+_lock = threading.Lock()
+_current: ReferenceData | None = None
+
+
+def get_reference_data() -> ReferenceData:
+    """Return this process's reference data, rebuilding it when the shared token has moved."""
+    token = cache.reference_version()
+    current = _current
+    if current is not None and current.token == token:
+        return current
+    return _refresh(token)
+
+
+async def aget_reference_data() -> ReferenceData:
+    """:func:`get_reference_data` for async views; a rebuild runs in a worker thread."""
+    token = await cache.areference_version()
+    current = _current
+    if current is not None and current.token == token:
+        return current
+    return await sync_to_async(_refresh)(token)
+
+
+def _refresh(token: str) -> ReferenceData:
+    global _current
+    with _lock:
+        if _current is None or _current.token != token:
+            with replicas.primary():
+                _current = _build(token)
+        return _current
+
+
+def _build(token: str) -> ReferenceData:
+    metadata = {
+        'methods': list(METHODS),
+        'goals': [{'key': choice.value, 'label': choice.label} for choice in models.GoalKey],
+        'tank_choices': {
+            'facility_type': models.Tank.FACILITY_CHOICES,
+            'foundation': models.Tank.FOUNDATION_CHOICES,
+            'access_structure': models.Tank.ACCESS_STRUCTURE_CHOICES,
+            'comment_types': models.VisualFinding.COMMENT_CHOICES,
+            'visual_areas': models.VisualFinding.AREA_CHOICES,
+            'ut_categories': models.UTResult.CATEGORY_CHOICES,
+        },
+    }
+    queryset = models.GoalQuestionTemplate.objects.order_by('goal_key', 'prompt', 'pk')
+    templates = [dict(row) for row in serializers.GoalQuestionTemplateSerializer(queryset, many=True).data]
+    digest = hashlib.sha256(json.dumps([metadata, templates]).encode('utf-8')).hexdigest()[:16]
+    return ReferenceData(token=token, version=digest, metadata={**metadata, 'version': digest}, templates=templates)
+
+
+def respond(request, data: Any, version: str):
+    """Serve ``data`` with an ETag for ``version``; cache it for a year when the URL names that version."""
+    renderer = getattr(request, 'accepted_renderer', None)
+    etag = f'"{version}.{getattr(renderer, "format", "json")}"'
+    response = get_conditional_response(request, etag=etag) or Response(data)
+    response['ETag'] = etag
+    patch_vary_headers(response, ('Accept',))
+    if request.query_params.get(VERSION_QUERY_PARAM) == version:
+        patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, no_cache=True)
+    return response
@@ -0,0 +1,172 @@
+"""Read replica routing with read-your-writes for API clients.
+
+When ``DATABASE_REPLICA_URL`` is set, :class:`ReplicaRouter` sends reads of inspection
+models made by GET, HEAD and OPTIONS requests to inspection viewsets to the ``replica``
+alias; every write goes to ``default``. A replica lags the primary, so reads stay on the
+primary when:
+
+- the request itself wrote something, from that write onwards;
+- the client wrote within ``DATABASE_REPLICA_PIN_SECONDS``: any unsafe request, or a
+  safe one that wrote, gets a short-lived cookie that pins the client's reads to the primary;
+- the primary is inside a transaction, so locked and just-written rows are read consistently;
+- code runs inside :func:`primary`, which the versioned caches use to build documents, since
+  a document built from lagging rows would be cached under the new version;
+- the view opts out with ``read_from_replica = False``.
+
+A streaming response runs its queries while the server iterates it, after the middleware has
+returned, so the middleware keeps the request's routing in place around each chunk.
+
+Reads outside a request (management commands, workers) always use the primary.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterable, Iterator
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import FileResponse
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.views import APIView
+
+REPLICA_DB_ALIAS = 'replica'
+PIN_COOKIE = 'db_primary_pin'
+
+
+@dataclass
+class RequestRouting:
+    request: object
+    pinned: bool
+    wrote: bool = False
+
+    def reads_from_replica(self) -> bool:
+        if self.pinned or self.wrote or self.request.method not in SAFE_METHODS:  # type: ignore[attr-defined]
+            return False
+        match = getattr(self.request, 'resolver_match', None)
+        cls = getattr(match.func, 'cls', None) if match else None
+        return (
+            cls is not None
+            and issubclass(cls, APIView)
+            and cls.__module__.startswith('inspections.')
+            and getattr(cls, 'read_from_replica', True)
+        )
+
+
+_routing: ContextVar[RequestRouting | None] = ContextVar('replica_request_routing', default=None)
+_primary: ContextVar[bool] = ContextVar('replica_force_primary', default=False)
+
+
+@contextmanager
+def primary() -> Iterator[None]:
+    """Read from the primary inside this block, whatever the request."""
+    token = _primary.set(True)
+    try:
+        yield
+    finally:
+        _primary.reset(token)
+
+
+class ReplicaRouter:
+    """Route the reads described in the module docstring to the replica; writes always go to the primary."""
+
+    def db_for_read(self, model, **hints):
+        routing = _routing.get()
+        if (
+            routing is None
+            or _primary.get()
+            or model._meta.app_label != 'inspections'
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+            or not routing.reads_from_replica()
+        ):
+            return DEFAULT_DB_ALIAS
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        routing = _routing.get()
+        if routing is not None:
+            routing.wrote = True
+        # Explicit, or Django would save an instance back to the database it was read from.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same rows.
+        if {obj1._state.db, obj2._state.db} <= {DEFAULT_DB_ALIAS, REPLICA_DB_ALIAS}:
+            return True
+        return None
+
+
+class ReplicaMiddleware:
+    """Track each request's writes for :class:`ReplicaRouter` and pin recent writers to the primary."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if REPLICA_DB_ALIAS not in settings.DATABASES:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        routing = RequestRouting(request, pinned=PIN_COOKIE in request.COOKIES)
+        token = _routing.set(routing)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+        return self.finish(request, response, routing)
+
+    async def __acall__(self, request):
+        routing = RequestRouting(request, pinned=PIN_COOKIE in request.COOKIES)
+        token = _routing.set(routing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _routing.reset(token)
+        return self.finish(request, response, routing)
+
+    def finish(self, request, response, routing: RequestRouting):
+        if response.streaming and not isinstance(response, FileResponse):
+            # FileResponse reads a file, not the database, and would lose its wsgi.file_wrapper path.
+            if response.is_async:
+                response.streaming_content = _aroute_chunks(response.streaming_content, routing)
+            else:
+                response.streaming_content = _route_chunks(response.streaming_content, routing)
+        if routing.wrote or request.method not in SAFE_METHODS:
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=settings.DATABASE_REPLICA_PIN_SECONDS, httponly=True, samesite='Lax'
+            )
+        return response
+
+
+def _route_chunks(content: Iterable[bytes], routing: RequestRouting) -> Iterator[bytes]:
+    iterator = iter(content)
+    while True:
+        token = _routing.set(routing)
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            _routing.reset(token)
+        yield chunk
+
+
+async def _aroute_chunks(content: AsyncIterator[bytes], routing: RequestRouting) -> AsyncIterator[bytes]:
+    iterator = aiter(content)
+    while True:
+        token = _routing.set(routing)
+        try:
+            chunk = await anext(iterator)
+        except StopAsyncIteration:
+            return
+        finally:
+            _routing.reset(token)
+        yield chunk
@@ -0,0 +1,367 @@
+"""Per-tank HTML and PDF reports rendered on a worker process pool.
+
+Artifacts are content addressed: the file name is a hash of the tank's ``updated_at``
+and the latest ``updated_at`` and row count of each child table, so an unchanged tank
+is never rendered twice and a changed tank can never be served a stale report.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+import textwrap
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from . import conditional, models, serializers, summaries
+
+logger = logging.getLogger(__name__)
+
+# Bump when the report layout changes so every artifact is rendered afresh.
+LAYOUT_VERSION = 1
+
+CONTENT_TYPES = {
+    'html': 'text/html; charset=utf-8',
+    'pdf': 'application/pdf',
+}
+
+
+def artifact_root() -> Path:
+    return Path(getattr(settings, 'REPORT_ARTIFACT_ROOT', Path(settings.BASE_DIR) / 'report_artifacts'))
+
+
+def artifact_path(key: str, report_format: str) -> Path:
+    return artifact_root() / key[:2] / f'{key}.{report_format}'
+
+
+def content_key(tank: models.Tank, report_format: str) -> str:
+    """Hash of everything a report depends on; ``tank`` must come from :func:`conditional.with_content_versions`."""
+    parts: list[Any] = [LAYOUT_VERSION, report_format, *conditional.content_parts(tank)]
+    return hashlib.sha256(json.dumps(parts).encode('utf-8')).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Document model shared by the HTML and PDF renderers
+
+
+@dataclass
+class Section:
+    title: str
+    columns: list[str] = field(default_factory=list)
+    rows: list[list[str]] = field(default_factory=list)
+    empty_message: str = 'No records.'
+
+
+def _yes(value: Any) -> str:
+    return 'Yes' if value else 'No'
+
+
+def _client(data: dict[str, Any]) -> str:
+    return summaries.format_value(data.get('client_name') or data.get('owner'))
+
+
+def build_document(data: dict[str, Any]) -> dict[str, Any]:
+    """Arrange serialized tank detail data into the sections of the Workflow 4 report."""
+    value = summaries.format_value
+
+    def pairs(title: str, items: list[tuple[str, str]]) -> Section:
+        return Section(title, rows=[[label, value(data.get(key))] for key, label in items])
+
+    annotations = data.get('construction_annotations') or {}
+    standard = annotations.get('standard') or {}
+    construction = Section('Construction overview', ['Component', 'Value', 'Tag', 'VE', 'UT', 'Comment'])
+    for key, label in summaries.CONSTRUCTION_FIELDS:
+        entry = standard.get(key) or {}
+        construction.rows.append([
+            label, value(data.get(key)), (entry.get('color') or '').title(),
+            _yes(entry.get('ve')), _yes(entry.get('ut')), entry.get('comment') or '',
+        ])
+    for entry in annotations.get('additional') or []:
+        construction.rows.append([
+            entry.get('label', ''), value(entry.get('value')), (entry.get('color') or '').title(),
+            _yes(entry.get('ve')), _yes(entry.get('ut')), entry.get('comment') or '',
+        ])
+
+    tags = Section('Colour tag summary', ['Tag', 'Component', 'Value'], empty_message='No items tagged.')
+    for color, entries in summaries.bucket_construction_tags(data).items():
+        tags.rows.extend([color.title(), entry['label'], entry['value']] for entry in entries)
+
+    sections = [
+        Section('Cover page', rows=[
+            ['Inspection type', value(data.get('inspection_type'))],
+            ['Client name', _client(data)],
+            ['Location', f"{value(data.get('city'))}, {value(data.get('state'))}"],
+            ['Address', value(data.get('exact_address'))],
+            ['PO number', value(data.get('po_number'))],
+        ]),
+        pairs('Executive summary', [
+            ('manufacturer', 'Manufacturer'),
+            ('diameter_ft', 'Diameter (ft)'),
+            ('height_ft', 'Height (ft)'),
+            ('shell_weld_type', 'Shell weld type'),
+            ('bottom_weld', 'Bottom weld type'),
+            ('bottom_type', 'Bottom type'),
+            ('fixed_roof_type', 'Roof type'),
+            ('floating_roof_type', 'Floating roof type'),
+            ('product_stored', 'Product stored'),
+        ]),
+        pairs('Inspection timeline', [
+            ('inspection_date', 'Inspection date'),
+            ('construction_date', 'Construction date'),
+            ('external_inspection_date', 'External inspection date'),
+            ('internal_inspection_date', 'Internal inspection date'),
+            ('ut_inspection_date', 'UT inspection date'),
+            ('next_inspection_due_date', 'Next inspection due date'),
+        ]),
+        construction,
+        tags,
+        Section('Shell settlement surveys', ['Recorded', 'Stations', 'Readings (in)'], [
+            [
+                value(survey.get('created_at'))[:10],
+                value(survey.get('station_count')),
+                '; '.join(f"{reading['station_label']}: {value(reading['measurement_in'])}" for reading in survey['readings']),
+            ]
+            for survey in data.get('shell_settlement_surveys', [])
+        ]),
+        Section('UT results', ['Category', 'Location', 'Course', 'Thickness (in)', 'Notes'], [
+            [value(row['category']).title(), value(row['location']), value(row['course']),
+             value(row['thickness_in']), row.get('notes') or '']
+            for row in data.get('ut_results', [])
+        ]),
+        Section('Edge settlement', ['Present', 'Result'], [
+            [_yes(row['present']), row.get('result') or ''] for row in data.get('edge_settlement_checks', [])
+        ]),
+        Section('Column plumbness', ['Column', 'Plumbness (in/ft)', 'Direction'], [
+            [value(row['column_id']), value(row['plumbness_in_per_ft']), row.get('direction') or '']
+            for row in data.get('column_plumbness_checks', [])
+        ]),
+        Section('Visual findings', ['Area', 'Finding', 'Action'], [
+            [value(row['area']).replace('_', ' ').title(), value(row['finding']), value(row['comment_type']).title()]
+            for row in data.get('visual_findings', [])
+        ]),
+        Section('Other NDE', ['Type', 'Result'], [
+            [value(row['nde_type']), value(row['result'])] for row in data.get('other_nde', [])
+        ]),
+        Section('Inspection goals', ['Goal', 'Methods'], [
+            [value(row.get('goal_key_display') or row['goal_key']), ', '.join(row.get('methods') or []) or 'N/A']
+            for row in data.get('goal_results', [])
+        ]),
+    ]
+    return {
+        'title': data.get('tank_name', ''),
+        'subtitle': f"{value(data.get('inspection_type'))} — {_client(data)}",
+        'as_of': value(data.get('updated_at')),
+        'sections': sections,
+    }
+
+
+def render_html(document: dict[str, Any]) -> bytes:
+    return render_to_string('inspections/report.html', document).encode('utf-8')
+
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+MARGIN = 54
+FONT_SIZE = 9
+LEADING = 12
+WRAP_COLUMNS = 110
+
+
+def _pdf_text(text: str) -> str:
+    text = text.encode('latin-1', 'replace').decode('latin-1')
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def render_pdf(document: dict[str, Any]) -> bytes:
+    """Lay the document out as a plain Helvetica PDF with no third-party dependency."""
+    lines: list[tuple[str, str]] = [('F2', document['title']), ('F1', document['subtitle']),
+                                    ('F1', f"Data as of {document['as_of']}"), ('F1', '')]
+    for section in document['sections']:
+        lines.append(('F2', section.title))
+        if section.columns:
+            lines.append(('F2', ' | '.join(section.columns)))
+        if not section.rows:
+            lines.append(('F1', section.empty_message))
+        for row in section.rows:
+            text = ' | '.join(row) if section.columns else f'{row[0]}: {row[1]}'
+            for index, line in enumerate(textwrap.wrap(text, WRAP_COLUMNS) or ['']):
+                lines.append(('F1', ('    ' if index else '') + line))
+        lines.append(('F1', ''))
+
+    per_page = (PAGE_HEIGHT - 2 * MARGIN) // LEADING
+    pages = [lines[start:start + per_page] for start in range(0, len(lines), per_page)] or [[]]
+
+    objects: list[bytes] = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'',  # page tree, filled in once page object numbers are known
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>',
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>',
+    ]
+    page_numbers = []
+    for number, page in enumerate(pages, start=1):
+        commands = [f'BT {LEADING} TL {MARGIN} {PAGE_HEIGHT - MARGIN} Td']
+        for font, text in page:
+            commands.append(f'/{font} {FONT_SIZE} Tf ({_pdf_text(text)}) Tj T*')
+        commands.append('ET')
+        commands.append(f'BT /F1 8 Tf {PAGE_WIDTH - MARGIN - 40} {MARGIN // 2} Td (Page {number} of {len(pages)}) Tj ET')
+        stream = '\n'.join(commands).encode('latin-1')
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+        objects.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R '
+            b'/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> >>' % (PAGE_WIDTH, PAGE_HEIGHT, len(objects))
+        )
+        page_numbers.append(len(objects))
+    kids = ' '.join(f'{number} 0 R' for number in page_numbers)
+    objects[1] = f'<< /Type /Pages /Kids [{kids}] /Count {len(page_numbers)} >>'.encode('ascii')
+
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref = len(output)
+    output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    output += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    output += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return bytes(output)
+
+
+RENDERERS = {'html': render_html, 'pdf': render_pdf}
+
+
+# ---------------------------------------------------------------------------
+# Rendering (runs inside worker processes)
+
+
+def render_tank_report(tank_id: Any, report_format: str) -> str:
+    """Render one report unless an artifact for the tank's current content already exists."""
+    queryset = models.Tank.objects.filter(pk=tank_id)
+    tank = conditional.with_content_versions(queryset).get()
+    key = content_key(tank, report_format)
+    path = artifact_path(key, report_format)
+    if path.exists():
+        return key
+    tank = queryset.prefetch_related(*serializers.TankDetailSerializer.prefetch_fields).get()
+    content = RENDERERS[report_format](build_document(serializers.TankDetailSerializer(tank).data))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle, temporary = tempfile.mkstemp(dir=path.parent, suffix='.part')
+    with os.fdopen(handle, 'wb') as stream:
+        stream.write(content)
+    os.replace(temporary, path)
+    return key
+
+
+def _init_worker() -> None:
+    import django
+
+    django.setup()
+
+
+def _render_job(tank_id: str, report_format: str, item_id: int | None) -> str | None:
+    items = models.ReportBatchItem.objects.filter(pk=item_id)
+    try:
+        if item_id is not None:
+            items.update(status=models.ReportBatchItem.RUNNING, updated_at=timezone.now())
+        key = render_tank_report(tank_id, report_format)
+        if item_id is not None:
+            items.update(status=models.ReportBatchItem.DONE, content_key=key, updated_at=timezone.now())
+        return key
+    except Exception as exc:
+        logger.exception('Rendering the %s report for tank %s failed.', report_format, tank_id)
+        if item_id is not None:
+            items.update(status=models.ReportBatchItem.FAILED, error=str(exc)[:1000], updated_at=timezone.now())
+        return None
+    finally:
+        connections.close_all()
+
+
+# ---------------------------------------------------------------------------
+# Scheduling (runs in the web process)
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_in_flight: set[tuple[str, str]] = set()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=getattr(settings, 'REPORT_WORKERS', 2),
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+            )
+        return _executor
+
+
+def _submit(jobs: list[tuple[str, str, int | None]]) -> None:
+    global _executor
+    for tank_id, report_format, item_id in jobs:
+        try:
+            future = _get_executor().submit(_render_job, tank_id, report_format, item_id)
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); replace the pool and retry once.
+            with _executor_lock:
+                _executor = None
+            future = _get_executor().submit(_render_job, tank_id, report_format, item_id)
+        if item_id is None:
+            future.add_done_callback(lambda _future, job=(tank_id, report_format): _finish(job))
+
+
+def _finish(job: tuple[str, str]) -> None:
+    with _executor_lock:
+        _in_flight.discard(job)
+
+
+def _submit_single(job: tuple[str, str]) -> None:
+    # Claimed only once the transaction has committed, so a rollback never leaves the job blocked.
+    with _executor_lock:
+        if job in _in_flight:
+            return
+        _in_flight.add(job)
+    try:
+        _submit([(job[0], job[1], None)])
+    except BaseException:
+        _finish(job)
+        raise
+
+
+def schedule_render(tank_id: Any, report_format: str) -> bool:
+    """Queue a single report after the current transaction commits; False if already queued."""
+    job = (str(tank_id), report_format)
+    with _executor_lock:
+        if job in _in_flight:
+            return False
+    transaction.on_commit(lambda: _submit_single(job))
+    return True
+
+
+def schedule_batch(batch: models.ReportBatch, items: list[models.ReportBatchItem]) -> None:
+    jobs = [(str(item.tank_id), batch.report_format, item.pk) for item in items]
+    transaction.on_commit(lambda: _submit(jobs))
+
+
+def requeue_stalled(batch: models.ReportBatch) -> int:
+    """Resubmit items left pending or running by a web process that has since exited."""
+    cutoff = timezone.now() - timedelta(seconds=getattr(settings, 'REPORT_STALL_SECONDS', 600))
+    unfinished = [models.ReportBatchItem.PENDING, models.ReportBatchItem.RUNNING]
+    stalled = list(batch.items.filter(status__in=unfinished, updated_at__lt=cutoff))
+    if stalled:
+        models.ReportBatchItem.objects.filter(pk__in=[item.pk for item in stalled]).update(
+            status=models.ReportBatchItem.PENDING, updated_at=timezone.now()
+        )
+        schedule_batch(batch, stalled)
+    return len(stalled)
@@ -0,0 +1,318 @@
+"""Full-text search over inspection narrative: findings, UT notes, NDE and edge results, goal answers.
+
+Each searchable record has one :class:`~inspections.models.SearchDocument` row holding its text.
+The database keeps the text index in step with that table: a generated ``tsvector`` column with
+a GIN index on Postgres, an FTS5 table fed by triggers on SQLite. Documents are rewritten as
+records are saved or deleted (signals for single rows, explicit calls after bulk inserts).
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+from django.db import connections
+from django.db.models import Count, F, Model, Q, QuerySet, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.fields import BooleanField, FloatField
+from django.db.models.signals import post_delete, post_save
+
+from . import models
+
+SEARCH_CONFIG = 'english'
+FTS_TABLE = 'inspections_searchdocument_fts'
+# Title matches (area, location, NDE type, goal) outweigh matches in the narrative itself.
+SQLITE_WEIGHTS = (4.0, 1.0)
+MAX_QUERY_LENGTH = 200
+SNIPPET_LENGTH = 160
+INDEX_CHUNK_SIZE = 1000
+
+_TOKEN = re.compile(r'(-?)"([^"]*)"|(\S+)')
+
+
+def _label(choices: Iterable[tuple[str, str]], value: str) -> str:
+    return dict(choices).get(value, value or '')
+
+
+def _text(*parts: Any) -> str:
+    return '\n'.join(str(part).strip() for part in parts if isinstance(part, str) and part.strip())
+
+
+def _goal_text(result: models.GoalResult) -> str:
+    custom = []
+    for item in result.custom_responses or []:
+        if isinstance(item, dict):
+            custom.append(_text(item.get('prompt'), item.get('answer')))
+    return _text(*(result.standard_responses or {}).values(), *custom)
+
+
+@dataclass(frozen=True)
+class SearchSource:
+    name: str
+    model: type[Model]
+    title: Callable[[Any], str]
+    body: Callable[[Any], str]
+
+
+SOURCES: dict[str, SearchSource] = {
+    source.name: source
+    for source in (
+        SearchSource(
+            'visual-findings',
+            models.VisualFinding,
+            lambda row: _text(_label(models.VisualFinding.AREA_CHOICES, row.area),
+                              _label(models.VisualFinding.COMMENT_CHOICES, row.comment_type)).replace('\n', ' · '),
+            lambda row: _text(row.finding),
+        ),
+        SearchSource(
+            'ut-results',
+            models.UTResult,
+            lambda row: _text(_label(models.UTResult.CATEGORY_CHOICES, row.category), row.location).replace('\n', ' '),
+            lambda row: _text(row.notes),
+        ),
+        SearchSource('other-nde', models.OtherNDE, lambda row: row.nde_type, lambda row: _text(row.result)),
+        SearchSource(
+            'edge-settlement-checks',
+            models.EdgeSettlementCheck,
+            lambda row: 'Edge settlement',
+            lambda row: _text(row.result),
+        ),
+        SearchSource(
+            'goal-results', models.GoalResult, lambda row: _label(models.GoalKey.choices, row.goal_key), _goal_text
+        ),
+    )
+}
+SOURCE_BY_MODEL: dict[type[Model], SearchSource] = {source.model: source for source in SOURCES.values()}
+
+
+# ---------------------------------------------------------------------------
+# Indexing
+
+def index_instances(instances: Iterable[Model]) -> None:
+    """Write (or drop, when they have no text) the search documents of saved records."""
+    by_source: dict[SearchSource, list[Model]] = {}
+    for instance in instances:
+        source = SOURCE_BY_MODEL.get(type(instance))
+        if source is not None:
+            by_source.setdefault(source, []).append(instance)
+    for source, rows in by_source.items():
+        documents, empty = [], []
+        for row in rows:
+            body = source.body(row)
+            if body:
+                documents.append(models.SearchDocument(
+                    resource=source.name,
+                    object_id=str(row.pk),
+                    tank_id=row.tank_id,
+                    title=source.title(row)[:255],
+                    body=body,
+                    updated_at=row.updated_at,
+                ))
+            else:
+                empty.append(str(row.pk))
+        if documents:
+            models.SearchDocument.objects.bulk_create(
+                documents,
+                batch_size=INDEX_CHUNK_SIZE,
+                update_conflicts=True,
+                unique_fields=['resource', 'object_id'],
+                update_fields=['tank', 'title', 'body', 'updated_at'],
+            )
+        if empty:
+            models.SearchDocument.objects.filter(resource=source.name, object_id__in=empty).delete()
+
+
+def index_records(model: type[Model], pks: Iterable[Any]) -> None:
+    """Re-read records by primary key and index them, e.g. after a ``bulk_create``."""
+    pks = list(pks)
+    for start in range(0, len(pks), INDEX_CHUNK_SIZE):
+        index_instances(model._default_manager.filter(pk__in=pks[start:start + INDEX_CHUNK_SIZE]))
+
+
+def remove(model: type[Model], pks: Iterable[Any]) -> None:
+    source = SOURCE_BY_MODEL.get(model)
+    if source is not None:
+        models.SearchDocument.objects.filter(resource=source.name, object_id__in=[str(pk) for pk in pks]).delete()
+
+
+def rebuild(sources: Iterable[SearchSource] | None = None) -> dict[str, int]:
+    """Index every record of ``sources`` (default all) from scratch; returns documents per resource."""
+    counts = {}
+    for source in sources or SOURCES.values():
+        models.SearchDocument.objects.filter(resource=source.name).delete()
+        queryset = source.model._default_manager.order_by('pk')
+        batch: list[Model] = []
+        for row in queryset.iterator(chunk_size=INDEX_CHUNK_SIZE):
+            batch.append(row)
+            if len(batch) >= INDEX_CHUNK_SIZE:
+                index_instances(batch)
+                batch = []
+        index_instances(batch)
+        counts[source.name] = models.SearchDocument.objects.filter(resource=source.name).count()
+    return counts
+
+
+def _saved(sender, instance, raw=False, **kwargs) -> None:
+    if not raw:
+        index_instances([instance])
+
+
+def _deleted(sender, instance, origin=None, **kwargs) -> None:
+    # Documents of a deleted tank's records go with the tank through their foreign key.
+    if isinstance(origin, models.Tank) or (isinstance(origin, QuerySet) and origin.model is models.Tank):
+        return
+    remove(sender, [instance.pk])
+
+
+def connect_signals() -> None:
+    for model in SOURCE_BY_MODEL:
+        post_save.connect(_saved, sender=model, dispatch_uid=f'search-index-{model.__name__}')
+        post_delete.connect(_deleted, sender=model, dispatch_uid=f'search-unindex-{model.__name__}')
+
+
+# ---------------------------------------------------------------------------
+# Querying
+
+@dataclass(frozen=True)
+class SearchQuery:
+    """A parsed query: terms and quoted phrases, ``or`` between alternatives, ``-`` to exclude."""
+
+    raw: str
+    groups: tuple[tuple[str, ...], ...]
+    excluded: tuple[str, ...]
+
+    @classmethod
+    def parse(cls, raw: str) -> SearchQuery:
+        groups: list[list[str]] = [[]]
+        excluded: list[str] = []
+        for negated, phrase, word in _TOKEN.findall(raw[:MAX_QUERY_LENGTH]):
+            if word.lower() == 'or' and not phrase:
+                if groups[-1]:
+                    groups.append([])
+                continue
+            if word.startswith('-'):
+                negated, word = '-', word[1:]
+            text = ' '.join((phrase or word).split())
+            if text:
+                (excluded if negated else groups[-1]).append(text)
+        return cls(raw=raw, groups=tuple(tuple(group) for group in groups if group), excluded=tuple(excluded))
+
+    def __bool__(self) -> bool:
+        return bool(self.groups)
+
+    def terms(self) -> list[str]:
+        return [term for group in self.groups for term in group]
+
+    def fts5(self) -> str:
+        """The query in FTS5 syntax; every term is quoted so punctuation is never an operator."""
+        def quote(text: str) -> str:
+            return '"' + text.replace('"', '""') + '"'
+
+        expression = ' OR '.join(f"({' '.join(quote(term) for term in group)})" for group in self.groups)
+        return ''.join([f'({expression})', *(f' NOT {quote(term)}' for term in self.excluded)])
+
+    def websearch(self) -> str:
+        """The query in ``websearch_to_tsquery`` syntax."""
+        def quote(text: str) -> str:
+            return f'"{text}"' if ' ' in text else text
+
+        expression = ' or '.join(' '.join(quote(term) for term in group) for group in self.groups)
+        return ' '.join([expression, *(f'-{quote(term)}' for term in self.excluded)])
+
+
+def _matching_sqlite(queryset: QuerySet, query: SearchQuery) -> QuerySet:
+    # FTS5 ranking functions only work against the virtual table itself, so join it in.
+    weights = ', '.join(str(weight) for weight in SQLITE_WEIGHTS)
+    document_table = models.SearchDocument._meta.db_table
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[f'{FTS_TABLE}.rowid = {document_table}.id', f'{FTS_TABLE} MATCH %s'],
+        params=[query.fts5()],
+        select={'rank': f'-bm25({FTS_TABLE}, {weights})'},
+    )
+
+
+def _matching_postgresql(queryset: QuerySet, query: SearchQuery) -> QuerySet:
+    tsquery = f"websearch_to_tsquery('{SEARCH_CONFIG}', %s)"
+    return queryset.filter(
+        RawSQL(f'search_vector @@ {tsquery}', [query.websearch()], output_field=BooleanField())
+    ).annotate(rank=RawSQL(f'ts_rank(search_vector, {tsquery})', [query.websearch()], output_field=FloatField()))
+
+
+def _matching_unindexed(queryset: QuerySet, query: SearchQuery) -> QuerySet:
+    # Other databases have no text index here: substring matches, without stemming, all ranked alike.
+    def contains(term: str) -> Q:
+        return Q(title__icontains=term) | Q(body__icontains=term)
+
+    condition = Q()
+    for group in query.groups:
+        group_condition = Q()
+        for term in group:
+            group_condition &= contains(term)
+        condition |= group_condition
+    for term in query.excluded:
+        condition &= ~contains(term)
+    return queryset.filter(condition).annotate(rank=Value(0.0, output_field=FloatField()))
+
+
+MATCHERS: dict[str, Callable[[QuerySet, SearchQuery], QuerySet]] = {
+    'sqlite': _matching_sqlite,
+    'postgresql': _matching_postgresql,
+}
+
+
+def matching(query: SearchQuery, queryset: QuerySet | None = None) -> QuerySet:
+    """Documents matching ``query`` with a ``rank`` (higher is better), through the database's index.
+
+    Databases without a matcher fall back to unindexed substring matching.
+    """
+    queryset = models.SearchDocument.objects.all() if queryset is None else queryset
+    matcher = MATCHERS.get(connections[queryset.db].vendor, _matching_unindexed)
+    return matcher(queryset, query)
+
+
+def ranked(queryset: QuerySet) -> QuerySet:
+    return queryset.select_related('tank').only(
+        'resource', 'object_id', 'title', 'body', 'updated_at', 'tank__tank_name', 'tank__owner'
+    ).order_by(F('rank').desc(), '-updated_at', '-id')
+
+
+def tank_facets(queryset: QuerySet, limit: int) -> list[dict[str, Any]]:
+    rows = queryset.values('tank_id', 'tank__tank_name').annotate(count=Count('id'))
+    rows = rows.order_by('-count', 'tank__tank_name')
+    return [
+        {'tank_id': row['tank_id'], 'tank_name': row['tank__tank_name'], 'count': row['count']}
+        for row in rows[:limit]
+    ]
+
+
+def resource_facets(queryset: QuerySet) -> list[dict[str, Any]]:
+    rows = queryset.values('resource').annotate(count=Count('id')).order_by('-count', 'resource')
+    return [{'resource': row['resource'], 'count': row['count']} for row in rows]
+
+
+def snippet(text: str, terms: Iterable[str]) -> dict[str, Any]:
+    """A window of ``text`` around the first matched term, with character ranges of each match.
+
+    Matching is a case-insensitive prefix match on word starts, so stemmed hits such as
+    "pitted" for "pitting" fall back to the start of the text without highlights.
+    """
+    words = [word for term in terms for word in term.split()]
+    if not words:
+        return {'text': text[:SNIPPET_LENGTH], 'highlights': []}
+    pattern = re.compile(r'\b(?:' + '|'.join(re.escape(word) for word in words) + r')\w*', re.IGNORECASE)
+    hits = list(pattern.finditer(text))
+    start = 0
+    if hits and hits[0].start() > SNIPPET_LENGTH // 3:
+        start = text.rfind(' ', 0, hits[0].start() - SNIPPET_LENGTH // 3) + 1
+    end = min(len(text), start + SNIPPET_LENGTH)
+    if end < len(text):
+        end = max(text.rfind(' ', start, end), start + SNIPPET_LENGTH // 2)
+    prefix = '…' if start else ''
+    window = prefix + text[start:end] + ('…' if end < len(text) else '')
+    highlights = [
+        [hit.start() - start + len(prefix), hit.end() - start + len(prefix)]
+        for hit in hits
+        if hit.start() >= start and hit.end() <= end
+    ]
+    return {'text': window, 'highlights': highlights}
@@ -1,14 +1,67 @@
 """Serializers for inspection API."""
 from __future__ import annotations
 
+import math
 from typing import Any
 
+from django.db import transaction
+from django.urls import reverse
 from rest_framework import serializers
 
-from . import models
-
-
-class TankSerializer(serializers.ModelSerializer):
+from . import models, perf, search
+
+
+def parse_field_list(value: str | None) -> set[str] | None:
+    """Parse a comma-separated ``?fields=`` / ``?exclude=`` value."""
+    if not value:
+        return None
+    names = {name.strip() for name in value.split(',')}
+    names.discard('')
+    return names or None
+
+
+def prune_fields(data: dict[str, Any], fields: set[str] | None, exclude: set[str] | None) -> dict[str, Any]:
+    """Apply a sparse fieldset to already-serialized data."""
+    if fields is None and not exclude:
+        return data
+    return {
+        key: value
+        for key, value in data.items()
+        if (fields is None or key in fields) and not (exclude and key in exclude)
+    }
+
+
+class SparseFieldsetMixin:
+    """Drops fields not named in ``context['fields']`` or named in ``context['exclude']``.
+
+    Only the top-level serializer is pruned; nested serializers keep their full shape.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = self.context.get('fields')  # type: ignore[attr-defined]
+        exclude = self.context.get('exclude')  # type: ignore[attr-defined]
+        if fields is None and not exclude:
+            return
+        for name in list(self.fields):  # type: ignore[attr-defined]
+            if (fields is not None and name not in fields) or (exclude and name in exclude):
+                self.fields.pop(name)  # type: ignore[attr-defined]
+
+    def get_model_columns(self) -> set[str]:
+        """Return the concrete model columns the remaining fields read from."""
+        opts = self.Meta.model._meta  # type: ignore[attr-defined]
+        concrete = {field.name for field in opts.concrete_fields}
+        columns = {opts.pk.name}
+        for field in self.fields.values():  # type: ignore[attr-defined]
+            source = field.source.split('.')[0]
+            if source.startswith('get_') and source.endswith('_display'):
+                source = source[len('get_'):-len('_display')]
+            if source in concrete:
+                columns.add(source)
+        return columns
+
+
+class TankSerializer(perf.TimedSerializerMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     def validate_construction_annotations(self, value: Any):
         if value in (None, ''):
             return {'standard': {}, 'additional': []}
@@ -51,70 +104,236 @@ class TankSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = models.Tank
-        fields = '__all__'
+        exclude = models.Tank.NAME_KEY_FIELDS
         read_only_fields = ('tank_unique_id', 'created_at', 'updated_at')
 
 
-class ShellSettlementSurveySerializer(serializers.ModelSerializer):
-    class Meta:
-        model = models.ShellSettlementSurvey
-        fields = '__all__'
+class TankListSerializer(TankSerializer):
+    """Compact tank representation for registry listings."""
 
-    def validate_readings(self, value: Any):
-        if not isinstance(value, list):
+    class Meta(TankSerializer.Meta):
+        fields = (
+            'tank_unique_id',
+            'tank_name',
+            'owner',
+            'client_name',
+            'facility_type',
+            'city',
+            'state',
+            'design_standard',
+            'product_stored',
+            'next_inspection_due_date',
+            'updated_at',
+        )
+        exclude = None
+
+
+class SettlementReadingsField(serializers.Field):
+    """Presents the normalized station rows as the ``readings`` list of the original JSON API.
+
+    Reads from the (prefetched) ``station_readings`` relation and builds plain dicts rather
+    than running a nested serializer per station.
+    """
+
+    LABEL_MAX_LENGTH = models.SettlementReading._meta.get_field('station_label').max_length
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('source', 'station_readings')
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return [
+            {'station_label': reading.station_label, 'measurement_in': reading.measurement_in}
+            for reading in value.all()
+        ]
+
+    def to_internal_value(self, data: Any):
+        if not isinstance(data, list):
             raise serializers.ValidationError('Readings must be a list of station measurements.')
-        for item in value:
+        readings = []
+        for item in data:
             if not isinstance(item, dict):
                 raise serializers.ValidationError('Each reading must be an object.')
             if 'station_label' not in item or 'measurement_in' not in item:
                 raise serializers.ValidationError('Each reading must include station_label and measurement_in.')
-        return value
+            label = str(item['station_label'])
+            if len(label) > self.LABEL_MAX_LENGTH:
+                raise serializers.ValidationError(
+                    f'Station labels may have no more than {self.LABEL_MAX_LENGTH} characters.'
+                )
+            measurement = item['measurement_in']
+            if measurement is not None:
+                try:
+                    measurement = float(measurement)
+                except (TypeError, ValueError):
+                    raise serializers.ValidationError('Each measurement_in must be a number.')
+                if not math.isfinite(measurement):
+                    raise serializers.ValidationError('Each measurement_in must be a number.')
+            readings.append({'station_label': label, 'measurement_in': measurement})
+        return readings
+
+
+class ShellSettlementSurveySerializer(perf.TimedSerializerMixin, SparseFieldsetMixin, serializers.ModelSerializer):
+    readings = SettlementReadingsField()
 
+    class Meta:
+        model = models.ShellSettlementSurvey
+        fields = '__all__'
+
+    def create(self, validated_data: dict[str, Any]):
+        readings = validated_data.pop('station_readings')
+        with transaction.atomic():
+            survey = super().create(validated_data)
+            self._write_readings(survey, readings)
+        return survey
+
+    def update(self, instance, validated_data: dict[str, Any]):
+        readings = validated_data.pop('station_readings', None)
+        with transaction.atomic():
+            survey = super().update(instance, validated_data)
+            if readings is not None:
+                survey.station_readings.all().delete()
+                self._write_readings(survey, readings)
+            elif 'tank' in validated_data:
+                survey.station_readings.update(tank=survey.tank)
+        return survey
+
+    @staticmethod
+    def _write_readings(survey: models.ShellSettlementSurvey, readings: list[dict[str, Any]]) -> None:
+        models.SettlementReading.objects.bulk_create(
+            models.SettlementReading(survey=survey, tank_id=survey.tank_id, position=position, **reading)
+            for position, reading in enumerate(readings)
+        )
+        # Drop any prefetched rows so the response reflects what was just written.
+        getattr(survey, '_prefetched_objects_cache', {}).pop('station_readings', None)
+
+
+class SettlementReadingSerializer(perf.TimedSerializerMixin, SparseFieldsetMixin, serializers.ModelSerializer):
+    class Meta:
+        model = models.SettlementReading
+        fields = '__all__'
+
+
+class SettlementAnalysisSerializer(perf.TimedSerializerMixin, SparseFieldsetMixin, serializers.ModelSerializer):
+    tank_name = serializers.CharField(source='tank.tank_name', read_only=True)
+
+    class Meta:
+        model = models.SettlementAnalysis
+        fields = '__all__'
+
+
+class UTResultSerializer(perf.TimedSerializerMixin, SparseFieldsetMixin, serializers.ModelSerializer):
+    SHELL_CATEGORY = models.UTResult.CATEGORY_CHOICES[3][0]
+    SHELL_COURSE_MESSAGE = 'Shell UT results must include a course number.'
 
-class UTResultSerializer(serializers.ModelSerializer):
     class Meta:
         model = models.UTResult
         fields = '__all__'
+        # ``PositiveIntegerField`` only has a database check; reject negatives before the insert.
+        extra_kwargs = {'course': {'min_value': 0}}
+
+    @classmethod
+    def missing_shell_course(cls, rows: list[dict[str, Any]]) -> list[int]:
+        """Return the positions of rows that are shell readings without a course."""
+        return [
+            index
+            for index, row in enumerate(rows)
+            if row.get('category') == cls.SHELL_CATEGORY and row.get('course') is None
+        ]
 
     def validate(self, attrs: dict[str, Any]):
-        category = attrs.get('category')
-        course = attrs.get('course')
-        if category == models.UTResult.CATEGORY_CHOICES[3][0] and course is None:
-            raise serializers.ValidationError({'course': 'Shell UT results must include a course number.'})
+        if self.missing_shell_course([attrs]):
+            raise serializers.ValidationError({'course': self.SHELL_COURSE_MESSAGE})
         return super().validate(attrs)
 
 
-class EdgeSettlementCheckSerializer(serializers.ModelSerializer):
+class EdgeSettlementCheckSerializer(perf.TimedSerializerMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = models.EdgeSettlementCheck
         fields = '__all__'
 
 
-class ColumnPlumbnessCheckSerializer(serializers.ModelSerializer):
+class ColumnPlumbnessCheckSerializer(perf.TimedSerializerMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = models.ColumnPlumbnessCheck
         fields = '__all__'
 
 
-class VisualFindingSerializer(serializers.ModelSerializer):
+class VisualFindingSerializer(perf.TimedSerializerMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = models.VisualFinding
         fields = '__all__'
 
 
-class OtherNDESerializer(serializers.ModelSerializer):
+class OtherNDESerializer(perf.TimedSerializerMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = models.OtherNDE
         fields = '__all__'
 
 
-class GoalQuestionTemplateSerializer(serializers.ModelSerializer):
+class InspectionPackageSerializer(serializers.Serializer):
+    """Every Workflow 2 record for one tank, validated by the per-record serializers.
+
+    ``save(tank=...)`` inserts each record type with one ``bulk_create`` inside a single
+    transaction and returns the new primary keys per section.
+    """
+
+    shell_settlement_surveys = ShellSettlementSurveySerializer(many=True, required=False)
+    ut_results = UTResultSerializer(many=True, required=False)
+    edge_settlement_checks = EdgeSettlementCheckSerializer(many=True, required=False)
+    column_plumbness_checks = ColumnPlumbnessCheckSerializer(many=True, required=False)
+    visual_findings = VisualFindingSerializer(many=True, required=False)
+    other_nde = OtherNDESerializer(many=True, required=False)
+
+    RECORD_MODELS = {
+        'ut_results': models.UTResult,
+        'edge_settlement_checks': models.EdgeSettlementCheck,
+        'column_plumbness_checks': models.ColumnPlumbnessCheck,
+        'visual_findings': models.VisualFinding,
+        'other_nde': models.OtherNDE,
+    }
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for field in fields.values():
+            # The tank comes from the URL; dropping the field avoids a tank lookup per record.
+            field.child.fields.pop('tank', None)
+        return fields
+
+    def validate(self, attrs: dict[str, Any]):
+        if not any(attrs.values()):
+            raise serializers.ValidationError('The package must contain at least one record.')
+        return attrs
+
+    def create(self, validated_data: dict[str, Any]) -> dict[str, list[Any]]:
+        tank = validated_data.pop('tank')
+        surveys_data = validated_data.pop('shell_settlement_surveys', [])
+        readings = [attrs.pop('station_readings') for attrs in surveys_data]
+        created: dict[str, list[Any]] = {}
+        with transaction.atomic():
+            surveys = models.ShellSettlementSurvey.objects.bulk_create(
+                models.ShellSettlementSurvey(tank=tank, **attrs) for attrs in surveys_data
+            )
+            models.SettlementReading.objects.bulk_create(
+                models.SettlementReading(survey=survey, tank=tank, position=position, **reading)
+                for survey, rows in zip(surveys, readings)
+                for position, reading in enumerate(rows)
+            )
+            created['shell_settlement_surveys'] = [survey.pk for survey in surveys]
+            for name, model in self.RECORD_MODELS.items():
+                objects = model.objects.bulk_create(model(tank=tank, **attrs) for attrs in validated_data.get(name, []))
+                search.index_instances(objects)
+                created[name] = [instance.pk for instance in objects]
+        return created
+
+
+class GoalQuestionTemplateSerializer(perf.TimedSerializerMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = models.GoalQuestionTemplate
         fields = '__all__'
 
 
-class GoalResultSerializer(serializers.ModelSerializer):
+class GoalResultSerializer(perf.TimedSerializerMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     tank = serializers.PrimaryKeyRelatedField(queryset=models.Tank.objects.all())
     goal_key_display = serializers.CharField(source='get_goal_key_display', read_only=True)
 
@@ -158,6 +377,49 @@ class GoalResultSerializer(serializers.ModelSerializer):
         return instance
 
 
+class GoalResultUpsertListSerializer(serializers.ListSerializer):
+    """Writes a tank's goal grid with one ``INSERT ... ON CONFLICT DO UPDATE`` statement."""
+
+    UPDATE_FIELDS = ('methods', 'standard_responses', 'custom_responses', 'updated_at')
+
+    def validate(self, attrs: list[dict[str, Any]]):
+        goal_keys = [item['goal_key'] for item in attrs]
+        duplicates = sorted({key for key in goal_keys if goal_keys.count(key) > 1})
+        if duplicates:
+            raise serializers.ValidationError(f'Each goal may appear once; repeated: {", ".join(duplicates)}.')
+        return attrs
+
+    def create(self, validated_data: list[dict[str, Any]]):
+        instances = []
+        for attrs in validated_data:
+            instance = models.GoalResult(**attrs)
+            instance.ensure_defaults()
+            instances.append(instance)
+        tank = instances[0].tank
+        with transaction.atomic():
+            models.GoalResult.objects.bulk_create(
+                instances,
+                update_conflicts=True,
+                unique_fields=['tank', 'goal_key'],
+                update_fields=list(self.UPDATE_FIELDS),
+            )
+            results = list(tank.goal_results.filter(goal_key__in=[instance.goal_key for instance in instances]))
+            search.index_instances(results)
+        return results
+
+
+class GoalResultUpsertSerializer(GoalResultSerializer):
+    """One goal of a bulk upsert; the tank comes from the URL and ``(tank, goal_key)`` conflicts update in place."""
+
+    tank = None
+    goal_key_display = None
+
+    class Meta(GoalResultSerializer.Meta):
+        fields = ['goal_key', 'methods', 'standard_responses', 'custom_responses']
+        validators: list[Any] = []
+        list_serializer_class = GoalResultUpsertListSerializer
+
+
 class TankDetailSerializer(TankSerializer):
     shell_settlement_surveys = ShellSettlementSurveySerializer(many=True, read_only=True)
     ut_results = UTResultSerializer(many=True, read_only=True)
@@ -167,5 +429,64 @@ class TankDetailSerializer(TankSerializer):
     other_nde = OtherNDESerializer(many=True, read_only=True)
     goal_results = GoalResultSerializer(many=True, read_only=True)
 
-    class Meta(TankSerializer.Meta):
-        fields = '__all__'
+    prefetch_fields = (
+        'shell_settlement_surveys',
+        'shell_settlement_surveys__station_readings',
+        'ut_results',
+        'edge_settlement_checks',
+        'column_plumbness_checks',
+        'visual_findings',
+        'other_nde',
+        'goal_results',
+    )
+
+
+class ReportBatchSerializer(perf.TimedSerializerMixin, serializers.ModelSerializer):
+    """Creates a batch from tank selectors; reports progress from annotated item counts."""
+
+    tank_ids = serializers.ListField(child=serializers.UUIDField(), write_only=True, required=False)
+    owner = serializers.CharField(write_only=True, required=False)
+    client_name = serializers.CharField(write_only=True, required=False)
+    total = serializers.IntegerField(read_only=True)
+    pending = serializers.IntegerField(read_only=True)
+    running = serializers.IntegerField(read_only=True)
+    done = serializers.IntegerField(read_only=True)
+    failed = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = models.ReportBatch
+        fields = [
+            'id',
+            'report_format',
+            'filters',
+            'tank_ids',
+            'owner',
+            'client_name',
+            'total',
+            'pending',
+            'running',
+            'done',
+            'failed',
+            'created_at',
+            'updated_at',
+        ]
+        read_only_fields = ['filters']
+
+
+class ReportBatchItemSerializer(perf.TimedSerializerMixin, serializers.ModelSerializer):
+    tank_name = serializers.CharField(source='tank.tank_name', read_only=True)
+    download = serializers.SerializerMethodField()
+
+    class Meta:
+        model = models.ReportBatchItem
+        fields = ['id', 'tank', 'tank_name', 'status', 'content_key', 'error', 'download', 'updated_at']
+
+    def get_download(self, obj: models.ReportBatchItem) -> str | None:
+        if obj.status != models.ReportBatchItem.DONE:
+            return None
+        url = reverse(
+            'tanks-report',
+            kwargs={'pk': obj.tank_id, 'report_format': obj.batch.report_format},
+        )
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
@@ -0,0 +1,341 @@
+"""Shell settlement analysis: optimum cosine fit and out-of-plane settlement.
+
+Follows API 653 Annex B. Each survey's station elevations ``u_i`` at angles
+``theta_i = 2*pi*i/N`` are fitted with ``u = a + b*cos(theta) + c*sin(theta)``; the
+residual at each station is its out-of-plane settlement, which is compared with
+
+    S_max = (L**2 * Y * 11) / (2 * E * H)
+
+where ``L`` is the arc length between stations, ``Y`` the shell yield strength, ``E``
+the elastic modulus and ``H`` the tank height (lengths in feet, stresses in psi).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+import numpy as np
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Count, F, Q, QuerySet
+from django.utils import timezone
+
+from . import models
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_YIELD_STRENGTH_PSI = 30_000.0
+DEFAULT_ELASTIC_MODULUS_PSI = 29_000_000.0
+MIN_FIT_STATIONS = 3
+REFRESH_CHUNK_SIZE = 500
+
+ANALYSIS_FIELDS = [
+    'tank',
+    'inputs_digest',
+    'station_count',
+    'cosine_offset_in',
+    'cosine_amplitude_in',
+    'cosine_phase_deg',
+    'r_squared',
+    'max_out_of_plane_in',
+    'allowed_out_of_plane_in',
+    'utilization',
+    'stations',
+    'updated_at',
+]
+
+
+@dataclass
+class SurveyInput:
+    survey_id: int
+    tank_id: Any
+    labels: list[str]
+    measurements: list[float]
+    diameter_ft: float | None
+    height_ft: float | None
+    digest: str
+
+
+def material_constants() -> tuple[float, float]:
+    return (
+        float(getattr(settings, 'SETTLEMENT_YIELD_STRENGTH_PSI', DEFAULT_YIELD_STRENGTH_PSI)),
+        float(getattr(settings, 'SETTLEMENT_ELASTIC_MODULUS_PSI', DEFAULT_ELASTIC_MODULUS_PSI)),
+    )
+
+
+def allowed_out_of_plane_in(diameter_ft: float | None, height_ft: float | None, station_count: int) -> float | None:
+    """Maximum permitted out-of-plane settlement in inches, or None without tank dimensions."""
+    if not diameter_ft or not height_ft or station_count < 1:
+        return None
+    yield_psi, modulus_psi = material_constants()
+    arc_ft = math.pi * diameter_ft / station_count
+    return (arc_ft ** 2 * yield_psi * 11) / (2 * modulus_psi * height_ft) * 12
+
+
+def inputs_digest(readings: Any, diameter_ft: Any, height_ft: Any) -> str:
+    """Fingerprint everything an analysis depends on, so unchanged surveys are never refitted."""
+    payload = json.dumps(
+        {
+            'readings': readings,
+            'diameter_ft': diameter_ft,
+            'height_ft': height_ft,
+            'material': material_constants(),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def fit_cosine(measurements: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Fit the optimum cosine curve to every row of an ``(surveys, stations)`` matrix.
+
+    All rows share one design matrix, so a single least-squares solve covers the batch.
+    Returns ``(coefficients, fitted)`` with coefficients as ``(a, b, c)`` per row.
+    """
+    count = measurements.shape[1]
+    theta = 2 * np.pi * np.arange(count) / count
+    basis = np.column_stack([np.ones(count), np.cos(theta), np.sin(theta)])
+    coefficients, *_ = np.linalg.lstsq(basis, measurements.T, rcond=None)
+    return coefficients.T, (basis @ coefficients).T
+
+
+def analyze(inputs: Iterable[SurveyInput]) -> list[dict[str, Any]]:
+    """Analyse surveys in batches grouped by station count."""
+    by_count: dict[int, list[SurveyInput]] = {}
+    for item in inputs:
+        by_count.setdefault(len(item.measurements), []).append(item)
+
+    results: list[dict[str, Any]] = []
+    for count, batch in by_count.items():
+        measurements = np.array([item.measurements for item in batch], dtype=float)
+        coefficients, fitted = fit_cosine(measurements)
+        residuals = measurements - fitted
+        max_out_of_plane = np.abs(residuals).max(axis=1)
+        total = ((measurements - measurements.mean(axis=1, keepdims=True)) ** 2).sum(axis=1)
+        explained = 1 - (residuals ** 2).sum(axis=1) / np.where(total > 0, total, 1)
+        amplitude = np.hypot(coefficients[:, 1], coefficients[:, 2])
+        phase = np.degrees(np.arctan2(coefficients[:, 2], coefficients[:, 1]))
+
+        for row, item in enumerate(batch):
+            allowed = allowed_out_of_plane_in(item.diameter_ft, item.height_ft, count)
+            worst = float(max_out_of_plane[row])
+            results.append({
+                'survey_id': item.survey_id,
+                'tank_id': item.tank_id,
+                'inputs_digest': item.digest,
+                'station_count': count,
+                'cosine_offset_in': float(coefficients[row, 0]),
+                'cosine_amplitude_in': float(amplitude[row]),
+                'cosine_phase_deg': float(phase[row]),
+                'r_squared': float(explained[row]) if total[row] > 0 else None,
+                'max_out_of_plane_in': worst,
+                'allowed_out_of_plane_in': allowed,
+                'utilization': worst / allowed if allowed else None,
+                'stations': [
+                    {
+                        'station_label': label,
+                        'measurement_in': float(measurements[row, index]),
+                        'fitted_in': round(float(fitted[row, index]), 6),
+                        'out_of_plane_in': round(float(residuals[row, index]), 6),
+                    }
+                    for index, label in enumerate(item.labels)
+                ],
+            })
+    return results
+
+
+def _survey_input(row: dict[str, Any], readings: list[tuple[str, float | None]]) -> SurveyInput | None:
+    if len(readings) < MIN_FIT_STATIONS:
+        return None
+    measurements = [value for _label, value in readings]
+    if any(value is None or not math.isfinite(value) for value in measurements):
+        return None
+    diameter = row['tank__diameter_ft']
+    height = row['tank__height_ft']
+    return SurveyInput(
+        survey_id=row['id'],
+        tank_id=row['tank_id'],
+        labels=[label for label, _value in readings],
+        measurements=measurements,  # type: ignore[arg-type]
+        diameter_ft=float(diameter) if diameter is not None else None,
+        height_ft=float(height) if height is not None else None,
+        digest=inputs_digest(readings, diameter, height),
+    )
+
+
+def _station_readings(survey_ids: list[int]) -> dict[int, list[tuple[str, float | None]]]:
+    readings: dict[int, list[tuple[str, float | None]]] = {survey_id: [] for survey_id in survey_ids}
+    rows = (
+        models.SettlementReading.objects.filter(survey_id__in=survey_ids)
+        .order_by('survey_id', 'position')
+        .values_list('survey_id', 'station_label', 'measurement_in')
+    )
+    for survey_id, label, value in rows:
+        readings[survey_id].append((label, value))
+    return readings
+
+
+def fittable_surveys() -> QuerySet:
+    """Ids of surveys with at least ``MIN_FIT_STATIONS`` readings, every one of them finite."""
+    largest = sys.float_info.max  # infinities, and NaN on Postgres, compare beyond it
+    return (
+        models.SettlementReading.objects.order_by()
+        .values('survey')
+        .annotate(
+            stations=Count('pk'),
+            unusable=Count(
+                'pk',
+                filter=Q(measurement_in__isnull=True)
+                | Q(measurement_in__gt=largest)
+                | Q(measurement_in__lt=-largest),
+            ),
+        )
+        .filter(stations__gte=MIN_FIT_STATIONS, unusable=0)
+        .values('survey')
+    )
+
+
+def stale_surveys(queryset: QuerySet | None = None) -> QuerySet:
+    """Surveys to refresh: fittable ones with no analysis, or whose survey or tank changed after it
+    was computed, and unfittable ones that still have an analysis to drop.
+
+    A survey that cannot be fitted never gets an analysis, so it is only stale while one is left over.
+    """
+    queryset = models.ShellSettlementSurvey.objects.all() if queryset is None else queryset
+    fittable = Q(pk__in=fittable_surveys())
+    outdated = (
+        Q(analysis__isnull=True)
+        | Q(analysis__updated_at__lt=F('updated_at'))
+        | Q(analysis__updated_at__lt=F('tank__updated_at'))
+    )
+    return queryset.filter((fittable & outdated) | (~fittable & Q(analysis__isnull=False)))
+
+
+def refresh_analyses(queryset: QuerySet, force: bool = False) -> int:
+    """Recompute analyses for ``queryset`` whose inputs changed; returns how many were written."""
+    rows = (
+        queryset.order_by('pk')
+        .values('id', 'tank_id', 'tank__diameter_ft', 'tank__height_ft', 'analysis__inputs_digest')
+        .iterator(chunk_size=REFRESH_CHUNK_SIZE)
+    )
+    written = 0
+    chunk: list[dict[str, Any]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= REFRESH_CHUNK_SIZE:
+            written += _refresh_chunk(chunk, force)
+            chunk = []
+    if chunk:
+        written += _refresh_chunk(chunk, force)
+    return written
+
+
+def _refresh_chunk(rows: list[dict[str, Any]], force: bool) -> int:
+    readings = _station_readings([row['id'] for row in rows])
+    pending: list[SurveyInput] = []
+    unchanged: list[int] = []
+    unusable: list[int] = []
+    for row in rows:
+        item = _survey_input(row, readings[row['id']])
+        if item is None:
+            if row['analysis__inputs_digest'] is not None:
+                unusable.append(row['id'])
+        elif not force and item.digest == row['analysis__inputs_digest']:
+            unchanged.append(item.survey_id)
+        else:
+            pending.append(item)
+
+    objects = [
+        models.SettlementAnalysis(
+            survey_id=result['survey_id'],
+            tank_id=result['tank_id'],
+            **{key: value for key, value in result.items() if key not in {'survey_id', 'tank_id'}},
+        )
+        for result in analyze(pending)
+    ]
+    with transaction.atomic():
+        models.SettlementAnalysis.objects.bulk_create(
+            objects,
+            update_conflicts=True,
+            unique_fields=['survey'],
+            update_fields=ANALYSIS_FIELDS,
+        )
+        if unchanged:
+            models.SettlementAnalysis.objects.filter(survey_id__in=unchanged).update(updated_at=timezone.now())
+        if unusable:
+            models.SettlementAnalysis.objects.filter(survey_id__in=unusable).delete()
+    return len(objects)
+
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+# Surveys queued or being refitted, those being refitted, and those written again mid-refit.
+_scheduled: set[int] = set()
+_running: set[int] = set()
+_rerun: set[int] = set()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'SETTLEMENT_ANALYSIS_WORKERS', 2),
+                thread_name_prefix='settlement-analysis',
+            )
+        return _executor
+
+
+def _enqueue(survey_ids: list[int]) -> None:
+    with _executor_lock:
+        # A refit that already read its surveys would stamp the old data as current: run it again after.
+        _rerun.update(_running.intersection(survey_ids))
+        ids = sorted(set(survey_ids) - _scheduled)
+        _scheduled.update(ids)
+    if not ids:
+        return
+    if getattr(settings, 'SETTLEMENT_ANALYSIS_ASYNC', True):
+        _get_executor().submit(_run_refresh, ids, True)
+    else:
+        _run_refresh(ids, False)
+
+
+def _run_refresh(survey_ids: list[int], background: bool) -> None:
+    with _executor_lock:
+        _running.update(survey_ids)
+    try:
+        refresh_analyses(models.ShellSettlementSurvey.objects.filter(pk__in=survey_ids))
+    except Exception:
+        logger.exception('Settlement analysis refresh failed for surveys %s.', survey_ids)
+    finally:
+        with _executor_lock:
+            _running.difference_update(survey_ids)
+            _scheduled.difference_update(survey_ids)
+            again = sorted(_rerun.intersection(survey_ids))
+            _rerun.difference_update(again)
+        if background:
+            connections.close_all()
+    if again:
+        _enqueue(again)
+
+
+def schedule_refresh(survey_ids: Iterable[int]) -> int:
+    """Queue surveys for analysis off the request thread once the current transaction commits.
+
+    Surveys already queued are skipped; a survey whose refit is already running is refitted
+    again when it finishes. Nothing is queued if the transaction rolls back. With
+    ``SETTLEMENT_ANALYSIS_ASYNC = False`` the work runs inline instead. Returns how many
+    surveys will be refreshed.
+    """
+    ids = sorted(set(survey_ids))
+    if ids:
+        transaction.on_commit(lambda: _enqueue(ids))
+    return len(ids)
@@ -0,0 +1,137 @@
+"""Grouped thickness statistics over UT results, computed in the database."""
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+from django.db import connections
+from django.db.models import Aggregate, Avg, Count, F, FloatField, Max, Min, QuerySet, StdDev, Window
+from django.db.models.functions import RowNumber
+
+GROUP_FIELDS = {
+    'tank': 'tank_id',
+    'category': 'category',
+    'course': 'course',
+}
+DEFAULT_GROUP_BY = ('tank', 'category', 'course')
+DEFAULT_PERCENTILES = (10.0, 50.0, 90.0)
+THICKNESS_QUANTUM = Decimal('0.0001')
+
+
+class PercentileCont(Aggregate):
+    """PostgreSQL ``percentile_cont(fraction) WITHIN GROUP (ORDER BY expr)``."""
+
+    function = 'PERCENTILE_CONT'
+    name = 'PercentileCont'
+    template = '%(function)s(%(fraction)s) WITHIN GROUP (ORDER BY %(expressions)s)'
+    output_field = FloatField()
+
+    def __init__(self, expression, fraction: float, **extra):
+        if not 0 <= fraction <= 1:
+            raise ValueError('Percentile fraction must be between 0 and 1.')
+        super().__init__(expression, fraction=repr(float(fraction)), **extra)
+
+
+def percentile_key(percentile: float) -> str:
+    return f'p{percentile:g}'.replace('.', '_')
+
+
+def _quantize(value: Any) -> Decimal | None:
+    if value is None:
+        return None
+    return Decimal(str(value)).quantize(THICKNESS_QUANTUM)
+
+
+def ut_statistics(
+    queryset: QuerySet,
+    group_by: Sequence[str] = DEFAULT_GROUP_BY,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+) -> list[dict[str, Any]]:
+    """Return count/min/max/mean/stddev/percentiles and the thinnest reading per group.
+
+    Aggregates run as one ``GROUP BY`` query. PostgreSQL also computes the standard deviation
+    and, with ``percentile_cont``, the percentiles; other backends compute those with NumPy per
+    group over one sorted thickness column. The thinnest reading per group comes from a
+    ``ROW_NUMBER()`` window query.
+    """
+    keys = [GROUP_FIELDS[name] for name in group_by]
+    base = queryset.order_by()
+    in_database = connections[base.db].vendor == 'postgresql'
+
+    aggregates: dict[str, Any] = {
+        'count': Count('id'),
+        'min': Min('thickness_in'),
+        'max': Max('thickness_in'),
+        'mean': Avg('thickness_in'),
+    }
+    if in_database:
+        aggregates['stddev'] = StdDev('thickness_in', sample=True)
+        for percentile in percentiles:
+            aggregates[percentile_key(percentile)] = PercentileCont('thickness_in', percentile / 100)
+
+    if keys:
+        grouped = base.values(*keys).annotate(**aggregates).order_by(*keys)
+    else:
+        # ``values()`` with no fields would select, and so group by, every column.
+        totals = base.aggregate(**aggregates)
+        grouped = [totals] if totals['count'] else []
+    groups: dict[tuple, dict[str, Any]] = {}
+    for row in grouped:
+        group_key = tuple(row[key] for key in keys)
+        groups[group_key] = {
+            **{name: row[GROUP_FIELDS[name]] for name in group_by},
+            'count': row['count'],
+            'min': _quantize(row['min']),
+            'max': _quantize(row['max']),
+            'mean': _quantize(row['mean']),
+            'stddev': _quantize(row['stddev']) if in_database else None,
+            'percentiles': {
+                percentile_key(percentile): _quantize(row[percentile_key(percentile)])
+                for percentile in percentiles
+            } if in_database else {},
+            'thinnest': None,
+        }
+
+    if not in_database and groups:
+        # One sorted thickness column; the GROUP BY counts, in the same key order, cut it into groups.
+        extract = base.order_by(*keys, 'thickness_in').values_list('thickness_in', flat=True)
+        thickness = np.fromiter((float(value) for value in extract.iterator(chunk_size=10000)), dtype=float)
+        boundaries = np.cumsum([group['count'] for group in groups.values()])[:-1]
+        for group, values in zip(groups.values(), np.split(thickness, boundaries)):
+            if len(values) > 1:  # the sample deviation of one reading is undefined, NULL in SQL
+                group['stddev'] = _quantize(float(np.std(values, ddof=1)))
+            if percentiles:
+                results = np.percentile(values, percentiles, method='linear')
+                group['percentiles'] = {
+                    percentile_key(percentile): _quantize(float(value))
+                    for percentile, value in zip(percentiles, results)
+                }
+
+    for row in _thinnest_readings(base, keys):
+        group_key = tuple(row[key] for key in keys)
+        if group_key in groups:
+            groups[group_key]['thinnest'] = {
+                'id': row['id'],
+                'tank': row['tank_id'],
+                'location': row['location'],
+                'course': row['course'],
+                'thickness_in': _quantize(row['thickness_in']),
+                'created_at': row['created_at'],
+            }
+    return list(groups.values())
+
+
+def _thinnest_readings(queryset: QuerySet, keys: Iterable[str]) -> QuerySet:
+    partition = [F(key) for key in keys]
+    return (
+        queryset.annotate(
+            thinnest_rank=Window(
+                RowNumber(),
+                partition_by=partition or None,
+                order_by=[F('thickness_in').asc(), F('created_at').desc(), F('id').desc()],
+            )
+        )
+        .filter(thinnest_rank=1)
+        .values(*dict.fromkeys([*keys, 'id', 'tank_id', 'location', 'course', 'thickness_in', 'created_at']))
+    )
@@ -0,0 +1,86 @@
+"""Fleet-level executive summary built server-side for the reporting view."""
+from __future__ import annotations
+
+from typing import Any, Iterable, Iterator
+
+from django.db.models import QuerySet
+from rest_framework.utils.encoders import JSONEncoder
+
+from . import serializers
+
+TAG_COLORS = ('red', 'blue', 'yellow', 'green')
+
+# Mirrors ``constructionFieldMeta`` in ExecutiveSummaryPage so the buckets read the same.
+CONSTRUCTION_FIELDS: list[tuple[str, str]] = [
+    ('foundation', 'Foundation'),
+    ('anchors', 'Anchors'),
+    ('shell_weld_type', 'Shell weld type'),
+    ('insulation', 'Insulation'),
+    ('shell_manway', 'Shell manway'),
+    ('drain', 'Drain'),
+    ('level_gauge_type', 'Level gauge type'),
+    ('access_structure', 'Access structure'),
+    ('bottom_type', 'Bottom type'),
+    ('bottom_weld', 'Bottom weld type'),
+    ('annular_plate', 'Annular plate'),
+    ('fixed_roof_type', 'Fixed roof type'),
+    ('floating_roof_type', 'Floating roof type'),
+    ('primary_seal', 'Primary seal'),
+    ('secondary_seal', 'Secondary seal'),
+    ('anti_rotation_device', 'Anti-rotation device'),
+    ('vent_type_and_number', 'Vent type & quantity'),
+    ('emergency_venting_type', 'Emergency venting'),
+    ('roof_manway_or_hatch', 'Roof manway / hatch'),
+    ('pressure', 'Pressure'),
+    ('temperature', 'Temperature'),
+]
+
+SUMMARY_CHUNK_SIZE = 500
+
+
+def format_value(value: Any) -> str:
+    if value is None or value == '':
+        return 'N/A'
+    return str(value)
+
+
+def bucket_construction_tags(data: dict[str, Any]) -> dict[str, list[dict[str, str]]]:
+    """Group colour-tagged construction items by colour, as the summary card displays them."""
+    buckets: dict[str, list[dict[str, str]]] = {color: [] for color in TAG_COLORS}
+    annotations = data.get('construction_annotations') or {}
+    standard = annotations.get('standard') or {}
+    for key, label in CONSTRUCTION_FIELDS:
+        entry = standard.get(key) or {}
+        color = entry.get('color')
+        if color in buckets:
+            buckets[color].append({'label': label, 'value': format_value(data.get(key))})
+    for entry in annotations.get('additional') or []:
+        color = entry.get('color')
+        if color in buckets:
+            buckets[color].append({'label': entry.get('label', ''), 'value': entry.get('value', '')})
+    return buckets
+
+
+def build_tank_summary(tank) -> dict[str, Any]:
+    data = dict(serializers.TankSerializer(tank).data)
+    data['color_buckets'] = bucket_construction_tags(data)
+    return data
+
+
+def iter_tank_summaries(queryset: QuerySet, chunk_size: int = SUMMARY_CHUNK_SIZE) -> Iterator[dict[str, Any]]:
+    """Yield one summary per tank from a single chunked query."""
+    for tank in queryset.iterator(chunk_size=chunk_size):
+        yield build_tank_summary(tank)
+
+
+def stream_json_array(items: Iterable[dict[str, Any]]) -> Iterator[str]:
+    """Encode ``items`` as a JSON array one element at a time."""
+    encoder = JSONEncoder()
+    yield '['
+    for index, item in enumerate(items):
+        yield (',' if index else '') + encoder.encode(item)
+    yield ']'
+
+
+def stream_executive_summary(queryset: QuerySet) -> Iterator[str]:
+    return stream_json_array(iter_tank_summaries(queryset))
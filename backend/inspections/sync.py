@@ -0,0 +1,360 @@
+"""Delta sync for offline field tablets.
+
+:func:`changes_since` merges every tank and inspection record whose ``updated_at`` is past
+a cursor, plus tombstones for deletes, into one ordered stream. Each source is read with a
+range scan on its ``(updated_at, id)`` index, so a sync costs what changed rather than the
+size of the fleet. :func:`apply_changes` writes a batch pushed by a client and refuses any
+update or delete whose base version is no longer the one on the server.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import heapq
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Any, Iterable
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Model, QuerySet, prefetch_related_objects
+from django.utils import timezone
+from rest_framework import serializers as drf_serializers
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from . import cache, models, serializers, settlement
+
+MAX_PAGE_SIZE = 5000
+TIMESTAMP = drf_serializers.DateTimeField()
+
+
+@dataclass(frozen=True)
+class SyncResource:
+    name: str
+    model: type[Model]
+    serializer_class: type[drf_serializers.ModelSerializer]
+    prefetch: tuple[str, ...] = ()
+
+    @property
+    def pk_name(self) -> str:
+        return self.model._meta.pk.name
+
+    @property
+    def tank_lookup(self) -> str:
+        return 'pk__in' if self.model is models.Tank else 'tank_id__in'
+
+
+RESOURCES: dict[str, SyncResource] = {
+    resource.name: resource
+    for resource in (
+        SyncResource('tanks', models.Tank, serializers.TankSerializer),
+        SyncResource(
+            'shell-settlement-surveys',
+            models.ShellSettlementSurvey,
+            serializers.ShellSettlementSurveySerializer,
+            prefetch=('station_readings',),
+        ),
+        SyncResource('ut-results', models.UTResult, serializers.UTResultSerializer),
+        SyncResource('edge-settlement-checks', models.EdgeSettlementCheck, serializers.EdgeSettlementCheckSerializer),
+        SyncResource(
+            'column-plumbness-checks', models.ColumnPlumbnessCheck, serializers.ColumnPlumbnessCheckSerializer
+        ),
+        SyncResource('visual-findings', models.VisualFinding, serializers.VisualFindingSerializer),
+        SyncResource('other-nde', models.OtherNDE, serializers.OtherNDESerializer),
+        SyncResource('goal-results', models.GoalResult, serializers.GoalResultSerializer),
+    )
+}
+RESOURCE_LIST = tuple(RESOURCES.values())
+RESOURCE_BY_MODEL = {resource.model: resource for resource in RESOURCE_LIST}
+# Tombstones are the last stream, so a delete sorts after an update with the same timestamp.
+TOMBSTONE_STREAM = len(RESOURCES)
+
+
+class CursorExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = 'This cursor is older than the tombstone retention window; sync again without a cursor.'
+    default_code = 'cursor_expired'
+
+
+@dataclass(frozen=True, order=True)
+class Position:
+    """How far a client has read: a timestamp, then a stream index and primary key to break ties."""
+
+    timestamp: datetime
+    stream: int = -1
+    key: str = ''
+
+
+@dataclass
+class ChangePage:
+    changes: list[dict[str, Any]]
+    cursor: Position
+    has_more: bool
+
+
+def encode_cursor(position: Position) -> str:
+    raw = json.dumps([position.timestamp.isoformat(), position.stream, position.key], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(token: str | None) -> Position | None:
+    if not token:
+        return None
+    try:
+        timestamp, stream, key = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+        position = Position(datetime.fromisoformat(timestamp), int(stream), str(key))
+    except (binascii.Error, UnicodeError, ValueError, TypeError):
+        raise ValidationError({'cursor': 'Invalid cursor.'})
+    if timezone.is_naive(position.timestamp):
+        raise ValidationError({'cursor': 'Invalid cursor.'})
+    horizon = timezone.now() - timedelta(days=getattr(settings, 'SYNC_TOMBSTONE_RETENTION_DAYS', 90))
+    if position.timestamp < horizon:
+        raise CursorExpired()
+    return position
+
+
+def page_size_param(params) -> int:
+    raw = params.get('page_size')
+    if raw is None:
+        return getattr(settings, 'SYNC_PAGE_SIZE', 500)
+    try:
+        size = int(raw)
+    except ValueError:
+        raise ValidationError({'page_size': 'Must be an integer.'})
+    if size < 1:
+        raise ValidationError({'page_size': 'Must be at least 1.'})
+    return min(size, MAX_PAGE_SIZE)
+
+
+def _stream(queryset: QuerySet, time_field: str, stream: int, position: Position | None, limit: int) -> list[tuple]:
+    """Rows of one source strictly after ``position``, in ``(time, pk)`` order."""
+    pk_name = queryset.model._meta.pk.name
+    if position is not None:
+        if stream < position.stream:
+            queryset = queryset.filter(**{f'{time_field}__gt': position.timestamp})
+        else:
+            queryset = queryset.filter(**{f'{time_field}__gte': position.timestamp})
+            if stream == position.stream:
+                queryset = queryset.exclude(**{time_field: position.timestamp, f'{pk_name}__lte': position.key})
+    rows = queryset.order_by(time_field, pk_name)[: limit + 1]
+    return [(getattr(row, time_field), stream, number, row) for number, row in enumerate(rows)]
+
+
+def changes_since(
+    position: Position | None,
+    limit: int,
+    tank_ids: Iterable[str] = (),
+    context: dict[str, Any] | None = None,
+) -> ChangePage:
+    """Return up to ``limit`` changes after ``position``, oldest first, and the cursor to resume from."""
+    tank_ids = list(tank_ids)
+    streams = []
+    for stream, resource in enumerate(RESOURCE_LIST):
+        queryset = resource.model._default_manager.all()
+        if tank_ids:
+            queryset = queryset.filter(**{resource.tank_lookup: tank_ids})
+        streams.append(_stream(queryset, 'updated_at', stream, position, limit))
+    tombstones = models.Tombstone.objects.all()
+    if tank_ids:
+        tombstones = tombstones.filter(tank_id__in=tank_ids)
+    streams.append(_stream(tombstones, 'deleted_at', TOMBSTONE_STREAM, position, limit))
+
+    merged = list(islice(heapq.merge(*streams), limit + 1))
+    has_more = len(merged) > limit
+    page = merged[:limit]
+
+    data: dict[int, dict[str, Any]] = {}
+    for stream, resource in enumerate(RESOURCE_LIST):
+        rows = [row for _time, row_stream, _number, row in page if row_stream == stream]
+        if not rows:
+            continue
+        if resource.prefetch:
+            prefetch_related_objects(rows, *resource.prefetch)
+        for row, item in zip(rows, resource.serializer_class(rows, many=True, context=context or {}).data):
+            data[id(row)] = item
+
+    changes = []
+    for _time, stream, _number, row in page:
+        if stream == TOMBSTONE_STREAM:
+            changes.append(_tombstone_change(row))
+        else:
+            resource = RESOURCE_LIST[stream]
+            changes.append({
+                'resource': resource.name,
+                'id': row.pk,
+                'tank': cache.tank_id_for(row),
+                'updated_at': data[id(row)]['updated_at'],
+                'deleted': False,
+                'data': data[id(row)],
+            })
+
+    if has_more:
+        cursor = Position(page[-1][0], page[-1][1], str(page[-1][3].pk))
+    else:
+        # Everything up to now has been read. Resume at the start of the settle window, in case a
+        # slower transaction commits into it, and never at an older row: a fleet that has been
+        # quiet for longer than the tombstone retention would be handed an expired cursor.
+        cursor = Position(timezone.now() - timedelta(seconds=getattr(settings, 'SYNC_SETTLE_SECONDS', 5)))
+    return ChangePage(changes=changes, cursor=cursor, has_more=has_more)
+
+
+def _tombstone_change(tombstone: models.Tombstone) -> dict[str, Any]:
+    resource = RESOURCES.get(tombstone.resource)
+    object_id: Any = tombstone.object_id
+    if resource is not None and resource.model is not models.Tank:
+        object_id = int(object_id)
+    return {
+        'resource': tombstone.resource,
+        'id': object_id,
+        'tank': tombstone.tank_id,
+        'updated_at': TIMESTAMP.to_representation(tombstone.deleted_at),
+        'deleted': True,
+        'data': None,
+    }
+
+
+def record_deletion(instance: Model) -> None:
+    """Leave a tombstone for ``instance``; call before deleting it."""
+    models.Tombstone.objects.create(
+        resource=RESOURCE_BY_MODEL[type(instance)].name,
+        object_id=str(instance.pk),
+        tank_id=cache.tank_id_for(instance),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Push
+
+
+@dataclass
+class _Effects:
+    """Tanks and surveys touched by a push, for cache invalidation and settlement refits."""
+
+    tank_ids: set[Any] = field(default_factory=set)
+    updated_tank_ids: set[Any] = field(default_factory=set)
+    survey_ids: set[int] = field(default_factory=set)
+
+    def saved(self, instance: Model, created: bool) -> None:
+        self.tank_ids.add(cache.tank_id_for(instance))
+        if isinstance(instance, models.ShellSettlementSurvey):
+            self.survey_ids.add(instance.pk)
+        elif isinstance(instance, models.Tank) and not created:
+            self.updated_tank_ids.add(instance.pk)
+
+
+def _invalid(outcome: dict[str, Any], errors: Any) -> dict[str, Any]:
+    return {**outcome, 'status': 'invalid', 'errors': errors}
+
+
+def apply_changes(items: list[Any], context: dict[str, Any] | None = None) -> list[dict[str, Any]]:
+    """Apply pushed changes in order, each in its own savepoint, and report the outcome of each.
+
+    An update or delete must carry ``base_updated_at``, the ``updated_at`` the client last
+    saw; if the server's row has moved on it is left alone and reported as a conflict along
+    with the current record. Creates may carry a ``ref`` that later changes in the same push
+    can use as their ``tank``.
+    """
+    context = context or {}
+    refs: dict[str, Any] = {}
+    effects = _Effects()
+    with transaction.atomic():
+        results = [{'index': index, **_apply(item, refs, effects, context)} for index, item in enumerate(items)]
+    effects.tank_ids.update(effects.updated_tank_ids)
+    cache.invalidate_tanks(*effects.tank_ids)
+    surveys = set(effects.survey_ids)
+    if effects.updated_tank_ids:
+        tank_surveys = models.ShellSettlementSurvey.objects.filter(tank_id__in=effects.updated_tank_ids)
+        surveys.update(tank_surveys.values_list('pk', flat=True))
+    settlement.schedule_refresh(surveys)
+    return results
+
+
+def _apply(item: Any, refs: dict[str, Any], effects: _Effects, context: dict[str, Any]) -> dict[str, Any]:
+    # Every result names the resource and id it refers to, as far as the item gives them.
+    outcome: dict[str, Any] = {'resource': None, 'id': None}
+    if not isinstance(item, dict):
+        return _invalid(outcome, {'non_field_errors': ['Each change must be an object.']})
+    resource = RESOURCES.get(item.get('resource'))  # type: ignore[arg-type]
+    object_id = item.get('id')
+    outcome['id'] = object_id
+    if resource is None:
+        return _invalid(outcome, {'resource': [f'Must be one of: {", ".join(RESOURCES)}.']})
+    outcome['resource'] = resource.name
+    data = item.get('data') or {}
+    if not isinstance(data, dict):
+        return _invalid(outcome, {'data': ['Must be an object.']})
+    if isinstance(data.get('tank'), str) and data['tank'] in refs:
+        data = {**data, 'tank': refs[data['tank']]}
+
+    if object_id is None:
+        if item.get('deleted'):
+            return _invalid(outcome, {'id': ['Required to delete a record.']})
+        serializer = resource.serializer_class(data=data, context=context)
+        if not serializer.is_valid():
+            return _invalid(outcome, serializer.errors)
+        try:
+            with transaction.atomic():
+                instance = serializer.save()
+        except IntegrityError:
+            return _invalid(outcome, {'non_field_errors': ['Conflicts with an existing record.']})
+        effects.saved(instance, created=True)
+        ref = item.get('ref')
+        if isinstance(ref, str) and ref:
+            refs[ref] = instance.pk
+            outcome['ref'] = ref
+        return {**outcome, 'status': 'created', 'id': instance.pk, 'record': serializer.data}
+
+    if item.get('base_updated_at') is None:
+        return _invalid(outcome, {'base_updated_at': ['Required to update or delete a record.']})
+    try:
+        base = TIMESTAMP.to_internal_value(item['base_updated_at'])
+    except ValidationError as exc:
+        return _invalid(outcome, {'base_updated_at': exc.detail})
+
+    try:
+        object_id = resource.model._meta.pk.to_python(object_id)
+    except DjangoValidationError:
+        return _invalid(outcome, {'id': ['Not a valid identifier.']})
+    try:
+        with transaction.atomic():
+            return _apply_existing(resource, object_id, base, item, data, outcome, effects, context)
+    except IntegrityError:
+        return _invalid(outcome, {'non_field_errors': ['Conflicts with an existing record.']})
+
+
+def _apply_existing(
+    resource: SyncResource,
+    object_id: Any,
+    base: datetime,
+    item: dict[str, Any],
+    data: dict[str, Any],
+    outcome: dict[str, Any],
+    effects: _Effects,
+    context: dict[str, Any],
+) -> dict[str, Any]:
+    """Update or delete one locked row if it is still at the client's base version."""
+    instance = resource.model._default_manager.select_for_update().filter(pk=object_id).first()
+    if instance is None:
+        if item.get('deleted'):
+            return {**outcome, 'status': 'deleted'}
+        return {**outcome, 'status': 'conflict', 'current': None}
+    if instance.updated_at != base:
+        current = resource.serializer_class(instance, context=context).data
+        return {**outcome, 'status': 'conflict', 'current': current}
+    if item.get('deleted'):
+        effects.tank_ids.add(cache.tank_id_for(instance))
+        record_deletion(instance)
+        instance.delete()
+        return {**outcome, 'status': 'deleted'}
+    previous_tank_id = cache.tank_id_for(instance)
+    serializer = resource.serializer_class(instance, data=data, partial=True, context=context)
+    if not serializer.is_valid():
+        return _invalid(outcome, serializer.errors)
+    instance = serializer.save()
+    effects.tank_ids.add(previous_tank_id)
+    effects.saved(instance, created=False)
+    return {**outcome, 'status': 'updated', 'record': serializer.data}
@@ -0,0 +1,229 @@
+"""Deterministic synthetic fleets for query-plan checks and benchmarks."""
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Iterable
+
+from . import models, search, tags
+
+BATCH_SIZE = 2000
+
+OWNERS = ('Zenith Midstream', 'Harbor Fuels', 'Prairie Terminals', 'Gulf Coast Storage', 'Northline Energy')
+STATES = ('TX', 'LA', 'OK', 'CA', 'WA', 'OR', 'IL', 'NJ', 'PA', 'ND')
+DESIGN_STANDARDS = ('API 650', 'API 12C', 'API 12F', 'UL 142')
+PRODUCTS = ('Diesel', 'Gasoline', 'Crude oil', 'Jet fuel', 'Water', 'Ethanol')
+NDE_TYPES = ('MFL', 'VT', 'MT', 'PT', 'Vacuum box')
+FINDINGS = (
+    'Coating breakdown with light surface corrosion.',
+    'Pitting at chime, deepest approximately 0.05 in.',
+    'Minor pitting on bottom extension near drain.',
+    'Corrosion under insulation at nozzle N2.',
+    'Loose handrail post on stairway landing.',
+    'Vent screen plugged with debris.',
+    'Blistering of roof coating at seams.',
+    'Shell distortion near manway, within tolerance.',
+)
+UT_NOTES = (
+    'Scale removed before reading.',
+    'Reading taken through coating.',
+    'Localized thinning, verify at next inspection.',
+    'Isolated pitting adjacent to weld.',
+)
+TAG_COLORS = ('red', 'blue', 'yellow', 'green')
+TAGGED_FIELDS = ('foundation', 'anchors', 'shell_weld_type', 'insulation', 'bottom_type', 'access_structure')
+
+
+@dataclass
+class FleetSize:
+    tanks: int = 200
+    surveys: int = 2
+    stations: int = 8
+    ut_results: int = 40
+    edge_checks: int = 2
+    plumbness_checks: int = 4
+    visual_findings: int = 6
+    other_nde: int = 2
+    goal_results: int = 8
+
+
+def _annotations(rng: random.Random) -> dict[str, Any]:
+    standard = {
+        key: {'color': rng.choice(TAG_COLORS), 've': rng.random() < 0.5, 'ut': rng.random() < 0.3, 'comment': ''}
+        for key in rng.sample(TAGGED_FIELDS, rng.randint(0, 3))
+    }
+    additional = [
+        {'label': 'Cathodic protection', 'value': 'Impressed current', 'color': rng.choice(TAG_COLORS),
+         've': False, 'ut': False, 'comment': ''}
+    ] if rng.random() < 0.2 else []
+    return {'standard': standard, 'additional': additional}
+
+
+def _past(rng: random.Random, today: date, years: int) -> date | None:
+    return today - timedelta(days=rng.randint(0, 365 * years)) if rng.random() < 0.9 else None
+
+
+def build_fleet(
+    size: FleetSize,
+    seed: int = 0,
+    prefix: str = 'SYN',
+    progress: Callable[[str, int], None] | None = None,
+) -> list[models.Tank]:
+    """Insert ``size.tanks`` tanks and their child records with ``bulk_create``.
+
+    ``progress`` is called with each model's name and row count once it is written.
+    """
+    rng = random.Random(seed)
+    today = date.today()
+    report = progress or (lambda name, count: None)
+    tanks = [
+        models.Tank(
+            tank_name=f'{prefix}-{index:06d}',
+            owner=rng.choice(OWNERS),
+            client_name=rng.choice(OWNERS),
+            facility_type=rng.choice(models.Tank.FACILITY_CHOICES)[0],
+            city=f'City {rng.randint(1, 400)}',
+            state=rng.choice(STATES),
+            year_built=rng.randint(1950, 2022),
+            design_standard=rng.choice(DESIGN_STANDARDS),
+            product_stored=rng.choice(PRODUCTS),
+            next_inspection_due_date=today + timedelta(days=rng.randint(-720, 1800)),
+            external_inspection_date=_past(rng, today, 6),
+            internal_inspection_date=_past(rng, today, 12),
+            ut_inspection_date=_past(rng, today, 16),
+            diameter_ft=Decimal(rng.randint(20, 300)),
+            height_ft=Decimal(rng.randint(16, 64)),
+            foundation=rng.choice(models.Tank.FOUNDATION_CHOICES)[0],
+            anchors='none',
+            shell_weld_type='butt',
+            insulation='none',
+            shell_manway='24 in',
+            access_structure=rng.choice(models.Tank.ACCESS_STRUCTURE_CHOICES)[0],
+            bottom_type='cone up',
+            secondary_containment_type='earthen dike',
+            construction_annotations=_annotations(rng),
+        )
+        for index in range(size.tanks)
+    ]
+    for tank in tanks:
+        tank.set_name_keys()
+    models.Tank.objects.bulk_create(tanks, batch_size=BATCH_SIZE)
+    report('tanks', len(tanks))
+    report('construction tags', tags.index_tanks(tanks))
+
+    surveys = models.ShellSettlementSurvey.objects.bulk_create(
+        [
+            models.ShellSettlementSurvey(tank=tank, station_count=size.stations)
+            for tank in tanks
+            for _ in range(size.surveys)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    if surveys and surveys[0].pk is None:
+        surveys = list(models.ShellSettlementSurvey.objects.filter(tank__in=tanks).order_by('pk'))
+    report('shell settlement surveys', len(surveys))
+    report('settlement readings', _bulk(
+        models.SettlementReading(
+            survey=survey,
+            tank_id=survey.tank_id,
+            position=position,
+            station_label=f'S{position + 1}',
+            measurement_in=round(rng.gauss(0, 0.5), 3),
+        )
+        for survey in surveys
+        for position in range(size.stations)
+    ))
+
+    categories = [value for value, _label in models.UTResult.CATEGORY_CHOICES]
+    report('UT results', _bulk(
+        models.UTResult(
+            tank=tank,
+            category=(category := rng.choice(categories)),
+            location=f'Point {index + 1}',
+            course=rng.randint(1, 8) if category == 'shell' else None,
+            thickness_in=Decimal(str(round(rng.uniform(0.15, 0.5), 4))),
+            notes=rng.choice(UT_NOTES) if rng.random() < 0.1 else None,
+        )
+        for tank in tanks
+        for index in range(size.ut_results)
+    ))
+    report('edge settlement checks', _bulk(
+        models.EdgeSettlementCheck(
+            tank=tank,
+            present=(present := rng.random() < 0.2),
+            result='Edge settlement within B.3.4 limits.' if present else None,
+        )
+        for tank in tanks
+        for _ in range(size.edge_checks)
+    ))
+    report('column plumbness checks', _bulk(
+        models.ColumnPlumbnessCheck(
+            tank=tank,
+            column_id=f'C{index + 1}',
+            plumbness_in_per_ft=Decimal(str(round(rng.uniform(0, 0.2), 4))),
+            direction=rng.choice(('N', 'E', 'S', 'W')),
+        )
+        for tank in tanks
+        for index in range(size.plumbness_checks)
+    ))
+    areas = [value for value, _label in models.VisualFinding.AREA_CHOICES]
+    comments = [value for value, _label in models.VisualFinding.COMMENT_CHOICES]
+    report('visual findings', _bulk(
+        models.VisualFinding(
+            tank=tank,
+            area=rng.choice(areas),
+            finding=rng.choice(FINDINGS),
+            comment_type=rng.choice(comments),
+        )
+        for tank in tanks
+        for _ in range(size.visual_findings)
+    ))
+    report('other NDE', _bulk(
+        models.OtherNDE(tank=tank, nde_type=rng.choice(NDE_TYPES), result='No relevant indications.')
+        for tank in tanks
+        for _ in range(size.other_nde)
+    ))
+    goal_keys = list(models.GoalKey.values)[: size.goal_results]
+    report('goal results', _bulk(
+        _goal_result(tank, goal_key)
+        for tank in tanks
+        for goal_key in goal_keys
+    ))
+    tank_ids = [tank.pk for tank in tanks]
+    indexed = 0
+    for source in search.SOURCES.values():
+        for start in range(0, len(tank_ids), BATCH_SIZE):
+            rows = source.model.objects.filter(tank_id__in=tank_ids[start:start + BATCH_SIZE])
+            for batch in _batches(rows.iterator(chunk_size=search.INDEX_CHUNK_SIZE), search.INDEX_CHUNK_SIZE):
+                search.index_instances(batch)
+                indexed += len(batch)
+    report('records indexed for search', indexed)
+    return tanks
+
+
+def _goal_result(tank: models.Tank, goal_key: str) -> models.GoalResult:
+    result = models.GoalResult(tank=tank, goal_key=goal_key)
+    result.ensure_defaults()
+    return result
+
+
+def _batches(objects: Iterable[Any], size: int) -> Iterable[list[Any]]:
+    batch = []
+    for instance in objects:
+        batch.append(instance)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _bulk(objects) -> int:
+    """``bulk_create`` a stream of unsaved instances in batches, without materialising it; returns the count."""
+    count = 0
+    for batch in _batches(objects, BATCH_SIZE):
+        type(batch[0]).objects.bulk_create(batch)
+        count += len(batch)
+    return count
@@ -0,0 +1,107 @@
+"""Indexed construction tags: the tagged entries of ``Tank.construction_annotations`` as rows.
+
+Each standard or additional annotation that carries a colour, a VE or UT flag or a comment
+becomes one :class:`~inspections.models.ConstructionTag`. A tank's tags are rewritten when the
+tank is saved (a signal) and after bulk inserts (explicit calls), so tank filters and the fleet
+rollup read indexes instead of deserializing every tank's JSON.
+"""
+from __future__ import annotations
+
+from typing import Any, Iterable, Iterator
+
+from django.db.models import Count, QuerySet
+from django.db.models.signals import post_save
+
+from . import models, summaries
+
+GROUP_FIELDS = ('field_key', 'label', 'color', 've', 'ut')
+DEFAULT_GROUP_BY = ('field_key', 'color')
+INDEX_CHUNK_SIZE = 1000
+
+_FIELD_LABELS = dict(summaries.CONSTRUCTION_FIELDS)
+
+
+def annotation_entries(annotations: Any) -> Iterator[dict[str, Any]]:
+    """Yield the tagged entries of a ``construction_annotations`` value as ``ConstructionTag`` field values.
+
+    Tolerates documents that never went through ``TankSerializer`` validation: entries that are
+    not objects are skipped and unknown colours are dropped.
+    """
+    if not isinstance(annotations, dict):
+        return
+    standard, additional = annotations.get('standard'), annotations.get('additional')
+    sections = (
+        (models.ConstructionTag.STANDARD, standard.items() if isinstance(standard, dict) else ()),
+        (models.ConstructionTag.ADDITIONAL, enumerate(additional) if isinstance(additional, list) else ()),
+    )
+    colors = {value for value, _ in models.ConstructionTag.COLOR_CHOICES}
+    for section, entries in sections:
+        for position, (key, entry) in enumerate(entries):
+            if not isinstance(entry, dict):
+                continue
+            is_standard = section == models.ConstructionTag.STANDARD
+            tag = {
+                'section': section,
+                'position': position,
+                'field_key': str(key)[:64] if is_standard else '',
+                'label': str(_FIELD_LABELS.get(key, key) if is_standard else entry.get('label') or '')[:255],
+                'value': '' if is_standard else str(entry.get('value') or '')[:255],
+                'color': entry.get('color') if entry.get('color') in colors else None,
+                've': bool(entry.get('ve')),
+                'ut': bool(entry.get('ut')),
+                'comment': str(entry.get('comment') or ''),
+            }
+            if tag['color'] or tag['ve'] or tag['ut'] or tag['comment']:
+                yield tag
+
+
+def index_tanks(tanks: Iterable[models.Tank]) -> int:
+    """Rewrite the tags of saved tanks; returns the number of tags written."""
+    tanks = list(tanks)
+    models.ConstructionTag.objects.filter(tank__in=[tank.pk for tank in tanks]).delete()
+    rows = [
+        models.ConstructionTag(tank_id=tank.pk, **entry)
+        for tank in tanks
+        for entry in annotation_entries(tank.construction_annotations)
+    ]
+    models.ConstructionTag.objects.bulk_create(rows, batch_size=INDEX_CHUNK_SIZE)
+    return len(rows)
+
+
+def rebuild() -> int:
+    """Rewrite the tags of every tank; returns the number of tags written."""
+    models.ConstructionTag.objects.all().delete()
+    count = 0
+    queryset = models.Tank.objects.order_by('pk').only('pk', 'construction_annotations')
+    batch: list[models.Tank] = []
+    for tank in queryset.iterator(chunk_size=INDEX_CHUNK_SIZE):
+        batch.append(tank)
+        if len(batch) >= INDEX_CHUNK_SIZE:
+            count += index_tanks(batch)
+            batch = []
+    return count + index_tanks(batch)
+
+
+def _saved(sender, instance, raw=False, update_fields=None, **kwargs) -> None:
+    if raw or (update_fields is not None and 'construction_annotations' not in update_fields):
+        return
+    index_tanks([instance])
+
+
+def connect_signals() -> None:
+    post_save.connect(_saved, sender=models.Tank, dispatch_uid='construction-tags-index')
+
+
+# ---------------------------------------------------------------------------
+# Rollup
+
+def rollup(queryset: QuerySet, group_by: Iterable[str]) -> list[dict[str, Any]]:
+    """Tag and distinct tank counts per group of ``queryset`` (``ConstructionTag`` rows)."""
+    group_by = list(group_by)
+    rows = (
+        queryset.order_by()
+        .values(*group_by)
+        .annotate(tags=Count('pk'), tanks=Count('tank', distinct=True))
+        .order_by(*group_by)
+    )
+    return list(rows)
@@ -0,0 +1,37 @@
+"""Shared builders for the inspections test suite."""
+from __future__ import annotations
+
+from typing import Any
+
+from django.core.cache import cache
+
+from inspections import models
+
+TANK_DEFAULTS: dict[str, Any] = {
+    'owner': 'Acme Midstream',
+    'facility_type': 'terminal',
+    'city': 'Midland',
+    'state': 'TX',
+    'design_standard': 'API 650',
+    'product_stored': 'Crude',
+    'foundation': 'ringwall',
+    'anchors': 'None',
+    'shell_weld_type': 'Butt',
+    'insulation': 'None',
+    'shell_manway': '24 in',
+    'access_structure': 'stair',
+    'bottom_type': 'Flat',
+    'secondary_containment_type': 'Earthen dike',
+}
+
+
+def make_tank(tank_name: str = 'Tank 1', **fields: Any) -> models.Tank:
+    return models.Tank.objects.create(tank_name=tank_name, **{**TANK_DEFAULTS, **fields})
+
+
+class CacheClearingMixin:
+    """Start every test with an empty cache, so cached documents and versions never leak between tests."""
+
+    def setUp(self):
+        super().setUp()  # type: ignore[misc]
+        cache.clear()
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from django.test import SimpleTestCase
+from django.urls import URLPattern
+
+from inspections import async_views, urls
+
+
+class AsyncRouteTests(SimpleTestCase):
+    def first_match(self, path: str) -> URLPattern:
+        for pattern in async_views.urlpatterns(urls.router.urls):
+            if pattern.resolve(path):
+                return pattern
+        self.fail(f'Nothing routes {path}')
+
+    def test_fixed_tank_routes_are_not_taken_for_a_pk(self):
+        for action in ('compliance', 'construction-tags', 'typeahead', 'executive-summary'):
+            with self.subTest(action=action):
+                self.assertEqual(self.first_match(f'tanks/{action}/').name, f'tanks-{action}')
+
+    def test_hot_routes_are_served_async(self):
+        router_views = {pattern.name: pattern.callback for pattern in urls.router.urls}
+        self.assertIsNot(self.first_match('tanks/').callback, router_views['tanks-list'])
+        self.assertIsNot(self.first_match('tanks/7/').callback, router_views['tanks-detail'])
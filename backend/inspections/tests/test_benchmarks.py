@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from django.core.cache import cache as django_cache
+from django.test import LiveServerTestCase
+
+from inspections import benchmarks, models
+
+from .helpers import make_tank
+
+
+class BenchmarkTests(LiveServerTestCase):
+    def setUp(self):
+        django_cache.clear()
+        tank = make_tank()
+        models.VisualFinding.objects.create(tank=tank, area='shell', finding='Rust', comment_type='monitor')
+        make_tank('Tank 2')
+
+    def run_named(self, endpoints, name, requests=4):
+        (endpoint,) = [endpoint for endpoint in endpoints if endpoint.name == name]
+        return benchmarks.run_endpoint(self.live_server_url, endpoint, requests, concurrency=1, warmup=2)
+
+    def test_cold_tank_detail_is_reported_apart_from_the_cached_one(self):
+        endpoints, _skipped = benchmarks.discover()
+        warm = self.run_named(endpoints, 'tanks-detail')
+        cold = self.run_named(endpoints, 'tanks-detail-cold')
+        self.assertEqual(cold.statuses, {'200': 4})
+        # A cached document costs the validator and permission queries; a cold one also serializes.
+        self.assertEqual(len(set(warm.queries)), 1)
+        self.assertGreater(min(cold.queries), max(warm.queries))
+
+    def test_cold_variants_need_a_shared_cache(self):
+        endpoints, skipped = benchmarks.discover(shared_cache=False)
+        self.assertFalse(set(benchmarks.COLD_ENDPOINTS) & {endpoint.name for endpoint in endpoints})
+        self.assertLessEqual(set(benchmarks.COLD_ENDPOINTS), set(skipped))
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from datetime import date
+
+from rest_framework.test import APITestCase
+
+from .helpers import CacheClearingMixin, make_tank
+
+AS_OF = date(2025, 6, 1)
+
+
+class ComplianceRollupTests(CacheClearingMixin, APITestCase):
+    url = '/api/tanks/compliance/'
+
+    def setUp(self):
+        super().setUp()
+        make_tank(
+            'A1', owner='Acme', next_inspection_due_date=date(2025, 5, 1), external_inspection_date=date(2019, 1, 1)
+        )
+        make_tank('A2', owner='Acme', next_inspection_due_date=date(2025, 6, 20))
+        make_tank('A3', owner='Acme', next_inspection_due_date=date(2025, 8, 1))
+        make_tank('B1', owner='Beta', next_inspection_due_date=date(2026, 1, 1), state='OK')
+        make_tank('B2', owner='Beta', next_inspection_due_date=date(2027, 1, 1), state='OK')
+        self.unscheduled = make_tank('B3', owner='Beta', state='OK')
+
+    def rollup(self, **params):
+        response = self.client.get(self.url, {'as_of': AS_OF.isoformat(), **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_buckets_per_owner(self):
+        data = self.rollup()
+        buckets = ('overdue', 'due_30', 'due_90', 'due_365', 'current', 'unscheduled', 'total')
+        counts = {group['owner']: {name: group[name] for name in buckets} for group in data['groups']}
+        self.assertEqual(counts, {
+            'Acme': {'overdue': 1, 'due_30': 1, 'due_90': 1, 'due_365': 0, 'current': 0, 'unscheduled': 0, 'total': 3},
+            'Beta': {'overdue': 0, 'due_30': 0, 'due_90': 0, 'due_365': 1, 'current': 1, 'unscheduled': 1, 'total': 3},
+        })
+        self.assertEqual(data['totals']['total'], 6)
+        self.assertEqual(data['totals']['earliest_due'], '2025-05-01')
+
+    def test_inspection_date_schedules_add_the_interval(self):
+        data = self.rollup(schedule='external', group_by='state')
+        (texas,) = [group for group in data['groups'] if group['state'] == 'TX']
+        # Inspected externally on 2019-01-01 with a 5 year interval: due 2024-01-01.
+        self.assertEqual((texas['overdue'], texas['unscheduled']), (1, 2))
+        self.assertEqual(texas['earliest_due'], '2024-01-01')
+        self.assertEqual(data['interval_years'], 5)
+
+    def test_list_filters_apply(self):
+        data = self.rollup(owner='Beta')
+        self.assertEqual([group['owner'] for group in data['groups']], ['Beta'])
+
+    def test_answers_304_until_a_tank_changes(self):
+        etag = self.client.get(self.url, {'as_of': AS_OF.isoformat()})['ETag']
+        unchanged = self.client.get(self.url, {'as_of': AS_OF.isoformat()}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(unchanged.status_code, 304)
+        self.client.patch(
+            f'/api/tanks/{self.unscheduled.pk}/', {'next_inspection_due_date': '2025-01-01'}, format='json'
+        )
+        changed = self.client.get(self.url, {'as_of': AS_OF.isoformat()}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.json()['totals']['overdue'], 2)
+
+    def test_invalid_parameters(self):
+        for params in ({'as_of': '2025-13-01'}, {'as_of': 'soon'}, {'schedule': 'weekly'}, {'group_by': 'city'}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(self.url, params).status_code, 400)
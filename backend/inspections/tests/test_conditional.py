@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from rest_framework.test import APITestCase
+
+from inspections import models
+
+from .helpers import CacheClearingMixin, make_tank
+
+
+class ConditionalGetTests(CacheClearingMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.tank = make_tank()
+        self.detail_url = f'/api/tanks/{self.tank.pk}/'
+
+    def test_detail_answers_304_until_a_record_changes(self):
+        first = self.client.get(self.detail_url)
+        self.assertEqual(first['Cache-Control'], 'private, no-cache')
+        self.assertIn('Last-Modified', first)
+
+        etag = first['ETag']
+        self.assertEqual(self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        models.VisualFinding.objects.create(tank=self.tank, area='shell', finding='Rust', comment_type='monitor')
+        changed = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], etag)
+
+    def test_list_answers_304_until_the_page_changes(self):
+        etag = self.client.get('/api/tanks/')['ETag']
+        self.assertEqual(self.client.get('/api/tanks/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        make_tank('Tank 2')
+        self.assertEqual(self.client.get('/api/tanks/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_sparse_fieldsets_have_their_own_etag(self):
+        full = self.client.get(self.detail_url)['ETag']
+        sparse = self.client.get(self.detail_url, {'fields': 'tank_name'})
+        self.assertEqual(sparse.json(), {'tank_name': self.tank.tank_name})
+        self.assertNotEqual(sparse['ETag'], full)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import json
+
+from rest_framework.test import APITestCase
+
+from inspections import summaries
+
+from .helpers import CacheClearingMixin, make_tank
+
+
+class ExecutiveSummaryTests(CacheClearingMixin, APITestCase):
+    url = '/api/tanks/executive-summary/'
+
+    def summary(self, params=None):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        return json.loads(b''.join(response.streaming_content))
+
+    def test_an_empty_fleet_streams_an_empty_array(self):
+        self.assertEqual(self.summary(), [])
+
+    def test_streams_one_entry_per_tank_with_colour_buckets(self):
+        tagged = make_tank(
+            'Tagged',
+            foundation='Concrete ring',
+            anchors='',
+            construction_annotations={
+                'standard': {'foundation': {'color': 'red'}, 'anchors': {'color': 'green'}},
+                'additional': [{'label': 'Heater', 'value': 'Steam coil', 'color': 'blue'}, {'label': 'Untagged'}],
+            },
+        )
+        plain = make_tank('Plain')
+
+        rows = self.summary()
+
+        self.assertEqual([row['tank_unique_id'] for row in rows], [str(plain.pk), str(tagged.pk)])
+        self.assertEqual(rows[0]['color_buckets'], {color: [] for color in summaries.TAG_COLORS})
+        self.assertEqual(rows[1]['color_buckets'], {
+            'red': [{'label': 'Foundation', 'value': 'Concrete ring'}],
+            'blue': [{'label': 'Heater', 'value': 'Steam coil'}],
+            'yellow': [],
+            'green': [{'label': 'Anchors', 'value': 'N/A'}],
+        })
+
+    def test_stream_json_array_joins_items(self):
+        chunks = list(summaries.stream_json_array(iter([{'a': 1}, {'b': 2}])))
+        self.assertEqual(json.loads(''.join(chunks)), [{'a': 1}, {'b': 2}])
+        self.assertEqual(''.join(summaries.stream_json_array([])), '[]')
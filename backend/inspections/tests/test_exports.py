@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import date
+
+from rest_framework.test import APITestCase
+
+from inspections import models
+
+from .helpers import CacheClearingMixin, make_tank
+
+UT_HEADER = [
+    'id', 'created_at', 'updated_at', 'tank_id', 'tank_name', 'category', 'location', 'course', 'thickness_in', 'notes'
+]
+
+
+class ExportTests(CacheClearingMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.north = make_tank('North', next_inspection_due_date=date(2027, 5, 1))
+        self.south = make_tank('South')
+        self.other = make_tank('Other')
+        for tank, thickness in ((self.north, '0.2500'), (self.south, '0.1875'), (self.other, '0.3125')):
+            models.UTResult.objects.create(
+                tank=tank, category='shell', location='North', course=1, thickness_in=thickness
+            )
+
+    def export(self, resource, params=None):
+        response = self.client.get(f'/api/exports/{resource}/', params)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('attachment;', response['Content-Disposition'])
+        return b''.join(response.streaming_content).decode()
+
+    def csv_rows(self, resource, params=None):
+        return list(csv.reader(io.StringIO(self.export(resource, params))))
+
+    def ndjson_rows(self, resource, params=None):
+        return [json.loads(line) for line in self.export(resource, {**(params or {}), 'format': 'ndjson'}).splitlines()]
+
+    def test_csv_has_a_header_and_the_tank_name(self):
+        header, *rows = self.csv_rows('ut-results', {'tank_id': str(self.north.pk)})
+        self.assertEqual(header, UT_HEADER)
+        [row] = [dict(zip(header, row)) for row in rows]
+        self.assertEqual(row['tank_id'], str(self.north.pk))
+        self.assertEqual(row['tank_name'], 'North')
+        self.assertEqual(row['thickness_in'], '0.2500')
+        self.assertEqual(row['notes'], '')
+
+    def test_ndjson_encodes_decimals_uuids_and_dates_as_strings(self):
+        [row] = self.ndjson_rows('ut-results', {'tank_id': str(self.south.pk)})
+        self.assertEqual(list(row), UT_HEADER)
+        self.assertEqual(row['tank_id'], str(self.south.pk))
+        self.assertEqual(row['tank_name'], 'South')
+        self.assertEqual(row['thickness_in'], '0.1875')
+        self.assertEqual(row['course'], 1)
+        self.assertIsNone(row['notes'])
+        created_at = models.UTResult.objects.get(tank=self.south).created_at
+        self.assertEqual(row['created_at'], created_at.isoformat())
+
+        [tank] = self.ndjson_rows('tanks', {'tank_id': str(self.north.pk)})
+        self.assertEqual(tank['next_inspection_due_date'], '2027-05-01')
+        self.assertNotIn('tank_name_key', tank)
+
+    def test_tank_id_is_repeatable_and_comma_separated(self):
+        expected = {'North', 'South'}
+        repeated = self.ndjson_rows('ut-results', {'tank_id': [str(self.north.pk), str(self.south.pk)]})
+        self.assertEqual({row['tank_name'] for row in repeated}, expected)
+        joined = self.csv_rows('ut-results', {'tank_id': f'{self.north.pk}, {self.south.pk}'})
+        self.assertEqual({row[4] for row in joined[1:]}, expected)
+
+    def test_invalid_tank_id_is_rejected(self):
+        for export_format in ('csv', 'ndjson'):
+            with self.subTest(export_format=export_format):
+                response = self.client.get(
+                    '/api/exports/ut-results/', {'tank_id': f'{self.north.pk},nope', 'format': export_format}
+                )
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('tank_id', response.content.decode())
+
+    def test_unknown_resource_is_not_found(self):
+        self.assertEqual(self.client.get('/api/exports/nothing/').status_code, 404)
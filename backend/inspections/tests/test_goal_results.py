@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from inspections import models
+
+from .helpers import CacheClearingMixin, make_tank
+
+
+class GoalResultBulkUpsertTests(CacheClearingMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.tank = make_tank()
+        self.existing = models.GoalResult.objects.create(
+            tank=self.tank, goal_key='goal_1', methods=['Document with digital camera'], custom_responses=[]
+        )
+        # Back-date it, so an update in the same clock tick still moves ``updated_at``.
+        models.GoalResult.objects.filter(pk=self.existing.pk).update(updated_at=timezone.now() - timedelta(days=1))
+        self.existing.refresh_from_db()
+        self.url = f'/api/goal-results/bulk/?tank_id={self.tank.pk}'
+
+    def upsert(self, items):
+        return self.client.post(self.url, items, format='json')
+
+    def test_updates_existing_goals_in_place_and_inserts_new_ones(self):
+        response = self.upsert([
+            {'goal_key': 'goal_1', 'methods': ['Ultrasonic Thickness Testing (UT)']},
+            {'goal_key': 'goal_3', 'methods': ['Survey of the shell for settlement']},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['goal_key'] for row in response.json()], ['goal_1', 'goal_3'])
+        updated = models.GoalResult.objects.get(tank=self.tank, goal_key='goal_1')
+        self.assertEqual(updated.pk, self.existing.pk)
+        self.assertEqual(updated.methods, ['Ultrasonic Thickness Testing (UT)'])
+        self.assertEqual(updated.created_at, self.existing.created_at)
+        self.assertGreater(updated.updated_at, self.existing.updated_at)
+        inserted = models.GoalResult.objects.get(tank=self.tank, goal_key='goal_3')
+        self.assertIn('shell_ut_nominal', inserted.standard_responses)  # defaults filled in
+        self.assertEqual(models.GoalResult.objects.count(), 2)
+
+    def test_repeated_goal_is_rejected(self):
+        response = self.upsert([{'goal_key': 'goal_2'}, {'goal_key': 'goal_2'}])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('goal_2', str(response.json()))
+        self.assertFalse(models.GoalResult.objects.filter(goal_key='goal_2').exists())
+
+    def test_requires_a_tank_and_at_least_one_goal(self):
+        no_tank = self.client.post('/api/goal-results/bulk/', [{'goal_key': 'goal_2'}], format='json')
+        self.assertEqual(no_tank.status_code, 400)
+        self.assertEqual(self.upsert([]).status_code, 400)
+
+    def test_upsert_moves_the_tank_detail_etag(self):
+        detail_url = f'/api/tanks/{self.tank.pk}/'
+        etag = self.client.get(detail_url)['ETag']
+
+        self.upsert([{'goal_key': 'goal_1', 'methods': []}])
+
+        response = self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        goal = next(row for row in response.json()['goal_results'] if row['goal_key'] == 'goal_1')
+        self.assertEqual(goal['methods'], [])
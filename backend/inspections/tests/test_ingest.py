@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+
+from inspections import ingest, models, serializers
+
+from .helpers import CacheClearingMixin, make_tank
+
+
+def reading(**fields):
+    return {'category': 'shell', 'location': 'Course 1 N', 'course': 1, 'thickness_in': '0.2500', **fields}
+
+
+class CoerceUTRowTests(SimpleTestCase):
+    def test_valid_row(self):
+        values, errors = ingest.coerce_ut_row(reading())
+        self.assertIsNone(errors)
+        self.assertEqual(str(values['thickness_in']), '0.2500')
+
+    def test_positive_exponent_counts_as_whole_digits(self):
+        _, errors = ingest.coerce_ut_row(reading(thickness_in='1E+5'))
+        self.assertIn('digits before the decimal point', errors['thickness_in'][0])
+        values, errors = ingest.coerce_ut_row(reading(thickness_in='1E+1'))
+        self.assertIsNone(errors)
+
+    def test_too_many_decimal_places(self):
+        _, errors = ingest.coerce_ut_row(reading(thickness_in='0.12345'))
+        self.assertIn('decimal places', errors['thickness_in'][0])
+
+    def test_blank_cells_are_missing_and_padding_is_trimmed(self):
+        values, errors = ingest.coerce_ut_row(reading(category=' roof ', course='', notes='  ', location=' N '))
+        self.assertIsNone(errors)
+        self.assertEqual(
+            (values['category'], values['location'], values['course'], values['notes']), ('roof', 'N', None, None)
+        )
+        _, errors = ingest.coerce_ut_row(reading(category='', thickness_in=None))
+        self.assertEqual(errors, {'category': ['This field is required.'], 'thickness_in': ['This field is required.']})
+
+    def test_errors_match_the_serializer(self):
+        for row in (
+            reading(category='hull'),
+            reading(location='x' * 300),
+            reading(course='-1'),
+            reading(course='two'),
+            reading(thickness_in='thin'),
+            reading(thickness_in='NaN'),
+        ):
+            with self.subTest(row=row):
+                serializer = serializers.UTResultSerializer(data=row)
+                serializer.is_valid()
+                _, errors = ingest.coerce_ut_row(row)
+                self.assertEqual(errors, {name: [str(error) for error in serializer.errors[name]] for name in errors})
+
+
+class UTBulkIngestTests(CacheClearingMixin, APITestCase):
+    def test_ndjson_upload_keeps_valid_rows_and_reports_rejects(self):
+        tank = make_tank()
+        body = '\n'.join(json.dumps(row) for row in (reading(), reading(thickness_in='1E+5'), reading(location='S')))
+        response = self.client.generic(
+            'POST', f'/api/ut-results/bulk/?tank_id={tank.pk}', body, content_type='application/x-ndjson'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['created'], 2)
+        self.assertEqual(response.json()['rejected'], 1)
+        self.assertEqual(models.UTResult.objects.filter(tank=tank).count(), 2)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from unittest import mock
+
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from inspections import models, settlement
+
+from .helpers import CacheClearingMixin, make_tank
+
+
+def package(**overrides):
+    return {
+        'shell_settlement_surveys': [{
+            'station_count': 4,
+            'readings': [{'station_label': str(number), 'measurement_in': 0.25 * number} for number in range(4)],
+        }],
+        'ut_results': [{'category': 'shell', 'location': 'North', 'course': 1, 'thickness_in': '0.2500'}],
+        'edge_settlement_checks': [{'present': False}],
+        'column_plumbness_checks': [{'column_id': 'C1', 'plumbness_in_per_ft': '0.0100'}],
+        'visual_findings': [{'area': 'shell', 'finding': 'Pitting near the manway', 'comment_type': 'monitor'}],
+        'other_nde': [{'nde_type': 'MFL', 'result': 'No indications'}],
+        **overrides,
+    }
+
+
+@override_settings(SETTLEMENT_ANALYSIS_ASYNC=False)
+class InspectionPackageTests(CacheClearingMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.tank = make_tank()
+        self.url = f'/api/tanks/{self.tank.pk}/inspection-package/'
+
+    def test_creates_every_record_and_returns_their_ids(self):
+        with mock.patch.object(settlement, '_enqueue') as enqueue:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(self.url, package(), format='json')
+
+        self.assertEqual(response.status_code, 201)
+        created = response.json()['created']
+        for name, model in (
+            ('shell_settlement_surveys', models.ShellSettlementSurvey),
+            ('ut_results', models.UTResult),
+            ('edge_settlement_checks', models.EdgeSettlementCheck),
+            ('column_plumbness_checks', models.ColumnPlumbnessCheck),
+            ('visual_findings', models.VisualFinding),
+            ('other_nde', models.OtherNDE),
+        ):
+            with self.subTest(name=name):
+                self.assertEqual(created[name], list(model.objects.filter(tank=self.tank).values_list('pk', flat=True)))
+        survey = models.ShellSettlementSurvey.objects.get()
+        self.assertEqual(list(survey.station_readings.values_list('measurement_in', flat=True)), [0.0, 0.25, 0.5, 0.75])
+        self.assertTrue(models.SearchDocument.objects.filter(resource='visual-findings').exists())
+        enqueue.assert_called_once_with([survey.pk])
+
+    def test_one_invalid_record_rejects_the_whole_package(self):
+        body = package(ut_results=[
+            {'category': 'shell', 'location': 'North', 'course': 1, 'thickness_in': '0.2500'},
+            {'category': 'hull', 'location': 'South', 'course': 1, 'thickness_in': '0.2500'},
+        ])
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(self.url, body, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['ut_results'][0], {})
+        self.assertIn('category', response.json()['ut_results'][1])
+        self.assertFalse(models.UTResult.objects.exists())
+        self.assertFalse(models.ShellSettlementSurvey.objects.exists())
+        self.assertEqual(callbacks, [])
+
+    def test_a_failed_insert_leaves_nothing_behind(self):
+        with mock.patch.object(models.OtherNDE.objects, 'bulk_create', side_effect=RuntimeError):
+            with self.captureOnCommitCallbacks() as callbacks:
+                with self.assertRaises(RuntimeError):
+                    self.client.post(self.url, package(), format='json')
+
+        self.assertFalse(models.VisualFinding.objects.exists())
+        self.assertFalse(models.SearchDocument.objects.exists())
+        self.assertFalse(models.SettlementReading.objects.exists())
+        self.assertEqual(callbacks, [])
+
+    def test_an_empty_package_is_rejected(self):
+        response = self.client.post(self.url, {}, format='json')
+        self.assertEqual(response.status_code, 400)
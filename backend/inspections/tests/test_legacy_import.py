@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from inspections import legacy_import, models
+
+from .helpers import make_tank
+
+MAPPING = {
+    'resource': 'ut-results',
+    'tank': {'column': 'Tank', 'match': 'tank_name'},
+    'fields': {
+        'category': {'column': 'Component', 'values': {'SHELL': 'shell', 'BTM': 'bottom'}},
+        'location': 'Location',
+        'course': 'Course',
+        'thickness_in': 'Thk (in)',
+    },
+}
+
+
+class ImportLegacyTests(TestCase):
+    def setUp(self):
+        make_tank('Tank 1')
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.mapping = Path(directory.name) / 'mapping.json'
+        self.mapping.write_text(json.dumps(MAPPING))
+        self.source = Path(directory.name) / 'ut.csv'
+        lines = ['Tank,Component,Location,Course,Thk (in)']
+        lines += [f'Tank 1,SHELL,Point {number},1,0.{250 + number}' for number in range(5)]
+        lines.append('Tank 9,BTM,Center,,0.2500')
+        self.source.write_text('\n'.join(lines) + '\n')
+
+    def run_import(self, *args: str) -> str:
+        out = StringIO()
+        call_command(
+            'import_legacy', str(self.mapping), str(self.source), '--workers=1', '--chunk-size=2', *args, stdout=out
+        )
+        return out.getvalue()
+
+    def test_imports_valid_rows_and_rejects_unmatched_tanks(self):
+        self.run_import()
+
+        self.assertEqual(models.UTResult.objects.count(), 5)
+        checkpoint = models.ImportCheckpoint.objects.get()
+        self.assertEqual((checkpoint.rows_done, checkpoint.created, checkpoint.rejected), (6, 5, 1))
+        self.assertIsNotNone(checkpoint.completed_at)
+        self.assertIn('already imported', self.run_import())
+        self.assertEqual(models.UTResult.objects.count(), 5)
+
+    def test_interrupted_import_resumes_after_the_last_committed_chunk(self):
+        write_chunk = legacy_import.write_chunk
+        calls = []
+
+        def interrupted(mapping, result, checkpoint):
+            calls.append(result.end)
+            if len(calls) == 2:
+                raise KeyboardInterrupt
+            return write_chunk(mapping, result, checkpoint)
+
+        with mock.patch.object(legacy_import, 'write_chunk', side_effect=interrupted):
+            with self.assertRaises(KeyboardInterrupt):
+                self.run_import()
+        self.assertEqual(models.UTResult.objects.count(), 2)
+        self.assertEqual(models.ImportCheckpoint.objects.get().rows_done, 2)
+
+        self.assertIn('resuming after 2 rows', self.run_import())
+        self.assertEqual(
+            sorted(models.UTResult.objects.values_list('location', flat=True)),
+            [f'Point {number}' for number in range(5)],
+        )
+        checkpoint = models.ImportCheckpoint.objects.get()
+        self.assertEqual((checkpoint.rows_done, checkpoint.created, checkpoint.rejected), (6, 5, 1))
+
+    def test_changed_file_needs_restart(self):
+        self.run_import()
+        with self.source.open('a') as source:
+            source.write('Tank 1,BTM,Edge,,0.3000\n')
+
+        with self.assertRaisesMessage(CommandError, 'restart it'):
+            self.run_import()
+
+        self.run_import('--restart')
+        self.assertEqual(models.UTResult.objects.count(), 11)
+        self.assertEqual(models.ImportCheckpoint.objects.get().created, 6)
+
+    def test_dry_run_writes_nothing(self):
+        self.assertIn('Validated', self.run_import('--dry-run'))
+        self.assertFalse(models.UTResult.objects.exists())
+        self.assertFalse(models.ImportCheckpoint.objects.exists())
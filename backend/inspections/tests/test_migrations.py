@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+
+class MigrationTestCase(TransactionTestCase):
+    """Migrate back to ``migrate_from``, let the test load rows, then migrate forward to ``migrate_to``."""
+
+    migrate_from: str
+    migrate_to: str
+
+    def setUp(self):
+        super().setUp()
+        executor = MigrationExecutor(connection)
+        self.addCleanup(self._migrate, executor.loader.graph.leaf_nodes())
+        self.apps = self._migrate([('inspections', self.migrate_from)])
+
+    def migrate_forward(self):
+        self.apps = self._migrate([('inspections', self.migrate_to)])
+
+    @staticmethod
+    def _migrate(targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def make_tank(self, tank_name='Tank 1'):
+        return self.apps.get_model('inspections', 'Tank').objects.create(
+            tank_name=tank_name, owner='Acme Midstream', facility_type='terminal', city='Midland', state='TX'
+        )
+
+
+class SearchBackfillTests(MigrationTestCase):
+    migrate_from = '0010_sync_change_feed'
+    migrate_to = '0011_search_documents'
+
+    def test_existing_records_are_indexed(self):
+        tank = self.make_tank()
+        VisualFinding = self.apps.get_model('inspections', 'VisualFinding')
+        finding = VisualFinding.objects.create(
+            tank=tank, area='shell', finding='Pitting at the manway', comment_type='monitor'
+        )
+        self.apps.get_model('inspections', 'OtherNDE').objects.create(tank=tank, nde_type='MFL', result='  ')
+
+        self.migrate_forward()
+
+        documents = self.apps.get_model('inspections', 'SearchDocument').objects.all()
+        self.assertEqual(
+            list(documents.values_list('resource', 'object_id', 'title', 'body')),
+            [('visual-findings', str(finding.pk), 'Shell · Monitor', 'Pitting at the manway')],
+        )
+        if connection.vendor == 'sqlite':  # the FTS5 triggers saw the backfill too
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT rowid FROM inspections_searchdocument_fts WHERE inspections_searchdocument_fts MATCH %s',
+                    ['pitting'],
+                )
+                self.assertEqual([row[0] for row in cursor.fetchall()], [documents.get().pk])
+
+
+class ConstructionTagBackfillTests(MigrationTestCase):
+    migrate_from = '0013_import_checkpoints'
+    migrate_to = '0014_construction_tags'
+
+    def test_existing_tanks_are_tagged(self):
+        tank = self.make_tank()
+        tank.construction_annotations = {
+            'standard': {'annular_plate': {'color': 'red'}, 'anchors': {}},
+            'additional': [{'label': 'Gauge pole', 'value': '6 in', 'ut': True}],
+        }
+        tank.save()
+
+        self.migrate_forward()
+
+        tags = self.apps.get_model('inspections', 'ConstructionTag').objects.filter(tank_id=tank.pk)
+        self.assertEqual(
+            list(tags.values_list('section', 'field_key', 'label', 'value', 'color', 'ut')),
+            [
+                ('additional', '', 'Gauge pole', '6 in', None, True),
+                ('standard', 'annular_plate', 'Annular plate', '', 'red', False),
+            ],
+        )
+
+
+class SettlementReadingSplitTests(MigrationTestCase):
+    migrate_from = '0005_settlement_analysis'
+    migrate_to = '0006_settlement_readings'
+
+    def make_survey(self, readings):
+        return self.apps.get_model('inspections', 'ShellSettlementSurvey').objects.create(
+            tank=self.make_tank(), station_count=len(readings), readings=readings
+        )
+
+    def test_readings_become_station_rows(self):
+        survey = self.make_survey([
+            {'station_label': 'A', 'measurement_in': 0.5},
+            {'station_label': 'B', 'measurement_in': '-0.25'},
+            {'station_label': 'C', 'measurement_in': None},
+            {'station_label': 'D', 'measurement_in': ''},
+        ])
+
+        self.migrate_forward()
+
+        rows = self.apps.get_model('inspections', 'SettlementReading').objects.filter(survey_id=survey.pk)
+        self.assertEqual(
+            list(rows.order_by('position').values_list('station_label', 'measurement_in')),
+            [('A', 0.5), ('B', -0.25), ('C', None), ('D', None)],
+        )
+
+    def test_readings_that_cannot_be_copied_stop_the_migration(self):
+        survey = self.make_survey([
+            {'station_label': 'A', 'measurement_in': 0.5},
+            {'station_label': 'B', 'measurement_in': 'see photo'},
+        ])
+
+        with self.assertRaisesMessage(ValueError, f"survey {survey.pk}, station 2 ('B'): measurement_in 'see photo'"):
+            self.migrate_forward()
+        survey.delete()  # so the cleanup can migrate forward again
+
+
+class TankNameKeyBackfillTests(MigrationTestCase):
+    migrate_from = '0011_search_documents'
+    migrate_to = '0012_tank_filter_indexes'
+
+    def test_existing_tanks_get_name_keys(self):
+        tank = self.make_tank('Tank  North 07')
+
+        self.migrate_forward()
+
+        keys = self.apps.get_model('inspections', 'Tank').objects.values_list('tank_name_key', 'tank_name_sort')
+        self.assertEqual(keys.get(pk=tank.pk), ('tank north 07', 'tank north 000000000007'))
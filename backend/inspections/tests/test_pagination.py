@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from rest_framework.test import APITestCase
+
+from .helpers import CacheClearingMixin, make_tank
+
+
+class KeysetPaginationTests(CacheClearingMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        for number in range(5):
+            make_tank(f'Tank {number}')
+
+    def names(self, response):
+        return [row['tank_name'] for row in response.json()['results']]
+
+    def test_pages_walk_forwards_and_backwards(self):
+        first = self.client.get('/api/tanks/', {'page_size': 2})
+        self.assertEqual(self.names(first), ['Tank 0', 'Tank 1'])
+        self.assertIsNone(first.json()['previous'])
+
+        second = self.client.get(first.json()['next'])
+        self.assertEqual(self.names(second), ['Tank 2', 'Tank 3'])
+
+        last = self.client.get(second.json()['next'])
+        self.assertEqual(self.names(last), ['Tank 4'])
+        self.assertIsNone(last.json()['next'])
+
+        back = self.client.get(last.json()['previous'])
+        self.assertEqual(self.names(back), ['Tank 2', 'Tank 3'])
+
+    def test_rows_inserted_behind_the_cursor_do_not_shift_later_pages(self):
+        first = self.client.get('/api/tanks/', {'page_size': 2})
+        make_tank('Tank 00')
+        second = self.client.get(first.json()['next'])
+        self.assertEqual(self.names(second), ['Tank 2', 'Tank 3'])
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get('/api/tanks/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
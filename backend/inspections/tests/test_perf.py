@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import re
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from rest_framework import serializers as drf_serializers
+from rest_framework.test import APITestCase
+
+from inspections import models, perf, serializers
+
+from .helpers import CacheClearingMixin, make_tank
+
+
+class SerializerTimingTests(TestCase):
+    def test_drf_serializers_are_left_alone(self):
+        self.assertEqual(drf_serializers.BaseSerializer.data.fget.__module__, 'rest_framework.serializers')
+
+    def test_each_row_is_timed_once(self):
+        for number in range(3):
+            make_tank(f'Tank {number}')
+        tanks = list(models.Tank.objects.prefetch_related(*serializers.TankDetailSerializer.prefetch_fields))
+        metrics = perf.RequestMetrics()
+        token = perf._current.set(metrics)
+        self.addCleanup(perf._current.reset, token)
+        timed = mock.Mock(wraps=perf.perf_counter)
+        with mock.patch.object(perf, 'perf_counter', timed):
+            data = serializers.TankDetailSerializer(tanks, many=True).data
+        self.assertEqual(len(data), 3)
+        # A start and an end per row; the nested record serializers are not timed again.
+        self.assertEqual(timed.call_count, 6)
+        self.assertGreater(metrics.serialize_seconds, 0)
+        self.assertFalse(metrics.serializing)
+
+    def test_outside_a_request_nothing_is_recorded(self):
+        make_tank()
+        with mock.patch.object(perf, 'perf_counter') as timed:
+            serializers.TankSerializer(models.Tank.objects.get()).data
+        timed.assert_not_called()
+
+
+@override_settings(PERF_TOKEN='secret')
+class PerfMiddlewareTests(CacheClearingMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        perf.reset()
+        make_tank()
+
+    def test_server_timing_and_summary(self):
+        response = self.client.get('/api/tanks/')
+        self.assertRegex(
+            response['Server-Timing'],
+            r'^app;dur=[\d.]+, db;dur=[\d.]+;desc="queries=\d+", serialize;dur=[\d.]+$',
+        )
+        queries = int(re.search(r'queries=(\d+)', response['Server-Timing']).group(1))
+        self.assertGreater(queries, 0)
+
+        self.assertEqual(self.client.get('/api/_perf/').status_code, 403)
+        summary = self.client.get('/api/_perf/', HTTP_X_PERF_TOKEN='secret').json()
+        (row,) = [row for row in summary['views'] if row['view'] == 'TankViewSet.list']
+        self.assertEqual((row['requests'], row['queries']), (1, queries))
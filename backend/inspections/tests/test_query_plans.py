@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import io
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from inspections import query_plans
+
+# Composite indexes from models.py that the audited endpoints are expected to read through.
+ENDPOINT_INDEXES = (
+    'tank_name_pk_idx',
+    'tank_owner_idx',
+    'tank_state_idx',
+    'tank_facility_idx',
+    'tank_updated_idx',
+    'settlement_created_idx',
+    'settlement_tank_created_idx',
+    'settlement_reading_station_idx',
+    'ut_result_created_idx',
+    'ut_result_tank_created_idx',
+    'ut_result_tank_category_idx',
+    'ut_result_category_idx',
+    'edge_check_created_idx',
+    'edge_check_tank_created_idx',
+    'plumbness_created_idx',
+    'plumbness_tank_created_idx',
+    'visual_created_idx',
+    'visual_tank_created_idx',
+    'other_nde_created_idx',
+    'other_nde_tank_created_idx',
+    'goal_result_created_idx',
+    'goal_result_tank_created_idx',
+    'tag_field_color_idx',
+    'tag_color_idx',
+    'tag_ut_idx',
+    'tombstone_deleted_idx',
+)
+
+
+class CheckQueryPlansCommandTests(TestCase):
+    def test_every_endpoint_reads_through_its_indexes(self):
+        out = io.StringIO()
+        call_command('check_query_plans', tanks=30, ut_results=5, show_plans=True, stdout=out)
+
+        output = out.getvalue()
+        count = len(query_plans.ENDPOINTS) + len(query_plans.SORTED_ENDPOINTS)
+        self.assertIn(f'All {count} endpoints use indexed plans.', output)
+        self.assertNotIn('FAIL', output)
+        for index in ENDPOINT_INDEXES:
+            with self.subTest(index=index):
+                self.assertRegex(output, rf'USING (COVERING )?INDEX {index}\b')
+
+
+class PlanProblemTests(SimpleTestCase):
+    def test_sqlite_scans_and_sorts(self):
+        plan = [
+            'SCAN inspections_tank',
+            'SCAN inspections_tank USING INDEX tank_name_pk_idx',
+            'USE TEMP B-TREE FOR ORDER BY',
+        ]
+        self.assertEqual(
+            query_plans.plan_problems(plan, 'sqlite'),
+            ['sequential scan: SCAN inspections_tank', 'sort: USE TEMP B-TREE FOR ORDER BY'],
+        )
+        self.assertEqual(len(query_plans.plan_problems(plan, 'sqlite', allow_sort=True)), 1)
+
+    def test_postgres_scans_and_sorts(self):
+        plan = ['Limit', '  Sort', '    Seq Scan on inspections_tank']
+        self.assertEqual(
+            query_plans.plan_problems(plan, 'postgresql'),
+            ['sort: Sort', 'sequential scan: Seq Scan on inspections_tank'],
+        )
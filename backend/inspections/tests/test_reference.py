@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import time
+from unittest import mock
+
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from inspections import models
+
+from .helpers import CacheClearingMixin
+
+
+@override_settings(TANK_DETAIL_CACHE_TIMEOUT=60)
+class ReferenceDataTests(CacheClearingMixin, APITestCase):
+    def version(self):
+        return self.client.get('/api/metadata/').json()['version']
+
+    def test_template_edit_through_the_api_moves_the_version(self):
+        before = self.version()
+        response = self.client.post(
+            '/api/goal-question-templates/', {'goal_key': 'goal_1', 'prompt': 'Is it tight?'}, format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertNotEqual(self.version(), before)
+
+    def test_versioned_requests_are_immutable(self):
+        version = self.version()
+        response = self.client.get('/api/metadata/', {'v': version})
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(self.client.get('/api/metadata/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    def test_in_process_cache_picks_up_other_workers_edits_within_the_timeout(self):
+        before = self.version()
+        # Another worker's write: its cache invalidation never reaches this process's cache.
+        models.GoalQuestionTemplate.objects.create(goal_key='goal_1', prompt='Is it tight?')
+        self.assertEqual(self.version(), before)
+        with mock.patch.object(time, 'time', return_value=time.time() + 61):
+            self.assertNotEqual(self.version(), before)
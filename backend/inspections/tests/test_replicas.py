@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from unittest import mock
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase
+from django.urls import resolve
+
+from inspections import models, replicas
+
+
+def api_request(method: str, path: str, **extra):
+    request = getattr(RequestFactory(), method)(path, **extra)
+    request.resolver_match = resolve(path)
+    return request
+
+
+def replica_middleware(get_response) -> replicas.ReplicaMiddleware:
+    # The middleware only checks that the alias is configured; nothing here queries it.
+    with mock.patch.dict(settings.DATABASES, {replicas.REPLICA_DB_ALIAS: settings.DATABASES[DEFAULT_DB_ALIAS]}):
+        return replicas.ReplicaMiddleware(get_response)
+
+
+def read_alias() -> str:
+    return replicas.ReplicaRouter().db_for_read(models.Tank)
+
+
+class ReplicaRouterTests(SimpleTestCase):
+    def route(self, request) -> str:
+        token = replicas._routing.set(replicas.RequestRouting(request, pinned=replicas.PIN_COOKIE in request.COOKIES))
+        try:
+            return read_alias()
+        finally:
+            replicas._routing.reset(token)
+
+    def test_safe_inspection_reads_go_to_the_replica(self):
+        self.assertEqual(self.route(api_request('get', '/api/tanks/')), replicas.REPLICA_DB_ALIAS)
+
+    def test_reads_stay_on_the_primary(self):
+        pinned = api_request('get', '/api/tanks/')
+        pinned.COOKIES[replicas.PIN_COOKIE] = '1'
+        self.assertEqual(self.route(pinned), DEFAULT_DB_ALIAS)
+        self.assertEqual(self.route(api_request('post', '/api/tanks/')), DEFAULT_DB_ALIAS)
+        self.assertEqual(self.route(api_request('get', '/api/sync/changes/')), DEFAULT_DB_ALIAS)
+        self.assertEqual(read_alias(), DEFAULT_DB_ALIAS)  # outside a request
+
+        request = api_request('get', '/api/tanks/')
+        with replicas.primary():
+            self.assertEqual(self.route(request), DEFAULT_DB_ALIAS)
+        with mock.patch.object(connections[DEFAULT_DB_ALIAS], 'in_atomic_block', True):
+            self.assertEqual(self.route(request), DEFAULT_DB_ALIAS)
+
+    def test_a_write_pins_the_rest_of_the_request(self):
+        routing = replicas.RequestRouting(api_request('get', '/api/tanks/'), pinned=False)
+        token = replicas._routing.set(routing)
+        try:
+            self.assertEqual(read_alias(), replicas.REPLICA_DB_ALIAS)
+            replicas.ReplicaRouter().db_for_write(models.Tank)
+            self.assertEqual(read_alias(), DEFAULT_DB_ALIAS)
+        finally:
+            replicas._routing.reset(token)
+
+
+class ReplicaMiddlewareTests(SimpleTestCase):
+    def test_unsafe_requests_set_the_pin_cookie(self):
+        middleware = replica_middleware(lambda request: HttpResponse())
+        self.assertNotIn(replicas.PIN_COOKIE, middleware(api_request('get', '/api/tanks/')).cookies)
+        self.assertIn(replicas.PIN_COOKIE, middleware(api_request('post', '/api/tanks/')).cookies)
+
+    def test_streaming_responses_keep_routing_until_exhausted(self):
+        def chunks():
+            for _ in range(2):
+                yield read_alias()
+
+        middleware = replica_middleware(lambda request: StreamingHttpResponse(chunks()))
+        response = middleware(api_request('get', '/api/tanks/executive-summary/'))
+
+        self.assertEqual(read_alias(), DEFAULT_DB_ALIAS)
+        self.assertEqual(b''.join(response), replicas.REPLICA_DB_ALIAS.encode() * 2)
+        self.assertEqual(read_alias(), DEFAULT_DB_ALIAS)
+
+    async def test_async_streaming_responses_keep_routing_until_exhausted(self):
+        async def chunks():
+            for _ in range(2):
+                yield read_alias()
+
+        async def get_response(request):
+            return StreamingHttpResponse(chunks())
+
+        middleware = replica_middleware(get_response)
+        response = await middleware(api_request('get', '/api/tanks/executive-summary/'))
+
+        self.assertEqual(read_alias(), DEFAULT_DB_ALIAS)
+        self.assertEqual(b''.join([chunk async for chunk in response]), replicas.REPLICA_DB_ALIAS.encode() * 2)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest import mock
+
+from django.db import transaction
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from inspections import models, reports
+
+from .helpers import make_tank
+
+
+class ScheduleRenderTests(TestCase):
+    def setUp(self):
+        self.addCleanup(reports._in_flight.clear)
+        patcher = mock.patch.object(reports, '_get_executor')
+        self.executor = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+
+    def test_job_is_submitted_once_until_it_finishes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(reports.schedule_render('tank-1', 'pdf'))
+            self.executor.submit.assert_not_called()
+        self.assertFalse(reports.schedule_render('tank-1', 'pdf'))
+        self.assertTrue(reports.schedule_render('tank-1', 'html'))
+        self.executor.submit.assert_called_once_with(reports._render_job, 'tank-1', 'pdf', None)
+
+        done = self.executor.submit.return_value.add_done_callback.call_args.args[0]
+        done(self.executor.submit.return_value)
+        self.assertTrue(reports.schedule_render('tank-1', 'pdf'))
+
+    def test_rolled_back_job_can_be_scheduled_again(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    reports.schedule_render('tank-1', 'pdf')
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.executor.submit.assert_not_called()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(reports.schedule_render('tank-1', 'pdf'))
+        self.executor.submit.assert_called_once()
+
+
+class ReportBatchRetrieveTests(APITestCase):
+    def setUp(self):
+        self.batch = models.ReportBatch.objects.create()
+        running, done, _fresh = (
+            models.ReportBatchItem.objects.create(batch=self.batch, tank=make_tank(name), status=status)
+            for name, status in (('A', 'running'), ('B', 'done'), ('C', 'running'))
+        )
+        models.ReportBatchItem.objects.filter(pk__in=[running.pk, done.pk]).update(
+            updated_at=timezone.now() - timedelta(hours=1)
+        )
+        self.stalled = running
+        self.url = f'/api/report-batches/{self.batch.pk}/'
+
+    def test_counts_reflect_the_requeued_items(self):
+        with mock.patch.object(reports, '_submit') as submit:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        counts = {name: response.json()[name] for name in ('total', 'pending', 'running', 'done', 'failed')}
+        self.assertEqual(counts, {'total': 3, 'pending': 1, 'running': 1, 'done': 1, 'failed': 0})
+        submit.assert_called_once_with([(str(self.stalled.tank_id), 'pdf', self.stalled.pk)])
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from unittest import mock
+
+from rest_framework.test import APITestCase
+
+from inspections import models, search
+
+from .helpers import CacheClearingMixin, make_tank
+
+
+class SearchTests(CacheClearingMixin, APITestCase):
+    url = '/api/search/'
+
+    def setUp(self):
+        super().setUp()
+        tank = make_tank()
+        for finding in ('Heavy pitting near the roof seam', 'Coating failure on shell', 'Pitting and coating loss'):
+            models.VisualFinding.objects.create(tank=tank, area='roof', finding=finding, comment_type='monitor')
+
+    def findings(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return sorted(result['snippet']['text'] for result in response.json()['results'])
+
+    def test_terms_phrases_alternatives_and_exclusions(self):
+        self.assertEqual(self.findings(q='pitting'), ['Heavy pitting near the roof seam', 'Pitting and coating loss'])
+        self.assertEqual(self.findings(q='pitting -coating'), ['Heavy pitting near the roof seam'])
+        self.assertEqual(self.findings(q='"coating failure" or seam'), [
+            'Coating failure on shell', 'Heavy pitting near the roof seam',
+        ])
+
+    def test_other_databases_fall_back_to_substring_matching(self):
+        with mock.patch.dict(search.MATCHERS, clear=True):
+            self.assertEqual(self.findings(q='pitting -coating'), ['Heavy pitting near the roof seam'])
+            self.assertEqual(self.findings(q='"coating failure" or seam'), [
+                'Coating failure on shell', 'Heavy pitting near the roof seam',
+            ])
+
+    def test_query_is_required(self):
+        self.assertEqual(self.client.get(self.url).status_code, 400)
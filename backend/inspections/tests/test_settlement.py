@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from unittest import mock
+
+from django.db import transaction
+from django.test import TestCase, override_settings
+from rest_framework.test import APITestCase
+
+from inspections import models, settlement
+
+from .helpers import CacheClearingMixin, make_tank
+
+
+def make_survey(tank: models.Tank, measurements=(0.0, 0.5, 1.0, 0.25, -0.5, -0.25, 0.1, 0.0)):
+    survey = models.ShellSettlementSurvey.objects.create(tank=tank, station_count=len(measurements))
+    models.SettlementReading.objects.bulk_create(
+        models.SettlementReading(
+            survey=survey, tank=tank, position=position, station_label=str(position + 1), measurement_in=value
+        )
+        for position, value in enumerate(measurements)
+    )
+    return survey
+
+
+class SettlementAnalysisTests(TestCase):
+    def test_refresh_clears_staleness_until_the_survey_changes(self):
+        tank = make_tank(diameter_ft=100, height_ft=40)
+        survey = make_survey(tank)
+        self.assertEqual(list(settlement.stale_surveys()), [survey])
+
+        self.assertEqual(settlement.refresh_analyses(settlement.stale_surveys()), 1)
+        self.assertFalse(settlement.stale_surveys().exists())
+
+        survey.save()
+        self.assertEqual(list(settlement.stale_surveys()), [survey])
+
+    def test_unfittable_surveys_are_stale_only_while_an_analysis_is_left(self):
+        tank = make_tank(diameter_ft=100, height_ft=40)
+        make_survey(tank, measurements=(0.0, 0.5))
+        make_survey(tank, measurements=(0.0, None, 1.0, 0.5))
+        self.assertFalse(settlement.stale_surveys().exists())
+
+        survey = make_survey(tank)
+        settlement.refresh_analyses(settlement.stale_surveys())
+        survey.station_readings.filter(position=0).update(measurement_in=float('inf'))
+        self.assertEqual(list(settlement.stale_surveys()), [survey])
+
+        settlement.refresh_analyses(settlement.stale_surveys())
+        self.assertFalse(models.SettlementAnalysis.objects.exists())
+        self.assertFalse(settlement.stale_surveys().exists())
+
+
+@override_settings(SETTLEMENT_ANALYSIS_ASYNC=False)
+class ScheduleRefreshTests(TestCase):
+    def setUp(self):
+        for state in (settlement._scheduled, settlement._running, settlement._rerun):
+            self.addCleanup(state.clear)
+
+    def test_runs_after_commit(self):
+        with mock.patch.object(settlement, '_run_refresh') as run:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertEqual(settlement.schedule_refresh([3, 1, 3]), 2)
+                run.assert_not_called()
+        run.assert_called_once_with([1, 3], False)
+
+    def test_rolled_back_surveys_can_be_scheduled_again(self):
+        with mock.patch.object(settlement, 'refresh_analyses') as refresh:
+            with self.captureOnCommitCallbacks(execute=True):
+                try:
+                    with transaction.atomic():
+                        settlement.schedule_refresh([1])
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+            refresh.assert_not_called()
+            with self.captureOnCommitCallbacks(execute=True):
+                settlement.schedule_refresh([1])
+            refresh.assert_called_once()
+
+    def test_write_during_a_refit_runs_it_again(self):
+        calls = []
+
+        def refresh(queryset):
+            calls.append(queryset)
+            if len(calls) == 1:
+                # The survey is saved again after this refit read it.
+                settlement.schedule_refresh([1])
+
+        with mock.patch.object(settlement, 'refresh_analyses', side_effect=refresh):
+            with self.captureOnCommitCallbacks(execute=True):
+                settlement.schedule_refresh([1])
+        self.assertEqual(len(calls), 2)
+        self.assertFalse(settlement._scheduled or settlement._running or settlement._rerun)
+
+    @override_settings(SETTLEMENT_ANALYSIS_ASYNC=True)
+    def test_surveys_already_queued_are_skipped(self):
+        with mock.patch.object(settlement, '_get_executor') as executor:
+            with self.captureOnCommitCallbacks(execute=True):
+                settlement.schedule_refresh([1, 2])
+            with self.captureOnCommitCallbacks(execute=True):
+                settlement.schedule_refresh([2, 3])
+        submitted = [call.args[1] for call in executor.return_value.submit.call_args_list]
+        self.assertEqual(submitted, [[1, 2], [3]])
+
+
+@override_settings(SETTLEMENT_ANALYSIS_ASYNC=False)
+class SettlementEndpointTests(CacheClearingMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        for state in (settlement._scheduled, settlement._running, settlement._rerun):
+            self.addCleanup(state.clear)
+        self.tank = make_tank(diameter_ft=100, height_ft=40)
+        make_survey(self.tank)
+        make_survey(self.tank, measurements=(0.0, 0.5))
+
+    def test_worst_queues_each_stale_survey_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self.client.get('/api/shell-settlement-surveys/worst/')
+        self.assertEqual(first.json()['pending'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            second = self.client.get('/api/shell-settlement-surveys/worst/')
+        self.assertEqual(second.json()['pending'], 0)
+        self.assertEqual(len(second.json()['results']), 1)
+        self.assertEqual(callbacks, [])
+
+    def test_tank_settlement_reads_stored_analyses_and_queues_stale_ones(self):
+        with mock.patch.object(settlement, 'refresh_analyses') as refresh:
+            response = self.client.get(f'/api/tanks/{self.tank.pk}/settlement/')
+        refresh.assert_not_called()
+        self.assertEqual(response.json(), {'pending': 1, 'results': []})
+
+        settlement.refresh_analyses(settlement.stale_surveys())
+        response = self.client.get(f'/api/tanks/{self.tank.pk}/settlement/')
+        self.assertEqual(response.json()['pending'], 0)
+        self.assertEqual(len(response.json()['results']), 1)
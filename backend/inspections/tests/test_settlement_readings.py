@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from inspections import models
+
+from .helpers import CacheClearingMixin, make_tank
+
+READINGS = [
+    {'station_label': 'A', 'measurement_in': 0.0},
+    {'station_label': 'B', 'measurement_in': 0.5},
+    {'station_label': 'C', 'measurement_in': None},
+    {'station_label': 'D', 'measurement_in': -0.25},
+]
+
+
+@override_settings(SETTLEMENT_ANALYSIS_ASYNC=False)
+class SurveyReadingsTests(CacheClearingMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.tank = make_tank()
+
+    def create_survey(self, readings=READINGS):
+        return self.client.post(
+            '/api/shell-settlement-surveys/',
+            {'tank': str(self.tank.pk), 'station_count': len(readings), 'readings': readings},
+            format='json',
+        )
+
+    def test_readings_round_trip_through_station_rows(self):
+        response = self.create_survey()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['readings'], READINGS)
+
+        survey = models.ShellSettlementSurvey.objects.get()
+        self.assertEqual(
+            list(survey.station_readings.values_list('position', 'station_label', 'measurement_in', 'tank_id')),
+            [
+                (position, item['station_label'], item['measurement_in'], self.tank.pk)
+                for position, item in enumerate(READINGS)
+            ],
+        )
+        detail = self.client.get(f'/api/shell-settlement-surveys/{survey.pk}/')
+        self.assertEqual(detail.json()['readings'], READINGS)
+
+    def test_numeric_strings_are_stored_as_numbers(self):
+        response = self.create_survey([{'station_label': 1, 'measurement_in': '0.125'}])
+        self.assertEqual(response.json()['readings'], [{'station_label': '1', 'measurement_in': 0.125}])
+
+    def test_writing_readings_replaces_the_station_rows(self):
+        survey_id = self.create_survey().json()['id']
+        url = f'/api/shell-settlement-surveys/{survey_id}/'
+
+        self.client.patch(url, {'readings': READINGS[:2]}, format='json')
+        self.assertEqual(models.SettlementReading.objects.filter(survey_id=survey_id).count(), 2)
+
+        self.client.patch(url, {'station_count': 2}, format='json')
+        self.assertEqual(self.client.get(url).json()['readings'], READINGS[:2])
+
+    def test_invalid_readings_are_rejected(self):
+        for readings in (
+            'A=0.1',
+            ['A'],
+            [{'station_label': 'A'}],
+            [{'station_label': 'A', 'measurement_in': 'n/a'}],
+            [{'station_label': 'A', 'measurement_in': 'inf'}],
+            [{'station_label': 'A' * 51, 'measurement_in': 0.1}],
+        ):
+            with self.subTest(readings=readings):
+                response = self.create_survey(readings)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('readings', response.json())
+        self.assertFalse(models.ShellSettlementSurvey.objects.exists())
+
+
+class SettlementReadingEndpointTests(CacheClearingMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.tank = make_tank()
+        other = make_tank('Tank 2')
+        self.survey = self.make_survey(self.tank, [0.0, 0.5, 1.0])
+        self.make_survey(other, [2.0])
+
+    @staticmethod
+    def make_survey(tank, measurements):
+        survey = models.ShellSettlementSurvey.objects.create(tank=tank, station_count=len(measurements))
+        models.SettlementReading.objects.bulk_create(
+            models.SettlementReading(
+                survey=survey, tank=tank, position=position, station_label=f'S{position + 1}', measurement_in=value
+            )
+            for position, value in enumerate(measurements)
+        )
+        return survey
+
+    def readings(self, params):
+        response = self.client.get('/api/settlement-readings/', params)
+        self.assertEqual(response.status_code, 200)
+        return [(row['station_label'], row['measurement_in']) for row in response.json()['results']]
+
+    def test_filters(self):
+        self.assertEqual(self.readings({'tank_id': str(self.tank.pk)}), [('S1', 0.0), ('S2', 0.5), ('S3', 1.0)])
+        self.assertEqual(self.readings({'survey_id': self.survey.pk, 'station_label': 'S2'}), [('S2', 0.5)])
+        self.assertEqual(self.readings({'measurement_gte': '0.5', 'measurement_lt': '2'}), [('S2', 0.5), ('S3', 1.0)])
+        self.assertEqual(self.readings({'measurement_gt': '1'}), [('S1', 2.0)])
+
+    def test_invalid_measurement_bound_is_a_validation_error(self):
+        response = self.client.get('/api/settlement-readings/', {'measurement_lte': 'deep'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('measurement_lte', response.json())
+
+    def test_read_only(self):
+        response = self.client.post('/api/settlement-readings/', {}, format='json')
+        self.assertEqual(response.status_code, 405)
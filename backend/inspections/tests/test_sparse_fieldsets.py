@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from inspections import models, serializers
+
+from .helpers import CacheClearingMixin, make_tank
+
+
+class ParseFieldListTests(APITestCase):
+    def test_parses_comma_separated_names(self):
+        self.assertEqual(serializers.parse_field_list(' id, thickness_in ,,'), {'id', 'thickness_in'})
+        self.assertIsNone(serializers.parse_field_list(''))
+        self.assertIsNone(serializers.parse_field_list(' , '))
+
+
+class SparseFieldsetTests(CacheClearingMixin, APITestCase):
+    url = '/api/ut-results/'
+
+    def setUp(self):
+        super().setUp()
+        self.tank = make_tank()
+        models.UTResult.objects.create(
+            tank=self.tank, category='shell', location='North', course=1, thickness_in='0.2500', notes='Pitted'
+        )
+
+    def results(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results']
+
+    def test_fields_keeps_only_the_named_fields(self):
+        self.assertEqual(self.results({'fields': 'id,thickness_in'})[0].keys(), {'id', 'thickness_in'})
+
+    def test_exclude_drops_the_named_fields(self):
+        row = self.results({'exclude': 'notes,location'})[0]
+        self.assertNotIn('notes', row)
+        self.assertNotIn('location', row)
+        self.assertEqual(row['thickness_in'], '0.2500')
+
+    def test_fields_and_exclude_combine(self):
+        self.assertEqual(self.results({'fields': 'id,course,notes', 'exclude': 'notes'})[0].keys(), {'id', 'course'})
+
+    def test_unknown_fields_are_ignored(self):
+        self.assertEqual(self.results({'fields': 'id,no_such_field'})[0].keys(), {'id'})
+        self.assertEqual(self.results({'exclude': 'no_such_field'})[0]['notes'], 'Pitted')
+
+    def test_list_selects_only_the_columns_it_serializes(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.results({'fields': 'id,thickness_in'})
+
+        table = models.UTResult._meta.db_table
+        [select] = [query['sql'] for query in queries if f'FROM "{table}"' in query['sql']]
+        self.assertIn(f'"{table}"."thickness_in"', select)
+        self.assertNotIn(f'"{table}"."notes"', select)
+        self.assertNotIn(f'"{table}"."location"', select)
+
+    def test_writes_return_every_field(self):
+        response = self.client.post(
+            f'{self.url}?fields=id',
+            {'tank': str(self.tank.pk), 'category': 'roof', 'location': 'Centre', 'thickness_in': '0.1875'},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('location', response.json())
+
+    def test_tank_detail_is_pruned(self):
+        response = self.client.get(f'/api/tanks/{self.tank.pk}/', {'fields': 'tank_name,ut_results'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json().keys(), {'tank_name', 'ut_results'})
+        self.assertIn('notes', response.json()['ut_results'][0])  # nested serializers keep their shape
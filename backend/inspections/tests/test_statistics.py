@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+from rest_framework.test import APITestCase
+
+from inspections import models, statistics
+
+from .helpers import CacheClearingMixin, make_tank
+
+
+class UTStatisticsTests(CacheClearingMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.tank = make_tank()
+        for location, course, thickness in (
+            ('C1 north', 1, '0.2500'),
+            ('C1 east', 1, '0.2300'),
+            ('C1 south', 1, '0.2000'),
+            ('C1 west', 1, '0.2400'),
+            ('C2 north', 2, '0.1900'),
+        ):
+            models.UTResult.objects.create(
+                tank=self.tank, category='shell', location=location, course=course, thickness_in=Decimal(thickness)
+            )
+
+    def test_statistics_per_group(self):
+        first, second = statistics.ut_statistics(models.UTResult.objects.all())
+
+        self.assertEqual(
+            {key: first[key] for key in ('tank', 'category', 'course', 'count', 'min', 'max', 'mean', 'stddev')},
+            {
+                'tank': self.tank.pk,
+                'category': 'shell',
+                'course': 1,
+                'count': 4,
+                'min': Decimal('0.2000'),
+                'max': Decimal('0.2500'),
+                'mean': Decimal('0.2300'),
+                'stddev': Decimal('0.0216'),  # sample standard deviation
+            },
+        )
+        # Linear interpolation between closest ranks, as percentile_cont computes it.
+        self.assertEqual(
+            first['percentiles'], {'p10': Decimal('0.2090'), 'p50': Decimal('0.2350'), 'p90': Decimal('0.2470')}
+        )
+        self.assertEqual(first['thinnest']['location'], 'C1 south')
+        self.assertEqual(first['thinnest']['thickness_in'], Decimal('0.2000'))
+
+        self.assertEqual((second['course'], second['count'], second['stddev']), (2, 1, None))
+        self.assertEqual(set(second['percentiles'].values()), {Decimal('0.1900')})
+        self.assertEqual(second['thinnest']['location'], 'C2 north')
+
+    def test_fleet_wide_group_and_custom_percentiles(self):
+        (fleet,) = statistics.ut_statistics(models.UTResult.objects.all(), group_by=(), percentiles=(0, 25, 100))
+        self.assertEqual(fleet['count'], 5)
+        self.assertEqual(
+            fleet['percentiles'], {'p0': Decimal('0.1900'), 'p25': Decimal('0.2000'), 'p100': Decimal('0.2500')}
+        )
+        self.assertEqual(fleet['thinnest']['location'], 'C2 north')
+
+    def test_no_results(self):
+        self.assertEqual(statistics.ut_statistics(models.UTResult.objects.none()), [])
+
+    def test_endpoint(self):
+        response = self.client.get(
+            '/api/ut-results/statistics/', {'group_by': 'course', 'percentiles': '50', 'course': '1'}
+        )
+        self.assertEqual(response.status_code, 200)
+        (row,) = response.json()
+        self.assertEqual((row['course'], row['count']), (1, 4))
+        self.assertEqual(Decimal(str(row['percentiles']['p50'])), Decimal('0.2350'))
+        self.assertEqual(row['thinnest']['location'], 'C1 south')
+
+    def test_invalid_parameters_are_validation_errors(self):
+        for params in ({'course': 'abc'}, {'group_by': 'owner'}, {'percentiles': '50,101'}, {'percentiles': 'median'}):
+            with self.subTest(params=params):
+                response = self.client.get('/api/ut-results/statistics/', params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(next(iter(params)), response.json())
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from inspections import models, sync
+
+from .helpers import TANK_DEFAULTS, CacheClearingMixin, make_tank
+
+
+@override_settings(SYNC_SETTLE_SECONDS=5, SYNC_TOMBSTONE_RETENTION_DAYS=90)
+class SyncChangesTests(CacheClearingMixin, APITestCase):
+    url = '/api/sync/changes/'
+
+    def setUp(self):
+        super().setUp()
+        self.tank = make_tank()
+
+    def backdate(self, model, days, **lookup):
+        model.objects.filter(**lookup).update(updated_at=timezone.now() - timedelta(days=days))
+
+    def test_full_sync_then_resume_from_the_cursor(self):
+        models.VisualFinding.objects.create(tank=self.tank, area='shell', finding='Rust', comment_type='monitor')
+        self.backdate(models.Tank, 1)
+        self.backdate(models.VisualFinding, 1)
+
+        first = self.client.get(self.url).json()
+        self.assertEqual([change['resource'] for change in first['changes']], ['tanks', 'visual-findings'])
+        self.assertFalse(first['has_more'])
+
+        again = self.client.get(self.url, {'cursor': first['cursor']}).json()
+        self.assertEqual(again['changes'], [])
+
+        self.client.patch(f'/api/tanks/{self.tank.pk}/', {'tank_name': 'Renamed'}, format='json')
+        latest = self.client.get(self.url, {'cursor': first['cursor']}).json()
+        self.assertEqual([(change['resource'], change['data']['tank_name']) for change in latest['changes']], [
+            ('tanks', 'Renamed'),
+        ])
+
+    def test_changes_are_paged_in_order(self):
+        for number in range(3):
+            make_tank(f'Tank {number + 2}')
+        seen = []
+        cursor = None
+        for _ in range(4):
+            params = {'page_size': 2, **({'cursor': cursor} if cursor else {})}
+            page = self.client.get(self.url, params).json()
+            seen.extend(change['id'] for change in page['changes'])
+            cursor = page['cursor']
+            if not page['has_more']:
+                break
+        self.assertEqual(sorted(seen), sorted(str(pk) for pk in models.Tank.objects.values_list('pk', flat=True)))
+        self.assertEqual(len(seen), 4)
+
+    def test_deletes_leave_tombstones(self):
+        finding = models.VisualFinding.objects.create(
+            tank=self.tank, area='shell', finding='Rust', comment_type='monitor'
+        )
+        cursor = self.client.get(self.url).json()['cursor']
+        self.assertEqual(self.client.delete(f'/api/visual-findings/{finding.pk}/').status_code, 204)
+        # The tombstone is inside the settle window the cursor re-reads.
+        changes = self.client.get(self.url, {'cursor': cursor}).json()['changes']
+        self.assertIn(
+            {
+                'resource': 'visual-findings', 'id': finding.pk, 'tank': str(self.tank.pk),
+                'updated_at': changes[-1]['updated_at'], 'deleted': True, 'data': None,
+            },
+            changes,
+        )
+
+    def test_cursor_older_than_the_retention_window_is_gone(self):
+        old = sync.encode_cursor(sync.Position(timezone.now() - timedelta(days=91)))
+        response = self.client.get(self.url, {'cursor': old})
+        self.assertEqual(response.status_code, 410)
+
+    def test_quiet_tank_does_not_get_an_expired_cursor(self):
+        self.backdate(models.Tank, 120)
+        first = self.client.get(self.url, {'tank_id': str(self.tank.pk)})
+        self.assertEqual(len(first.json()['changes']), 1)
+        replay = self.client.get(self.url, {'tank_id': str(self.tank.pk), 'cursor': first.json()['cursor']})
+        self.assertEqual(replay.status_code, 200)
+        self.assertEqual(replay.json()['changes'], [])
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get(self.url, {'cursor': 'nope'}).status_code, 400)
+
+
+class SyncPushTests(CacheClearingMixin, APITestCase):
+    url = '/api/sync/push/'
+
+    def push(self, *changes):
+        response = self.client.post(self.url, {'changes': list(changes)}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results']
+
+    def test_created_records_can_reference_each_other(self):
+        results = self.push(
+            {'resource': 'tanks', 'ref': 'new-tank', 'data': {'tank_name': 'Pushed', **TANK_DEFAULTS}},
+            {
+                'resource': 'visual-findings',
+                'data': {'tank': 'new-tank', 'area': 'roof', 'finding': 'Pitting', 'comment_type': 'consider'},
+            },
+        )
+        self.assertEqual([result['status'] for result in results], ['created', 'created'])
+        tank = models.Tank.objects.get(tank_name='Pushed')
+        self.assertEqual(results[0]['id'], str(tank.pk))
+        self.assertEqual(results[0]['ref'], 'new-tank')
+        self.assertEqual(tank.visual_findings.get().finding, 'Pitting')
+
+    def test_update_on_a_stale_base_is_a_conflict(self):
+        tank = make_tank()
+        stale = sync.TIMESTAMP.to_representation(tank.updated_at - timedelta(seconds=1))
+        current = sync.TIMESTAMP.to_representation(tank.updated_at)
+        conflict, updated = self.push(
+            {'resource': 'tanks', 'id': str(tank.pk), 'base_updated_at': stale, 'data': {'owner': 'Stale'}},
+            {'resource': 'tanks', 'id': str(tank.pk), 'base_updated_at': current, 'data': {'owner': 'Fresh'}},
+        )
+        self.assertEqual(conflict['status'], 'conflict')
+        self.assertEqual(conflict['current']['owner'], 'Acme Midstream')
+        self.assertEqual(updated['status'], 'updated')
+        tank.refresh_from_db()
+        self.assertEqual(tank.owner, 'Fresh')
+
+    def test_delete_leaves_a_tombstone(self):
+        tank = make_tank()
+        base = sync.TIMESTAMP.to_representation(tank.updated_at)
+        (result,) = self.push({'resource': 'tanks', 'id': str(tank.pk), 'base_updated_at': base, 'deleted': True})
+        self.assertEqual(result['status'], 'deleted')
+        self.assertFalse(models.Tank.objects.exists())
+        self.assertTrue(models.Tombstone.objects.filter(resource='tanks', object_id=str(tank.pk)).exists())
+
+    def test_every_result_has_the_same_shape(self):
+        tank = make_tank()
+        results = self.push(
+            'not an object',
+            {'resource': 'nope'},
+            {'resource': 'tanks', 'id': str(tank.pk), 'data': {'owner': 'No base'}},
+            {'resource': 'visual-findings', 'data': {'area': 'roof'}},
+        )
+        for index, result in enumerate(results):
+            self.assertEqual(result['index'], index)
+            self.assertEqual(result['status'], 'invalid')
+            self.assertLessEqual({'index', 'resource', 'id', 'status', 'errors'}, set(result))
+        self.assertEqual([result['resource'] for result in results], [None, None, 'tanks', 'visual-findings'])
+        self.assertEqual(results[2]['id'], str(tank.pk))
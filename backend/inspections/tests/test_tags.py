@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from inspections import models, tags
+
+from .helpers import CacheClearingMixin, make_tank
+
+
+def annotations(standard=None, additional=None):
+    return {'standard': standard or {}, 'additional': additional or []}
+
+
+class AnnotationEntriesTests(TestCase):
+    def test_only_tagged_entries_become_rows(self):
+        entries = list(tags.annotation_entries(annotations(
+            standard={
+                'foundation': {'color': 'red', 'comment': 'Cracked ringwall'},
+                'anchors': {},
+                'insulation': 'not an object',
+            },
+            additional=[{'label': 'Gauge pole', 'value': '6 in', 'color': 'purple', 'ut': True}],
+        )))
+
+        self.assertEqual([(entry['section'], entry['label']) for entry in entries], [
+            (models.ConstructionTag.STANDARD, 'Foundation'),
+            (models.ConstructionTag.ADDITIONAL, 'Gauge pole'),
+        ])
+        self.assertEqual(entries[0]['field_key'], 'foundation')
+        self.assertIsNone(entries[1]['color'])  # unknown colours are dropped
+        self.assertTrue(entries[1]['ut'])
+        self.assertEqual(list(tags.annotation_entries(None)), [])
+
+    def test_saving_a_tank_rewrites_its_tags(self):
+        tank = make_tank(construction_annotations=annotations(standard={'foundation': {'color': 'red'}}))
+        self.assertEqual(list(tank.construction_tags.values_list('color', flat=True)), ['red'])
+
+        tank.construction_annotations = annotations(standard={'anchors': {'ve': True}})
+        tank.save()
+        self.assertEqual(list(tank.construction_tags.values_list('field_key', 've')), [('anchors', True)])
+
+
+class ConstructionTagEndpointTests(CacheClearingMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.red = make_tank('Tank 1', state='TX', construction_annotations=annotations(
+            standard={'foundation': {'color': 'red'}, 'anchors': {'color': 'red', 'ut': True}},
+        ))
+        self.blue = make_tank('Tank 2', state='OK', construction_annotations=annotations(
+            standard={'foundation': {'color': 'blue', 've': True}},
+        ))
+        make_tank('Tank 3')
+
+    def tank_names(self, params):
+        response = self.client.get('/api/tanks/', params)
+        self.assertEqual(response.status_code, 200)
+        return [row['tank_name'] for row in response.json()['results']]
+
+    def test_tag_filters_pick_tanks_with_a_matching_tag(self):
+        self.assertEqual(self.tank_names({'tag_color': 'red', 'tag_field': 'foundation'}), ['Tank 1'])
+        self.assertEqual(self.tank_names({'tag_color': ['red', 'blue']}), ['Tank 1', 'Tank 2'])
+        self.assertEqual(self.tank_names({'tag_label': 'Foundation', 'tag_ve': 'true'}), ['Tank 2'])
+        # Both conditions must hold on the same tag: Tank 1's UT flag is on its anchors, not its foundation.
+        self.assertEqual(self.tank_names({'tag_field': 'foundation', 'tag_ut': 'true'}), [])
+
+    def test_tag_flags_must_be_booleans(self):
+        response = self.client.get('/api/tanks/', {'tag_ut': 'yes'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('tag_ut', response.json())
+
+    def test_rollup_counts_tags_and_tanks_per_group(self):
+        response = self.client.get('/api/tanks/construction-tags/')
+        self.assertEqual(response.json(), [
+            {'field_key': 'anchors', 'color': 'red', 'tags': 1, 'tanks': 1},
+            {'field_key': 'foundation', 'color': 'blue', 'tags': 1, 'tanks': 1},
+            {'field_key': 'foundation', 'color': 'red', 'tags': 1, 'tanks': 1},
+        ])
+
+        by_color = self.client.get('/api/tanks/construction-tags/', {'group_by': 'color'})
+        self.assertEqual(by_color.json(), [
+            {'color': 'blue', 'tags': 1, 'tanks': 1},
+            {'color': 'red', 'tags': 2, 'tanks': 1},
+        ])
+
+    def test_rollup_applies_tank_filters(self):
+        response = self.client.get('/api/tanks/construction-tags/', {'state': 'OK', 'group_by': 'color,ve'})
+        self.assertEqual(response.json(), [{'color': 'blue', 've': True, 'tags': 1, 'tanks': 1}])
+
+    def test_rollup_rejects_unknown_groups(self):
+        response = self.client.get('/api/tanks/construction-tags/', {'group_by': 'comment'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from unittest import mock
+
+from rest_framework.permissions import BasePermission
+from rest_framework.test import APITestCase
+
+from inspections import cache, views
+
+from .helpers import CacheClearingMixin, make_tank
+
+
+class DenyObjects(BasePermission):
+    def has_object_permission(self, request, view, obj):
+        return False
+
+
+class TankDetailCacheTests(CacheClearingMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.tank = make_tank()
+        self.url = f'/api/tanks/{self.tank.pk}/'
+
+    def test_second_request_is_served_from_cache(self):
+        first = self.client.get(self.url)
+        version = cache.current_version(self.tank.pk)
+        self.assertEqual(cache.get_tank_detail(str(self.tank.pk), version), first.json())
+        self.assertEqual(self.client.get(self.url).json(), first.json())
+
+    def test_cache_hit_checks_object_permissions(self):
+        self.client.get(self.url)
+        with mock.patch.object(views.TankViewSet, 'permission_classes', [DenyObjects]):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+
+    def test_cache_hit_for_deleted_tank_is_not_found(self):
+        self.client.get(self.url)
+        version = cache.current_version(self.tank.pk)
+        data = cache.get_tank_detail(str(self.tank.pk), version)
+        # Deleted behind the API's back, so the cached document is still under the current version.
+        type(self.tank).objects.filter(pk=self.tank.pk).delete()
+        cache.set_tank_detail(str(self.tank.pk), version, data)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_write_moves_the_document_to_a_new_version(self):
+        self.client.get(self.url)
+        self.client.patch(self.url, {'tank_name': 'Renamed'}, format='json')
+        self.assertEqual(self.client.get(self.url).json()['tank_name'], 'Renamed')
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from datetime import date
+
+from rest_framework.test import APITestCase
+
+from inspections import models
+
+from .helpers import CacheClearingMixin, make_tank
+
+
+class NaturalSortKeyTests(APITestCase):
+    def test_digit_runs_sort_by_value(self):
+        names = ['T-129', 'T-2', 'T-13', 'T-013', 'T-2a']
+        self.assertEqual(sorted(names, key=models.tank_name_sort_key), ['T-2', 'T-2a', 'T-13', 'T-013', 'T-129'])
+
+    def test_keys_ignore_case_and_spacing(self):
+        self.assertEqual(models.tank_name_key('  Tank   North 7 '), 'tank north 7')
+        self.assertEqual(make_tank('Tank   NORTH 7').tank_name_sort, 'tank north 000000000007')
+
+
+class TypeaheadTests(CacheClearingMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        for name in ('T-129', 'T-2', 'T-13', 'TX1', 'T_1', 'Other 1'):
+            make_tank(name)
+        make_tank('T-14', owner='Other Owner')
+
+    def names(self, params):
+        response = self.client.get('/api/tanks/typeahead/', params)
+        self.assertEqual(response.status_code, 200)
+        return [row['tank_name'] for row in response.json()]
+
+    def test_prefix_matches_in_natural_order(self):
+        self.assertEqual(self.names({'q': 't-'}), ['T-2', 'T-13', 'T-14', 'T-129'])
+        self.assertEqual(self.names({'q': 'T-1'}), ['T-13', 'T-14', 'T-129'])
+        self.assertEqual(self.names({'q': 'T-1', 'limit': 1}), ['T-13'])
+
+    def test_prefix_is_not_a_pattern(self):
+        self.assertEqual(self.names({'q': 'T_'}), ['T_1'])
+        self.assertEqual(self.names({'q': 'other  '}), ['Other 1'])
+
+    def test_list_filters_apply(self):
+        self.assertEqual(self.names({'q': 'T-', 'owner': 'Other Owner'}), ['T-14'])
+
+    def test_invalid_parameters(self):
+        for params in ({}, {'q': '   '}, {'q': 'T', 'limit': 'ten'}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get('/api/tanks/typeahead/', params).status_code, 400)
+
+
+class TankRangeFilterTests(CacheClearingMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        make_tank('Old', year_built=1962, next_inspection_due_date=date(2025, 3, 1))
+        make_tank('New', year_built=2015, next_inspection_due_date=date(2031, 6, 1))
+
+    def names(self, params):
+        response = self.client.get('/api/tanks/', params)
+        self.assertEqual(response.status_code, 200)
+        return [row['tank_name'] for row in response.json()['results']]
+
+    def test_ranges(self):
+        self.assertEqual(self.names({'year_built_lt': '2000'}), ['Old'])
+        self.assertEqual(self.names({'year_built_gte': '1962', 'next_inspection_due_date_gt': '2025-03-01'}), ['New'])
+
+    def test_invalid_bounds_are_validation_errors(self):
+        for param, value in (
+            ('year_built_gte', 'sixties'),
+            ('next_inspection_due_date_lte', 'soon'),
+            ('next_inspection_due_date_lte', '2025-13-01'),
+        ):
+            with self.subTest(param=param, value=value):
+                response = self.client.get('/api/tanks/', {param: value})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(param, response.json())
@@ -1,13 +1,15 @@
 """Inspection API URL routing."""
 from __future__ import annotations
 
+from django.conf import settings
 from rest_framework import routers
 
-from . import views
+from . import async_views, views
 
 router = routers.DefaultRouter()
 router.register('tanks', views.TankViewSet, basename='tanks')
 router.register('shell-settlement-surveys', views.ShellSettlementSurveyViewSet, basename='shell-settlement-surveys')
+router.register('settlement-readings', views.SettlementReadingViewSet, basename='settlement-readings')
 router.register('ut-results', views.UTResultViewSet, basename='ut-results')
 router.register('edge-settlement-checks', views.EdgeSettlementCheckViewSet, basename='edge-settlement-checks')
 router.register('column-plumbness-checks', views.ColumnPlumbnessCheckViewSet, basename='column-plumbness-checks')
@@ -15,6 +17,13 @@ router.register('visual-findings', views.VisualFindingViewSet, basename='visual-
 router.register('other-nde', views.OtherNDEViewSet, basename='other-nde')
 router.register('goal-results', views.GoalResultViewSet, basename='goal-results')
 router.register('goal-question-templates', views.GoalQuestionTemplateViewSet, basename='goal-question-templates')
+router.register('exports', views.ExportViewSet, basename='exports')
+router.register('report-batches', views.ReportBatchViewSet, basename='report-batches')
+router.register('search', views.SearchViewSet, basename='search')
+router.register('sync', views.SyncViewSet, basename='sync')
 router.register('metadata', views.MetadataViewSet, basename='metadata')
+router.register('_perf', views.PerfViewSet, basename='perf')
 
 urlpatterns = router.urls
+if settings.ASYNC_READ_VIEWS:
+    urlpatterns = async_views.urlpatterns(router.urls) + urlpatterns
@@ -1,41 +1,374 @@
 """REST API views for inspection workflows."""
 from __future__ import annotations
 
-from rest_framework import viewsets
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ParseError, UnsupportedMediaType, ValidationError
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.response import Response
 
-from . import models, serializers
+from . import (
+    cache, compliance, conditional, exports, filters, ingest, models, perf, reference, replicas, reports, search,
+    serializers, settlement, statistics, summaries, sync, tags,
+)
+from .pagination import KeysetPagination
 
 
-class TankViewSet(viewsets.ModelViewSet):
+class TankCacheInvalidationMixin:
+    """Drops the cached tank detail document whenever a write goes through the viewset."""
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)  # type: ignore[misc]
+        cache.invalidate_tanks(cache.tank_id_for(serializer.instance))
+
+    def perform_update(self, serializer):
+        previous_tank_id = cache.tank_id_for(serializer.instance)
+        super().perform_update(serializer)  # type: ignore[misc]
+        cache.invalidate_tanks(previous_tank_id, cache.tank_id_for(serializer.instance))
+
+    def perform_destroy(self, instance):
+        tank_id = cache.tank_id_for(instance)
+        super().perform_destroy(instance)  # type: ignore[misc]
+        cache.invalidate_tanks(tank_id)
+
+
+class SyncTombstoneMixin:
+    """Leaves a tombstone for the sync change feed when a record is deleted through the viewset."""
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            sync.record_deletion(instance)
+            super().perform_destroy(instance)  # type: ignore[misc]
+
+
+class SparseFieldsetViewMixin:
+    """Applies ``?fields=`` / ``?exclude=`` to serializers and defers unread columns on lists."""
+
+    def get_sparse_fieldset(self) -> tuple[set[str] | None, set[str] | None]:
+        params = self.request.query_params  # type: ignore[attr-defined]
+        return serializers.parse_field_list(params.get('fields')), serializers.parse_field_list(params.get('exclude'))
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()  # type: ignore[misc]
+        request = self.request  # type: ignore[attr-defined]
+        if request is not None and request.method in SAFE_METHODS:
+            context['fields'], context['exclude'] = self.get_sparse_fieldset()
+        return context
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)  # type: ignore[misc]
+        if self.action != 'list':  # type: ignore[attr-defined]
+            return queryset
+        columns = self.get_serializer().get_model_columns()  # type: ignore[attr-defined]
+        ordering = getattr(self, 'pagination_ordering', KeysetPagination.ordering)
+        pk_name = queryset.model._meta.pk.name
+        columns.update(pk_name if name == 'pk' else name for name in (field.lstrip('-') for field in ordering))
+        columns.update(getattr(self, 'list_required_fields', ()))
+        return queryset.only(*columns)
+
+
+class TankViewSet(TankCacheInvalidationMixin, SyncTombstoneMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = models.Tank.objects.all().order_by('tank_name')
     serializer_class = serializers.TankSerializer
+    pagination_ordering = ('tank_name', 'tank_unique_id')
+    # Read by the list validators even when ``?fields=`` leaves it out of the response.
+    list_required_fields = ('updated_at',)
+
+    def get_queryset(self):  # type: ignore[override]
+        queryset = super().get_queryset()
+        if self.action in {'retrieve', 'summary'}:
+            queryset = queryset.prefetch_related(*serializers.TankDetailSerializer.prefetch_fields)
+        elif self.action in {'list', 'typeahead', 'compliance'}:
+            queryset = filters.filter_tanks(queryset, self.request.query_params)
+        return queryset
 
     def get_serializer_class(self):
         if self.action in {'retrieve', 'summary'}:
             return serializers.TankDetailSerializer
+        if self.action == 'list' and 'fields' not in self.request.query_params:
+            return serializers.TankListSerializer
         return super().get_serializer_class()
 
+    def list(self, request, *args, **kwargs):  # type: ignore[override]
+        """List tanks, answering 304 when the page's rows are unchanged since the client's copy."""
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        rows = list(queryset) if page is None else page
+        paging = () if page is None else (self.paginator.has_next, self.paginator.has_previous)
+        validators = conditional.rows_validators(request, rows, *paging)
+        not_modified = conditional.not_modified(request, validators)
+        if not_modified is not None:
+            return not_modified
+        data = self.get_serializer(rows, many=True).data
+        response = Response(data) if page is None else self.get_paginated_response(data)
+        return conditional.apply(response, validators)
+
+    def retrieve(self, request, *args, **kwargs):  # type: ignore[override]
+        return self.get_conditional_detail_response()
+
+    @action(detail=False, methods=['get'])
+    def typeahead(self, request):  # type: ignore[override]
+        """Up to ``limit`` (default 10) tanks whose name starts with ``?q=``, in natural order.
+
+        Matching ignores case and repeated spaces; "13" sorts before "129". The list filters apply too.
+        """
+        query = request.query_params.get('q', '')
+        if not models.tank_name_key(query):
+            raise ValidationError({'q': 'Provide the start of a tank name.'})
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 50)
+        except ValueError:
+            raise ValidationError({'limit': 'A valid integer is required.'})
+        queryset = filters.filter_name_prefix(self.get_queryset(), query)
+        rows = queryset.order_by('tank_name_sort', 'tank_unique_id').values(
+            'tank_unique_id', 'tank_name', 'owner', 'client_name', 'facility_type', 'state'
+        )
+        return Response(list(rows[:limit]))
+
     @action(detail=True, methods=['get'])
     def summary(self, request, pk=None):  # type: ignore[override]
+        return self.get_conditional_detail_response()
+
+    def get_conditional_detail_response(self):
+        """Answer 304 from one aggregate query when the client's copy of the document is current."""
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        tank_id = cache.normalise_tank_id(self.kwargs[lookup_url_kwarg])
+        validators = conditional.tank_validators(self.request, tank_id) if tank_id is not None else None
+        not_modified = conditional.not_modified(self.request, validators)
+        if not_modified is not None:
+            return not_modified
+        return conditional.apply(Response(self.get_sparse_detail_data()), validators)
+
+    def get_sparse_detail_data(self):
+        fields, exclude = self.get_sparse_fieldset()
+        return serializers.prune_fields(self.get_detail_data(), fields, exclude)
+
+    def get_detail_data(self):
+        """Serve the full tank detail document from cache, serializing it with prefetches on a miss."""
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        tank_id = cache.normalise_tank_id(self.kwargs[lookup_url_kwarg])
+        if tank_id is not None:
+            version = cache.current_version(tank_id)
+            data = cache.get_tank_detail(tank_id, version)
+            if data is not None:
+                # A cached document still answers 404 for a missing tank and passes the object permissions.
+                tank = get_object_or_404(models.Tank.objects.only('pk'), pk=tank_id)
+                self.check_object_permissions(self.request, tank)
+                return data
+        with replicas.primary():
+            tank = self.get_object()
+            context = {'request': self.request, 'format': self.format_kwarg, 'view': self}
+            data = self.get_serializer_class()(tank, context=context).data
+        if tank_id is not None:
+            cache.set_tank_detail(tank_id, version, data)
+        return data
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        settlement.schedule_refresh(serializer.instance.shell_settlement_surveys.values_list('pk', flat=True))
+
+    @action(detail=True, methods=['get'])
+    def settlement(self, request, pk=None):  # type: ignore[override]
+        """Settlement analyses for every survey of this tank.
+
+        Reads precomputed analyses; surveys whose analysis is missing or stale are queued
+        for refitting and counted in ``pending``, as in ``shell-settlement-surveys/worst/``.
+        """
         tank = self.get_object()
-        serializer = self.get_serializer(tank)
-        return Response(serializer.data)
+        stale = settlement.stale_surveys(tank.shell_settlement_surveys.all())
+        pending = settlement.schedule_refresh(stale.values_list('pk', flat=True))
+        analyses = tank.settlement_analyses.select_related('tank').order_by('-survey__created_at', '-survey_id')
+        serializer = serializers.SettlementAnalysisSerializer(
+            analyses, many=True, context=self.get_serializer_context()
+        )
+        return Response({'pending': pending, 'results': serializer.data})
+
+    @action(detail=True, methods=['get'], url_path=r'report/(?P<report_format>html|pdf)')
+    def report(self, request, pk=None, report_format='pdf'):  # type: ignore[override]
+        """Serve the rendered report for the tank's current data, or queue it and answer 202."""
+        tank = get_object_or_404(conditional.with_content_versions(models.Tank.objects.all()), pk=pk)
+        key = reports.content_key(tank, report_format)
+        path = reports.artifact_path(key, report_format)
+        if path.exists():
+            response = FileResponse(
+                path.open('rb'),
+                as_attachment=report_format == 'pdf',
+                filename=f'{tank.tank_name}-report.{report_format}',
+                content_type=reports.CONTENT_TYPES[report_format],
+            )
+            response['ETag'] = f'"{key}"'
+            return response
+        reports.schedule_render(tank.pk, report_format)
+        return Response(
+            {'status': 'pending', 'key': key}, status=status.HTTP_202_ACCEPTED, headers={'Retry-After': '2'}
+        )
+
+    @action(detail=True, methods=['post'], url_path='inspection-package')
+    def inspection_package(self, request, pk=None):  # type: ignore[override]
+        """Create every Workflow 2 record in the request body in one transaction, or none of them."""
+        tank = self.get_object()
+        package = serializers.InspectionPackageSerializer(data=request.data, context=self.get_serializer_context())
+        package.is_valid(raise_exception=True)
+        created = package.save(tank=tank)
+        cache.invalidate_tanks(tank.pk)
+        settlement.schedule_refresh(created['shell_settlement_surveys'])
+        return Response({'tank': tank.pk, 'created': created}, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'])
+    def compliance(self, request):  # type: ignore[override]
+        """Tanks per due-date bucket, grouped by ``?group_by=`` owner, client and/or state (default owner).
+
+        ``schedule`` picks the date: ``next`` (planned due date, default) or ``external``,
+        ``internal`` or ``ut`` (last inspection plus its interval). ``as_of`` defaults to today.
+        The list filters apply. Results are cached until a tank or its records change.
+        """
+        params = request.query_params
+        schedule = params.get('schedule', 'next')
+        if schedule not in compliance.SCHEDULES:
+            raise ValidationError({'schedule': f'Choose from {", ".join(compliance.SCHEDULES)}.'})
+        group_by = serializers.parse_field_list(params.get('group_by'))
+        if group_by and set(group_by) - set(compliance.GROUP_FIELDS):
+            raise ValidationError({'group_by': f'Choose from {", ".join(compliance.GROUP_FIELDS)}.'})
+        group_by_order = compliance.DEFAULT_GROUP_BY if group_by is None else [
+            name for name in compliance.GROUP_FIELDS if name in group_by
+        ]
+        as_of = timezone.localdate()
+        if params.get('as_of'):
+            try:
+                as_of = parse_date(params['as_of'])
+            except ValueError:  # Well formed but not a real date, such as 2025-13-01.
+                as_of = None
+            if as_of is None:
+                raise ValidationError({'as_of': 'Use a YYYY-MM-DD date.'})
+
+        version = cache.fleet_version()
+        validators = conditional.version_validators(request, version, as_of.isoformat())
+        not_modified = conditional.not_modified(request, validators)
+        if not_modified is not None:
+            return not_modified
+        digest = validators.etag.strip('"')
+        data = cache.get_fleet_document('compliance', version, digest)
+        if data is None:
+            with replicas.primary():
+                data = compliance.rollup(self.get_queryset(), as_of, schedule, group_by_order)
+            cache.set_fleet_document('compliance', version, digest, data)
+        return conditional.apply(Response(data), validators)
+
+    @action(detail=False, methods=['get'], url_path='construction-tags')
+    def construction_tags(self, request):  # type: ignore[override]
+        """Construction tag and tank counts grouped by ``?group_by=`` (default field_key,color).
+
+        ``tag_color``, ``tag_field``, ``tag_label``, ``tag_ve`` and ``tag_ut`` pick the tags and the
+        other list filters pick their tanks. Counts come from the construction tag indexes.
+        """
+        params = request.query_params
+        group_by = serializers.parse_field_list(params.get('group_by'))
+        if group_by and set(group_by) - set(tags.GROUP_FIELDS):
+            raise ValidationError({'group_by': f'Choose from {", ".join(tags.GROUP_FIELDS)}.'})
+        group_by_order = tags.DEFAULT_GROUP_BY if group_by is None else [
+            name for name in tags.GROUP_FIELDS if name in group_by
+        ]
+        queryset = models.ConstructionTag.objects.filter(filters.tag_condition(params))
+        tanks = filters.filter_tanks(models.Tank.objects.all(), params, tags=False)
+        if tanks.query.has_filters():
+            queryset = queryset.filter(tank__in=tanks.values('pk'))
+        return Response(tags.rollup(queryset, group_by_order))
+
+    @action(detail=False, methods=['get'], url_path='executive-summary')
+    def executive_summary(self, request):  # type: ignore[override]
+        """Stream every tank's report summary with colour tags bucketed server-side."""
+        queryset = self.filter_queryset(self.get_queryset())
+        return StreamingHttpResponse(
+            summaries.stream_executive_summary(queryset),
+            content_type='application/json',
+        )
 
 
-class ShellSettlementSurveyViewSet(viewsets.ModelViewSet):
+class ShellSettlementSurveyViewSet(
+    TankCacheInvalidationMixin, SyncTombstoneMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet
+):
     serializer_class = serializers.ShellSettlementSurveySerializer
 
     def get_queryset(self):  # type: ignore[override]
-        queryset = models.ShellSettlementSurvey.objects.all()
+        queryset = models.ShellSettlementSurvey.objects.prefetch_related('station_readings')
         tank_id = self.request.query_params.get('tank_id')
         if tank_id:
             queryset = queryset.filter(tank_id=tank_id)
         return queryset
 
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        settlement.schedule_refresh([serializer.instance.pk])
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        settlement.schedule_refresh([serializer.instance.pk])
+
+    @action(detail=False, methods=['get'])
+    def worst(self, request):  # type: ignore[override]
+        """Fleet ranking of surveys by out-of-plane settlement utilization, worst first.
+
+        Reads precomputed analyses; surveys whose analysis is missing or stale are queued
+        for refitting and counted in ``pending`` rather than computed on this request.
+        """
+        params = request.query_params
+        try:
+            limit = min(max(int(params.get('limit', 50)), 1), 500)
+        except ValueError:
+            raise ValidationError({'limit': 'A valid integer is required.'})
+        surveys = models.ShellSettlementSurvey.objects.all()
+        analyses = models.SettlementAnalysis.objects.select_related('tank')
+        for name in ('owner', 'client_name', 'design_standard'):
+            value = params.get(name)
+            if value:
+                surveys = surveys.filter(**{f'tank__{name}': value})
+                analyses = analyses.filter(**{f'tank__{name}': value})
+        pending = settlement.schedule_refresh(settlement.stale_surveys(surveys).values_list('pk', flat=True))
+        serializer = serializers.SettlementAnalysisSerializer(
+            analyses[:limit], many=True, context=self.get_serializer_context()
+        )
+        return Response({'pending': pending, 'results': serializer.data})
+
+
+class SettlementReadingViewSet(SparseFieldsetViewMixin, viewsets.ReadOnlyModelViewSet):
+    """Individual station readings, filterable in SQL across surveys and tanks.
+
+    Readings are written through ``shell-settlement-surveys``; this endpoint is read-only.
+    """
+
+    serializer_class = serializers.SettlementReadingSerializer
+    pagination_ordering = ('survey_id', 'position')
+
+    def get_queryset(self):  # type: ignore[override]
+        params = self.request.query_params
+        queryset = models.SettlementReading.objects.all()
+        for param, lookup in (('tank_id', 'tank_id'), ('survey_id', 'survey_id'), ('station_label', 'station_label')):
+            value = params.get(param)
+            if value:
+                queryset = queryset.filter(**{lookup: value})
+        for param, lookup in (
+            ('measurement_gt', 'measurement_in__gt'),
+            ('measurement_gte', 'measurement_in__gte'),
+            ('measurement_lt', 'measurement_in__lt'),
+            ('measurement_lte', 'measurement_in__lte'),
+        ):
+            value = params.get(param)
+            if value:
+                try:
+                    queryset = queryset.filter(**{lookup: float(value)})
+                except ValueError:
+                    raise ValidationError({param: 'A valid number is required.'})
+        return queryset
+
 
-class UTResultViewSet(viewsets.ModelViewSet):
+class UTResultViewSet(TankCacheInvalidationMixin, SyncTombstoneMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     serializer_class = serializers.UTResultSerializer
 
     def get_queryset(self):  # type: ignore[override]
@@ -48,8 +381,68 @@ class UTResultViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(category=category)
         return queryset
 
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):  # type: ignore[override]
+        """Ingest a JSON array, NDJSON or CSV upload of readings for ``?tank_id=``."""
+        tank_id = request.query_params.get('tank_id')
+        if not tank_id:
+            raise ValidationError({'tank_id': 'This query parameter is required.'})
+        tank = get_object_or_404(models.Tank, pk=tank_id)
+        media_type = (request.content_type or '').split(';')[0].strip().lower()
+        try:
+            rows = ingest.iter_upload(request.stream, media_type)
+        except ValueError:
+            raise UnsupportedMediaType(media_type)
+        try:
+            report = ingest.ingest_ut_results(tank, rows)
+        except ingest.IngestError as exc:
+            raise ParseError(str(exc))
+        cache.invalidate_tanks(tank.pk)
+        return Response(
+            report.as_dict(),
+            status=status.HTTP_201_CREATED if report.created else status.HTTP_400_BAD_REQUEST,
+        )
 
-class EdgeSettlementCheckViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['get'])
+    def statistics(self, request):  # type: ignore[override]
+        """Thickness statistics grouped by ``?group_by=`` (default tank,category,course).
+
+        Accepts the list filters plus ``course``, ``design_standard``, ``owner`` and
+        ``client_name`` so fleet-wide questions need no client-side aggregation.
+        """
+        params = request.query_params
+        queryset = self.get_queryset()
+        course = params.get('course')
+        if course:
+            try:
+                queryset = queryset.filter(course=int(course))
+            except ValueError:
+                raise ValidationError({'course': 'A valid integer is required.'})
+        for name in ('design_standard', 'owner', 'client_name'):
+            value = params.get(name)
+            if value:
+                queryset = queryset.filter(**{f'tank__{name}': value})
+
+        group_by = serializers.parse_field_list(params.get('group_by'))
+        group_by_order = [name for name in statistics.GROUP_FIELDS if group_by is None or name in group_by]
+        if group_by and set(group_by) - set(statistics.GROUP_FIELDS):
+            raise ValidationError({'group_by': f'Choose from {", ".join(statistics.GROUP_FIELDS)}.'})
+
+        percentiles = statistics.DEFAULT_PERCENTILES
+        if params.get('percentiles'):
+            try:
+                percentiles = tuple(float(value) for value in params['percentiles'].split(',') if value.strip())
+            except ValueError:
+                raise ValidationError({'percentiles': 'Provide comma-separated numbers between 0 and 100.'})
+            if any(not 0 <= value <= 100 for value in percentiles):
+                raise ValidationError({'percentiles': 'Provide comma-separated numbers between 0 and 100.'})
+
+        return Response(statistics.ut_statistics(queryset, group_by_order, percentiles))
+
+
+class EdgeSettlementCheckViewSet(
+    TankCacheInvalidationMixin, SyncTombstoneMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet
+):
     serializer_class = serializers.EdgeSettlementCheckSerializer
 
     def get_queryset(self):  # type: ignore[override]
@@ -60,7 +453,9 @@ class EdgeSettlementCheckViewSet(viewsets.ModelViewSet):
         return queryset
 
 
-class ColumnPlumbnessCheckViewSet(viewsets.ModelViewSet):
+class ColumnPlumbnessCheckViewSet(
+    TankCacheInvalidationMixin, SyncTombstoneMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet
+):
     serializer_class = serializers.ColumnPlumbnessCheckSerializer
 
     def get_queryset(self):  # type: ignore[override]
@@ -71,7 +466,9 @@ class ColumnPlumbnessCheckViewSet(viewsets.ModelViewSet):
         return queryset
 
 
-class VisualFindingViewSet(viewsets.ModelViewSet):
+class VisualFindingViewSet(
+    TankCacheInvalidationMixin, SyncTombstoneMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet
+):
     serializer_class = serializers.VisualFindingSerializer
 
     def get_queryset(self):  # type: ignore[override]
@@ -82,7 +479,7 @@ class VisualFindingViewSet(viewsets.ModelViewSet):
         return queryset
 
 
-class OtherNDEViewSet(viewsets.ModelViewSet):
+class OtherNDEViewSet(TankCacheInvalidationMixin, SyncTombstoneMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     serializer_class = serializers.OtherNDESerializer
 
     def get_queryset(self):  # type: ignore[override]
@@ -93,7 +490,7 @@ class OtherNDEViewSet(viewsets.ModelViewSet):
         return queryset
 
 
-class GoalResultViewSet(viewsets.ModelViewSet):
+class GoalResultViewSet(TankCacheInvalidationMixin, SyncTombstoneMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     serializer_class = serializers.GoalResultSerializer
 
     def get_queryset(self):  # type: ignore[override]
@@ -103,10 +500,28 @@ class GoalResultViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(tank_id=tank_id)
         return queryset
 
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):  # type: ignore[override]
+        """Upsert any or all of the tank's goals from a JSON array in one transaction.
+
+        Each item replaces that goal's methods and responses; goals not in the array are untouched.
+        """
+        tank_id = request.query_params.get('tank_id')
+        if not tank_id:
+            raise ValidationError({'tank_id': 'This query parameter is required.'})
+        tank = get_object_or_404(models.Tank, pk=tank_id)
+        upsert = serializers.GoalResultUpsertSerializer(data=request.data, many=True, allow_empty=False)
+        upsert.is_valid(raise_exception=True)
+        results = upsert.save(tank=tank)
+        cache.invalidate_tanks(tank.pk)
+        serializer = serializers.GoalResultSerializer(results, many=True, context=self.get_serializer_context())
+        return Response(serializer.data)
+
 
-class GoalQuestionTemplateViewSet(viewsets.ModelViewSet):
+class GoalQuestionTemplateViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     serializer_class = serializers.GoalQuestionTemplateSerializer
     queryset = models.GoalQuestionTemplate.objects.all()
+    pagination_ordering = ('goal_key', 'prompt')
 
     def get_queryset(self):  # type: ignore[override]
         queryset = super().get_queryset()
@@ -115,46 +530,240 @@ class GoalQuestionTemplateViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(goal_key=goal_key)
         return queryset
 
+    def list(self, request, *args, **kwargs):  # type: ignore[override]
+        """Serve the first page from the process-wide reference cache; later pages hit the database."""
+        if self.paginator.cursor_query_param in request.query_params:
+            return super().list(request, *args, **kwargs)
+        data = reference.get_reference_data()
+        goal_key = request.query_params.get('goal_key')
+        rows = [row for row in data.templates if not goal_key or row['goal_key'] == goal_key]
+        if len(rows) > self.paginator.get_page_size(request):
+            return super().list(request, *args, **kwargs)
+        fields, exclude = self.get_sparse_fieldset()
+        results = [serializers.prune_fields(row, fields, exclude) for row in rows]
+        return reference.respond(request, {'next': None, 'previous': None, 'results': results}, data.version)
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        cache.invalidate_reference_data()
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        cache.invalidate_reference_data()
+
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        cache.invalidate_reference_data()
+
+
+class SyncViewSet(viewsets.ViewSet):
+    """Delta sync for offline clients: pull every change since a cursor, push local edits back."""
+
+    # A lagging replica could let the cursor pass changes it has yet to receive.
+    read_from_replica = False
+
+    @action(detail=False, methods=['get'])
+    def changes(self, request):  # type: ignore[override]
+        """Changed and deleted records after ``?cursor=``, oldest first; omit the cursor for a full sync."""
+        params = request.query_params
+        page = sync.changes_since(
+            sync.decode_cursor(params.get('cursor')),
+            sync.page_size_param(params),
+            exports.tank_ids_param(params),
+            context={'request': request},
+        )
+        return Response({
+            'changes': page.changes,
+            'cursor': sync.encode_cursor(page.cursor),
+            'has_more': page.has_more,
+        })
+
+    @action(detail=False, methods=['post'])
+    def push(self, request):  # type: ignore[override]
+        """Apply ``{"changes": [...]}`` in order; each change reports created, updated, deleted, conflict or invalid."""
+        changes = request.data.get('changes') if isinstance(request.data, dict) else None
+        if not isinstance(changes, list):
+            raise ValidationError({'changes': 'Provide a list of changes.'})
+        limit = getattr(settings, 'SYNC_PUSH_MAX_CHANGES', 500)
+        if len(changes) > limit:
+            raise ValidationError({'changes': f'Push at most {limit} changes at a time.'})
+        return Response({'results': sync.apply_changes(changes, context={'request': request})})
+
+
+class SearchViewSet(viewsets.ViewSet):
+    """Ranked full-text search over findings, UT notes, NDE and edge results and goal answers."""
+
+    FACET_LIMIT = 20
+
+    def list(self, request):  # type: ignore[override]
+        """Search with ``?q=``; quote phrases, use ``or`` between alternatives and ``-`` to exclude.
+
+        Narrow with ``resource``, ``tank_id`` or tank attributes such as ``owner``; page with
+        ``limit`` (default 20, max 100) and ``offset``.
+        """
+        params = request.query_params
+        query = search.SearchQuery.parse(params.get('q', ''))
+        if not query:
+            raise ValidationError({'q': 'Provide one or more search terms.'})
+        try:
+            limit = min(max(int(params.get('limit', 20)), 1), 100)
+            offset = max(int(params.get('offset', 0)), 0)
+        except ValueError:
+            raise ValidationError({'limit': 'Use integers for limit and offset.'})
+
+        documents = models.SearchDocument.objects.all()
+        resources = [value for raw in params.getlist('resource') for value in raw.split(',') if value]
+        if any(name not in search.SOURCES for name in resources):
+            raise ValidationError({'resource': f'Must be among: {", ".join(search.SOURCES)}.'})
+        if resources:
+            documents = documents.filter(resource__in=resources)
+        tank_ids = exports.tank_ids_param(params)
+        if tank_ids:
+            documents = documents.filter(tank_id__in=tank_ids)
+        documents = filters.filter_tanks(documents, params, 'tank__')
+
+        matches = search.matching(query, documents)
+        terms = query.terms()
+        results = []
+        for document in search.ranked(matches)[offset:offset + limit]:
+            results.append({
+                'resource': document.resource,
+                'id': document.object_id,
+                'tank': {'id': document.tank_id, 'tank_name': document.tank.tank_name, 'owner': document.tank.owner},
+                'title': document.title,
+                'snippet': search.snippet(document.body, terms),
+                'rank': round(document.rank, 6),
+                'updated_at': document.updated_at,
+            })
+        return Response({
+            'count': matches.count(),
+            'results': results,
+            'facets': {
+                'tanks': search.tank_facets(matches, self.FACET_LIMIT),
+                'resources': search.resource_facets(matches),
+            },
+        })
+
+
+class ExportViewSet(viewsets.ViewSet):
+    """Streams a whole resource as CSV (default) or NDJSON: ``/api/exports/ut-results/?format=ndjson``.
+
+    Narrow the export with ``tank_id`` or tank attributes such as ``owner`` or ``state``.
+    """
+
+    renderer_classes = [exports.CSVRenderer, exports.NDJSONRenderer]
+    lookup_value_regex = '[a-z-]+'
+
+    def list(self, request, format=None):  # type: ignore[override]
+        return Response([{'resource': name} for name in exports.RESOURCES])
+
+    def retrieve(self, request, pk=None, format=None):  # type: ignore[override]
+        resource = exports.RESOURCES.get(pk or '')
+        if resource is None:
+            raise NotFound(f'Unknown export "{pk}". Choose from {", ".join(exports.RESOURCES)}.')
+        export_format = request.accepted_renderer.format
+        queryset = exports.filter_queryset(resource, resource.queryset(), request.query_params)
+        response = StreamingHttpResponse(
+            exports.stream_export(resource, queryset, export_format),
+            content_type=f'{request.accepted_renderer.media_type}; charset=utf-8',
+        )
+        filename = f'{pk}-{timezone.now():%Y%m%d-%H%M%S}.{export_format}'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+class ReportBatchViewSet(
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.ListModelMixin,
+    viewsets.GenericViewSet,
+):
+    """Render reports for many tanks on the worker pool and poll their progress.
+
+    POST ``{"report_format": "pdf", "client_name": "..."}`` (or ``owner`` / ``tank_ids``;
+    no selector means the whole fleet), then GET the batch until ``done + failed == total``.
+    """
+
+    serializer_class = serializers.ReportBatchSerializer
+
+    def get_queryset(self):  # type: ignore[override]
+        return models.ReportBatch.objects.annotate(
+            total=Count('items'),
+            **{
+                state: Count('items', filter=Q(items__status=state))
+                for state, _label in models.ReportBatchItem.STATUS_CHOICES
+            },
+        )
+
+    def create(self, request, *args, **kwargs):  # type: ignore[override]
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        selectors = {
+            name: serializer.validated_data[name]
+            for name in ('tank_ids', 'owner', 'client_name')
+            if serializer.validated_data.get(name)
+        }
+        tanks = models.Tank.objects.all()
+        if 'tank_ids' in selectors:
+            tanks = tanks.filter(pk__in=selectors['tank_ids'])
+        for name in ('owner', 'client_name'):
+            if name in selectors:
+                tanks = tanks.filter(**{name: selectors[name]})
+        tank_ids = list(tanks.order_by('tank_name', 'tank_unique_id').values_list('pk', flat=True))
+        if not tank_ids:
+            raise ValidationError({'non_field_errors': ['No tanks match this selection.']})
+
+        with transaction.atomic():
+            batch = models.ReportBatch.objects.create(
+                report_format=serializer.validated_data.get('report_format', 'pdf'),
+                filters={name: [str(value) for value in selectors[name]] if name == 'tank_ids' else selectors[name]
+                         for name in selectors},
+            )
+            items = models.ReportBatchItem.objects.bulk_create(
+                [models.ReportBatchItem(batch=batch, tank_id=tank_id) for tank_id in tank_ids]
+            )
+            reports.schedule_batch(batch, items)
+        data = self.get_serializer(self.get_queryset().get(pk=batch.pk)).data
+        return Response(data, status=status.HTTP_202_ACCEPTED)
+
+    def retrieve(self, request, *args, **kwargs):  # type: ignore[override]
+        batch = self.get_object()
+        if reports.requeue_stalled(batch):
+            # The annotated counts were read before the stalled items went back to pending.
+            batch = self.get_queryset().get(pk=batch.pk)
+        return Response(self.get_serializer(batch).data)
+
+    @action(detail=True, methods=['get'])
+    def items(self, request, pk=None):  # type: ignore[override]
+        """Per-tank status with download links for finished reports."""
+        batch = self.get_object()
+        queryset = batch.items.select_related('tank', 'batch')
+        state = request.query_params.get('status')
+        if state:
+            queryset = queryset.filter(status=state)
+        page = self.paginate_queryset(queryset)
+        serializer = serializers.ReportBatchItemSerializer(page, many=True, context=self.get_serializer_context())
+        return self.get_paginated_response(serializer.data)
+
 
 class MetadataViewSet(viewsets.ViewSet):
     """Provides static metadata like choice lists to power the UI."""
 
     def list(self, request):  # type: ignore[override]
-        methods = [
-            '100% Visual Examination (VE) of bottom plates, corner weld, and bottom welds',
-            '100% VE of base of tank, bottom extension, and shell',
-            'Document with digital camera',
-            'Ultrasonic Thickness Testing (UT)',
-            'Note brittle-fracture concerns if applicable',
-            'Document findings affecting structural or hydraulic integrity',
-            'Survey of the shell for settlement',
-            'Survey of fixed-roof supports for plumbness',
-            'VE of shell for bulges or distortion',
-            'Document potential findings affecting foundation or bottom integrity',
-            'Thorough VE of access structure and appurtenances',
-            'Thorough VE of roof and appurtenances',
-            'UT readings of accessible roof plates',
-            'VE of floating roof and appurtenances (if present)',
-            'VE of existing venting system',
-            'VE of coatings',
-        ]
+        data = reference.get_reference_data()
+        return reference.respond(request, data.metadata, data.version)
 
-        goals = [
-            {'key': choice.value, 'label': choice.label}
-            for choice in models.GoalKey
-        ]
 
-        return Response(
-            {
-                'methods': methods,
-                'goals': goals,
-                'tank_choices': {
-                    'facility_type': models.Tank.FACILITY_CHOICES,
-                    'foundation': models.Tank.FOUNDATION_CHOICES,
-                    'access_structure': models.Tank.ACCESS_STRUCTURE_CHOICES,
-                    'comment_types': models.VisualFinding.COMMENT_CHOICES,
-                    'visual_areas': models.VisualFinding.AREA_CHOICES,
-                    'ut_categories': models.UTResult.CATEGORY_CHOICES,
-                },
-            }
-        )
+class PerfViewSet(viewsets.ViewSet):
+    """Rolling latency, query and size summary per view action for this worker process."""
+
+    permission_classes = [perf.PerfAccess]
+    perf_exempt = True
+
+    def list(self, request):  # type: ignore[override]
+        return Response(perf.summary())
+
+    @action(detail=False, methods=['post'])
+    def reset(self, request):
+        perf.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
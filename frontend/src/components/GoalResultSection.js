@@ -1,6 +1,6 @@
 import { jsx as _jsx, jsxs as _jsxs } from "react/jsx-runtime";
 import { Fragment, useEffect, useMemo, useState } from 'react';
-import { apiGet, apiPatch, apiPost } from '../hooks/useApi';
+import { apiGetAll, apiPost } from '../hooks/useApi';
 import { useMetadata } from '../hooks/useMetadata';
 const GOAL_HELPERS = {
     goal_1: {
@@ -88,11 +88,15 @@ export function GoalResultSection({ tankId, initialResults, onResultsChange }) {
     useEffect(() => {
         setResults(initialResults);
     }, [initialResults]);
+    const referenceVersion = metadata.version;
     useEffect(() => {
+        if (!referenceVersion)
+            return;
         const load = async () => {
             setLoadingTemplates(true);
             try {
-                const data = await apiGet('/api/goal-question-templates/');
+                // Versioned URLs are cached by the browser until a template changes.
+                const data = await apiGetAll(`/api/goal-question-templates/?v=${referenceVersion}`);
                 setTemplates(data);
             }
             catch (err) {
@@ -103,7 +107,7 @@ export function GoalResultSection({ tankId, initialResults, onResultsChange }) {
             }
         };
         void load();
-    }, []);
+    }, [referenceVersion]);
     const groupedTemplates = useMemo(() => {
         return templates.reduce((acc, template) => {
             if (!acc[template.goal_key]) {
@@ -122,17 +126,15 @@ export function GoalResultSection({ tankId, initialResults, onResultsChange }) {
             goal_8: []
         });
     }, [templates]);
-    const handleUpsert = async (goal, formState, existing) => {
-        const payload = {
-            tank: tankId,
-            goal_key: goal,
-            methods: formState.methods,
-            standard_responses: formState.standard,
-            custom_responses: formState.customResponses
-        };
-        const endpoint = existing ? `/api/goal-results/${existing.id}/` : '/api/goal-results/';
-        const method = existing ? apiPatch : apiPost;
-        const saved = await method(endpoint, payload);
+    const handleUpsert = async (goal, formState) => {
+        // The bulk endpoint upserts on (tank, goal_key), so first saves never race into a conflict.
+        const payload = [{
+                goal_key: goal,
+                methods: formState.methods,
+                standard_responses: formState.standard,
+                custom_responses: formState.customResponses
+            }];
+        const saved = await apiPost(`/api/goal-results/bulk/?tank_id=${tankId}`, payload);
         setResults(prev => {
             const next = prev.filter(item => item.goal_key !== goal).concat(saved);
             onResultsChange?.(next);
@@ -176,7 +178,7 @@ function GoalCard({ goal, methods, templates, result, loadingTemplates, onSave,
         setSaving(true);
         setError(null);
         try {
-            await onSave(goal.key, formState, result);
+            await onSave(goal.key, formState);
         }
         catch (err) {
             setError(err instanceof Error ? err.message : String(err));
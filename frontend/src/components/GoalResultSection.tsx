@@ -1,5 +1,5 @@
 import { Fragment, useEffect, useMemo, useState } from 'react';
-import { apiGet, apiPatch, apiPost } from '../hooks/useApi';
+import { apiGetAll, apiPost } from '../hooks/useApi';
 import { useMetadata } from '../hooks/useMetadata';
 import type {
   GoalKey,
@@ -111,11 +111,15 @@ export function GoalResultSection({ tankId, initialResults, onResultsChange }: G
     setResults(initialResults);
   }, [initialResults]);
 
+  const referenceVersion = metadata.version;
+
   useEffect(() => {
+    if (!referenceVersion) return;
     const load = async () => {
       setLoadingTemplates(true);
       try {
-        const data = await apiGet<GoalQuestionTemplate[]>('/api/goal-question-templates/');
+        // Versioned URLs are cached by the browser until a template changes.
+        const data = await apiGetAll<GoalQuestionTemplate>(`/api/goal-question-templates/?v=${referenceVersion}`);
         setTemplates(data);
       } catch (err) {
         setError(err instanceof Error ? err.message : String(err));
@@ -124,7 +128,7 @@ export function GoalResultSection({ tankId, initialResults, onResultsChange }: G
       }
     };
     void load();
-  }, []);
+  }, [referenceVersion]);
 
   const groupedTemplates = useMemo(() => {
     return templates.reduce<Record<GoalKey, GoalQuestionTemplate[]>>((acc, template) => {
@@ -145,17 +149,15 @@ export function GoalResultSection({ tankId, initialResults, onResultsChange }: G
     });
   }, [templates]);
 
-  const handleUpsert = async (goal: GoalKey, formState: GoalFormState, existing?: GoalResult) => {
-    const payload = {
-      tank: tankId,
+  const handleUpsert = async (goal: GoalKey, formState: GoalFormState) => {
+    // The bulk endpoint upserts on (tank, goal_key), so first saves never race into a conflict.
+    const payload = [{
       goal_key: goal,
       methods: formState.methods,
       standard_responses: formState.standard,
       custom_responses: formState.customResponses
-    };
-    const endpoint = existing ? `/api/goal-results/${existing.id}/` : '/api/goal-results/';
-    const method = existing ? apiPatch<typeof payload, GoalResult> : apiPost<typeof payload, GoalResult>;
-    const saved = await method(endpoint, payload);
+    }];
+    const saved = await apiPost<typeof payload, GoalResult[]>(`/api/goal-results/bulk/?tank_id=${tankId}`, payload);
     setResults(prev => {
       const next = prev.filter(item => item.goal_key !== goal).concat(saved);
       onResultsChange?.(next);
@@ -199,7 +201,7 @@ interface GoalCardProps {
   templates: GoalQuestionTemplate[];
   result?: GoalResult;
   loadingTemplates: boolean;
-  onSave: (goal: GoalKey, state: GoalFormState, existing?: GoalResult) => Promise<void>;
+  onSave: (goal: GoalKey, state: GoalFormState) => Promise<void>;
   onCreateTemplate: (goal: GoalKey, prompt: string) => Promise<GoalQuestionTemplate>;
 }
 
@@ -237,7 +239,7 @@ function GoalCard({ goal, methods, templates, result, loadingTemplates, onSave,
     setSaving(true);
     setError(null);
     try {
-      await onSave(goal.key, formState, result);
+      await onSave(goal.key, formState);
     } catch (err) {
       setError(err instanceof Error ? err.message : String(err));
     } finally {
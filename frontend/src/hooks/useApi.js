@@ -36,6 +36,16 @@ export function useApi(url, opts) {
 export async function apiGet(url) {
     return request(url);
 }
+export async function apiGetAll(url) {
+    const items = [];
+    let next = url;
+    while (next) {
+        const page = await request(next);
+        items.push(...page.results);
+        next = page.next;
+    }
+    return items;
+}
 export async function apiPost(url, body) {
     return request(url, {
         method: 'POST',
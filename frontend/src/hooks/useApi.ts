@@ -1,4 +1,5 @@
 import { useCallback, useEffect, useState } from 'react';
+import type { Page } from '../types';
 
 interface ApiState<T> {
   data: T | null;
@@ -50,6 +51,17 @@ export async function apiGet<T>(url: string): Promise<T> {
   return request<T>(url);
 }
 
+export async function apiGetAll<T>(url: string): Promise<T[]> {
+  const items: T[] = [];
+  let next: string | null = url;
+  while (next) {
+    const page: Page<T> = await request<Page<T>>(next);
+    items.push(...page.results);
+    next = page.next;
+  }
+  return items;
+}
+
 export async function apiPost<TRequest, TResponse>(url: string, body: TRequest): Promise<TResponse> {
   return request<TResponse>(url, {
     method: 'POST',
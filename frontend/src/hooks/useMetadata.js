@@ -14,6 +14,7 @@ export function useMetadata() {
                 ut_categories: []
             };
             return {
+                version: '',
                 methods: [],
                 goals: [],
                 tank_choices: emptyChoices,
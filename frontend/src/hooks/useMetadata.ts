@@ -18,6 +18,7 @@ export function useMetadata() {
         ut_categories: []
       };
       return {
+        version: '',
         methods: [],
         goals: [],
         tank_choices: emptyChoices,
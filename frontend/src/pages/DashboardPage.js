@@ -1,5 +1,16 @@
 import { jsx as _jsx, jsxs as _jsxs } from "react/jsx-runtime";
 import { Link } from 'react-router-dom';
+import { useApi } from '../hooks/useApi';
+const complianceColumns = [
+    { key: 'overdue', label: 'Overdue', className: 'text-red-600 font-semibold' },
+    { key: 'due_30', label: '≤ 30 days', className: 'text-orange-600' },
+    { key: 'due_90', label: '≤ 90 days', className: 'text-yellow-700' },
+    { key: 'due_365', label: '≤ 1 year', className: 'text-gray-700' },
+    { key: 'current', label: 'Current', className: 'text-green-700' },
+    { key: 'unscheduled', label: 'No date', className: 'text-gray-500' },
+    { key: 'total', label: 'Total', className: 'text-gray-900 font-medium' }
+];
 export function DashboardPage() {
-    return (_jsxs("div", { className: "space-y-6", children: [_jsxs("section", { className: "bg-white shadow rounded-xl p-6", children: [_jsx("h2", { className: "text-xl font-semibold text-blue-800", children: "Get Started" }), _jsx("p", { className: "text-gray-600 mt-2", children: "Capture tank master data with detailed construction annotations, then assemble a one-page workflow 3 report for delivery." }), _jsxs("div", { className: "mt-4 flex flex-col sm:flex-row gap-3", children: [_jsx(Link, { to: "/tanks/new", className: "inline-flex items-center justify-center rounded-lg bg-blue-600 px-4 py-2 text-white hover:bg-blue-700", children: "Add a Tank" }), _jsx(Link, { to: "/executive-summary", className: "inline-flex items-center justify-center rounded-lg border border-blue-600 px-4 py-2 text-blue-700 hover:bg-blue-50", children: "View Workflow 3 Summary" })] })] }), _jsxs("section", { className: "grid gap-4 sm:grid-cols-2", children: [_jsxs("div", { className: "bg-white shadow rounded-xl p-6", children: [_jsx("h3", { className: "text-lg font-semibold text-gray-800", children: "Workflow 1" }), _jsx("p", { className: "text-gray-600 mt-1", children: "Capture and maintain tank master data, inspection logistics, and construction details with VE/UT checkboxes, color tags, and comments per item." })] }), _jsxs("div", { className: "bg-white shadow rounded-xl p-6", children: [_jsx("h3", { className: "text-lg font-semibold text-gray-800", children: "Workflow 3" }), _jsx("p", { className: "text-gray-600 mt-1", children: "Generate a one-page cover + executive summary using workflow 1 data, including tag highlights and custom construction items." })] })] })] }));
+    const { data: compliance, loading: complianceLoading, error: complianceError } = useApi('/api/tanks/compliance/');
+    return (_jsxs("div", { className: "space-y-6", children: [_jsxs("section", { className: "bg-white shadow rounded-xl p-6", children: [_jsx("h2", { className: "text-xl font-semibold text-blue-800", children: "Get Started" }), _jsx("p", { className: "text-gray-600 mt-2", children: "Capture tank master data with detailed construction annotations, then assemble a one-page workflow 3 report for delivery." }), _jsxs("div", { className: "mt-4 flex flex-col sm:flex-row gap-3", children: [_jsx(Link, { to: "/tanks/new", className: "inline-flex items-center justify-center rounded-lg bg-blue-600 px-4 py-2 text-white hover:bg-blue-700", children: "Add a Tank" }), _jsx(Link, { to: "/executive-summary", className: "inline-flex items-center justify-center rounded-lg border border-blue-600 px-4 py-2 text-blue-700 hover:bg-blue-50", children: "View Workflow 3 Summary" })] })] }), _jsxs("section", { className: "bg-white shadow rounded-xl p-6", children: [_jsx("h2", { className: "text-xl font-semibold text-blue-800", children: "Inspection Compliance" }), _jsxs("p", { className: "text-gray-600 mt-1 text-sm", children: ["Tanks by next inspection due date", compliance ? ` as of ${compliance.as_of}` : '', ", grouped by owner."] }), complianceLoading && _jsx("p", { className: "mt-4 text-sm text-gray-500", children: "Loading compliance rollup..." }), complianceError && _jsx("p", { className: "mt-4 text-sm text-red-600", children: complianceError }), compliance && (_jsx("div", { className: "mt-4 overflow-x-auto", children: _jsxs("table", { className: "min-w-full text-left text-sm", children: [_jsx("thead", { className: "bg-blue-50 text-blue-900 uppercase", children: _jsxs("tr", { children: [_jsx("th", { className: "px-3 py-2", children: "Owner" }), complianceColumns.map(column => (_jsx("th", { className: "px-3 py-2 text-right", children: column.label }, column.key)))] }) }), _jsxs("tbody", { className: "divide-y divide-gray-100", children: [compliance.groups.map(group => (_jsxs("tr", { children: [_jsx("td", { className: "px-3 py-2", children: group.owner || '—' }), complianceColumns.map(column => (_jsx("td", { className: `px-3 py-2 text-right ${column.className}`, children: group[column.key] }, column.key)))] }, group.owner ?? ''))), _jsxs("tr", { className: "bg-gray-50", children: [_jsx("td", { className: "px-3 py-2 font-semibold", children: "Fleet" }), complianceColumns.map(column => (_jsx("td", { className: `px-3 py-2 text-right ${column.className}`, children: compliance.totals[column.key] }, column.key)))] })] })] }) }))] }), _jsxs("section", { className: "grid gap-4 sm:grid-cols-2", children: [_jsxs("div", { className: "bg-white shadow rounded-xl p-6", children: [_jsx("h3", { className: "text-lg font-semibold text-gray-800", children: "Workflow 1" }), _jsx("p", { className: "text-gray-600 mt-1", children: "Capture and maintain tank master data, inspection logistics, and construction details with VE/UT checkboxes, color tags, and comments per item." })] }), _jsxs("div", { className: "bg-white shadow rounded-xl p-6", children: [_jsx("h3", { className: "text-lg font-semibold text-gray-800", children: "Workflow 3" }), _jsx("p", { className: "text-gray-600 mt-1", children: "Generate a one-page cover + executive summary using workflow 1 data, including tag highlights and custom construction items." })] })] })] }));
 }
@@ -1,6 +1,21 @@
 import { Link } from 'react-router-dom';
+import { useApi } from '../hooks/useApi';
+import type { ComplianceCounts, ComplianceRollup } from '../types';
+
+const complianceColumns: Array<{ key: keyof Omit<ComplianceCounts, 'earliest_due'>; label: string; className: string }> = [
+  { key: 'overdue', label: 'Overdue', className: 'text-red-600 font-semibold' },
+  { key: 'due_30', label: '≤ 30 days', className: 'text-orange-600' },
+  { key: 'due_90', label: '≤ 90 days', className: 'text-yellow-700' },
+  { key: 'due_365', label: '≤ 1 year', className: 'text-gray-700' },
+  { key: 'current', label: 'Current', className: 'text-green-700' },
+  { key: 'unscheduled', label: 'No date', className: 'text-gray-500' },
+  { key: 'total', label: 'Total', className: 'text-gray-900 font-medium' }
+];
 
 export function DashboardPage() {
+  const { data: compliance, loading: complianceLoading, error: complianceError } =
+    useApi<ComplianceRollup>('/api/tanks/compliance/');
+
   return (
     <div className="space-y-6">
       <section className="bg-white shadow rounded-xl p-6">
@@ -23,6 +38,50 @@ export function DashboardPage() {
           </Link>
         </div>
       </section>
+      <section className="bg-white shadow rounded-xl p-6">
+        <h2 className="text-xl font-semibold text-blue-800">Inspection Compliance</h2>
+        <p className="text-gray-600 mt-1 text-sm">
+          Tanks by next inspection due date{compliance ? ` as of ${compliance.as_of}` : ''}, grouped by owner.
+        </p>
+        {complianceLoading && <p className="mt-4 text-sm text-gray-500">Loading compliance rollup...</p>}
+        {complianceError && <p className="mt-4 text-sm text-red-600">{complianceError}</p>}
+        {compliance && (
+          <div className="mt-4 overflow-x-auto">
+            <table className="min-w-full text-left text-sm">
+              <thead className="bg-blue-50 text-blue-900 uppercase">
+                <tr>
+                  <th className="px-3 py-2">Owner</th>
+                  {complianceColumns.map(column => (
+                    <th key={column.key} className="px-3 py-2 text-right">
+                      {column.label}
+                    </th>
+                  ))}
+                </tr>
+              </thead>
+              <tbody className="divide-y divide-gray-100">
+                {compliance.groups.map(group => (
+                  <tr key={group.owner ?? ''}>
+                    <td className="px-3 py-2">{group.owner || '—'}</td>
+                    {complianceColumns.map(column => (
+                      <td key={column.key} className={`px-3 py-2 text-right ${column.className}`}>
+                        {group[column.key]}
+                      </td>
+                    ))}
+                  </tr>
+                ))}
+                <tr className="bg-gray-50">
+                  <td className="px-3 py-2 font-semibold">Fleet</td>
+                  {complianceColumns.map(column => (
+                    <td key={column.key} className={`px-3 py-2 text-right ${column.className}`}>
+                      {compliance.totals[column.key]}
+                    </td>
+                  ))}
+                </tr>
+              </tbody>
+            </table>
+          </div>
+        )}
+      </section>
       <section className="grid gap-4 sm:grid-cols-2">
         <div className="bg-white shadow rounded-xl p-6">
           <h3 className="text-lg font-semibold text-gray-800">Workflow 1</h3>
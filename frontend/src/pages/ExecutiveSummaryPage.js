@@ -1,5 +1,5 @@
 import { jsx as _jsx, jsxs as _jsxs } from "react/jsx-runtime";
-import { useEffect, useMemo, useState } from 'react';
+import { useEffect, useState } from 'react';
 import { apiGet } from '../hooks/useApi';
 const constructionFieldMeta = [
     { key: 'foundation', label: 'Foundation' },
@@ -32,6 +32,11 @@ const timelineFields = [
     { key: 'ut_inspection_date', label: 'UT inspection date' },
     { key: 'next_inspection_due_date', label: 'Next inspection due date' }
 ];
+const fleetExports = [
+    { resource: 'tanks', label: 'Fleet tanks' },
+    { resource: 'ut-results', label: 'UT history' },
+    { resource: 'visual-findings', label: 'Visual findings' }
+];
 const colorLabel = {
     red: 'Red',
     blue: 'Blue',
@@ -59,37 +64,11 @@ function formatDate(value) {
     return parsed.toLocaleDateString();
 }
 function SummaryCard({ detail }) {
-    const taggedItems = useMemo(() => {
-        const base = constructionFieldMeta
-            .map(({ key, label }) => {
-            const annotation = detail.construction_annotations.standard[key];
-            return annotation?.color
-                ? {
-                    color: annotation.color,
-                    label,
-                    value: formatValue(detail[key])
-                }
-                : null;
-        })
-            .filter(Boolean);
-        const additional = detail.construction_annotations.additional
-            .filter(item => item.color)
-            .map(item => ({
-            color: item.color,
-            label: item.label,
-            value: item.value
-        }));
-        return [...base, ...additional];
-    }, [detail]);
-    const colorBuckets = taggedItems.reduce((acc, item) => {
-        if (!acc[item.color]) {
-            acc[item.color] = [];
-        }
-        acc[item.color].push({ label: item.label, value: item.value });
-        return acc;
-    }, { red: [], blue: [], yellow: [], green: [] });
-    const downloadJson = () => {
-        const blob = new Blob([JSON.stringify(detail, null, 2)], { type: 'application/json' });
+    const colorBuckets = detail.color_buckets;
+    const hasTags = Object.keys(colorBuckets).some(color => colorBuckets[color].length > 0);
+    const downloadJson = async () => {
+        const record = await apiGet(`/api/tanks/${detail.tank_unique_id}/`);
+        const blob = new Blob([JSON.stringify(record, null, 2)], { type: 'application/json' });
         const url = URL.createObjectURL(blob);
         const link = document.createElement('a');
         link.href = url;
@@ -140,7 +119,7 @@ function SummaryCard({ detail }) {
                                             const annotation = detail.construction_annotations.standard[key];
                                             const tag = annotation?.color ? annotation.color : null;
                                             return (_jsxs("tr", { children: [_jsx("td", { className: "px-4 py-2 font-medium text-gray-700", children: label }), _jsx("td", { className: "px-4 py-2 text-gray-600", children: formatValue(detail[key]) }), _jsx("td", { className: "px-4 py-2", children: tag ? (_jsx("span", { className: `inline-flex rounded-full px-2 py-1 text-xs font-semibold ${colorChipClass[tag]}`, children: colorLabel[tag] })) : (_jsx("span", { className: "text-xs text-gray-400", children: "None" })) }), _jsx("td", { className: "px-4 py-2 text-gray-600", children: annotation?.ve ? 'Yes' : 'No' }), _jsx("td", { className: "px-4 py-2 text-gray-600", children: annotation?.ut ? 'Yes' : 'No' }), _jsx("td", { className: "px-4 py-2 text-gray-600", children: annotation?.comment || '—' })] }, key));
-                                        }), detail.construction_annotations.additional.length > 0 && (_jsx("tr", { className: "bg-gray-50 text-xs uppercase text-gray-500", children: _jsx("td", { className: "px-4 py-2", colSpan: 6, children: "Additional inspector items" }) })), detail.construction_annotations.additional.map((item, index) => (_jsxs("tr", { children: [_jsx("td", { className: "px-4 py-2 font-medium text-gray-700", children: item.label }), _jsx("td", { className: "px-4 py-2 text-gray-600", children: formatValue(item.value) }), _jsx("td", { className: "px-4 py-2", children: item.color ? (_jsx("span", { className: `inline-flex rounded-full px-2 py-1 text-xs font-semibold ${colorChipClass[item.color]}`, children: colorLabel[item.color] })) : (_jsx("span", { className: "text-xs text-gray-400", children: "None" })) }), _jsx("td", { className: "px-4 py-2 text-gray-600", children: item.ve ? 'Yes' : 'No' }), _jsx("td", { className: "px-4 py-2 text-gray-600", children: item.ut ? 'Yes' : 'No' }), _jsx("td", { className: "px-4 py-2 text-gray-600", children: item.comment || '—' })] }, `custom-${index}`)))] })] }) })] }), taggedItems.length > 0 && (_jsxs("section", { className: "space-y-3", children: [_jsx("h4", { className: "text-sm font-semibold text-blue-800", children: "Color tag summary" }), _jsx("div", { className: "grid gap-4 md:grid-cols-2", children: Object.keys(colorBuckets).map(color => (_jsxs("div", { className: "rounded-lg border border-gray-200 p-4 space-y-2", children: [_jsx("div", { className: `inline-flex rounded-full px-3 py-1 text-xs font-semibold ${colorChipClass[color]}`, children: colorLabel[color] }), colorBuckets[color].length === 0 ? (_jsx("p", { className: "text-sm text-gray-500", children: "No items tagged." })) : (_jsx("ul", { className: "list-disc pl-5 text-sm text-gray-600 space-y-1", children: colorBuckets[color].map(entry => (_jsxs("li", { children: [entry.label, ": ", entry.value] }, `${color}-${entry.label}`))) }))] }, color))) })] }))] }));
+                                        }), detail.construction_annotations.additional.length > 0 && (_jsx("tr", { className: "bg-gray-50 text-xs uppercase text-gray-500", children: _jsx("td", { className: "px-4 py-2", colSpan: 6, children: "Additional inspector items" }) })), detail.construction_annotations.additional.map((item, index) => (_jsxs("tr", { children: [_jsx("td", { className: "px-4 py-2 font-medium text-gray-700", children: item.label }), _jsx("td", { className: "px-4 py-2 text-gray-600", children: formatValue(item.value) }), _jsx("td", { className: "px-4 py-2", children: item.color ? (_jsx("span", { className: `inline-flex rounded-full px-2 py-1 text-xs font-semibold ${colorChipClass[item.color]}`, children: colorLabel[item.color] })) : (_jsx("span", { className: "text-xs text-gray-400", children: "None" })) }), _jsx("td", { className: "px-4 py-2 text-gray-600", children: item.ve ? 'Yes' : 'No' }), _jsx("td", { className: "px-4 py-2 text-gray-600", children: item.ut ? 'Yes' : 'No' }), _jsx("td", { className: "px-4 py-2 text-gray-600", children: item.comment || '—' })] }, `custom-${index}`)))] })] }) })] }), hasTags && (_jsxs("section", { className: "space-y-3", children: [_jsx("h4", { className: "text-sm font-semibold text-blue-800", children: "Color tag summary" }), _jsx("div", { className: "grid gap-4 md:grid-cols-2", children: Object.keys(colorBuckets).map(color => (_jsxs("div", { className: "rounded-lg border border-gray-200 p-4 space-y-2", children: [_jsx("div", { className: `inline-flex rounded-full px-3 py-1 text-xs font-semibold ${colorChipClass[color]}`, children: colorLabel[color] }), colorBuckets[color].length === 0 ? (_jsx("p", { className: "text-sm text-gray-500", children: "No items tagged." })) : (_jsx("ul", { className: "list-disc pl-5 text-sm text-gray-600 space-y-1", children: colorBuckets[color].map(entry => (_jsxs("li", { children: [entry.label, ": ", entry.value] }, `${color}-${entry.label}`))) }))] }, color))) })] }))] }));
 }
 export function ExecutiveSummaryPage() {
     const [summaries, setSummaries] = useState([]);
@@ -150,9 +129,8 @@ export function ExecutiveSummaryPage() {
         const load = async () => {
             setLoading(true);
             try {
-                const tanks = await apiGet('/api/tanks/');
-                const details = await Promise.all(tanks.map(tank => apiGet(`/api/tanks/${tank.tank_unique_id}/`)));
-                setSummaries(details);
+                const data = await apiGet('/api/tanks/executive-summary/');
+                setSummaries(data);
                 setError(null);
             }
             catch (err) {
@@ -173,5 +151,5 @@ export function ExecutiveSummaryPage() {
     if (summaries.length === 0) {
         return _jsx("p", { children: "No tanks available yet. Add a tank to generate the workflow 3 report." });
     }
-    return (_jsxs("div", { className: "space-y-6", children: [_jsxs("header", { children: [_jsx("h2", { className: "text-2xl font-semibold text-blue-800", children: "Workflow 3 Summary" }), _jsx("p", { className: "text-sm text-gray-500", children: "One-page cover, executive summary, and construction annotations derived from workflow 1 entries." })] }), _jsx("div", { className: "space-y-6", children: summaries.map(summary => (_jsx(SummaryCard, { detail: summary }, summary.tank_unique_id))) })] }));
+    return (_jsxs("div", { className: "space-y-6", children: [_jsxs("header", { children: [_jsx("h2", { className: "text-2xl font-semibold text-blue-800", children: "Workflow 3 Summary" }), _jsx("p", { className: "text-sm text-gray-500", children: "One-page cover, executive summary, and construction annotations derived from workflow 1 entries." }), _jsx("div", { className: "mt-3 flex flex-wrap gap-2 text-sm", children: fleetExports.map(({ resource, label }) => (_jsxs("a", { href: `/api/exports/${resource}/?format=csv`, className: "rounded-lg border border-blue-600 px-3 py-1 text-blue-700", children: [label, " (CSV)"] }, resource))) })] }), _jsx("div", { className: "space-y-6", children: summaries.map(summary => (_jsx(SummaryCard, { detail: summary }, summary.tank_unique_id))) })] }));
 }
@@ -1,8 +1,8 @@
-import { useEffect, useMemo, useState } from 'react';
+import { useEffect, useState } from 'react';
 import { apiGet } from '../hooks/useApi';
-import type { TagColor, Tank, TankDetail } from '../types';
+import type { TagColor, Tank, TankDetail, TankSummary } from '../types';
 
-const constructionFieldMeta: Array<{ key: keyof TankDetail; label: string }> = [
+const constructionFieldMeta: Array<{ key: keyof Tank; label: string }> = [
   { key: 'foundation', label: 'Foundation' },
   { key: 'anchors', label: 'Anchors' },
   { key: 'shell_weld_type', label: 'Shell weld type' },
@@ -26,7 +26,7 @@ const constructionFieldMeta: Array<{ key: keyof TankDetail; label: string }> = [
   { key: 'temperature', label: 'Temperature' }
 ];
 
-const timelineFields: Array<{ key: keyof TankDetail; label: string }> = [
+const timelineFields: Array<{ key: keyof Tank; label: string }> = [
   { key: 'inspection_date', label: 'Inspection date' },
   { key: 'construction_date', label: 'Construction date' },
   { key: 'external_inspection_date', label: 'External inspection date' },
@@ -35,6 +35,12 @@ const timelineFields: Array<{ key: keyof TankDetail; label: string }> = [
   { key: 'next_inspection_due_date', label: 'Next inspection due date' }
 ];
 
+const fleetExports: Array<{ resource: string; label: string }> = [
+  { resource: 'tanks', label: 'Fleet tanks' },
+  { resource: 'ut-results', label: 'UT history' },
+  { resource: 'visual-findings', label: 'Visual findings' }
+];
+
 const colorLabel: Record<TagColor, string> = {
   red: 'Red',
   blue: 'Blue',
@@ -64,45 +70,16 @@ function formatDate(value: string | null): string {
 }
 
 interface SummaryCardProps {
-  detail: TankDetail;
+  detail: TankSummary;
 }
 
 function SummaryCard({ detail }: SummaryCardProps) {
-  const taggedItems = useMemo(() => {
-    const base = constructionFieldMeta
-      .map(({ key, label }) => {
-        const annotation = detail.construction_annotations.standard[key as string];
-        return annotation?.color
-          ? {
-              color: annotation.color as TagColor,
-              label,
-              value: formatValue(detail[key])
-            }
-          : null;
-      })
-      .filter(Boolean) as Array<{ color: TagColor; label: string; value: string }>;
-
-    const additional = detail.construction_annotations.additional
-      .filter(item => item.color)
-      .map(item => ({
-        color: item.color as TagColor,
-        label: item.label,
-        value: item.value
-      }));
-
-    return [...base, ...additional];
-  }, [detail]);
+  const colorBuckets = detail.color_buckets;
+  const hasTags = (Object.keys(colorBuckets) as TagColor[]).some(color => colorBuckets[color].length > 0);
 
-  const colorBuckets = taggedItems.reduce<Record<TagColor, Array<{ label: string; value: string }>>>((acc, item) => {
-    if (!acc[item.color]) {
-      acc[item.color] = [];
-    }
-    acc[item.color].push({ label: item.label, value: item.value });
-    return acc;
-  }, { red: [], blue: [], yellow: [], green: [] });
-
-  const downloadJson = () => {
-    const blob = new Blob([JSON.stringify(detail, null, 2)], { type: 'application/json' });
+  const downloadJson = async () => {
+    const record = await apiGet<TankDetail>(`/api/tanks/${detail.tank_unique_id}/`);
+    const blob = new Blob([JSON.stringify(record, null, 2)], { type: 'application/json' });
     const url = URL.createObjectURL(blob);
     const link = document.createElement('a');
     link.href = url;
@@ -304,7 +281,7 @@ function SummaryCard({ detail }: SummaryCardProps) {
         </div>
       </section>
 
-      {taggedItems.length > 0 && (
+      {hasTags && (
         <section className="space-y-3">
           <h4 className="text-sm font-semibold text-blue-800">Color tag summary</h4>
           <div className="grid gap-4 md:grid-cols-2">
@@ -332,7 +309,7 @@ function SummaryCard({ detail }: SummaryCardProps) {
 }
 
 export function ExecutiveSummaryPage() {
-  const [summaries, setSummaries] = useState<TankDetail[]>([]);
+  const [summaries, setSummaries] = useState<TankSummary[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
 
@@ -340,9 +317,8 @@ export function ExecutiveSummaryPage() {
     const load = async () => {
       setLoading(true);
       try {
-        const tanks = await apiGet<Tank[]>('/api/tanks/');
-        const details = await Promise.all(tanks.map(tank => apiGet<TankDetail>(`/api/tanks/${tank.tank_unique_id}/`)));
-        setSummaries(details);
+        const data = await apiGet<TankSummary[]>('/api/tanks/executive-summary/');
+        setSummaries(data);
         setError(null);
       } catch (err) {
         setError(err instanceof Error ? err.message : String(err));
@@ -372,6 +348,17 @@ export function ExecutiveSummaryPage() {
         <p className="text-sm text-gray-500">
           One-page cover, executive summary, and construction annotations derived from workflow 1 entries.
         </p>
+        <div className="mt-3 flex flex-wrap gap-2 text-sm">
+          {fleetExports.map(({ resource, label }) => (
+            <a
+              key={resource}
+              href={`/api/exports/${resource}/?format=csv`}
+              className="rounded-lg border border-blue-600 px-3 py-1 text-blue-700"
+            >
+              {label} (CSV)
+            </a>
+          ))}
+        </div>
       </header>
       <div className="space-y-6">
         {summaries.map(summary => (
@@ -2,15 +2,40 @@ import { jsx as _jsx, jsxs as _jsxs } from "react/jsx-runtime";
 import { useEffect, useState } from 'react';
 import { Link } from 'react-router-dom';
 import { apiDelete, apiGet } from '../hooks/useApi';
+import { useMetadata } from '../hooks/useMetadata';
+const emptyFilters = {
+    name: '',
+    owner: '',
+    state: '',
+    facility_type: '',
+    next_inspection_due_date_lte: ''
+};
+function tanksUrl(filters) {
+    const params = new URLSearchParams();
+    for (const [key, value] of Object.entries(filters)) {
+        if (value.trim())
+            params.set(key, value.trim());
+    }
+    const query = params.toString();
+    return query ? `/api/tanks/?${query}` : '/api/tanks/';
+}
 export function TankListPage() {
+    const { metadata } = useMetadata();
     const [tanks, setTanks] = useState([]);
+    const [nextPage, setNextPage] = useState(null);
     const [loading, setLoading] = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [error, setError] = useState(null);
+    const [filters, setFilters] = useState(emptyFilters);
+    const [applied, setApplied] = useState(emptyFilters);
+    const [suggestions, setSuggestions] = useState([]);
+    const hasFilters = Object.values(applied).some(value => value.trim());
     const load = async () => {
         setLoading(true);
         try {
-            const data = await apiGet('/api/tanks/');
-            setTanks(data);
+            const page = await apiGet(tanksUrl(applied));
+            setTanks(page.results);
+            setNextPage(page.next);
             setError(null);
         }
         catch (err) {
@@ -20,9 +45,59 @@ export function TankListPage() {
             setLoading(false);
         }
     };
+    const loadMore = async () => {
+        if (!nextPage)
+            return;
+        setLoadingMore(true);
+        try {
+            const page = await apiGet(nextPage);
+            setTanks(prev => [...prev, ...page.results]);
+            setNextPage(page.next);
+        }
+        catch (err) {
+            setError(err instanceof Error ? err.message : String(err));
+        }
+        finally {
+            setLoadingMore(false);
+        }
+    };
     useEffect(() => {
         void load();
-    }, []);
+    }, [applied]);
+    useEffect(() => {
+        const prefix = filters.name.trim();
+        if (!prefix) {
+            setSuggestions([]);
+            return;
+        }
+        let cancelled = false;
+        const timer = window.setTimeout(async () => {
+            try {
+                const matches = await apiGet(`/api/tanks/typeahead/?q=${encodeURIComponent(prefix)}`);
+                if (!cancelled)
+                    setSuggestions(matches);
+            }
+            catch (err) {
+                if (!cancelled)
+                    setSuggestions([]);
+            }
+        }, 150);
+        return () => {
+            cancelled = true;
+            window.clearTimeout(timer);
+        };
+    }, [filters.name]);
+    const updateFilter = (key, value) => {
+        setFilters(prev => ({ ...prev, [key]: value }));
+    };
+    const handleFilter = (event) => {
+        event.preventDefault();
+        setApplied(filters);
+    };
+    const clearFilters = () => {
+        setFilters(emptyFilters);
+        setApplied(emptyFilters);
+    };
     const handleDelete = async (tankId) => {
         if (!confirm('Delete this tank and all associated records?'))
             return;
@@ -34,5 +109,5 @@ export function TankListPage() {
             alert(err instanceof Error ? err.message : String(err));
         }
     };
-    return (_jsxs("div", { className: "space-y-6", children: [_jsxs("div", { className: "flex items-center justify-between", children: [_jsxs("div", { children: [_jsx("h2", { className: "text-xl font-semibold text-blue-800", children: "Tank Registry" }), _jsx("p", { className: "text-gray-500 text-sm", children: "Master data stored in the local database." })] }), _jsx(Link, { to: "/tanks/new", className: "rounded-lg bg-blue-600 text-white px-4 py-2 hover:bg-blue-700", children: "Add Tank" })] }), _jsx("div", { className: "bg-white shadow rounded-xl overflow-hidden", children: _jsxs("table", { className: "min-w-full text-left", children: [_jsx("thead", { className: "bg-blue-50 text-blue-900 text-sm uppercase", children: _jsxs("tr", { children: [_jsx("th", { className: "px-4 py-3", children: "Tank" }), _jsx("th", { className: "px-4 py-3", children: "Owner" }), _jsx("th", { className: "px-4 py-3", children: "Facility" }), _jsx("th", { className: "px-4 py-3", children: "City / State" }), _jsx("th", { className: "px-4 py-3 text-right", children: "Actions" })] }) }), _jsxs("tbody", { className: "divide-y divide-gray-100 text-sm", children: [loading && (_jsx("tr", { children: _jsx("td", { colSpan: 5, className: "px-4 py-6 text-center text-gray-500", children: "Loading tanks..." }) })), error && !loading && (_jsx("tr", { children: _jsx("td", { colSpan: 5, className: "px-4 py-6 text-center text-red-600", children: error }) })), !loading && !error && tanks.length === 0 && (_jsx("tr", { children: _jsx("td", { colSpan: 5, className: "px-4 py-6 text-center text-gray-500", children: "No tanks recorded yet. Start by adding a master record." }) })), tanks.map(tank => (_jsxs("tr", { className: "hover:bg-gray-50", children: [_jsx("td", { className: "px-4 py-3 font-medium text-gray-900", children: tank.tank_name }), _jsx("td", { className: "px-4 py-3", children: tank.owner }), _jsx("td", { className: "px-4 py-3", children: tank.facility_type }), _jsxs("td", { className: "px-4 py-3", children: [tank.city, ", ", tank.state] }), _jsx("td", { className: "px-4 py-3", children: _jsxs("div", { className: "flex justify-end gap-2", children: [_jsx(Link, { to: `/tanks/${tank.tank_unique_id}`, className: "rounded-md border border-blue-600 px-3 py-1 text-blue-700 hover:bg-blue-50", children: "Open" }), _jsx("button", { type: "button", onClick: () => handleDelete(tank.tank_unique_id), className: "rounded-md border border-red-200 px-3 py-1 text-red-500 hover:bg-red-50", children: "Delete" })] }) })] }, tank.tank_unique_id)))] })] }) })] }));
+    return (_jsxs("div", { className: "space-y-6", children: [_jsxs("div", { className: "flex items-center justify-between", children: [_jsxs("div", { children: [_jsx("h2", { className: "text-xl font-semibold text-blue-800", children: "Tank Registry" }), _jsx("p", { className: "text-gray-500 text-sm", children: "Master data stored in the local database." })] }), _jsx(Link, { to: "/tanks/new", className: "rounded-lg bg-blue-600 text-white px-4 py-2 hover:bg-blue-700", children: "Add Tank" })] }), _jsxs("form", { onSubmit: handleFilter, className: "bg-white shadow rounded-xl p-4 grid gap-3 md:grid-cols-6 items-end", children: [_jsxs("label", { className: "flex flex-col text-sm md:col-span-2", children: ["Tank name", _jsx("input", { className: "mt-1 rounded-lg border border-gray-300 px-3 py-2", value: filters.name, onChange: event => updateFilter('name', event.target.value), list: "tank-name-suggestions", placeholder: "Starts with\u2026" }), _jsx("datalist", { id: "tank-name-suggestions", children: suggestions.map(suggestion => (_jsx("option", { value: suggestion.tank_name, children: suggestion.owner }, suggestion.tank_unique_id))) })] }), _jsxs("label", { className: "flex flex-col text-sm", children: ["Owner", _jsx("input", { className: "mt-1 rounded-lg border border-gray-300 px-3 py-2", value: filters.owner, onChange: event => updateFilter('owner', event.target.value) })] }), _jsxs("label", { className: "flex flex-col text-sm", children: ["State", _jsx("input", { className: "mt-1 rounded-lg border border-gray-300 px-3 py-2", value: filters.state, onChange: event => updateFilter('state', event.target.value), placeholder: "TX" })] }), _jsxs("label", { className: "flex flex-col text-sm", children: ["Facility", _jsxs("select", { className: "mt-1 rounded-lg border border-gray-300 px-3 py-2", value: filters.facility_type, onChange: event => updateFilter('facility_type', event.target.value), children: [_jsx("option", { value: "", children: "Any" }), metadata.choices.facility_type.map(([value, label]) => (_jsx("option", { value: value, children: label }, value)))] })] }), _jsxs("label", { className: "flex flex-col text-sm", children: ["Due on or before", _jsx("input", { type: "date", className: "mt-1 rounded-lg border border-gray-300 px-3 py-2", value: filters.next_inspection_due_date_lte, onChange: event => updateFilter('next_inspection_due_date_lte', event.target.value) })] }), _jsxs("div", { className: "flex justify-end gap-2 md:col-span-6", children: [_jsx("button", { type: "button", onClick: clearFilters, className: "rounded-lg border border-gray-300 px-4 py-2 text-gray-700 hover:bg-gray-50", children: "Clear" }), _jsx("button", { type: "submit", className: "rounded-lg bg-blue-600 px-4 py-2 text-white hover:bg-blue-700", children: "Apply filters" })] })] }), _jsx("div", { className: "bg-white shadow rounded-xl overflow-hidden", children: _jsxs("table", { className: "min-w-full text-left", children: [_jsx("thead", { className: "bg-blue-50 text-blue-900 text-sm uppercase", children: _jsxs("tr", { children: [_jsx("th", { className: "px-4 py-3", children: "Tank" }), _jsx("th", { className: "px-4 py-3", children: "Owner" }), _jsx("th", { className: "px-4 py-3", children: "Facility" }), _jsx("th", { className: "px-4 py-3", children: "City / State" }), _jsx("th", { className: "px-4 py-3 text-right", children: "Actions" })] }) }), _jsxs("tbody", { className: "divide-y divide-gray-100 text-sm", children: [loading && (_jsx("tr", { children: _jsx("td", { colSpan: 5, className: "px-4 py-6 text-center text-gray-500", children: "Loading tanks..." }) })), error && !loading && (_jsx("tr", { children: _jsx("td", { colSpan: 5, className: "px-4 py-6 text-center text-red-600", children: error }) })), !loading && !error && tanks.length === 0 && (_jsx("tr", { children: _jsx("td", { colSpan: 5, className: "px-4 py-6 text-center text-gray-500", children: hasFilters ? 'No tanks match these filters.' : 'No tanks recorded yet. Start by adding a master record.' }) })), tanks.map(tank => (_jsxs("tr", { className: "hover:bg-gray-50", children: [_jsx("td", { className: "px-4 py-3 font-medium text-gray-900", children: tank.tank_name }), _jsx("td", { className: "px-4 py-3", children: tank.owner }), _jsx("td", { className: "px-4 py-3", children: tank.facility_type }), _jsxs("td", { className: "px-4 py-3", children: [tank.city, ", ", tank.state] }), _jsx("td", { className: "px-4 py-3", children: _jsxs("div", { className: "flex justify-end gap-2", children: [_jsx(Link, { to: `/tanks/${tank.tank_unique_id}`, className: "rounded-md border border-blue-600 px-3 py-1 text-blue-700 hover:bg-blue-50", children: "Open" }), _jsx("button", { type: "button", onClick: () => handleDelete(tank.tank_unique_id), className: "rounded-md border border-red-200 px-3 py-1 text-red-500 hover:bg-red-50", children: "Delete" })] }) })] }, tank.tank_unique_id)))] })] }) }), nextPage && (_jsx("div", { className: "flex justify-center", children: _jsx("button", { type: "button", onClick: loadMore, disabled: loadingMore, className: "rounded-lg border border-blue-600 px-4 py-2 text-blue-700 hover:bg-blue-50 disabled:opacity-50", children: loadingMore ? 'Loading...' : 'Load more tanks' }) }))] }));
 }
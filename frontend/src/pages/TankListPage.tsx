@@ -1,18 +1,52 @@
-import { useEffect, useState } from 'react';
+import { FormEvent, useEffect, useState } from 'react';
 import { Link } from 'react-router-dom';
 import { apiDelete, apiGet } from '../hooks/useApi';
-import type { Tank } from '../types';
+import { useMetadata } from '../hooks/useMetadata';
+import type { Page, TankListItem, TankSuggestion } from '../types';
+
+interface TankFilters {
+  name: string;
+  owner: string;
+  state: string;
+  facility_type: string;
+  next_inspection_due_date_lte: string;
+}
+
+const emptyFilters: TankFilters = {
+  name: '',
+  owner: '',
+  state: '',
+  facility_type: '',
+  next_inspection_due_date_lte: ''
+};
+
+function tanksUrl(filters: TankFilters) {
+  const params = new URLSearchParams();
+  for (const [key, value] of Object.entries(filters)) {
+    if (value.trim()) params.set(key, value.trim());
+  }
+  const query = params.toString();
+  return query ? `/api/tanks/?${query}` : '/api/tanks/';
+}
 
 export function TankListPage() {
-  const [tanks, setTanks] = useState<Tank[]>([]);
+  const { metadata } = useMetadata();
+  const [tanks, setTanks] = useState<TankListItem[]>([]);
+  const [nextPage, setNextPage] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState<string | null>(null);
+  const [filters, setFilters] = useState<TankFilters>(emptyFilters);
+  const [applied, setApplied] = useState<TankFilters>(emptyFilters);
+  const [suggestions, setSuggestions] = useState<TankSuggestion[]>([]);
+  const hasFilters = Object.values(applied).some(value => value.trim());
 
   const load = async () => {
     setLoading(true);
     try {
-      const data = await apiGet<Tank[]>('/api/tanks/');
-      setTanks(data);
+      const page = await apiGet<Page<TankListItem>>(tanksUrl(applied));
+      setTanks(page.results);
+      setNextPage(page.next);
       setError(null);
     } catch (err) {
       setError(err instanceof Error ? err.message : String(err));
@@ -21,9 +55,58 @@ export function TankListPage() {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextPage) return;
+    setLoadingMore(true);
+    try {
+      const page = await apiGet<Page<TankListItem>>(nextPage);
+      setTanks(prev => [...prev, ...page.results]);
+      setNextPage(page.next);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : String(err));
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     void load();
-  }, []);
+  }, [applied]);
+
+  useEffect(() => {
+    const prefix = filters.name.trim();
+    if (!prefix) {
+      setSuggestions([]);
+      return;
+    }
+    let cancelled = false;
+    const timer = window.setTimeout(async () => {
+      try {
+        const matches = await apiGet<TankSuggestion[]>(`/api/tanks/typeahead/?q=${encodeURIComponent(prefix)}`);
+        if (!cancelled) setSuggestions(matches);
+      } catch (err) {
+        if (!cancelled) setSuggestions([]);
+      }
+    }, 150);
+    return () => {
+      cancelled = true;
+      window.clearTimeout(timer);
+    };
+  }, [filters.name]);
+
+  const updateFilter = (key: keyof TankFilters, value: string) => {
+    setFilters(prev => ({ ...prev, [key]: value }));
+  };
+
+  const handleFilter = (event: FormEvent) => {
+    event.preventDefault();
+    setApplied(filters);
+  };
+
+  const clearFilters = () => {
+    setFilters(emptyFilters);
+    setApplied(emptyFilters);
+  };
 
   const handleDelete = async (tankId: string) => {
     if (!confirm('Delete this tank and all associated records?')) return;
@@ -50,6 +133,79 @@ export function TankListPage() {
         </Link>
       </div>
 
+      <form onSubmit={handleFilter} className="bg-white shadow rounded-xl p-4 grid gap-3 md:grid-cols-6 items-end">
+        <label className="flex flex-col text-sm md:col-span-2">
+          Tank name
+          <input
+            className="mt-1 rounded-lg border border-gray-300 px-3 py-2"
+            value={filters.name}
+            onChange={event => updateFilter('name', event.target.value)}
+            list="tank-name-suggestions"
+            placeholder="Starts with…"
+          />
+          <datalist id="tank-name-suggestions">
+            {suggestions.map(suggestion => (
+              <option key={suggestion.tank_unique_id} value={suggestion.tank_name}>
+                {suggestion.owner}
+              </option>
+            ))}
+          </datalist>
+        </label>
+        <label className="flex flex-col text-sm">
+          Owner
+          <input
+            className="mt-1 rounded-lg border border-gray-300 px-3 py-2"
+            value={filters.owner}
+            onChange={event => updateFilter('owner', event.target.value)}
+          />
+        </label>
+        <label className="flex flex-col text-sm">
+          State
+          <input
+            className="mt-1 rounded-lg border border-gray-300 px-3 py-2"
+            value={filters.state}
+            onChange={event => updateFilter('state', event.target.value)}
+            placeholder="TX"
+          />
+        </label>
+        <label className="flex flex-col text-sm">
+          Facility
+          <select
+            className="mt-1 rounded-lg border border-gray-300 px-3 py-2"
+            value={filters.facility_type}
+            onChange={event => updateFilter('facility_type', event.target.value)}
+          >
+            <option value="">Any</option>
+            {metadata.choices.facility_type.map(([value, label]) => (
+              <option key={value} value={value}>
+                {label}
+              </option>
+            ))}
+          </select>
+        </label>
+        <label className="flex flex-col text-sm">
+          Due on or before
+          <input
+            type="date"
+            className="mt-1 rounded-lg border border-gray-300 px-3 py-2"
+            value={filters.next_inspection_due_date_lte}
+            onChange={event => updateFilter('next_inspection_due_date_lte', event.target.value)}
+          />
+        </label>
+        <div className="flex justify-end gap-2 md:col-span-6">
+          <button
+            type="button"
+            onClick={clearFilters}
+            className="rounded-lg border border-gray-300 px-4 py-2 text-gray-700 hover:bg-gray-50"
+          >
+            Clear
+          </button>
+          <button type="submit" className="rounded-lg bg-blue-600 px-4 py-2 text-white hover:bg-blue-700">
+            Apply filters
+          </button>
+        </div>
+      </form>
+
       <div className="bg-white shadow rounded-xl overflow-hidden">
         <table className="min-w-full text-left">
           <thead className="bg-blue-50 text-blue-900 text-sm uppercase">
@@ -79,7 +235,7 @@ export function TankListPage() {
             {!loading && !error && tanks.length === 0 && (
               <tr>
                 <td colSpan={5} className="px-4 py-6 text-center text-gray-500">
-                  No tanks recorded yet. Start by adding a master record.
+                  {hasFilters ? 'No tanks match these filters.' : 'No tanks recorded yet. Start by adding a master record.'}
                 </td>
               </tr>
             )}
@@ -111,6 +267,19 @@ export function TankListPage() {
           </tbody>
         </table>
       </div>
+
+      {nextPage && (
+        <div className="flex justify-center">
+          <button
+            type="button"
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="rounded-lg border border-blue-600 px-4 py-2 text-blue-700 hover:bg-blue-50 disabled:opacity-50"
+          >
+            {loadingMore ? 'Loading...' : 'Load more tanks'}
+          </button>
+        </div>
+      )}
     </div>
   );
 }
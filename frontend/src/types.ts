@@ -1,5 +1,11 @@
 export type UUID = string;
 
+export interface Page<T> {
+  next: string | null;
+  previous: string | null;
+  results: T[];
+}
+
 export type TagColor = 'red' | 'blue' | 'yellow' | 'green';
 
 export interface ConstructionAnnotation {
@@ -79,6 +85,26 @@ export interface Tank {
 
 export type TankPayload = Omit<Tank, 'tank_unique_id' | 'created_at' | 'updated_at'>;
 
+export type TankListItem = Pick<
+  Tank,
+  | 'tank_unique_id'
+  | 'tank_name'
+  | 'owner'
+  | 'client_name'
+  | 'facility_type'
+  | 'city'
+  | 'state'
+  | 'design_standard'
+  | 'product_stored'
+  | 'next_inspection_due_date'
+  | 'updated_at'
+>;
+
+export type TankSuggestion = Pick<
+  Tank,
+  'tank_unique_id' | 'tank_name' | 'owner' | 'client_name' | 'facility_type' | 'state'
+>;
+
 export interface ShellSettlementReading {
   station_label: string;
   measurement_in: number;
@@ -179,6 +205,7 @@ export interface GoalQuestionTemplate {
 }
 
 export interface MetadataResponse {
+  version: string;
   methods: string[];
   goals: { key: GoalKey; label: string }[];
   tank_choices: {
@@ -200,3 +227,26 @@ export interface TankDetail extends Tank {
   other_nde: OtherNDE[];
   goal_results: GoalResult[];
 }
+
+export interface TankSummary extends Tank {
+  color_buckets: Record<TagColor, Array<{ label: string; value: string }>>;
+}
+
+export interface ComplianceCounts {
+  overdue: number;
+  due_30: number;
+  due_90: number;
+  due_365: number;
+  current: number;
+  unscheduled: number;
+  total: number;
+  earliest_due: string | null;
+}
+
+export interface ComplianceRollup {
+  as_of: string;
+  schedule: 'next' | 'external' | 'internal' | 'ut';
+  group_by: Array<'owner' | 'client' | 'state'>;
+  totals: ComplianceCounts;
+  groups: Array<ComplianceCounts & { owner?: string; client?: string; state?: string }>;
+}